@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.benchmark.cache_benchmark import BACKENDS, format_cache_results, run_cache_benchmark
+from src.benchmark.cache_stress import format_stress_results, run_cache_stress
+
+def main():
+    """Measures write/read throughput and disk usage of the cache backends on synthetic transcripts."""
+    parser = argparse.ArgumentParser(description="Benchmark the pickle and sqlite cache backends.")
+    parser.add_argument('--backends', default=','.join(BACKENDS), help=f"Comma-separated backends out of {', '.join(BACKENDS)}.")
+    parser.add_argument('--entries', type=int, default=2000, help="Pages written and read per backend.")
+    parser.add_argument('--segments', type=int, default=200, help="Chair segments per synthetic transcript.")
+    parser.add_argument('--compression', default='zstd', help="Codec of the sqlite backend: zstd, zlib or none.")
+    parser.add_argument('--output', type=Path, help="Optional JSON file for the raw results.")
+    parser.add_argument('--stress', action='store_true',
+                        help="Instead, run worker processes over one shared cache and check for duplicate fetches and corruption.")
+    parser.add_argument('--processes', type=int, default=16, help="Worker processes of the stress test.")
+    args = parser.parse_args()
+
+    backends = [backend.strip() for backend in args.backends.split(',') if backend.strip()]
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"Unknown backends: {', '.join(sorted(unknown))}")
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    if args.stress:
+        results = [
+            run_cache_stress(backend, processes=args.processes, churn=churn)
+            for backend in backends for churn in (False, True)
+        ]
+        print(format_stress_results(results))
+    else:
+        results = run_cache_benchmark(backends, args.entries, args.segments, args.compression)
+        print(format_cache_results(results))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Raw results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.benchmark.dataset_benchmark import format_dataset_results, run_dataset_benchmark
+from src.parsing.parser_backends import PARSER_BACKENDS, resolve_parser_backend
+
+def main():
+    """Measures serial against process-pool segmentation of cached sessions on synthetic sessions."""
+    parser = argparse.ArgumentParser(description="Benchmark the parallel segmentation of cached sessions.")
+    parser.add_argument('--workers', default='1,2,4', help="Comma-separated worker counts; 1 is the serial run.")
+    parser.add_argument('--sessions', type=int, default=40, help="Synthetic sessions to segment.")
+    parser.add_argument('--segments', type=int, default=200, help="Chair segments per synthetic transcript.")
+    parser.add_argument('--backend', default='bs4', choices=PARSER_BACKENDS, help="The parser backend.")
+    parser.add_argument('--output', type=Path, help="Optional JSON file for the raw results.")
+    args = parser.parse_args()
+
+    try:
+        workers = [int(count) for count in args.workers.split(',') if count.strip()]
+    except ValueError:
+        parser.error(f"Invalid worker counts: {args.workers}")
+    if not workers or min(workers) < 1:
+        parser.error("Worker counts must be positive.")
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    results = run_dataset_benchmark(workers, args.sessions, args.segments, resolve_parser_backend(args.backend))
+    print(format_dataset_results(results))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Raw results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.benchmark.extraction_benchmark import format_extraction_results, run_extraction_benchmark
+from src.parsing.parser_backends import PARSER_BACKENDS
+
+def main():
+    """Compares the single-pass speech extraction with the former multi-pass one on synthetic transcripts."""
+    parser = argparse.ArgumentParser(description="Benchmark single-pass against multi-pass speech extraction.")
+    parser.add_argument('--backends', default=','.join(PARSER_BACKENDS), help=f"Comma-separated backends out of {', '.join(PARSER_BACKENDS)}.")
+    parser.add_argument('--pages', type=int, default=20, help="Pages extracted per backend and size.")
+    parser.add_argument('--segments', default='200,1000', help="Comma-separated session sizes, in chair segments per transcript.")
+    parser.add_argument('--output', type=Path, help="Optional JSON file for the raw results.")
+    args = parser.parse_args()
+
+    backends = [backend.strip() for backend in args.backends.split(',') if backend.strip()]
+    unknown = set(backends) - set(PARSER_BACKENDS)
+    if unknown:
+        parser.error(f"Unknown backends: {', '.join(sorted(unknown))}")
+    segments = [int(size) for size in args.segments.split(',') if size.strip()]
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    results = run_extraction_benchmark(backends, args.pages, segments)
+    print(format_extraction_results(results))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Raw results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.benchmark.parser_benchmark import format_parser_results, run_parser_benchmark
+from src.parsing.parser_backends import PARSER_BACKENDS
+
+def main():
+    """Measures parse and segmentation time of the HTML parser backends on synthetic transcripts."""
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parser backends.")
+    parser.add_argument('--backends', default=','.join(PARSER_BACKENDS), help=f"Comma-separated backends out of {', '.join(PARSER_BACKENDS)}.")
+    parser.add_argument('--pages', type=int, default=200, help="Pages parsed per backend.")
+    parser.add_argument('--segments', type=int, default=200, help="Chair segments per synthetic transcript.")
+    parser.add_argument('--output', type=Path, help="Optional JSON file for the raw results.")
+    args = parser.parse_args()
+
+    backends = [backend.strip() for backend in args.backends.split(',') if backend.strip()]
+    unknown = set(backends) - set(PARSER_BACKENDS)
+    if unknown:
+        parser.error(f"Unknown backends: {', '.join(sorted(unknown))}")
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    results = run_parser_benchmark(backends, args.pages, args.segments)
+    print(format_parser_results(results))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Raw results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
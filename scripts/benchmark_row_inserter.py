@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.benchmark.row_inserter_benchmark import format_row_inserter_results, run_row_inserter_benchmark
+
+def main():
+    """Measures the indexed link matching of RowInserter against the legacy per-link rescans on large synthetic sessions."""
+    parser = argparse.ArgumentParser(description="Benchmark RowInserter on large sessions.")
+    parser.add_argument('--sizes', default='100,500,1000', help="Comma-separated links per session.")
+    parser.add_argument('--output', type=Path, help="Optional JSON file for the raw results.")
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    except ValueError:
+        parser.error(f"Invalid sizes: {args.sizes}")
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    results = run_row_inserter_benchmark(sizes)
+    print(format_row_inserter_results(results))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Raw results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.benchmark.load_test import CLIENTS, format_results, run_benchmark
+from src.benchmark.mock_sejm_server import FaultProfile
+
+def main():
+    """Measures fetch throughput and tail latency of the scraping clients against a local mock Sejm server."""
+    parser = argparse.ArgumentParser(description="Benchmark the scraping clients against a local mock Sejm server.")
+    parser.add_argument('--clients', default='web,async,session', help=f"Comma-separated clients out of {', '.join(CLIENTS)}.")
+    parser.add_argument('--concurrency', default='1,4,8', help="Comma-separated concurrency settings.")
+    parser.add_argument('--requests', type=int, default=200, help="URLs fetched per client and concurrency setting.")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Base server latency in milliseconds.")
+    parser.add_argument('--jitter-ms', type=float, default=50.0, help="Maximum random latency added per response.")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Fraction of responses that are 429s.")
+    parser.add_argument('--captcha-rate', type=float, default=0.0, help="Fraction of responses that are CAPTCHA pages.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the injected faults.")
+    parser.add_argument('--output', type=Path, help="Optional JSON file for the raw results.")
+    args = parser.parse_args()
+
+    clients = [client.strip() for client in args.clients.split(',') if client.strip()]
+    unknown = set(clients) - set(CLIENTS)
+    if unknown:
+        parser.error(f"Unknown clients: {', '.join(sorted(unknown))}")
+    concurrencies = [int(value) for value in args.concurrency.split(',')]
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    faults = FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate,
+        captcha_rate=args.captcha_rate,
+        seed=args.seed
+    )
+    results = run_benchmark(clients, concurrencies, args.requests, faults)
+    print(format_results(results))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Raw results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
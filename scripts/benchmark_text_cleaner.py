@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+from src.benchmark.text_cleaner_benchmark import format_text_cleaner_results, load_texts, run_text_cleaner_benchmark, synthetic_texts
+from src.utils.config_loader import load_config
+
+def main():
+    """Measures TextCleaner's batch cleaning against the legacy per-string pipeline on the dataset's text column."""
+    parser = argparse.ArgumentParser(description="Benchmark TextCleaner on the 'text' column of the speech dataset.")
+    parser.add_argument('--csv', type=Path, help="The dataset CSV (default: Szejm_0731_1.csv in the configured input directory).")
+    parser.add_argument('--column', default='text', help="The column to clean.")
+    parser.add_argument('--limit', type=int, default=200000, help="The number of rows to read.")
+    parser.add_argument('--synthetic', action='store_true', help="Clean synthetic speech texts instead of the CSV.")
+    parser.add_argument('--output', type=Path, help="Optional JSON file for the raw results.")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    if args.synthetic:
+        texts = synthetic_texts(args.limit)
+    else:
+        config = load_config(project_root / 'config' / 'settings.yaml')
+        csv_path = args.csv or project_root / config['paths']['input_dir'] / 'Szejm_0731_1.csv'
+        try:
+            texts = load_texts(csv_path, args.column, args.limit, config['processing'].get('csv_delimiter', ','))
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(f"Could not read the '{args.column}' column of {csv_path} ({e}). Use --synthetic without the dataset.")
+
+    result = run_text_cleaner_benchmark(texts)
+    print(format_text_cleaner_results(result))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2))
+        print(f"Raw results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.config_loader import load_config
+from src.utils.logger import setup_logging
+from src.scraping.cache_bundle import import_bundle, write_bundle
+from src.scraping.cache_index import format_stats
+from src.scraping.cache_manager import build_cache_manager
+from src.scraping.sqlite_cache import SQLiteCacheManager, migrate_pickle_cache
+from src.scraping.url_canonicalizer import build_url_canonicalizer
+
+def migrate(config: dict, args: argparse.Namespace):
+    """Copies the pickle cache directory into the sqlite cache database."""
+    cache_config = config.get('cache', {})
+    source = args.source or Path(config['paths']['cache_dir'])
+    target = SQLiteCacheManager(
+        db_path=args.target or Path(config['paths'].get('cache_db', 'data/cache.sqlite3')),
+        cache_ttl_seconds=cache_config.get('ttl_seconds', 86400),
+        expiry_policy=cache_config.get('expiry_policy', 'expire'),
+        revalidate_year_range=cache_config.get('revalidate_year_range'),
+        compression=cache_config.get('compression', 'zstd'),
+        batch_size=max(cache_config.get('batch_size', 50), 500),
+        canonicalizer=build_url_canonicalizer(config),
+        deduplicate=cache_config.get('deduplicate', False)
+    )
+    try:
+        counts = migrate_pickle_cache(source, target)
+    finally:
+        target.close()
+    print(f"Migrated {counts['migrated']} entries into {target.db_path} ({counts['skipped']} skipped).")
+    if counts['migrated']:
+        print("Set 'cache.backend: sqlite' in config/settings.yaml to use the database.")
+
+def stats(config: dict, args: argparse.Namespace):
+    """Prints the entry count, size, age histogram and hit ratio of the configured cache."""
+    cache_manager = build_cache_manager(config)
+    try:
+        report = cache_manager.stats()
+    finally:
+        cache_manager.close()
+    print(json.dumps(report, indent=2) if args.json else format_stats(report))
+
+def evict(config: dict, args: argparse.Namespace):
+    """Removes the oldest entries of the configured cache until it fits in the size budget."""
+    cache_manager = build_cache_manager(config)
+    try:
+        evicted = cache_manager.evict(int(args.max_mb * 1e6))
+    finally:
+        cache_manager.close()
+    print(f"Evicted {evicted} entries.")
+
+def expire(config: dict, args: argparse.Namespace):
+    """Removes the expired entries of the configured cache."""
+    cache_manager = build_cache_manager(config)
+    try:
+        cache_manager.clear_expired_cache()
+    finally:
+        cache_manager.close()
+
+def export(config: dict, args: argparse.Namespace):
+    """Packs the configured cache into a single bundle file."""
+    cache_manager = build_cache_manager(config)
+    try:
+        exported = write_bundle(cache_manager, args.output, compression=config.get('cache', {}).get('compression', 'zstd'))
+    finally:
+        cache_manager.close()
+    print(f"Exported {exported} entries to {args.output}.")
+
+def import_(config: dict, args: argparse.Namespace):
+    """Copies the entries of a bundle into the configured cache."""
+    cache_manager = build_cache_manager(config)
+    try:
+        counts = import_bundle(args.bundle, cache_manager, overwrite=args.overwrite)
+    finally:
+        cache_manager.close()
+    print(f"Imported {counts['imported']} entries ({counts['skipped']} skipped).")
+
+def reindex(config: dict, args: argparse.Namespace):
+    """Rebuilds the sidecar index of the pickle cache from its files."""
+    cache_manager = build_cache_manager(config)
+    try:
+        cache_manager.rebuild_index()
+    finally:
+        cache_manager.close()
+
+def rekey(config: dict, args: argparse.Namespace):
+    """Moves the entries stored under their raw URL's key to their canonical URL's key."""
+    cache_manager = build_cache_manager(config)
+    if cache_manager.canonicalizer is None:
+        cache_manager.close()
+        print("URL canonicalization is disabled (cache.canonicalize_urls.enabled). Nothing to rekey.")
+        return
+    try:
+        moved = cache_manager.rekey()
+    finally:
+        cache_manager.close()
+    print(f"Moved {moved} entries to their canonical URL keys.")
+
+def main():
+    """Maintenance commands for the page cache."""
+    parser = argparse.ArgumentParser(description="Maintain the scraper's page cache.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    migrate_parser = subparsers.add_parser('migrate', help="Copy the pickle cache directory into the sqlite database.")
+    migrate_parser.add_argument('--source', type=Path, help="Pickle cache directory (default: paths.cache_dir).")
+    migrate_parser.add_argument('--target', type=Path, help="SQLite database file (default: paths.cache_db).")
+    migrate_parser.set_defaults(handler=migrate)
+
+    stats_parser = subparsers.add_parser('stats', help="Report entry count, size, age histogram and hit ratio.")
+    stats_parser.add_argument('--json', action='store_true', help="Print the report as JSON.")
+    stats_parser.set_defaults(handler=stats)
+
+    evict_parser = subparsers.add_parser('evict', help="Remove the oldest entries until the cache fits in a size budget.")
+    evict_parser.add_argument('--max-mb', type=float, required=True, help="The size budget in megabytes.")
+    evict_parser.set_defaults(handler=evict)
+
+    export_parser = subparsers.add_parser('export', help="Pack the cache into a single portable bundle file.")
+    export_parser.add_argument('output', type=Path, help="The bundle file to write.")
+    export_parser.set_defaults(handler=export)
+
+    import_parser = subparsers.add_parser('import', help="Copy the entries of a bundle into the cache.")
+    import_parser.add_argument('bundle', type=Path, help="The bundle file to read.")
+    import_parser.add_argument('--overwrite', action='store_true', help="Replace entries the cache already has.")
+    import_parser.set_defaults(handler=import_)
+
+    subparsers.add_parser('expire', help="Remove the expired entries.").set_defaults(handler=expire)
+    subparsers.add_parser('reindex', help="Rebuild the pickle cache's index from its files.").set_defaults(handler=reindex)
+    subparsers.add_parser('rekey', help="Key every entry by its canonical URL at once.").set_defaults(handler=rekey)
+
+    args = parser.parse_args()
+    config = load_config(project_root / 'config/settings.yaml')
+    setup_logging(log_dir=Path(config['paths']['log_dir']))
+    args.handler(config, args)
+
+if __name__ == "__main__":
+    main()
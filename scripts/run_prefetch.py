@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow imports from 'src'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.prefetch import run_prefetch
+
+def main():
+    """The command-line entry point that fills the cache ahead of the segmentation run."""
+    parser = argparse.ArgumentParser(description="Prefetch the speaker transcripts into the cache.")
+    parser.add_argument(
+        '--fetcher',
+        choices=['browser', 'http'],
+        help="How to fetch pages (defaults to the 'prefetch.fetcher' setting)."
+    )
+    args = parser.parse_args()
+
+    print("Starting the transcript prefetch...")
+    try:
+        run_prefetch(fetcher=args.fetcher)
+        print("Prefetch finished. Check logs for details.")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
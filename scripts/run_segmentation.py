@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -11,9 +12,17 @@ from src.main import run_pipeline
 
 def main():
     """The main entry point for the command-line script."""
+    parser = argparse.ArgumentParser(description="Segment the speaker speeches of the Polish Parliament dataset.")
+    parser.add_argument(
+        '--retry-dead-letters',
+        action='store_true',
+        help="Reprocess only the sessions whose transcript could not be fetched in earlier runs."
+    )
+    args = parser.parse_args()
+
     print("Starting the segmentation pipeline...")
     try:
-        run_pipeline()
+        run_pipeline(retry_dead_letters=args.retry_dead_letters)
         print("Pipeline finished. Check logs for details.")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
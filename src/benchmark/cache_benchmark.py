@@ -0,0 +1,115 @@
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from src.benchmark.load_test import percentile
+from src.benchmark.mock_sejm_server import LAYOUTS, synthetic_transcript
+from src.scraping.cache_manager import CacheManager
+from src.scraping.sqlite_cache import SQLiteCacheManager
+
+BACKENDS = ('pickle', 'sqlite')
+
+def _directory_size(path: Path) -> int:
+    return sum(item.stat().st_size for item in path.rglob('*') if item.is_file())
+
+def _new_cache(backend: str, root: Path, compression: str) -> CacheManager:
+    if backend == 'pickle':
+        return CacheManager(cache_dir=root / 'cache')
+    return SQLiteCacheManager(db_path=root / 'cache.sqlite3', compression=compression)
+
+def _timed(operation: Callable[[str], Any], urls: Sequence[str]) -> List[float]:
+    timings = []
+    for url in urls:
+        start_time = time.perf_counter()
+        operation(url)
+        timings.append(time.perf_counter() - start_time)
+    return timings
+
+def benchmark_cache_backend(backend: str, pages: Dict[str, str], compression: str = 'zstd', seed: int = 0) -> Dict[str, Any]:
+    """
+    Writes the pages into a fresh cache of one backend, then reads them back in random order.
+
+    Args:
+        backend: 'pickle' or 'sqlite'.
+        pages: The page bodies by URL.
+        compression: The sqlite backend's codec.
+        seed: The seed of the read order.
+
+    Returns:
+        A dictionary with write/read throughput, p50/p99 latencies in microseconds and the bytes on disk.
+    """
+    urls = list(pages)
+    read_order = urls[:]
+    random.Random(seed).shuffle(read_order)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        cache = _new_cache(backend, root, compression)
+        write_start = time.perf_counter()
+        write_timings = _timed(lambda url: cache.save_to_cache(url, pages[url], {'year': 2001}), urls)
+        cache.close() # Commits buffered writes, so they count towards the write time
+        write_seconds = time.perf_counter() - write_start
+        disk_bytes = _directory_size(root)
+
+        cache = _new_cache(backend, root, compression) # Cold reads through a fresh instance
+        read_start = time.perf_counter()
+        read_timings = _timed(cache.get_from_cache, read_order)
+        read_seconds = time.perf_counter() - read_start
+        cache.close()
+
+    raw_bytes = sum(len(page.encode('utf-8')) for page in pages.values())
+    return {
+        'backend': backend,
+        'entries': len(urls),
+        'writes_per_second': len(urls) / write_seconds if write_seconds > 0 else 0.0,
+        'write_p50_us': percentile(write_timings, 50) * 1e6,
+        'write_p99_us': percentile(write_timings, 99) * 1e6,
+        'reads_per_second': len(urls) / read_seconds if read_seconds > 0 else 0.0,
+        'read_p50_us': percentile(read_timings, 50) * 1e6,
+        'read_p99_us': percentile(read_timings, 99) * 1e6,
+        'raw_bytes': raw_bytes,
+        'disk_bytes': disk_bytes
+    }
+
+def run_cache_benchmark(
+    backends: Sequence[str] = BACKENDS,
+    entries: int = 2000,
+    segments: int = 200,
+    compression: str = 'zstd'
+) -> List[Dict[str, Any]]:
+    """
+    Benchmarks the cache backends on the same synthetic transcripts.
+
+    Args:
+        backends: Names from BACKENDS.
+        entries: The number of pages written and read.
+        segments: The number of chair segments per synthetic transcript (200 is roughly a real session page).
+        compression: The sqlite backend's codec.
+
+    Returns:
+        One result dictionary per backend.
+    """
+    pages = {
+        f"https://orka2.sejm.gov.pl/Debata1.nsf/bench-{index}?OpenDocument":
+            synthetic_transcript(f"bench-{index}", LAYOUTS[index % len(LAYOUTS)], segments)
+        for index in range(entries)
+    }
+    return [benchmark_cache_backend(backend, pages, compression) for backend in backends]
+
+def format_cache_results(results: List[Dict[str, Any]]) -> str:
+    """Formats cache benchmark results as a fixed-width table."""
+    header = (
+        f"{'backend':<9}{'entries':>8}{'writes/s':>10}{'w p50 us':>10}{'w p99 us':>10}"
+        f"{'reads/s':>10}{'r p50 us':>10}{'r p99 us':>10}{'disk MB':>9}{'ratio':>7}"
+    )
+    lines = [header, '-' * len(header)]
+    for result in results:
+        ratio = result['raw_bytes'] / result['disk_bytes'] if result['disk_bytes'] else 0.0
+        lines.append(
+            f"{result['backend']:<9}{result['entries']:>8}{result['writes_per_second']:>10.0f}"
+            f"{result['write_p50_us']:>10.0f}{result['write_p99_us']:>10.0f}{result['reads_per_second']:>10.0f}"
+            f"{result['read_p50_us']:>10.0f}{result['read_p99_us']:>10.0f}"
+            f"{result['disk_bytes'] / 1e6:>9.1f}{ratio:>7.1f}"
+        )
+    return '\n'.join(lines)
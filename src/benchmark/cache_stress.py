@@ -0,0 +1,161 @@
+import multiprocessing
+import pickle
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+from loguru import logger
+
+from src.benchmark.mock_sejm_server import LEGACY_LAYOUT, synthetic_transcript
+from src.scraping.cache_manager import BODIES_DIR, CACHE_FILE_PATTERN, CacheManager
+from src.scraping.sqlite_cache import SQLiteCacheManager
+
+STRESS_URL = 'https://orka2.sejm.gov.pl/Debata1.nsf/0/{:032x}?OpenDocument'
+# Pages are drawn from a few bodies, so that deduplicated bodies are shared and contended too.
+DISTINCT_BODIES = 5
+
+def expected_body(url: str) -> str:
+    """The only content a stress URL may ever be cached with."""
+    document = int(url.rsplit('/', 1)[1].split('?')[0], 16)
+    return synthetic_transcript(str(document % DISTINCT_BODIES), LEGACY_LAYOUT, 20)
+
+def _new_cache(backend: str, root: Path, ttl_seconds: float) -> CacheManager:
+    if backend == 'pickle':
+        return CacheManager(cache_dir=root / 'cache', cache_ttl_seconds=ttl_seconds, deduplicate=True)
+    return SQLiteCacheManager(db_path=root / 'cache.sqlite3', cache_ttl_seconds=ttl_seconds, deduplicate=True, batch_size=5)
+
+def _stress_worker(backend: str, root: str, urls: List[str], rounds: int, churn: bool, fetch_seconds: float, seed: int) -> Dict[str, Any]:
+    """
+    One process of the stress test: reads every URL in random order, fetching misses under the
+    single-flight lease, and, with `churn`, rewrites, expires and evicts entries in between.
+
+    Returns:
+        The URLs it fetched, and its 'operations' and 'corrupted' read counts.
+    """
+    logger.remove()
+    logger.add(sys.stderr, level='ERROR')
+    rng = random.Random(seed)
+    # With churn, entries expire within the run, so expired reads race with fresh writes.
+    cache = _new_cache(backend, Path(root), ttl_seconds=0.05 if churn else 3600)
+    fetched, operations, corrupted = [], 0, 0
+    try:
+        for _ in range(rounds):
+            for url in rng.sample(urls, len(urls)):
+                operations += 1
+                content = cache.get_from_cache(url)
+                if content is None:
+                    with cache.single_flight(url) as fetched_meanwhile:
+                        content = fetched_meanwhile
+                        if content is None:
+                            time.sleep(fetch_seconds) # The download
+                            fetched.append(url)
+                            content = expected_body(url)
+                            cache.save_to_cache(url, content)
+                if content != expected_body(url):
+                    corrupted += 1
+                if churn:
+                    action = rng.random()
+                    if action < 0.2:
+                        cache.save_to_cache(url, expected_body(url))
+                    elif action < 0.25:
+                        cache.clear_expired_cache()
+                    elif action < 0.28:
+                        cache.evict(max_bytes=len(expected_body(url)) * len(urls) // 2)
+    finally:
+        cache.close()
+    return {'fetched': fetched, 'operations': operations, 'corrupted': corrupted}
+
+def check_cache_consistency(backend: str, root: Path) -> List[str]:
+    """
+    Verifies a stressed cache: every stored entry is readable with its expected body and, for the
+    pickle backend, no temporary file is left over and every body is referenced by an entry.
+
+    Returns:
+        The problems found, empty if the cache is consistent.
+    """
+    problems = []
+    cache = _new_cache(backend, root, ttl_seconds=3600)
+    try:
+        urls = list(cache.iter_urls())
+        for url in urls:
+            cache_entry = cache.get_entry(url)
+            if cache_entry is None or cache_entry['content'] != expected_body(url):
+                problems.append(f"unreadable or wrong entry for {url}")
+        if cache.stats()['entries'] != len(urls):
+            problems.append("the entry count does not match the stored URLs")
+        if backend == 'pickle':
+            cache_dir = root / 'cache'
+            problems.extend(f"leftover temporary file {item.name}" for item in cache_dir.glob('.*.tmp'))
+            entry_files = [item for item in cache_dir.iterdir() if CACHE_FILE_PATTERN.match(item.name)]
+            if len(entry_files) != len(urls):
+                problems.append(f"{len(entry_files)} cache files for {len(urls)} indexed entries")
+            bodies = {item.name for item in (cache_dir / BODIES_DIR).glob('*')}
+            referenced = {pickle.loads(item.read_bytes()).get('content_ref') for item in entry_files}
+            if bodies != referenced:
+                problems.append(f"{len(bodies - referenced)} unreferenced and {len(referenced - bodies)} missing bodies")
+    finally:
+        cache.close()
+    return problems
+
+def run_cache_stress(
+    backend: str,
+    processes: int = 8,
+    url_count: int = 40,
+    rounds: int = 3,
+    churn: bool = False,
+    fetch_seconds: float = 0.005,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Runs worker processes over one shared cache and checks the outcome.
+
+    Args:
+        backend: 'pickle' or 'sqlite'.
+        processes: The number of worker processes.
+        url_count: The number of distinct URLs every worker reads.
+        rounds: The passes every worker makes over the URLs.
+        churn: Whether workers also rewrite, expire and evict entries. Expired and evicted
+               entries are fetched again, so only runs without churn fetch every URL once.
+        fetch_seconds: The simulated download time.
+        seed: The seed of the workers' access orders.
+
+    Returns:
+        A dictionary with the 'fetches' and 'duplicate_fetches' (fetches of an URL beyond its first)
+        counts, the 'operations' and 'corrupted_reads' counts, the 'problems' of the final
+        consistency check and the 'elapsed_seconds'.
+    """
+    urls = [STRESS_URL.format(index) for index in range(url_count)]
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start_time = time.perf_counter()
+        with context.Pool(processes) as pool:
+            outcomes = pool.starmap(
+                _stress_worker,
+                [(backend, temp_dir, urls, rounds, churn, fetch_seconds, seed + worker) for worker in range(processes)]
+            )
+        elapsed_seconds = time.perf_counter() - start_time
+        problems = check_cache_consistency(backend, Path(temp_dir))
+    fetches = Counter(url for outcome in outcomes for url in outcome['fetched'])
+    return {
+        'backend': backend,
+        'processes': processes,
+        'fetches': sum(fetches.values()),
+        'duplicate_fetches': sum(count - 1 for count in fetches.values()),
+        'operations': sum(outcome['operations'] for outcome in outcomes),
+        'corrupted_reads': sum(outcome['corrupted'] for outcome in outcomes),
+        'problems': problems,
+        'elapsed_seconds': elapsed_seconds
+    }
+
+def format_stress_results(results: List[Dict[str, Any]]) -> str:
+    """Formats run_cache_stress results as a table."""
+    lines = [f"{'backend':<8}{'procs':>6}{'ops':>8}{'fetches':>9}{'dup':>6}{'corrupt':>9}{'problems':>10}{'seconds':>9}"]
+    for result in results:
+        lines.append(
+            f"{result['backend']:<8}{result['processes']:>6}{result['operations']:>8}{result['fetches']:>9}"
+            f"{result['duplicate_fetches']:>6}{result['corrupted_reads']:>9}{len(result['problems']):>10}{result['elapsed_seconds']:>9.2f}"
+        )
+    return '\n'.join(lines)
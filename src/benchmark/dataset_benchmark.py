@@ -0,0 +1,120 @@
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import pandas as pd
+
+from src.benchmark.mock_sejm_server import LAYOUTS, MODERN_LAYOUT, SPEAKER_TITLES, synthetic_transcript
+from src.parsing.parser_backends import BS4_BACKEND
+from src.reconstruction.dataset_builder import segment_session, segment_sessions
+
+RULES_PATH = Path(__file__).resolve().parent.parent.parent / 'config' / 'scraping_rules.yaml'
+BASE_URL = 'https://orka2.sejm.gov.pl'
+LINK = re.compile(r'<a href="([^"]+)">([^<]+)</a>')
+# Longest first, so that "Minister Finansów" is not read as the title "Minister"
+TITLES = sorted(SPEAKER_TITLES, key=len, reverse=True)
+
+def synthetic_session(doc_id: str, layout: str, date: str, segments: int = 12) -> Tuple[pd.DataFrame, str]:
+    """
+    Generates a session of the dataset together with its speaker's transcript.
+
+    The session has the speaker's (chair) row, with the whole transcript text, and one row per
+    speech linked from the transcript. Modern speeches are matched to their links by their
+    source URL, legacy ones by the speaker's title and name.
+
+    Args:
+        doc_id: The document identifier of synthetic_transcript.
+        layout: LEGACY_LAYOUT or MODERN_LAYOUT.
+        date: The session date.
+        segments: The number of chair text segments.
+
+    Returns:
+        (session rows, transcript HTML).
+    """
+    html_content = synthetic_transcript(doc_id, layout, segments)
+    session_date = pd.Timestamp(date)
+    rows = [{
+        'text': re.sub(r'<[^>]+>', ' ', html_content),
+        'speaker': 'Marszałek Sejmu',
+        'speaker_type': 'Marszałek',
+        'chair': 1,
+        'agenda_item': 'Otwarcie posiedzenia.',
+        'place_agenda': 1,
+        'date': session_date,
+        'source': f"{BASE_URL}/Debata1.nsf/main/{doc_id}"
+    }]
+    for index, (href, link_text) in enumerate(LINK.findall(html_content)):
+        title = next(title for title in TITLES if link_text.startswith(title + ' '))
+        rows.append({
+            'text': f"Wypowiedź {index} posiedzenia {doc_id}.",
+            'speaker': link_text[len(title) + 1:],
+            'speaker_type': title,
+            'chair': 0,
+            'agenda_item': f"Punkt {index // 3 + 1} porządku dziennego.",
+            'place_agenda': index + 2,
+            'date': session_date,
+            'source': f"{BASE_URL}{href}" if layout == MODERN_LAYOUT else f"{BASE_URL}/Debata1.nsf/speech/{doc_id}-{index}"
+        })
+    return pd.DataFrame(rows), html_content
+
+def synthetic_sessions(sessions: int, segments: int = 12) -> List[Tuple[pd.DataFrame, str]]:
+    """Returns `sessions` synthetic sessions on consecutive days, alternating the layouts."""
+    dates = pd.date_range('2001-01-01', periods=sessions, freq='D')
+    return [
+        synthetic_session(f"ds-{index}", LAYOUTS[index % len(LAYOUTS)], str(date.date()), segments)
+        for index, date in enumerate(dates)
+    ]
+
+def run_dataset_benchmark(
+    workers: Sequence[int] = (1, 2, 4),
+    sessions: int = 40,
+    segments: int = 200,
+    backend: str = BS4_BACKEND
+) -> List[Dict[str, Any]]:
+    """
+    Segments the same synthetic sessions serially and in worker process pools.
+
+    Args:
+        workers: The pool sizes; 1 segments the sessions in this process, like DatasetBuilder.
+        sessions: The number of sessions.
+        segments: The chair segments per transcript (200 is roughly a real session page).
+        backend: The parser backend.
+
+    Returns:
+        One result dictionary per pool size, with the elapsed seconds, the sessions per second,
+        the speedup over the first pool size and whether its output CSV is byte-identical to it.
+    """
+    work_units = synthetic_sessions(sessions, segments)
+    config = {'extraction_cache': {'enabled': False}}
+    results, reference = [], None
+    for worker_count in workers:
+        start_time = time.perf_counter()
+        if worker_count > 1:
+            processed = list(segment_sessions(work_units, worker_count, config, RULES_PATH, backend))
+        else:
+            processed = [segment_session(session_df, html_content, RULES_PATH, backend) for session_df, html_content in work_units]
+        elapsed_seconds = time.perf_counter() - start_time
+        output = pd.concat(processed, ignore_index=True).to_csv(index=False)
+        reference = output if reference is None else reference
+        results.append({
+            'workers': worker_count,
+            'sessions': sessions,
+            'elapsed_seconds': elapsed_seconds,
+            'sessions_per_second': sessions / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+            'identical': output == reference
+        })
+    for result in results:
+        result['speedup'] = result['sessions_per_second'] / results[0]['sessions_per_second'] if results[0]['sessions_per_second'] else 0.0
+    return results
+
+def format_dataset_results(results: List[Dict[str, Any]]) -> str:
+    """Formats dataset benchmark results as a fixed-width table."""
+    header = f"{'workers':>8}{'sessions':>10}{'seconds':>9}{'sessions/s':>12}{'speedup':>9}{'identical':>11}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['workers']:>8}{result['sessions']:>10}{result['elapsed_seconds']:>9.2f}"
+            f"{result['sessions_per_second']:>12.1f}{result['speedup']:>8.2f}x{'yes' if result['identical'] else 'NO':>11}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,119 @@
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from src.benchmark.load_test import percentile
+from src.benchmark.mock_sejm_server import LAYOUTS, synthetic_transcript
+from src.benchmark.parser_benchmark import SPEECH_LINK
+from src.parsing.parser_backends import PARSER_BACKENDS, ParsedDocument, parse_html
+from src.parsing.speech_extractor import SpeechExtractor
+from src.utils.text_cleaner import TextCleaner
+
+def multi_pass_extraction(document: ParsedDocument, selector: str) -> Tuple[List[str], List[Dict[str, str]], int]:
+    """
+    The extraction as SpeechExtractor did it before the single-pass traversal, for comparison:
+    a removal pass, a select and a walk for the segments, with delimiters held in a set, a
+    second select for the links and a get_text over the whole page for the loss check.
+
+    Returns:
+        The segments, the links and the cleaned page text length.
+    """
+    document.remove('script, style')
+    segments, current_segment_parts = [], []
+    delimiter_links = set(document.select(selector))
+    for element in document.walk():
+        if element in delimiter_links:
+            if current_segment_parts:
+                cleaned_segment = TextCleaner.clean_text(' '.join(current_segment_parts).strip())
+                if cleaned_segment:
+                    segments.append(cleaned_segment)
+                current_segment_parts = []
+        elif isinstance(element, str):
+            text = element.strip()
+            if text:
+                current_segment_parts.append(text)
+    if current_segment_parts:
+        cleaned_segment = TextCleaner.clean_text(' '.join(current_segment_parts).strip())
+        if cleaned_segment:
+            segments.append(cleaned_segment)
+
+    links = []
+    for link_tag in document.select(selector):
+        link_text = TextCleaner.clean_text(document.text(link_tag))
+        link_href = document.attribute(link_tag, 'href')
+        if link_text and link_href:
+            links.append({'text': link_text, 'href': link_href})
+    return segments, links, len(TextCleaner.clean_text(document.stripped_text()))
+
+def _single_pass_extraction(document: ParsedDocument, selector: str) -> Tuple[List[str], List[Dict[str, str]], int]:
+    extraction = SpeechExtractor(document, {'speech_link': selector}).extract()
+    return extraction['segments'], extraction['links'], extraction['text_length']
+
+def benchmark_extraction(backend: str, pages: Sequence[str]) -> Dict[str, Any]:
+    """
+    Times the multi-pass and the single-pass extraction of pages parsed with one backend.
+    Parsing is not timed; every extraction gets a freshly parsed page.
+
+    Args:
+        backend: A name from PARSER_BACKENDS.
+        pages: The page HTML.
+
+    Returns:
+        A dictionary with the p50 extraction time of each in milliseconds, the speedup of their
+        total times and whether both gave identical segments, links and text lengths.
+    """
+    timings: Dict[str, List[float]] = {'multi_pass': [], 'single_pass': []}
+    identical = True
+    for html_content in pages:
+        outputs = []
+        for name, extraction in (('multi_pass', multi_pass_extraction), ('single_pass', _single_pass_extraction)):
+            document = parse_html(html_content, backend)
+            start_time = time.perf_counter()
+            outputs.append(extraction(document, SPEECH_LINK))
+            timings[name].append(time.perf_counter() - start_time)
+        identical = identical and outputs[0] == outputs[1]
+    single_pass_seconds = sum(timings['single_pass'])
+    return {
+        'backend': backend,
+        'pages': len(pages),
+        'multi_pass_p50_ms': percentile(timings['multi_pass'], 50) * 1e3,
+        'single_pass_p50_ms': percentile(timings['single_pass'], 50) * 1e3,
+        'speedup': sum(timings['multi_pass']) / single_pass_seconds if single_pass_seconds > 0 else 0.0,
+        'identical': identical
+    }
+
+def run_extraction_benchmark(
+    backends: Sequence[str] = PARSER_BACKENDS,
+    pages: int = 20,
+    segments: Sequence[int] = (200, 1000)
+) -> List[Dict[str, Any]]:
+    """
+    Benchmarks the single-pass extraction against the multi-pass one on synthetic transcripts.
+
+    Args:
+        backends: Names from PARSER_BACKENDS.
+        pages: The number of pages per size.
+        segments: The session sizes, in chair segments per transcript (200 is roughly a real
+                  session page, 1000 a long sitting).
+
+    Returns:
+        One result dictionary per backend and size.
+    """
+    results = []
+    for segment_count in segments:
+        html_pages = [
+            synthetic_transcript(f"bench-{index}", LAYOUTS[index % len(LAYOUTS)], segment_count) for index in range(pages)
+        ]
+        for backend in backends:
+            results.append({'segments': segment_count, **benchmark_extraction(backend, html_pages)})
+    return results
+
+def format_extraction_results(results: List[Dict[str, Any]]) -> str:
+    """Formats extraction benchmark results as a fixed-width table."""
+    header = f"{'backend':<9}{'segments':>9}{'pages':>7}{'multi p50 ms':>14}{'single p50 ms':>15}{'speedup':>9}{'identical':>11}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['backend']:<9}{result['segments']:>9}{result['pages']:>7}{result['multi_pass_p50_ms']:>14.2f}"
+            f"{result['single_pass_p50_ms']:>15.2f}{result['speedup']:>8.1f}x{'yes' if result['identical'] else 'NO':>11}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,205 @@
+import math
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from loguru import logger
+
+from src.benchmark.mock_sejm_server import LAYOUTS, FaultProfile, MockSejmServer
+from src.scraping.async_fetcher import AsyncFetcher
+from src.scraping.bot_detection import detect_bot_challenge
+from src.scraping.cache_manager import CacheManager
+from src.scraping.session_scraper import SessionScraper
+from src.scraping.web_client import WebClient
+
+BENCHMARK_USER_AGENT = 'Sejm scraper benchmark'
+CLIENTS = ('web', 'async', 'session', 'playwright')
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Returns the nearest-rank q-th percentile (0-100) of the values, or 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(latencies: Sequence[float], succeeded: int, total: int, elapsed_seconds: float) -> Dict[str, Any]:
+    """
+    Condenses the per-URL latencies of a run into throughput and tail-latency figures.
+
+    Args:
+        latencies: The seconds each URL took, retries included.
+        succeeded: The number of URLs that returned a transcript.
+        total: The number of URLs requested.
+        elapsed_seconds: The wall-clock duration of the run.
+
+    Returns:
+        A dictionary with the counts, 'pages_per_second' and the p50/p95/p99/max latencies in milliseconds.
+    """
+    return {
+        'requested': total,
+        'succeeded': succeeded,
+        'failed': total - succeeded,
+        'elapsed_seconds': elapsed_seconds,
+        'pages_per_second': succeeded / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': max(latencies, default=0.0) * 1000
+    }
+
+def _is_transcript(content: Optional[str]) -> bool:
+    return bool(content) and detect_bot_challenge(content) is None
+
+def _timed_fetch(fetch: Callable[[str], Optional[str]], url: str) -> Tuple[float, bool]:
+    """Fetches a URL, returning the seconds it took and whether it returned a transcript."""
+    start_time = time.perf_counter()
+    try:
+        content = fetch(url)
+    except Exception as e:
+        logger.error(f"Benchmark fetch of {url} raised {type(e).__name__}: {e}")
+        content = None
+    return time.perf_counter() - start_time, _is_transcript(content)
+
+def _summarize_outcomes(outcomes: List[Tuple[float, bool]], elapsed_seconds: float) -> Dict[str, Any]:
+    return summarize([latency for latency, _ in outcomes], sum(ok for _, ok in outcomes), len(outcomes), elapsed_seconds)
+
+def _run_threaded(fetch: Callable[[str], Optional[str]], urls: List[str], concurrency: int) -> Dict[str, Any]:
+    """Fetches the URLs with `concurrency` worker threads, timing every call."""
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(lambda url: _timed_fetch(fetch, url), urls))
+    return _summarize_outcomes(outcomes, time.perf_counter() - start_time)
+
+def _run_inline(fetch: Callable[[str], Optional[str]], urls: List[str]) -> Dict[str, Any]:
+    """Fetches the URLs one by one on the calling thread, timing every call."""
+    start_time = time.perf_counter()
+    outcomes = [_timed_fetch(fetch, url) for url in urls]
+    return _summarize_outcomes(outcomes, time.perf_counter() - start_time)
+
+def _new_web_client() -> WebClient:
+    return WebClient(user_agent=BENCHMARK_USER_AGENT, max_retries=2, backoff_factor=0.1, rate_limit_delay=0)
+
+def benchmark_web_client(urls: List[str], concurrency: int) -> Dict[str, Any]:
+    """Fetches the URLs with one WebClient per worker thread."""
+    local = threading.local()
+
+    def fetch(url: str) -> Optional[str]:
+        if not hasattr(local, 'client'):
+            local.client = _new_web_client()
+        return local.client.fetch(url)
+
+    return _run_threaded(fetch, urls, concurrency)
+
+def benchmark_async_fetcher(urls: List[str], concurrency: int) -> Dict[str, Any]:
+    """Fetches the URLs with the AsyncFetcher, allowing `concurrency` requests in flight."""
+    fetcher = AsyncFetcher(
+        user_agent=BENCHMARK_USER_AGENT,
+        max_retries=2,
+        backoff_factor=0.1,
+        requests_per_second=10_000,
+        burst=concurrency,
+        max_in_flight_per_host=concurrency,
+        max_workers=concurrency
+    )
+    try:
+        summary = fetcher.fetch_batch(urls, skip_cached=False)
+    finally:
+        fetcher.close()
+    succeeded = sum(1 for content in summary['results'].values() if _is_transcript(content))
+    return summarize(list(summary['latencies'].values()), succeeded, len(urls), summary['elapsed_seconds'])
+
+def benchmark_session_scraper(urls: List[str], concurrency: int) -> Dict[str, Any]:
+    """Fetches the URLs through SessionScraper (cache lookups and writes included) into a temporary cache."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scraper = SessionScraper(_new_web_client(), CacheManager(cache_dir=Path(cache_dir)))
+        return _run_threaded(scraper.fetch_session_html, urls, concurrency)
+
+def benchmark_playwright(urls: List[str], concurrency: int) -> Dict[str, Any]:
+    """
+    Renders the URLs in a headless browser: a PlaywrightClient for concurrency 1,
+    a PlaywrightPagePool with one page per worker otherwise.
+    """
+    from src.scraping.playwright_client import PlaywrightClient
+    from src.scraping.playwright_pool import PlaywrightPagePool
+
+    options = {'headless': True, 'fast_navigation': True, 'readiness_timeout': 5000}
+    client = PlaywrightClient(**options) if concurrency == 1 else PlaywrightPagePool(pool_size=concurrency, **options)
+    try:
+        client.start()
+    except Exception as e:
+        return {'skipped': f"browser could not be started: {str(e).splitlines()[0]}"}
+    try:
+        if isinstance(client, PlaywrightPagePool):
+            return _run_threaded(client.fetch, urls, concurrency)
+        # A sync PlaywrightClient only works on the thread that started it
+        return _run_inline(client.fetch, urls)
+    finally:
+        client.close()
+
+BENCHMARKS: Dict[str, Callable[[List[str], int], Dict[str, Any]]] = {
+    'web': benchmark_web_client,
+    'async': benchmark_async_fetcher,
+    'session': benchmark_session_scraper,
+    'playwright': benchmark_playwright
+}
+
+def run_benchmark(
+    clients: Sequence[str],
+    concurrencies: Sequence[int],
+    requests: int,
+    faults: Optional[FaultProfile] = None,
+    segments: int = 12
+) -> List[Dict[str, Any]]:
+    """
+    Starts a MockSejmServer and measures every client at every concurrency setting.
+
+    Each run requests fresh document ids, alternating the legacy and modern layouts,
+    so runs never profit from each other's caches or validators.
+
+    Args:
+        clients: Names from CLIENTS.
+        concurrencies: The worker/in-flight counts to measure.
+        requests: The number of URLs fetched per run.
+        faults: The latency and failures injected by the server.
+        segments: The number of chair segments per synthetic transcript.
+
+    Returns:
+        One result dictionary per (client, concurrency) run, including the server-side counters.
+    """
+    server = MockSejmServer(faults=faults, segments=segments)
+    server.start()
+    results = []
+    try:
+        for client in clients:
+            for concurrency in concurrencies:
+                urls = [
+                    server.url_for(f"{client}-c{concurrency}-{index}", LAYOUTS[index % len(LAYOUTS)])
+                    for index in range(requests)
+                ]
+                server_before = dict(server.stats)
+                logger.info(f"Benchmarking '{client}' with concurrency {concurrency} on {requests} URLs...")
+                result = BENCHMARKS[client](urls, concurrency)
+                server_delta = {key: value - server_before[key] for key, value in server.stats.items()}
+                results.append({'client': client, 'concurrency': concurrency, **result, 'server': server_delta})
+    finally:
+        server.stop()
+    return results
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """Formats benchmark results as a fixed-width table."""
+    header = f"{'client':<11}{'conc':>5}{'ok':>7}{'fail':>6}{'pages/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'429s':>6}{'captcha':>8}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        if 'skipped' in result:
+            lines.append(f"{result['client']:<11}{result['concurrency']:>5}  skipped: {result['skipped']}")
+            continue
+        lines.append(
+            f"{result['client']:<11}{result['concurrency']:>5}{result['succeeded']:>7}{result['failed']:>6}"
+            f"{result['pages_per_second']:>10.1f}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+            f"{result['p99_ms']:>9.1f}{result['max_ms']:>9.1f}"
+            f"{result['server']['throttled']:>6}{result['server']['captchas']:>8}"
+        )
+    return '\n'.join(lines)
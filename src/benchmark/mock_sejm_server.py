@@ -0,0 +1,231 @@
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+from loguru import logger
+
+from src.scraping.bot_detection import CAPTCHA_SIGNATURE
+
+# The two transcript layouts of the Sejm website.
+LEGACY_LAYOUT = 'legacy'   # Debata1.nsf documents: the transcript in the second <blockquote>
+MODERN_LAYOUT = 'modern'   # Stenogram pages: a div.stenogram with links to wypowiedz.xsp
+LAYOUTS = (LEGACY_LAYOUT, MODERN_LAYOUT)
+
+SPEAKER_TITLES = ['Poseł', 'Minister Finansów', 'Sekretarz Stanu w Ministerstwie Zdrowia', 'Wicemarszałek', 'Prezes Rady Ministrów']
+SPEAKER_NAMES = ['Jan Kowalski', 'Anna Nowak', 'Zbigniew Wąsik', 'Małgorzata Żółkiewska', 'Łukasz Ślązak', 'Ewa Kierzkowska']
+CHAIR_SENTENCES = [
+    'Otwieram posiedzenie Sejmu.',
+    'Proszę o zajęcie miejsc.',
+    'Przystępujemy do rozpatrzenia kolejnego punktu porządku dziennego.',
+    'Dziękuję bardzo.',
+    'Udzielam głosu panu posłowi.',
+    'Zamykam dyskusję.',
+    'Przechodzimy do głosowania.',
+]
+
+CAPTCHA_PAGE = f"""<html><head><title>Request Rejected</title></head><body>
+<p>{CAPTCHA_SIGNATURE}</p><p>Please complete the security check to continue.</p>
+</body></html>"""
+
+
+def synthetic_transcript(doc_id: str, layout: str, segments: int = 12) -> str:
+    """
+    Generates a deterministic synthetic transcript page in one of the Sejm layouts.
+
+    The Marszałek's text segments are separated by links to the other speakers' speeches,
+    like on the real pages, so the output can be parsed and segmented by the pipeline.
+
+    Args:
+        doc_id: The document identifier; the same id always yields the same page.
+        layout: LEGACY_LAYOUT or MODERN_LAYOUT.
+        segments: The number of chair text segments.
+
+    Returns:
+        The page HTML.
+    """
+    rng = random.Random(doc_id)
+    parts = []
+    for index in range(segments):
+        parts.append(' '.join(rng.choice(CHAIR_SENTENCES) for _ in range(rng.randint(1, 4))))
+        if index < segments - 1:
+            speaker = f"{rng.choice(SPEAKER_TITLES)} {rng.choice(SPEAKER_NAMES)}"
+            speech_id = f"{doc_id}-{index}"
+            if layout == LEGACY_LAYOUT:
+                href = f"/Debata1.nsf/main/{speech_id}"
+            else:
+                href = f"/Sejm.nsf/wypowiedz.xsp?id={speech_id}"
+            parts.append(f'<a href="{href}">{speaker}</a>')
+
+    body = '\n'.join(f"<p>{part}</p>" for part in parts)
+    if layout == LEGACY_LAYOUT:
+        return (
+            "<html><head><title>Sprawozdanie stenograficzne</title></head><body>\n"
+            f"<blockquote><b>Posiedzenie Sejmu nr {doc_id}</b></blockquote>\n"
+            f"<blockquote>\n{body}\n</blockquote>\n</body></html>"
+        )
+    return (
+        "<html><head><title>Stenogram</title></head><body>\n"
+        f'<div class="header">Posiedzenie Sejmu nr {doc_id}</div>\n'
+        f'<div class="stenogram">\n{body}\n</div>\n</body></html>'
+    )
+
+
+class FaultProfile:
+    """The latency and failures a MockSejmServer injects into its responses."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        throttle_rate: float = 0.0,
+        captcha_rate: float = 0.0,
+        retry_after_seconds: int = 1,
+        seed: int = 0
+    ):
+        """
+        Initializes the FaultProfile.
+
+        Args:
+            latency_ms: The base response latency in milliseconds.
+            jitter_ms: The maximum random latency added on top of the base latency.
+            throttle_rate: The fraction of requests answered with 429 Too Many Requests.
+            captcha_rate: The fraction of requests answered with a CAPTCHA page.
+            retry_after_seconds: The Retry-After value sent with 429 responses.
+            seed: The seed of the random generator, for reproducible runs.
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.captcha_rate = captcha_rate
+        self.retry_after_seconds = retry_after_seconds
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """Returns (delay in seconds, throttle?, captcha?) for the next request."""
+        with self._lock:
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+            roll = self._rng.random()
+        return delay, roll < self.throttle_rate, self.throttle_rate <= roll < self.throttle_rate + self.captcha_rate
+
+
+class MockSejmHandler(BaseHTTPRequestHandler):
+    """Serves synthetic transcripts and the faults drawn from the server's FaultProfile."""
+
+    server: 'MockSejmServer'
+
+    def _layout_and_id(self) -> Optional[tuple]:
+        """Maps a request path to (layout, doc_id), or None if the path is unknown."""
+        parts = urlsplit(self.path)
+        segments = [segment for segment in parts.path.split('/') if segment]
+        if len(segments) >= 2 and segments[0] == 'Debata1.nsf':
+            return LEGACY_LAYOUT, '-'.join(segments[1:])
+        if segments[-1:] == ['stenogram.xsp']:
+            doc_id = parse_qs(parts.query).get('id', [''])[0]
+            return (MODERN_LAYOUT, doc_id) if doc_id else None
+        return None
+
+    def _send(self, status: int, body: str = '', headers: Optional[Dict[str, str]] = None):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if payload and self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    def do_GET(self):
+        delay, throttle, captcha = self.server.faults.draw()
+        if delay:
+            time.sleep(delay)
+
+        route = self._layout_and_id()
+        if route is None:
+            self.server.count('not_found')
+            self._send(404, '<html><body>Not found</body></html>')
+            return
+        if throttle:
+            self.server.count('throttled')
+            self._send(429, '<html><body>Too Many Requests</body></html>',
+                       {'Retry-After': str(self.server.faults.retry_after_seconds)})
+            return
+        if captcha:
+            self.server.count('captchas')
+            self._send(200, CAPTCHA_PAGE)
+            return
+
+        layout, doc_id = route
+        body = synthetic_transcript(doc_id, layout, self.server.segments)
+        etag = '"' + hashlib.sha256(body.encode('utf-8')).hexdigest()[:16] + '"'
+        headers = {'ETag': etag, 'Last-Modified': 'Mon, 01 Jan 2001 00:00:00 GMT'}
+        if self.headers.get('If-None-Match') == etag:
+            self.server.count('not_modified')
+            self._send(304, headers=headers)
+            return
+        self.server.count('served')
+        self._send(200, body, headers)
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean; the counters describe the traffic
+
+
+class MockSejmServer(ThreadingHTTPServer):
+    """
+    A self-contained local stand-in for orka2.sejm.gov.pl, for offline benchmarks and tests.
+
+    Legacy transcripts are served under /Debata1.nsf/<id>?OpenDocument and modern ones under
+    /Sejm.nsf/stenogram.xsp?id=<id>. Responses carry an ETag and honour If-None-Match.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, faults: Optional[FaultProfile] = None, segments: int = 12):
+        """
+        Initializes the MockSejmServer. Port 0 picks a free port.
+
+        Args:
+            host: The interface to listen on.
+            port: The port to listen on.
+            faults: The latency and failures to inject; none by default.
+            segments: The number of chair segments per synthetic transcript.
+        """
+        super().__init__((host, port), MockSejmHandler)
+        self.faults = faults or FaultProfile()
+        self.segments = segments
+        self.stats: Dict[str, int] = {'served': 0, 'not_modified': 0, 'throttled': 0, 'captchas': 0, 'not_found': 0}
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, doc_id: str, layout: str = LEGACY_LAYOUT) -> str:
+        """Returns the URL of a synthetic transcript."""
+        if layout == LEGACY_LAYOUT:
+            return f"{self.base_url}/Debata1.nsf/{doc_id}?OpenDocument"
+        return f"{self.base_url}/Sejm.nsf/stenogram.xsp?id={doc_id}"
+
+    def count(self, outcome: str):
+        with self._stats_lock:
+            self.stats[outcome] += 1
+
+    def start(self):
+        """Serves requests from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-sejm-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Mock Sejm server listening on {self.base_url}")
+
+    def stop(self):
+        """Stops serving and closes the socket."""
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,82 @@
+import time
+from typing import Any, Dict, List, Sequence
+
+from src.benchmark.load_test import percentile
+from src.benchmark.mock_sejm_server import LAYOUTS, synthetic_transcript
+from src.parsing.parser_backends import PARSER_BACKENDS, parse_html
+from src.parsing.speech_extractor import SpeechExtractor
+
+SPEECH_LINK = 'a[href*="/main/"], a[href*="wypowiedz.xsp"]'
+
+def benchmark_parser_backend(backend: str, pages: Sequence[str]) -> Dict[str, Any]:
+    """
+    Parses and segments pages with one parser backend.
+
+    Args:
+        backend: A name from PARSER_BACKENDS.
+        pages: The page HTML.
+
+    Returns:
+        A dictionary with the parse and extraction (segments plus links) times per page, p50 and
+        p99 in milliseconds, the pages per second and the extracted 'results', for comparison.
+    """
+    rules = {'speech_link': SPEECH_LINK}
+    parse_timings, extract_timings, results = [], [], []
+    for html_content in pages:
+        start_time = time.perf_counter()
+        document = parse_html(html_content, backend)
+        parse_timings.append(time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        extractor = SpeechExtractor(document, rules)
+        results.append((extractor.extract_segments(), extractor.extract_hyperlinks()))
+        extract_timings.append(time.perf_counter() - start_time)
+
+    total_seconds = sum(parse_timings) + sum(extract_timings)
+    return {
+        'backend': backend,
+        'pages': len(pages),
+        'parse_p50_ms': percentile(parse_timings, 50) * 1e3,
+        'parse_p99_ms': percentile(parse_timings, 99) * 1e3,
+        'extract_p50_ms': percentile(extract_timings, 50) * 1e3,
+        'extract_p99_ms': percentile(extract_timings, 99) * 1e3,
+        'pages_per_second': len(pages) / total_seconds if total_seconds > 0 else 0.0,
+        'results': results
+    }
+
+def run_parser_benchmark(backends: Sequence[str] = PARSER_BACKENDS, pages: int = 200, segments: int = 200) -> List[Dict[str, Any]]:
+    """
+    Benchmarks the parser backends on the same synthetic transcripts.
+
+    Args:
+        backends: Names from PARSER_BACKENDS.
+        pages: The number of pages.
+        segments: The number of chair segments per synthetic transcript (200 is roughly a real session page).
+
+    Returns:
+        One result dictionary per backend; 'identical' tells whether its segments and links
+        equal those of the first backend.
+    """
+    html_pages = [synthetic_transcript(f"bench-{index}", LAYOUTS[index % len(LAYOUTS)], segments) for index in range(pages)]
+    results = [benchmark_parser_backend(backend, html_pages) for backend in backends]
+    reference = results[0]['results'] if results else None
+    for result in results:
+        result['identical'] = result.pop('results') == reference
+    return results
+
+def format_parser_results(results: List[Dict[str, Any]]) -> str:
+    """Formats parser benchmark results as a fixed-width table."""
+    header = (
+        f"{'backend':<9}{'pages':>7}{'parse p50':>11}{'parse p99':>11}"
+        f"{'extr p50':>10}{'extr p99':>10}{'pages/s':>9}{'speedup':>9}{'identical':>11}"
+    )
+    lines = [header, '-' * len(header)]
+    baseline = results[0]['pages_per_second'] if results else 0.0
+    for result in results:
+        speedup = result['pages_per_second'] / baseline if baseline else 0.0
+        lines.append(
+            f"{result['backend']:<9}{result['pages']:>7}{result['parse_p50_ms']:>11.2f}{result['parse_p99_ms']:>11.2f}"
+            f"{result['extract_p50_ms']:>10.2f}{result['extract_p99_ms']:>10.2f}{result['pages_per_second']:>9.1f}"
+            f"{speedup:>8.2f}x{'yes' if result['identical'] else 'NO':>11}"
+        )
+    return '\n'.join(lines)
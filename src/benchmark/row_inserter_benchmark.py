@@ -0,0 +1,110 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.benchmark.dataset_benchmark import RULES_PATH, synthetic_session
+from src.benchmark.mock_sejm_server import LAYOUTS
+from src.parsing.extraction_cache import extract_session
+from src.parsing.parser_backends import LXML_BACKEND
+from src.reconstruction.row_inserter import RowInserter, normalize_text
+from src.segmentation.metadata_manager import MetadataManager
+
+# Columns the legacy matching added to the session's rows, and so to the output
+LEGACY_COLUMNS = ['norm_agenda_item', 'norm_speaker_info']
+
+def legacy_find_matching_speech_index(analyzed_link: Dict[str, str], speeches_df: pd.DataFrame) -> Optional[int]:
+    """find_matching_speech_index before the match index, without its logging."""
+    link_href = analyzed_link.get('href', '')
+    link_text_normalized = normalize_text(analyzed_link.get('text', ''))
+    if not link_href and not link_text_normalized:
+        return None
+    if 'wypowiedz.xsp' in link_href:
+        matching_rows = speeches_df[speeches_df['source'].str.contains(link_href, case=False, na=False)]
+        if not matching_rows.empty:
+            return matching_rows.index[0]
+    speeches_df['norm_agenda_item'] = speeches_df['agenda_item'].apply(normalize_text)
+    speeches_df['norm_speaker_info'] = (speeches_df['speaker_type'].fillna('') + ' ' + speeches_df['speaker'].fillna('')).apply(normalize_text)
+    for matches in (
+        speeches_df[speeches_df['norm_agenda_item'] == link_text_normalized],
+        speeches_df[speeches_df['norm_speaker_info'] == link_text_normalized],
+        speeches_df[speeches_df['norm_agenda_item'].str.contains(link_text_normalized, na=False)],
+    ):
+        if not matches.empty:
+            return matches.index[0]
+    return None
+
+def legacy_insert_rows(session_df: pd.DataFrame, new_rows: List[Dict[str, Any]], analyzed_links: List[Dict[str, str]]) -> pd.DataFrame:
+    """
+    RowInserter.insert_rows as it was before the match index, for comparison: every link
+    renormalizes and scans the remaining speeches, and a match is dropped from them.
+    """
+    if not new_rows:
+        return session_df
+    if session_df.empty:
+        return pd.DataFrame(new_rows)
+    reconstructed_rows = [new_rows[0]]
+    remaining_speeches = session_df.copy()
+    for i, link in enumerate(analyzed_links):
+        match_index = legacy_find_matching_speech_index(link, remaining_speeches)
+        if match_index is not None:
+            reconstructed_rows.append(remaining_speeches.loc[match_index].to_dict())
+            remaining_speeches.drop(match_index, inplace=True)
+        if (i + 1) < len(new_rows):
+            reconstructed_rows.append(new_rows[i + 1])
+    if not remaining_speeches.empty:
+        reconstructed_rows.extend(remaining_speeches.to_dict('records'))
+    return pd.DataFrame(reconstructed_rows)
+
+def session_inputs(doc_id: str, layout: str, segments: int) -> Tuple[pd.DataFrame, List[Dict[str, Any]], List[Dict[str, str]]]:
+    """Returns the non-speaker rows, the speaker's segment rows and the analyzed links of a synthetic session."""
+    session_df, html_content = synthetic_session(doc_id, layout, '2001-01-01', segments)
+    segments_text, analyzed_links = extract_session(html_content, 2001, RULES_PATH, backend=LXML_BACKEND)
+    new_rows = MetadataManager(session_df[session_df['chair'] == 1].iloc[0], segments_text).create_new_rows()
+    return session_df[session_df['chair'] == 0].copy(), new_rows, analyzed_links
+
+def run_row_inserter_benchmark(sizes: Sequence[int] = (100, 500, 1000), repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Times the legacy row insertion against RowInserter.insert_rows on sessions of each size and layout.
+
+    Args:
+        sizes: The numbers of links (and speeches) per session.
+        repeat: The runs per variant; the fastest counts. The legacy one runs once.
+
+    Returns:
+        One result dictionary per size and layout, with the seconds of each variant, the speedup
+        and whether the outputs are identical once the legacy's leaked columns are dropped.
+    """
+    results = []
+    for size in sizes:
+        for layout in LAYOUTS:
+            other_rows, new_rows, analyzed_links = session_inputs(f"rows-{size}", layout, size + 1)
+            start_time = time.perf_counter()
+            legacy = legacy_insert_rows(other_rows, new_rows, analyzed_links)
+            legacy_seconds = time.perf_counter() - start_time
+            timings = []
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                indexed = RowInserter.insert_rows(other_rows, new_rows, analyzed_links)
+                timings.append(time.perf_counter() - start_time)
+            legacy = legacy.drop(columns=[column for column in LEGACY_COLUMNS if column in legacy.columns])
+            results.append({
+                'links': len(analyzed_links),
+                'layout': layout,
+                'legacy_seconds': legacy_seconds,
+                'indexed_seconds': min(timings),
+                'speedup': legacy_seconds / min(timings) if min(timings) > 0 else 0.0,
+                'identical': legacy.to_csv(index=False) == indexed.to_csv(index=False)
+            })
+    return results
+
+def format_row_inserter_results(results: List[Dict[str, Any]]) -> str:
+    """Formats row inserter benchmark results as a fixed-width table."""
+    header = f"{'links':>7}  {'layout':<8}{'legacy s':>10}{'indexed s':>11}{'speedup':>9}{'identical':>11}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['links']:>7}  {result['layout']:<8}{result['legacy_seconds']:>10.3f}{result['indexed_seconds']:>11.4f}"
+            f"{result['speedup']:>8.0f}x{'yes' if result['identical'] else 'NO':>11}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,80 @@
+import random
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.benchmark.mock_sejm_server import CHAIR_SENTENCES, SPEAKER_NAMES, SPEAKER_TITLES
+from src.data.csv_handler import CSVHandler
+from src.utils.text_cleaner import TextCleaner
+
+# Fragments of the speech texts of the dataset, for a synthetic 'text' column when the CSV is not at hand.
+TEXT_FRAGMENTS = CHAIR_SENTENCES + [
+    '(Oklaski)', '(Poruszenie na sali)', '(Początek posiedzenia o godz. 10 min 02)', 'POS: 1 DZIEN: 2',
+    '&nbsp;', '&quot;Tak&quot;', '&amp;', '<br>', 'ust. 2 pkt 3:', 'Z\u0307\u0301', 'Zaczynamy.',
+] + [f"{title} {name}" for title in SPEAKER_TITLES for name in SPEAKER_NAMES]
+
+def legacy_clean_text(text: str) -> str:
+    """The TextCleaner.clean_text pipeline before batching: five sequential passes plus NFC, for comparison."""
+    if not text:
+        return ""
+    text = text.replace('&nbsp;', ' ').replace('&quot;', '"').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+    text = TextCleaner.HTML_TAG_PATTERN.sub('', text)
+    text = TextCleaner.BRACKET_INFO_PATTERN.sub(' ', text)
+    text = TextCleaner.METADATA_PATTERN.sub('', text)
+    text = unicodedata.normalize('NFC', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def synthetic_texts(count: int, seed: int = 0) -> List[str]:
+    """Returns speech texts assembled from TEXT_FRAGMENTS, with the repetitions of a real column."""
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(TEXT_FRAGMENTS) for _ in range(rng.randint(1, 40))) for _ in range(count)]
+
+def load_texts(csv_path: Path, column: str = 'text', limit: Optional[int] = None, delimiter: str = ',') -> List[str]:
+    """Reads the text column of the dataset, as strings ('' for missing values)."""
+    texts = CSVHandler(delimiter=delimiter).read_csv(csv_path, usecols=[column])[column]
+    if limit:
+        texts = texts.head(limit)
+    return texts.fillna('').astype(str).tolist()
+
+def run_text_cleaner_benchmark(texts: List[str], repeat: int = 3) -> Dict[str, Any]:
+    """
+    Times the legacy per-string cleaning against TextCleaner.clean_text and TextCleaner.clean_texts.
+
+    Args:
+        texts: The strings to clean.
+        repeat: The runs per variant; the fastest counts.
+
+    Returns:
+        A dictionary with the number of 'texts' and 'distinct' strings, the seconds and strings
+        per second of each variant and whether their outputs are 'identical' to the legacy one.
+    """
+    variants = {
+        'legacy': lambda: [legacy_clean_text(text) for text in texts],
+        'clean_text': lambda: [TextCleaner.clean_text(text) for text in texts],
+        'clean_texts': lambda: TextCleaner.clean_texts(texts),
+    }
+    result: Dict[str, Any] = {'texts': len(texts), 'distinct': len(set(texts)), 'identical': True}
+    reference = None
+    for name, variant in variants.items():
+        timings = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            output = variant()
+            timings.append(time.perf_counter() - start_time)
+        if reference is None:
+            reference = output
+        result['identical'] = result['identical'] and output == reference
+        result[f"{name}_seconds"] = min(timings)
+        result[f"{name}_per_second"] = len(texts) / min(timings) if min(timings) > 0 else 0.0
+    return result
+
+def format_text_cleaner_results(result: Dict[str, Any]) -> str:
+    """Formats a text cleaner benchmark result as a table."""
+    lines = [f"{result['texts']} texts ({result['distinct']} distinct), identical output: {'yes' if result['identical'] else 'NO'}"]
+    lines.append(f"{'variant':<13}{'seconds':>9}{'texts/s':>11}{'speedup':>9}")
+    for name in ('legacy', 'clean_text', 'clean_texts'):
+        speedup = result['legacy_seconds'] / result[f"{name}_seconds"] if result[f"{name}_seconds"] else 0.0
+        lines.append(f"{name:<13}{result[f'{name}_seconds']:>9.3f}{result[f'{name}_per_second']:>11.0f}{speedup:>8.1f}x")
+    return '\n'.join(lines)
@@ -17,13 +17,20 @@ class CSVHandler:
         self.encoding = encoding
         self.delimiter = delimiter
 
-    def read_csv(self, filepath: Path, chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    def read_csv(
+        self,
+        filepath: Path,
+        chunksize: Optional[int] = None,
+        usecols: Optional[List[str]] = None
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Reads a CSV file into a pandas DataFrame or an iterator of DataFrames.
 
         Args:
             filepath: The path to the CSV file.
             chunksize: If specified, returns an iterator of DataFrames of this size.
+            usecols: If specified, only these columns are parsed, which keeps scans of
+                     the large speech file cheap when the 'text' column is not needed.
 
         Returns:
             A DataFrame or an iterator of DataFrames.
@@ -39,6 +46,7 @@ class CSVHandler:
                 encoding=self.encoding,
                 delimiter=self.delimiter,
                 chunksize=chunksize,
+                usecols=usecols,
                 on_bad_lines='warn'
             )
             if chunksize:
@@ -6,11 +6,43 @@ from src.utils.config_loader import load_config
 from src.utils.logger import setup_logging
 from src.data.csv_handler import CSVHandler
 from src.reconstruction.dataset_builder import DatasetBuilder
+from src.utils.metrics import build_metrics_reporter
 
 from loguru import logger
 
-def run_pipeline():
-    """Executes the end-to-end segmentation and reconstruction pipeline."""
+# The sessions covered by the segmentation task.
+START_DATE = '1991-01-01'
+END_DATE = '2011-12-31'
+
+def merge_retried_sessions(csv_handler: CSVHandler, output_filepath: Path, retried_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replaces the sessions of a dead-letter retry run in the existing output, keeping the date order.
+
+    Args:
+        csv_handler: The handler used to read the existing output.
+        output_filepath: The path of the previous run's output CSV file.
+        retried_df: The reprocessed sessions, with 'date' already formatted as in the output.
+
+    Returns:
+        The merged dataset, or `retried_df` alone if there is no previous output.
+    """
+    if not output_filepath.exists():
+        logger.warning(f"No previous output at {output_filepath}; saving only the retried sessions.")
+        return retried_df
+    existing_df = csv_handler.read_csv(output_filepath)
+    kept_df = existing_df[~existing_df['date'].isin(set(retried_df['date']))]
+    merged_df = pd.concat([kept_df, retried_df], ignore_index=True)
+    # A stable sort keeps the row order within each session
+    return merged_df.sort_values('date', kind='mergesort', ignore_index=True)
+
+def run_pipeline(retry_dead_letters: bool = False):
+    """
+    Executes the end-to-end segmentation and reconstruction pipeline.
+
+    Args:
+        retry_dead_letters: Whether to reprocess only the sessions whose transcript fetch failed
+                            in earlier runs, merging them into the existing output.
+    """
     # --- 1. Configuration and Setup ---
     config_path = Path('config/settings.yaml')
     config = load_config(config_path)
@@ -41,8 +73,8 @@ def run_pipeline():
 
     # --- 2a. Filter DataFrame to the required date range (1991-2011) ---
     logger.info(f"Original dataset has {len(input_df)} rows.")
-    start_date = '1991-01-01'
-    end_date = '2011-12-31'
+    start_date = START_DATE
+    end_date = END_DATE
     input_df = input_df[(input_df['date'] >= start_date) & (input_df['date'] <= end_date)]
     logger.info(f"Filtered dataset to the range {start_date} - {end_date}. New row count: {len(input_df)}.")
 
@@ -51,18 +83,26 @@ def run_pipeline():
         return
 
     # --- 3. Process and Reconstruct Dataset ---
+    metrics_reporter = build_metrics_reporter(config)
+    if metrics_reporter:
+        metrics_reporter.start()
     try:
         dataset_builder = DatasetBuilder(config)
-        reconstructed_df = dataset_builder.process_dataset(input_df)
+        reconstructed_df = dataset_builder.process_dataset(input_df, retry_dead_letters=retry_dead_letters)
     except Exception as e:
         logger.exception(f"An unexpected error occurred during dataset reconstruction. Pipeline aborted. Error: {e}")
         return
+    finally:
+        if metrics_reporter:
+            metrics_reporter.stop()
 
     # --- 4. Save Output Data ---
     if reconstructed_df is not None and not reconstructed_df.empty:
         logger.info(f"Saving reconstructed dataset to: {output_filepath}")
         # Convert datetime back to string for consistent CSV format
         reconstructed_df['date'] = reconstructed_df['date'].dt.strftime('%Y-%m-%d')
+        if retry_dead_letters:
+            reconstructed_df = merge_retried_sessions(csv_handler, output_filepath, reconstructed_df)
         csv_handler.write_csv(reconstructed_df, output_filepath)
         logger.info("--- Pipeline finished successfully! ---")
     else:
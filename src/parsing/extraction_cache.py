@@ -0,0 +1,163 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from loguru import logger
+
+from src.parsing.html_parser import HTMLParser
+from src.parsing.link_analyzer import LinkAnalyzer
+from src.parsing.parser_backends import BS4_BACKEND
+from src.parsing.speech_extractor import EXTRACTOR_VERSION, SpeechExtractor
+from src.scraping.rules_loader import RuleSet, get_rules_registry, rules_hash
+from src.utils.metrics import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extractions (
+    key TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    result TEXT NOT NULL
+);
+"""
+
+Extraction = Tuple[List[str], List[Dict[str, str]]]
+Rules = Union[Dict[str, Any], RuleSet]
+
+class ExtractionCache:
+    """
+    A content-addressed store of extraction results: the speech segments and analyzed links
+    of a session page.
+
+    Results are deterministic in the page, the rule set and the extractor code, so the key
+    combines the SHA256 of the HTML, the hash of the year's rule set and EXTRACTOR_VERSION.
+    Entries never expire; a changed page, rule set or extractor simply misses. Results are
+    stored as JSON in a single SQLite file.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Opens (or creates) the extraction cache.
+
+        Args:
+            path: The SQLite database file.
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(SCHEMA)
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(html_content: str, rules: Rules) -> str:
+        """Returns the cache key of a page parsed with a rule set by the current extractor."""
+        html_hash = hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+        version = rules.version if isinstance(rules, RuleSet) else rules_hash(rules)
+        return f"{html_hash}:{version}:v{EXTRACTOR_VERSION}"
+
+    def get(self, html_content: str, rules: Rules) -> Optional[Extraction]:
+        """
+        Looks up the extraction result of a page.
+
+        Args:
+            html_content: The page HTML.
+            rules: The rule set of the session's year, a RuleSet or its selectors.
+
+        Returns:
+            (segments, analyzed_links), or None on a miss.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT result FROM extractions WHERE key = ?', (self.key(html_content, rules),)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        metrics.inc('extraction_cache_lookups_total', result='miss' if row is None else 'hit')
+        if row is None:
+            return None
+        result = json.loads(row[0])
+        return result['segments'], result['links']
+
+    def put(self, html_content: str, rules: Rules, segments: List[str], analyzed_links: List[Dict[str, str]]):
+        """Stores the extraction result of a page."""
+        result = json.dumps({'segments': segments, 'links': analyzed_links}, ensure_ascii=False)
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO extractions (key, created, result) VALUES (?, ?, ?)',
+                    (self.key(html_content, rules), time.time(), result)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Could not store an extraction result in {self.path}: {e}")
+
+    def close(self):
+        """Closes the database. Safe to call more than once."""
+        with self._lock:
+            if self._connection is None:
+                return
+            self._connection.close()
+            self._connection = None
+        logger.info(f"Extraction cache: {self.hits} hits, {self.misses} misses.")
+
+def extract_session(
+    html_content: str,
+    year: int,
+    rules_path: Path,
+    extraction_cache: Optional[ExtractionCache] = None,
+    backend: str = BS4_BACKEND
+) -> Extraction:
+    """
+    Extracts the speaker's segments and the analyzed speech links of a session page,
+    reusing a cached result when the page, rule set and extractor are unchanged.
+
+    Args:
+        html_content: The page HTML.
+        year: The session year, selecting the rule set.
+        rules_path: The path to the scraping rules YAML file.
+        extraction_cache: An optional ExtractionCache.
+        backend: The parser backend. Backends give identical results, so it is not part of the cache key.
+
+    Returns:
+        (segments, analyzed_links); both empty if the page has no content area.
+    """
+    rules = get_rules_registry(rules_path).rule_set(year)
+    if extraction_cache is not None:
+        cached = extraction_cache.get(html_content, rules)
+        if cached is not None:
+            logger.debug(f"Reusing the cached extraction of a {year} session page.")
+            return cached
+
+    parser = HTMLParser(html_content, year=year, rules_path=rules_path, backend=backend)
+    content_area = parser.extract_content_area()
+    if not content_area:
+        return [], []
+
+    extractor = SpeechExtractor(content_area, parser.rule_set)
+    segments = extractor.extract_segments()
+    links = extractor.extract_hyperlinks()
+    analyzed_links = LinkAnalyzer(links).analyze_links()
+
+    if extraction_cache is not None:
+        extraction_cache.put(html_content, rules, segments, analyzed_links)
+    return segments, analyzed_links
+
+def build_extraction_cache(config: dict) -> Optional[ExtractionCache]:
+    """
+    Creates the ExtractionCache described by the 'extraction_cache' settings.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+
+    Returns:
+        The ExtractionCache, or None if it is disabled.
+    """
+    if not config.get('extraction_cache', {}).get('enabled', False):
+        return None
+    return ExtractionCache(Path(config['paths'].get('extraction_cache', 'data/extraction_cache.sqlite3')))
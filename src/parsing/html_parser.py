@@ -1,14 +1,15 @@
 from pathlib import Path
-from typing import Optional
-from bs4 import BeautifulSoup, Tag
+from typing import Optional, Union
+from bs4 import Tag
 from loguru import logger
 
-from src.scraping.rules_loader import load_scraping_rules
+from src.parsing.parser_backends import BS4_BACKEND, Bs4Document, ParsedDocument, parse_html
+from src.scraping.rules_loader import get_rules_registry
 
 class HTMLParser:
     """Parses HTML content to extract the main transcript area using year-specific rules."""
 
-    def __init__(self, html_content: str, year: int, rules_path: Path):
+    def __init__(self, html_content: str, year: int, rules_path: Path, backend: str = BS4_BACKEND):
         """
         Initializes the HTMLParser.
 
@@ -16,24 +17,30 @@ class HTMLParser:
             html_content: The raw HTML content of the session page.
             year: The year of the session, used to select the correct parsing rules.
             rules_path: The path to the scraping rules YAML file.
+            backend: The parser backend, one of PARSER_BACKENDS.
         """
         if not html_content:
             raise ValueError("HTML content cannot be empty.")
-        self.soup = BeautifulSoup(html_content, 'lxml')
+        self.document = parse_html(html_content, backend)
+        # The BeautifulSoup tree, if the page was parsed with the bs4 backend
+        self.soup = self.document.root if isinstance(self.document, Bs4Document) else None
         self.year = year
         try:
-            self.rules = load_scraping_rules(rules_path, year)
+            # The year's rule set, with its selectors compiled once for every page of the dataset
+            self.rule_set = get_rules_registry(rules_path).rule_set(year)
+            self.rules = self.rule_set.selectors
         except (FileNotFoundError, ValueError) as e:
             logger.error(f"Could not load scraping rules for year {year}: {e}")
             raise
 
-    def extract_content_area(self) -> Optional[Tag]:
+    def extract_content_area(self) -> Optional[Union[Tag, ParsedDocument]]:
         """
         The input is now expected to be the relevant HTML fragment from the CSV.
         Therefore, the whole parsed soup is considered the content area.
 
         Returns:
-            The BeautifulSoup Tag object representing the content area.
+            The BeautifulSoup Tag object representing the content area, or the parsed
+            document if the page was parsed with another backend.
         """
         logger.debug("Using the entire provided HTML string as the content area.")
-        return self.soup
+        return self.soup if self.soup is not None else self.document
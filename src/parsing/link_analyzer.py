@@ -1,19 +1,29 @@
 import re
-from typing import List, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 from loguru import logger
 
+# Distinct link texts whose parse is memoized per process. Speaker links repeat across sessions
+# ("Poseł X", "Minister Y"), so a few thousand entries cover a whole dataset.
+SPEAKER_CACHE_SIZE = 16384
+
 class LinkAnalyzer:
     """Analyzes hyperlinks to extract structured data like speaker names and titles."""
 
     # Regex to capture a title (e.g., "Poseł", "Minister", "Sekretarz Stanu") and a name.
     # This pattern looks for a title followed by a name, which may contain spaces and hyphens.
     # It assumes the name is the last part of the string.
+    # The name starts at the first word that can start it; every quantifier is possessive or
+    # atomic, so a text that does not match fails in linear time instead of backtracking.
     SPEAKER_PATTERN = re.compile(
-        r"^\s*"                           # Optional leading whitespace
-        r"([\w\s\.\-]+?)"               # Non-greedy capture for the title (group 1)
-        r"\s+"                             # Separator
-        r"([A-ZĄĆĘŁŃÓŚŹŻ][\w\s\-ĄĆĘŁŃÓŚŹŻ]+)" # Capture for the name (group 2), assumes name starts with capital
-        r"[\s\.]*$"                            # Optional trailing whitespace or period
+        r"^(?=[\w\s.\-]*+$)"               # Only characters a title or name can contain
+        r"\s*+"                             # Optional leading whitespace
+        r"("                                # Title (group 1): the words before the name,
+        r"(?>(?:[\w\s.\-]*\.(?=\s*+[\w\-]))?)" # through the last period inside the text (names have none),
+        r"[\w.\-]*+\s++(?:[\w.\-]++\s++)*?"  # then as few words as possible, each with its separator
+        r"|(?<=\s\s))"                      # or empty, after at least two leading whitespace characters
+        r"([A-ZĄĆĘŁŃÓŚŹŻ][\w\s\-ĄĆĘŁŃÓŚŹŻ]++)" # Capture for the name (group 2), assumes name starts with capital
+        r"[\s.]*+$"                         # Optional trailing whitespace or period
     , re.IGNORECASE)
 
     def __init__(self, links: List[Dict[str, str]]):
@@ -36,18 +46,21 @@ class LinkAnalyzer:
         Returns:
             A dictionary containing the speaker's 'name' and 'title'.
         """
-        logger.debug(f"Attempting to parse speaker details from link text: '{link_text}'")
-        match = self.SPEAKER_PATTERN.match(link_text)
-        if match:
-            title = match.group(1).strip()
-            name = match.group(2).strip()
-            logger.debug(f"Regex matched. Group 1 (Title): '{title}', Group 2 (Name): '{name}'")
-            return {'name': name, 'title': title}
-        else:
-            # If the regex doesn't match, we can assume the whole text is the name
-            # or handle it as an unknown format.
-            logger.warning(f"Could not parse speaker details from link text: '{link_text}'")
-            return {'name': link_text, 'title': 'Unknown'}
+        name, title = _parse_speaker(link_text)
+        return {'name': name, 'title': title}
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        """Returns the hits, misses, size and hit rate of the process-wide memo of parsed link texts."""
+        info = _parse_speaker.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0
+        }
 
     def analyze_links(self) -> List[Dict[str, str]]:
         """
@@ -60,12 +73,23 @@ class LinkAnalyzer:
         logger.info(f"Analyzing {len(self.links)} links...")
         analyzed_links = []
         for link in self.links:
-            speaker_info = self._extract_speaker_from_link_text(link['text'])
+            speaker_name, speaker_title = _parse_speaker(link['text'])
             analyzed_link = {
                 **link, # Original href and text
-                'speaker_name': speaker_info['name'],
-                'speaker_title': speaker_info['title']
+                'speaker_name': speaker_name,
+                'speaker_title': speaker_title
             }
             analyzed_links.append(analyzed_link)
-        
+
         return analyzed_links
+
+@lru_cache(maxsize=SPEAKER_CACHE_SIZE)
+def _parse_speaker(link_text: str) -> Tuple[str, str]:
+    """Returns the (name, title) of a link text; memoized, so each distinct text is parsed and logged once."""
+    match = LinkAnalyzer.SPEAKER_PATTERN.match(link_text)
+    if match:
+        return match.group(2).strip(), match.group(1).strip()
+    # If the regex doesn't match, we can assume the whole text is the name
+    # or handle it as an unknown format.
+    logger.warning(f"Could not parse speaker details from link text: '{link_text}'")
+    return link_text, 'Unknown'
@@ -0,0 +1,321 @@
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, Iterator, List, Optional, Set, Tuple, Union
+import soupsieve
+from bs4 import BeautifulSoup, NavigableString, Tag
+from lxml import etree
+from loguru import logger
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError: # cssselect is a core dependency; BeautifulSoup covers environments installed without it
+    CSSSelector = None
+
+# Parser backends. Both parse with libxml2's HTML parser, so they see the same tree; 'bs4'
+# builds a BeautifulSoup tree on top of it, 'lxml' works on lxml's own (C) tree directly.
+BS4_BACKEND = 'bs4'
+LXML_BACKEND = 'lxml'
+PARSER_BACKENDS = (BS4_BACKEND, LXML_BACKEND)
+
+# Tags whose strings BeautifulSoup stores as special string classes, which get_text() skips.
+STRING_CONTAINER_TAGS = frozenset({'rt', 'rp', 'style', 'script', 'template'})
+
+# A doctype declared before the root element, possibly after comments and processing instructions.
+DOCTYPE_NAME = re.compile(r'^\s*(?:(?:<!--(?:(?!-->).)*-->|<\?[^>]*>)\s*)*<!DOCTYPE\s+([^\s>\[]+)', re.IGNORECASE | re.DOTALL)
+DOCTYPE = re.compile(r'<!DOCTYPE', re.IGNORECASE)
+
+# An element of a parsed page: a bs4 Tag or an lxml element.
+Node = Union[Tag, etree._Element]
+
+# A CSS selector as text, or compiled by compile_selector for one backend.
+CompiledSelector = Any
+Selector = Union[str, CompiledSelector]
+
+# Events of ParsedDocument.events: an element starts or ends, a string of its text (one
+# that get_text() includes), or another string (a comment, the doctype, a script's code).
+START = 'start'
+END = 'end'
+TEXT = 'text'
+MARKUP = 'markup'
+# Internal states of the lxml walk
+OPEN = 'open'
+CLOSED = 'closed'
+
+def resolve_parser_backend(backend: str) -> str:
+    """
+    Validates a configured parser backend, falling back from lxml to bs4 if cssselect is not installed.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}'. Expected one of {PARSER_BACKENDS}.")
+    if backend == LXML_BACKEND and CSSSelector is None:
+        logger.warning("The cssselect package is not installed. Parsing pages with BeautifulSoup instead.")
+        return BS4_BACKEND
+    return backend
+
+@lru_cache(maxsize=64)
+def _css_selector(selector: str) -> 'CSSSelector':
+    return CSSSelector(selector, translator='html')
+
+def compile_selector(selector: str, backend: str) -> CompiledSelector:
+    """
+    Compiles a CSS selector for the documents of a parser backend, to be passed to their
+    `select` and `matcher` instead of the text.
+
+    Args:
+        selector: The CSS selector.
+        backend: One of PARSER_BACKENDS.
+
+    Returns:
+        A soupsieve selector for 'bs4', an lxml CSSSelector for 'lxml'.
+    """
+    if backend == LXML_BACKEND:
+        return _css_selector(selector)
+    return soupsieve.compile(selector)
+
+class ParsedDocument(ABC):
+    """
+    The operations SpeechExtractor needs from a parsed page, independent of the parser.
+
+    Selectors are CSS text or, compiled once by compile_selector, for the document's `backend`.
+    `walk` yields the page in document order like BeautifulSoup's `descendants`: every element,
+    followed by its content, with text, comments and the doctype as strings.
+    """
+
+    backend: str
+
+    @abstractmethod
+    def select(self, selector: Selector) -> List[Node]:
+        """Returns the elements matching a CSS selector, in document order."""
+
+    @abstractmethod
+    def remove(self, selector: str):
+        """Removes the elements matching a CSS selector and their content, but not the text after them."""
+
+    @abstractmethod
+    def walk(self) -> Iterator[Union[Node, str]]:
+        """Yields the elements and strings of the page in document order, as BeautifulSoup's `descendants`."""
+
+    @abstractmethod
+    def events(self, skip_tags: FrozenSet[str] = frozenset()) -> Iterator[Tuple[str, Any]]:
+        """
+        Walks the page once in document order, for single-pass extraction.
+
+        Args:
+            skip_tags: Names of elements whose subtree is skipped, as if removed.
+
+        Yields:
+            (START, element) and (END, element) around an element's content, (TEXT, string) for
+            the strings get_text() includes and (MARKUP, string) for the others `walk` yields.
+        """
+
+    @abstractmethod
+    def matcher(self, selector: Selector) -> Callable[[Node], bool]:
+        """Returns a test of whether an element matches a CSS selector, by identity, not by equality."""
+
+    @abstractmethod
+    def text(self, node: Node) -> str:
+        """Returns the text of an element, as BeautifulSoup's `get_text()`."""
+
+    @abstractmethod
+    def attribute(self, node: Node, name: str) -> Optional[str]:
+        """Returns the value of an element's attribute, or None if it is not set."""
+
+    @abstractmethod
+    def stripped_text(self) -> str:
+        """Returns the page text, as BeautifulSoup's `get_text(separator=' ', strip=True)`."""
+
+class Bs4Document(ParsedDocument):
+    """A page parsed into a BeautifulSoup tree, or a Tag of one."""
+
+    backend = BS4_BACKEND
+
+    def __init__(self, tag: Tag):
+        self.root = tag
+
+    def select(self, selector: Selector) -> List[Tag]:
+        return self.root.select(selector)
+
+    def remove(self, selector: str):
+        for tag in self.root.select(selector):
+            tag.decompose()
+
+    def walk(self) -> Iterator[Union[Tag, str]]:
+        return self.root.descendants
+
+    def events(self, skip_tags: FrozenSet[str] = frozenset()) -> Iterator[Tuple[str, Any]]:
+        text_types = Tag.MAIN_CONTENT_STRING_TYPES
+        stack = [(None, iter(self.root.contents))]
+        while stack:
+            tag, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if tag is not None:
+                    yield END, tag
+            elif isinstance(child, NavigableString):
+                yield TEXT if type(child) in text_types else MARKUP, child
+            elif child.name not in skip_tags:
+                yield START, child
+                stack.append((child, iter(child.contents)))
+
+    def matcher(self, selector: Selector) -> Callable[[Tag], bool]:
+        # Matched when visited: testing membership in a set of Tags would hash them by their markup
+        return self.root.css.compile(selector).match
+
+    def text(self, node: Tag) -> str:
+        return node.get_text()
+
+    def attribute(self, node: Tag, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def stripped_text(self) -> str:
+        return self.root.get_text(separator=' ', strip=True)
+
+class LxmlDocument(ParsedDocument):
+    """
+    A page parsed into an lxml tree, without building a BeautifulSoup tree.
+
+    The page is fed to lxml's HTML parser the way BeautifulSoup's 'lxml' builder feeds it, so
+    the tree is the same, and the strings are reproduced as BeautifulSoup reports them: comments
+    and processing instructions are walked, a declared doctype is walked as "name PUBLIC ...",
+    and the text around a removed element stays in separate strings.
+    """
+
+    backend = LXML_BACKEND
+
+    def __init__(self, html_content: str):
+        parser = etree.HTMLParser()
+        parser.feed(html_content)
+        try:
+            self.root: Optional[etree._Element] = parser.close()
+        except etree.XMLSyntaxError: # No element at all
+            self.root = None
+        self._removed: Set[etree._Element] = set()
+        self._doctype, self._nodes_before_doctype = self._declared_doctype(html_content)
+        # lxml drops a doctype inside the page, BeautifulSoup keeps it as a string where it stands
+        self.misplaced_doctype = len(DOCTYPE.findall(html_content)) > (self._doctype is not None)
+
+    def _declared_doctype(self, html_content: str) -> Tuple[Optional[str], int]:
+        """Returns the doctype string BeautifulSoup would report, and how many top-level nodes precede it."""
+        match = DOCTYPE_NAME.search(html_content)
+        if match is None or self.root is None:
+            return None, 0 # lxml reports an implied doctype that BeautifulSoup does not
+        docinfo = self.root.getroottree().docinfo
+        doctype, public_id, system_url = match.group(1), docinfo.public_id, docinfo.system_url
+        if public_id is not None:
+            doctype += f' PUBLIC "{public_id}"'
+            if system_url is not None:
+                doctype += f' "{system_url}"'
+        elif system_url is not None:
+            doctype += f' SYSTEM "{system_url}"'
+        prefix = html_content[:match.start(1)]
+        return doctype, prefix.count('<!--') + prefix.count('<?')
+
+    def select(self, selector: Selector) -> List[etree._Element]:
+        # Content after </html> makes libxml2 start another <html> element next to the root
+        matcher = _css_selector(selector) if isinstance(selector, str) else selector
+        return [
+            element for node in self._top_level_nodes() if isinstance(node.tag, str)
+            for element in matcher(node) if not self._is_removed(element)
+        ]
+
+    def _is_removed(self, element: etree._Element) -> bool:
+        return any(ancestor in self._removed for ancestor in element.iterancestors()) or element in self._removed
+
+    def remove(self, selector: str):
+        for element in self.select(selector):
+            # The element stays in the tree, emptied and skipped, so that its tail remains a string of its own
+            element.clear(keep_tail=True)
+            self._removed.add(element)
+
+    def _top_level_nodes(self) -> List[etree._Element]:
+        if self.root is None:
+            return []
+        return list(reversed(list(self.root.itersiblings(preceding=True)))) + [self.root] + list(self.root.itersiblings())
+
+    def _events(self, nodes: List[etree._Element], skip_tags: FrozenSet[str] = frozenset(), tail: bool = True) -> Iterator[Tuple[str, Any]]:
+        """
+        Walks sibling nodes and their content in document order, as `events` describes.
+
+        Args:
+            nodes: The sibling nodes to walk.
+            skip_tags: Names of elements whose subtree is skipped; the text after them is not.
+            tail: Whether the text after the last node is walked.
+        """
+        # Entries are (node, state, inside a string container). An OPEN entry is visited; a closing
+        # entry walks the node's tail, after an END event if the node was entered.
+        stack = [(node, OPEN, False) for node in reversed(nodes)]
+        last = nodes[-1] if nodes else None
+        removed = self._removed
+        while stack:
+            node, state, contained = stack.pop()
+            if state != OPEN:
+                if state == END:
+                    yield END, node
+                if node.tail and (tail or node is not last):
+                    yield MARKUP if contained else TEXT, node.tail
+                continue
+            tag = node.tag
+            if tag is etree.Comment:
+                yield MARKUP, node.text or ''
+            elif tag is etree.ProcessingInstruction:
+                yield MARKUP, f"{node.target} {node.text or ''}"
+            elif isinstance(tag, str) and tag not in skip_tags and node not in removed:
+                stack.append((node, END, contained))
+                yield START, node
+                inner = contained or tag in STRING_CONTAINER_TAGS
+                if node.text:
+                    yield MARKUP if inner else TEXT, node.text
+                stack.extend((child, OPEN, inner) for child in reversed(node))
+                continue
+            stack.append((node, CLOSED, contained))
+
+    def events(self, skip_tags: FrozenSet[str] = frozenset()) -> Iterator[Tuple[str, Any]]:
+        nodes = self._top_level_nodes()
+        if self._doctype is not None:
+            yield from self._events(nodes[:self._nodes_before_doctype], skip_tags)
+            yield MARKUP, self._doctype
+            nodes = nodes[self._nodes_before_doctype:]
+        yield from self._events(nodes, skip_tags)
+
+    def walk(self) -> Iterator[Union[etree._Element, str]]:
+        return (item for event, item in self.events() if event != END)
+
+    def text(self, node: etree._Element) -> str:
+        if any(ancestor.tag in STRING_CONTAINER_TAGS for ancestor in node.iterancestors()):
+            return ''
+        return ''.join(item for event, item in self._events([node], tail=False) if event == TEXT)
+
+    def attribute(self, node: etree._Element, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def matcher(self, selector: Selector) -> Callable[[etree._Element], bool]:
+        # lxml elements compare and hash by identity; the set keeps them alive, and with them their identity
+        return set(self.select(selector)).__contains__
+
+    def stripped_text(self) -> str:
+        strings = (item for event, item in self.events() if event == TEXT)
+        return ' '.join(stripped for stripped in (string.strip() for string in strings) if stripped)
+
+def parse_html(html_content: str, backend: str = BS4_BACKEND) -> ParsedDocument:
+    """
+    Parses a page with a parser backend.
+
+    Args:
+        html_content: The page HTML.
+        backend: One of PARSER_BACKENDS.
+
+    Returns:
+        The parsed page.
+    """
+    if resolve_parser_backend(backend) == LXML_BACKEND:
+        document = LxmlDocument(html_content)
+        if document.root is not None and not document.misplaced_doctype:
+            return document
+        # Pages lxml cannot reproduce: without elements (lxml returns no tree, BeautifulSoup still
+        # has their comments) or with a doctype inside the page
+    return Bs4Document(BeautifulSoup(html_content, 'lxml'))
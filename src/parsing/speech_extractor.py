@@ -1,80 +1,131 @@
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple, Union
 from bs4 import Tag
 from loguru import logger
 
+from src.parsing.parser_backends import MARKUP, START, TEXT, Bs4Document, ParsedDocument
+from src.scraping.rules_loader import RuleSet
 from src.utils.text_cleaner import TextCleaner
 
+# Version of the extraction output (SpeechExtractor, TextCleaner and LinkAnalyzer). It is part of
+# the key of cached extraction results: bump it whenever a change alters segments or links.
+EXTRACTOR_VERSION = 1
+
+# Elements whose content is never part of a segment.
+SKIPPED_TAGS = frozenset({'script', 'style'})
+
 class SpeechExtractor:
     """Extracts speech segments from a parsed HTML content area."""
 
-    def __init__(self, content_area: Tag, rules: Dict[str, str]):
+    def __init__(self, content_area: Union[Tag, ParsedDocument], rules: Union[Dict[str, str], RuleSet]):
         """
         Initializes the SpeechExtractor.
 
         Args:
-            content_area: A BeautifulSoup Tag object representing the main content area.
-            rules: A dictionary of scraping rules for the specific year.
+            content_area: A BeautifulSoup Tag object representing the main content area,
+                          or a page parsed by any parser backend.
+            rules: A dictionary of scraping rules for the specific year, or the year's RuleSet,
+                   whose compiled selectors are reused.
         """
-        if not content_area or not isinstance(content_area, Tag):
-            raise ValueError("A valid BeautifulSoup Tag for 'content_area' must be provided.")
+        if isinstance(content_area, Tag):
+            content_area = Bs4Document(content_area)
+        if not isinstance(content_area, ParsedDocument):
+            raise ValueError("A valid BeautifulSoup Tag or parsed document for 'content_area' must be provided.")
         self.content_area = content_area
-        self.rules = rules
+        self.rule_set = rules if isinstance(rules, RuleSet) else None
+        self.rules = rules.selectors if isinstance(rules, RuleSet) else rules
         self.speech_link_selector = self.rules.get('speech_link')
         if not self.speech_link_selector:
             raise ValueError("'speech_link' selector not found in rules.")
+        self._extraction: Optional[Dict[str, Any]] = None
 
-    def extract_segments(self) -> List[str]:
+    def extract(self) -> Dict[str, Any]:
         """
-        Extracts the Speaker's (Marszałek) speech segments from the content.
+        Extracts the segments, the delimiter links and the text length for the loss check in a
+        single traversal of the page; later calls return the same result.
 
-        The logic identifies segments as the text that appears between the hyperlinks
-        of other speakers' speeches.
+        The Speaker's (Marszałek) segments are the text between the hyperlinks of other speakers'
+        speeches. Delimiter links are recognized as they are visited, by identity, and their text
+        is collected on the way; script and style elements are skipped.
 
         Returns:
-            A list of cleaned speech segments.
+            A dictionary with the cleaned 'segments', the 'links' (dictionaries with the link's
+            text and href), their interleaving as the 'sequence' of ('segment', index) and
+            ('link', index) pairs, and the 'text_length' of the cleaned page text.
         """
+        if self._extraction is not None:
+            return self._extraction
         logger.info("Starting extraction of speech segments...")
-
-        # Pre-cleaning step: remove all script and style tags from the content area
-        for tag in self.content_area.select('script, style'):
-            tag.decompose()
-
-        segments = []
+        selector = self.speech_link_selector
+        if self.rule_set is not None:
+            selector = self.rule_set.selector('speech_link', self.content_area.backend)
+        is_delimiter = self.content_area.matcher(selector)
+        # Segments and link texts are collected raw and cleaned together at the end
+        raw_segments, page_text, sequence = [], [], []
         current_segment_parts = []
+        # The (text strings, href) of every delimiter link; the strings fill up while the link is open
+        raw_links: List[Tuple[List[str], Optional[str]]] = []
+        open_links = []
 
-        # Find all delimiter links first using the robust selector
-        delimiter_links = {link for link in self.content_area.select(self.speech_link_selector)}
-        
-        # Iterate through all descendants of the content area
-        for element in self.content_area.descendants:
-            # If the element is one of the delimiter hyperlinks, it marks the end of a segment.
-            if element in delimiter_links:
-                # When a delimiter is found, the accumulated text forms a segment
-                if current_segment_parts:
-                    full_segment = ' '.join(current_segment_parts).strip()
-                    cleaned_segment = TextCleaner.clean_text(full_segment)
-                    if cleaned_segment:
-                        segments.append(cleaned_segment)
-                        logger.debug(f"Extracted segment: {cleaned_segment[:100]}...")
-                    current_segment_parts = [] # Reset for the next segment
-            
-            # If it's just text, add it to the current segment
-            elif isinstance(element, str):
-                text = element.strip()
+        for event, item in self.content_area.events(skip_tags=SKIPPED_TAGS):
+            if event == TEXT or event == MARKUP:
+                text = item.strip()
                 if text:
                     current_segment_parts.append(text)
+                if event == TEXT:
+                    if text:
+                        page_text.append(text)
+                    for _, link_strings in open_links:
+                        link_strings.append(item)
+            elif event == START:
+                # A delimiter ends the segment accumulated so far
+                if is_delimiter(item):
+                    if current_segment_parts:
+                        sequence.append(('segment', len(raw_segments)))
+                        raw_segments.append(' '.join(current_segment_parts).strip())
+                        current_segment_parts = []
+                    sequence.append(('link', len(raw_links)))
+                    open_links.append((item, []))
+                    raw_links.append((open_links[-1][1], self.content_area.attribute(item, 'href')))
+            elif open_links and open_links[-1][0] is item: # The end of a delimiter
+                open_links.pop()
 
         # Add the last segment if any text was accumulated after the final link
         if current_segment_parts:
-            full_segment = ' '.join(current_segment_parts).strip()
-            cleaned_segment = TextCleaner.clean_text(full_segment)
-            if cleaned_segment:
-                segments.append(cleaned_segment)
-                logger.debug(f"Extracted final segment: {cleaned_segment[:100]}...")
+            sequence.append(('segment', len(raw_segments)))
+            raw_segments.append(' '.join(current_segment_parts).strip())
+
+        cleaned = TextCleaner.clean_texts(
+            raw_segments + [''.join(link_strings) for link_strings, _ in raw_links] + [' '.join(page_text)]
+        )
+        # Empty segments and links without text or href are dropped, and the sequence renumbered accordingly
+        segments, links, numbers = [], [], {}
+        for index, segment in enumerate(cleaned[:len(raw_segments)]):
+            if segment:
+                numbers['segment', index] = len(segments)
+                segments.append(segment)
+        for index, (link_text, (_, link_href)) in enumerate(zip(cleaned[len(raw_segments):-1], raw_links)):
+            if link_text and link_href:
+                numbers['link', index] = len(links)
+                links.append({'text': link_text, 'href': link_href})
+        sequence = [(kind, numbers[kind, index]) for kind, index in sequence if (kind, index) in numbers]
+
+        logger.info(f"Extraction complete. Found {len(segments)} speech segments and {len(links)} hyperlinks.")
+        text_length = len(cleaned[-1])
+        self._log_validation(text_length, segments)
+        self._extraction = {'segments': segments, 'links': links, 'sequence': sequence, 'text_length': text_length}
+        return self._extraction
 
-        logger.info(f"Extraction complete. Found {len(segments)} speech segments.")
-        self.validate_segments(segments)
-        return segments
+    def extract_segments(self) -> List[str]:
+        """
+        Extracts the Speaker's (Marszałek) speech segments from the content.
+
+        The logic identifies segments as the text that appears between the hyperlinks
+        of other speakers' speeches.
+
+        Returns:
+            A list of cleaned speech segments.
+        """
+        return self.extract()['segments']
 
     def extract_hyperlinks(self) -> List[Dict[str, str]]:
         """
@@ -83,16 +134,7 @@ class SpeechExtractor:
         Returns:
             A list of dictionaries, where each dictionary contains the link's text and href.
         """
-        links = []
-        found_links = self.content_area.select(self.speech_link_selector)
-        for link_tag in found_links:
-            link_text = TextCleaner.clean_text(link_tag.get_text())
-            link_href = link_tag.get('href')
-            if link_text and link_href:
-                links.append({'text': link_text, 'href': link_href})
-        
-        logger.info(f"Found {len(links)} hyperlinks in the content area.")
-        return links
+        return self.extract()['links']
 
     def validate_segments(self, segments: List[str]):
         """
@@ -103,10 +145,12 @@ class SpeechExtractor:
             segments: The list of extracted speech segments.
         """
         # Get the total text from the original content area, excluding script/style tags
-        original_text = self.content_area.get_text(separator=' ', strip=True)
-        cleaned_original_text = TextCleaner.clean_text(original_text)
-        original_length = len(cleaned_original_text)
+        self.content_area.remove('script, style')
+        original_text = self.content_area.stripped_text()
+        self._log_validation(len(TextCleaner.clean_text(original_text)), segments)
 
+    def _log_validation(self, original_length: int, segments: List[str]):
+        """Compares the cleaned page text length with the total segments length, and warns about a large gap."""
         segments_text = ' '.join(segments)
         segments_length = len(segments_text)
 
@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Dict, Optional
+import pandas as pd
+
+from src.utils.config_loader import load_config
+from src.utils.logger import setup_logging
+from src.data.csv_handler import CSVHandler
+from src.main import START_DATE, END_DATE
+from src.scraping.async_fetcher import AsyncFetcher
+from src.scraping.cache_manager import build_cache_manager
+from src.scraping.circuit_breaker import build_circuit_breaker
+from src.scraping.dead_letters import build_dead_letter_queue
+from src.scraping.prefetcher import Prefetcher
+from src.scraping.rate_limiter import build_rate_limiter
+from src.scraping.session_scraper import SessionScraper
+from src.utils.metrics import build_metrics_reporter
+from src.scraping.playwright_client import BROWSER_USER_AGENT
+from src.scraping.tiered_fetcher import build_fetch_client, load_cookie_file
+
+from loguru import logger
+
+# The only columns needed to find the speaker transcripts; skipping 'text' keeps the scan cheap.
+PREFETCH_COLUMNS = ['source', 'chair', 'date_presented']
+
+def load_speaker_urls(input_filepath: Path, chunksize: int = 100000) -> Dict[str, int]:
+    """
+    Scans the input CSV column-wise and returns the unique chair=1 source URLs within the task's date range.
+
+    Args:
+        input_filepath: The path to the speeches CSV file.
+        chunksize: The number of rows parsed at a time.
+
+    Returns:
+        A dictionary mapping each URL to its session year, in order of first appearance.
+    """
+    csv_handler = CSVHandler()
+    urls: Dict[str, int] = {}
+    for chunk in csv_handler.read_csv(input_filepath, chunksize=chunksize, usecols=PREFETCH_COLUMNS):
+        speaker_rows = chunk[chunk['chair'] == 1]
+        dates = pd.to_datetime(speaker_rows['date_presented'], format='mixed', errors='coerce')
+        in_range = (dates >= START_DATE) & (dates <= END_DATE) & speaker_rows['source'].notna()
+        for url, date in zip(speaker_rows.loc[in_range, 'source'], dates[in_range]):
+            urls.setdefault(url, date.year)
+    logger.info(f"Found {len(urls)} unique speaker transcript URLs between {START_DATE} and {END_DATE}.")
+    return urls
+
+def run_prefetch(fetcher: Optional[str] = None):
+    """
+    Fills the cache with the speaker transcripts of the input CSV ahead of the reconstruction run.
+
+    Args:
+        fetcher: 'browser' to fetch pages with the client selected by 'scraping.fetch_strategy'
+                 (Playwright, or HTTP with browser escalation) or 'http' to download them with the
+                 asynchronous HTTP fetcher, using the browser's User-Agent and exported cookies.
+                 Defaults to the 'prefetch.fetcher' setting.
+    """
+    config_path = Path('config/settings.yaml')
+    config = load_config(config_path)
+
+    log_dir = Path(config['paths']['log_dir'])
+    setup_logging(log_dir=log_dir, log_level="INFO")
+
+    logger.info("--- Starting session transcript prefetch ---")
+
+    scraping_config = config['scraping']
+    prefetch_config = config.get('prefetch', {})
+    fetcher = fetcher or prefetch_config.get('fetcher', 'browser')
+    input_filepath = Path(config['paths']['input_dir']) / 'Szejm_0731_1.csv'
+    failures_path = log_dir / 'prefetch_failures.csv'
+
+    try:
+        urls = load_speaker_urls(input_filepath, chunksize=prefetch_config.get('scan_chunk_size', 100000))
+    except (FileNotFoundError, ValueError) as e:
+        logger.exception(f"Failed to scan the input CSV file. Prefetch aborted. Error: {e}")
+        return
+
+    cache_manager = build_cache_manager(config)
+    rate_limiter = build_rate_limiter(config)
+    metrics_reporter = build_metrics_reporter(config)
+    if metrics_reporter:
+        metrics_reporter.start()
+
+    # Closed in any case, so that batched cache writes and the final metrics are not lost
+    try:
+        if fetcher == 'http':
+            async_fetcher = AsyncFetcher(
+                user_agent=BROWSER_USER_AGENT, # Must match the browser for its cookies to stay valid
+                cache_manager=cache_manager,
+                timeout=scraping_config.get('timeout', 30),
+                max_retries=scraping_config.get('retry_count', 3),
+                backoff_factor=scraping_config.get('retry_delay', 1.0),
+                requests_per_second=scraping_config.get('requests_per_second', 2.0),
+                burst=scraping_config.get('burst', 1),
+                max_in_flight_per_host=scraping_config.get('max_in_flight_per_host', 4),
+                rate_limiter=rate_limiter
+            )
+            cookie_file = config['paths'].get('cookie_file')
+            if not cookie_file or not load_cookie_file(async_fetcher, Path(cookie_file)):
+                logger.warning(
+                    "No browser cookies were loaded. Bot-protected pages will fail with a challenge and be "
+                    "recorded as failures; run a browser prefetch or reconstruction first to export the cookies."
+                )
+            try:
+                Prefetcher(cache_manager, async_fetcher=async_fetcher).run(list(urls), years=urls, failures_path=failures_path)
+            finally:
+                async_fetcher.close()
+        elif fetcher == 'browser':
+            pool_size = scraping_config.get('playwright_pool_size', 1)
+            browser_client = build_fetch_client(config, rate_limiter)
+            browser_client.start()
+            try:
+                session_scraper = SessionScraper(
+                    browser_client,
+                    cache_manager,
+                    dead_letters=build_dead_letter_queue(config),
+                    circuit_breaker=build_circuit_breaker(config)
+                )
+                prefetcher = Prefetcher(cache_manager, session_scraper=session_scraper, max_workers=pool_size)
+                prefetcher.run(list(urls), years=urls, failures_path=failures_path)
+            finally:
+                browser_client.close()
+        else:
+            logger.error(f"Unknown prefetch fetcher '{fetcher}'. Expected 'browser' or 'http'.")
+            return
+        logger.info("--- Prefetch finished ---")
+    finally:
+        cache_manager.close()
+        if rate_limiter:
+            logger.info(f"Adaptive rate limiter: {rate_limiter.metrics()}")
+        if metrics_reporter:
+            metrics_reporter.stop()
+
+if __name__ == "__main__":
+    run_prefetch()
@@ -1,19 +1,163 @@
+import multiprocessing
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from loguru import logger
 import pandas as pd
-from src.scraping.playwright_client import PlaywrightClient
+from src.scraping.rate_limiter import build_rate_limiter
+from src.scraping.tiered_fetcher import build_fetch_client
 from src.scraping.session_scraper import SessionScraper
-from src.scraping.cache_manager import CacheManager
+from src.scraping.cache_manager import build_cache_manager
+from src.scraping.circuit_breaker import build_circuit_breaker
+from src.scraping.dead_letters import build_dead_letter_queue
 from src.segmentation.order_calculator import OrderCalculator
-from src.parsing.html_parser import HTMLParser
-from src.parsing.speech_extractor import SpeechExtractor
+from src.parsing.extraction_cache import ExtractionCache, build_extraction_cache, extract_session
 from src.parsing.link_analyzer import LinkAnalyzer
+from src.parsing.parser_backends import BS4_BACKEND, resolve_parser_backend
+from src.reconstruction.document_index import DocumentIndex
 from src.reconstruction.row_inserter import RowInserter
 from src.segmentation.metadata_manager import MetadataManager
 from src.reconstruction.reconstruction_validator import ReconstructionValidator
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Tuple
 from tqdm import tqdm
 
+# A session to segment: its rows and the speaker's transcript HTML (None keeps the rows as they are).
+WorkUnit = Tuple[pd.DataFrame, Optional[str]]
+
+# The extraction cache and document index of a segmentation worker process, set by its initializer.
+_worker_extraction_cache: Optional[ExtractionCache] = None
+_worker_document_index: Optional[DocumentIndex] = None
+
+def segment_session(
+    session_df: pd.DataFrame,
+    html_content: str,
+    rules_path: Path,
+    backend: str,
+    extraction_cache: Optional[ExtractionCache] = None,
+    document_index: Optional[DocumentIndex] = None
+) -> pd.DataFrame:
+    """
+    Segments the speaker's speech of a session from its transcript and reinserts the segments
+    among the other speeches.
+
+    Args:
+        session_df: A DataFrame containing all rows for a single session, with a speaker row.
+        html_content: The speaker's transcript HTML.
+        rules_path: The path to the scraping rules YAML file.
+        backend: The parser backend.
+        extraction_cache: An optional ExtractionCache.
+        document_index: An optional DocumentIndex of the dataset, to resolve modern links.
+
+    Returns:
+        The reconstructed session, or the original rows if extraction or validation fails.
+    """
+    speaker_row = session_df[session_df['chair'] == 1].iloc[0]
+    other_rows = session_df[session_df['chair'] == 0].copy()
+
+    # --- Parsing ---
+    try:
+        segments, analyzed_links = extract_session(
+            html_content,
+            year=speaker_row['date'].year,
+            rules_path=rules_path,
+            extraction_cache=extraction_cache,
+            backend=backend
+        )
+
+        if not segments:
+            logger.warning(f"No segments extracted for session on {speaker_row['date'].date()}. Returning original.")
+            return session_df
+    except Exception as e:
+        logger.error(f"An error occurred during parsing/extraction for session {speaker_row['date'].date()}: {e}")
+        return session_df
+
+    # --- Segmentation and Reconstruction ---
+    metadata_manager = MetadataManager(speaker_row, segments)
+    new_speaker_rows = metadata_manager.create_new_rows()
+
+    reconstructed_df = RowInserter.insert_rows(other_rows, new_speaker_rows, analyzed_links, document_index)
+    ordered_df = OrderCalculator.recalculate_place_agenda(reconstructed_df)
+    final_session_df = MetadataManager.assign_agenda_items(ordered_df)
+
+    # --- Final Validation ---
+    is_valid = ReconstructionValidator.validate_reconstruction(
+        original_session_df=session_df,
+        reconstructed_session_df=final_session_df,
+        num_new_segments=len(new_speaker_rows)
+    )
+
+    if not is_valid:
+        logger.error(f"Reconstruction validation failed for session on {session_df['date'].iloc[0].date()}. Returning original, unprocessed data for this session.")
+        return session_df
+
+    return final_session_df
+
+def _init_segmentation_worker(config: dict, document_index: Optional[DocumentIndex]):
+    """
+    Sets up a segmentation worker process: warnings only on the console, its own extraction
+    cache connection and its copy of the document index.
+    """
+    global _worker_extraction_cache, _worker_document_index
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    _worker_extraction_cache = build_extraction_cache(config)
+    _worker_document_index = document_index
+
+def _segment_in_worker(session_df: pd.DataFrame, html_content: str, rules_path: Path, backend: str) -> Tuple[pd.DataFrame, Optional[dict]]:
+    """Segments a session, and returns it with the document index statistics it recorded."""
+    segmented_df = segment_session(session_df, html_content, rules_path, backend, _worker_extraction_cache, _worker_document_index)
+    return segmented_df, _worker_document_index.take_stats() if _worker_document_index is not None else None
+
+def segment_sessions(
+    work_units: Iterable[WorkUnit],
+    workers: int,
+    config: dict,
+    rules_path: Path,
+    backend: str,
+    document_index: Optional[DocumentIndex] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Segments sessions in a pool of worker processes.
+
+    Work units are consumed lazily, so the caller can fetch transcripts while earlier sessions
+    are segmented, and at most a few per worker are in flight. Results are yielded in the order
+    of the work units, so the output is identical to segmenting them one by one.
+
+    Args:
+        work_units: The sessions, as (session rows, transcript HTML or None).
+        workers: The number of worker processes.
+        config: The application settings, for the workers' extraction cache.
+        rules_path: The path to the scraping rules YAML file.
+        backend: The parser backend.
+        document_index: An optional DocumentIndex of the dataset. Each worker gets a copy, and the
+            statistics they record are merged into this one.
+
+    Yields:
+        The reconstructed sessions; units without HTML are yielded unchanged.
+    """
+    def result_of(pending_result) -> pd.DataFrame:
+        if not isinstance(pending_result, Future):
+            return pending_result
+        segmented_df, stats = pending_result.result()
+        if document_index is not None and stats:
+            document_index.merge_stats(stats)
+        return segmented_df
+
+    # Spawned, not forked: the parent runs browser and cache threads that a fork would copy mid-operation
+    context = multiprocessing.get_context('spawn')
+    pending = deque()
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_segmentation_worker, initargs=(config, document_index)) as executor:
+        for session_df, html_content in work_units:
+            if html_content is None:
+                pending.append(session_df)
+            else:
+                pending.append(executor.submit(_segment_in_worker, session_df, html_content, rules_path, backend))
+            while len(pending) > workers * 4:
+                yield result_of(pending.popleft())
+        while pending:
+            yield result_of(pending.popleft())
+
 
 class DatasetBuilder:
     """Orchestrates the end-to-end process of reconstructing the dataset."""
@@ -30,106 +174,141 @@ class DatasetBuilder:
         self.rules_path = project_root / 'config/scraping_rules.yaml'
 
         # Initialize the components needed for the pipeline
-        self.playwright_client = PlaywrightClient(
-            headless=self.config['scraping'].get('headless', True) # Default to headless
-        )
+        self.pool_size = self.config['scraping'].get('playwright_pool_size', 1)
+        self.rate_limiter = build_rate_limiter(self.config)
+        self.playwright_client = build_fetch_client(self.config, self.rate_limiter)
         self.playwright_client.start() # Start the browser
-        cache_manager = CacheManager(cache_dir=Path(config['paths']['cache_dir']))
-        self.session_scraper = SessionScraper(self.playwright_client, cache_manager)
+        self.cache_manager = build_cache_manager(config)
+        self.dead_letters = build_dead_letter_queue(config)
+        self.extraction_cache = build_extraction_cache(config)
+        self.parser_backend = resolve_parser_backend(config.get('parsing', {}).get('backend', BS4_BACKEND))
+        # Worker processes parsing and segmenting the sessions; 1 processes them in this process
+        self.workers = max(1, config.get('processing', {}).get('workers', 1))
+        # The dataset-wide href index of modern speeches, built by process_dataset
+        self.document_index: Optional[DocumentIndex] = None
+        self.session_scraper = SessionScraper(
+            self.playwright_client,
+            self.cache_manager,
+            dead_letters=self.dead_letters,
+            circuit_breaker=build_circuit_breaker(config)
+        )
 
-    def _process_session(self, session_df: pd.DataFrame) -> pd.DataFrame:
+    def _fetch_session(self, session_df: pd.DataFrame) -> Optional[str]:
         """
-        Processes a single session to segment the speaker's speech.
+        Fetches the speaker's transcript of a session.
 
         Args:
             session_df: A DataFrame containing all rows for a single session.
 
         Returns:
-            A new DataFrame for the session with the speaker's speech segmented.
+            The transcript HTML, or None if the session has no speaker row, no URL or no
+            transcript, and is kept as it is.
         """
         # Find the main speaker row
         speaker_rows = session_df[session_df['chair'] == 1]
         if len(speaker_rows) == 0:
             logger.warning(f"Session on date {session_df['date'].iloc[0].date()} has no speaker rows. Skipping.")
             logger.debug(f"Head of skipped session DataFrame:\n{session_df.head().to_string()}")
-            return session_df # Return original if no speaker row is found
+            return None
 
         if len(speaker_rows) > 1:
             logger.info(f"Session on date {session_df['date'].iloc[0].date()} has {len(speaker_rows)} speaker rows. Processing only the first one.")
         
         speaker_row = speaker_rows.iloc[0]
-        
-        # All other rows (non-chair)
-        other_rows = session_df[session_df['chair'] == 0].copy()
 
         session_url = speaker_row.get('source')
         if not session_url or not isinstance(session_url, str):
             logger.warning(f"No valid URL found for session on {speaker_row['date'].date()}. Skipping.")
-            return session_df
+            return None
 
-        # --- Scraping and Parsing ---
+        # --- Scraping ---
         try:
-            html_content = self.session_scraper.fetch_session_html(session_url)
-            if not html_content:
-                return session_df
-
-            parser = HTMLParser(html_content, year=speaker_row['date'].year, rules_path=self.rules_path)
-            content_area = parser.extract_content_area()
-            if not content_area:
-                return session_df
-
-            extractor = SpeechExtractor(content_area, parser.rules)
-            segments = extractor.extract_segments()
-            links = extractor.extract_hyperlinks()
+            return self.session_scraper.fetch_session_html(session_url, year=speaker_row['date'].year) or None
+        except Exception as e:
+            logger.error(f"An error occurred while fetching the transcript of session {speaker_row['date'].date()}: {e}")
+            return None
 
-            link_analyzer = LinkAnalyzer(links)
-            analyzed_links = link_analyzer.analyze_links()
+    def _process_session(self, session_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Processes a single session to segment the speaker's speech.
 
-            if not segments:
-                logger.warning(f"No segments extracted for session on {speaker_row['date'].date()}. Returning original.")
-                return session_df
-        except Exception as e:
-            logger.error(f"An error occurred during parsing/extraction for session {speaker_row['date'].date()}: {e}")
-            return session_df
+        Args:
+            session_df: A DataFrame containing all rows for a single session.
 
-        # --- Segmentation and Reconstruction ---
-        metadata_manager = MetadataManager(speaker_row, segments)
-        new_speaker_rows = metadata_manager.create_new_rows()
+        Returns:
+            A new DataFrame for the session with the speaker's speech segmented.
+        """
+        html_content = self._fetch_session(session_df)
+        if html_content is None:
+            return session_df # Return original if there is nothing to segment
+        return segment_session(session_df, html_content, self.rules_path, self.parser_backend, self.extraction_cache, self.document_index)
 
-        reconstructed_df = RowInserter.insert_rows(other_rows, new_speaker_rows, analyzed_links)
-        ordered_df = OrderCalculator.recalculate_place_agenda(reconstructed_df)
-        final_session_df = MetadataManager.assign_agenda_items(ordered_df)
+    def select_dead_letter_sessions(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Restricts the DataFrame to the sessions whose speaker transcript is dead-lettered,
+        and makes those URLs eligible for an immediate retry.
 
-        # --- Final Validation ---
-        is_valid = ReconstructionValidator.validate_reconstruction(
-            original_session_df=session_df,
-            reconstructed_session_df=final_session_df,
-            num_new_segments=len(new_speaker_rows)
-        )
+        Args:
+            df: The DataFrame with all sessions.
 
-        if not is_valid:
-            logger.error(f"Reconstruction validation failed for session on {session_df['date'].iloc[0].date()}. Returning original, unprocessed data for this session.")
-            return session_df
+        Returns:
+            The rows of the sessions (dates) with a dead-lettered speaker URL.
+        """
+        if self.dead_letters is None:
+            logger.error("No dead-letter file is configured ('paths.dead_letter_file'). Nothing to retry.")
+            return df.iloc[0:0]
 
-        return final_session_df
+        dead_urls = {entry['url'] for entry in self.dead_letters.entries()}
+        speaker_rows = df[(df['chair'] == 1) & df['source'].isin(dead_urls)]
+        session_dates = set(speaker_rows['date'].dt.date)
+        self.dead_letters.release_all()
+        logger.info(f"Retrying {len(session_dates)} sessions with {len(dead_urls)} dead-lettered URLs.")
+        return df[df['date'].dt.date.isin(session_dates)]
 
-    def process_dataset(self, df: pd.DataFrame) -> pd.DataFrame:
+    def process_dataset(self, df: pd.DataFrame, retry_dead_letters: bool = False) -> pd.DataFrame:
         """
         Groups the DataFrame by session and applies the segmentation process.
         Ensures that the Playwright client is properly closed after processing.
+
+        Args:
+            df: The DataFrame with the sessions to process.
+            retry_dead_letters: Whether to process only the sessions whose transcript is dead-lettered.
         """
         if 'date' not in df.columns:
             logger.error("Input DataFrame must contain a 'date' column.")
             return pd.DataFrame()
 
+        if retry_dead_letters:
+            df = self.select_dead_letter_sessions(df)
+
+        # Modern links are resolved by a hash lookup of their document in this index
+        self.document_index = DocumentIndex(df)
+
         all_reconstructed_rows = []
         try:
+            if self.pool_size > 1:
+                # Render the uncached transcripts concurrently before the sequential processing loop
+                # with their session years, which select the cache expiry policy of each page
+                speaker_rows = df.loc[(df['chair'] == 1) & df['source'].notna()].drop_duplicates('source')
+                session_years = dict(zip(speaker_rows['source'], speaker_rows['date'].dt.year.tolist()))
+                self.session_scraper.fetch_sessions(session_years, max_workers=self.pool_size)
+
             # Group by date to process each session individually
             grouped = df.groupby(df['date'].dt.date)
             
             # Use tqdm for a progress bar
-            for date, session_df in tqdm(grouped, desc="Processing Sessions"):
-                processed_session_df = self._process_session(session_df.copy())
+            sessions = (session_df.copy() for date, session_df in tqdm(grouped, desc="Processing Sessions"))
+            if self.workers > 1:
+                # Transcripts are fetched here, in date order, and segmented in worker processes
+                logger.info(f"Segmenting sessions in {self.workers} worker processes.")
+                work_units = ((session_df, self._fetch_session(session_df)) for session_df in sessions)
+                processed_sessions = segment_sessions(
+                    work_units, self.workers, self.config, self.rules_path, self.parser_backend, self.document_index
+                )
+            else:
+                processed_sessions = (self._process_session(session_df) for session_df in sessions)
+
+            for processed_session_df in processed_sessions:
                 if processed_session_df is not None:
                     all_reconstructed_rows.append(processed_session_df)
         
@@ -137,6 +316,22 @@ class DatasetBuilder:
             # Ensure the browser is closed even if an error occurs
             logger.info("Closing Playwright client...")
             self.playwright_client.close()
+            self.cache_manager.close()
+            if self.extraction_cache is not None:
+                self.extraction_cache.close()
+            if self.rate_limiter:
+                logger.info(f"Adaptive rate limiter: {self.rate_limiter.metrics()}")
+            logger.info(f"Speaker parse memo: {LinkAnalyzer.cache_stats()}")
+            for cycle, rates in self.document_index.match_rates().items():
+                logger.info(
+                    f"Term {cycle}: the document index resolved {rates['resolved']} of {rates['links']} modern links "
+                    f"({rates['match_rate']:.1%})."
+                )
+            if self.dead_letters is not None and len(self.dead_letters):
+                logger.warning(
+                    f"{len(self.dead_letters)} session URLs are dead-lettered in {self.dead_letters.path}. "
+                    f"Rerun with --retry-dead-letters to reprocess only those sessions."
+                )
 
         if not all_reconstructed_rows:
             logger.warning("No sessions were processed or reconstructed.")
@@ -0,0 +1,131 @@
+from bisect import bisect_right
+from typing import Any, Dict, Hashable, List, Optional
+from loguru import logger
+import pandas as pd
+import re
+
+# A modern speech URL or href: the optional Notes database (e.g. Sejm7.nsf, whose number is the
+# term) and the query of wypowiedz.xsp, which identifies the speech within it.
+DOCUMENT_ID_PATTERN = r'(?i)(?:/([^/?#]+\.nsf))?/?wypowiedz\.xsp\?([^#]*)'
+_DOCUMENT_ID = re.compile(DOCUMENT_ID_PATTERN)
+
+# The first sittings of the Sejm terms (kadencje) covered by the dataset and after it.
+SEJM_TERMS = [
+    ('1989-07-04', 'X PRL'),
+    ('1991-11-25', 'I'),
+    ('1993-10-14', 'II'),
+    ('1997-10-20', 'III'),
+    ('2001-10-19', 'IV'),
+    ('2005-10-19', 'V'),
+    ('2007-11-05', 'VI'),
+    ('2011-11-08', 'VII'),
+    ('2015-11-12', 'VIII'),
+    ('2019-11-12', 'IX'),
+    ('2023-11-13', 'X'),
+]
+_TERM_STARTS = [pd.Timestamp(start) for start, _ in SEJM_TERMS]
+UNKNOWN_CYCLE = 'unknown'
+
+def _canonical_document_id(database: Optional[str], query: str) -> str:
+    """Combines the database and the query parameters, lowercased and sorted, into a document identifier."""
+    parameters = sorted(parameter for parameter in query.lower().split('&') if parameter)
+    return f"{(database or '').lower()}|{'&'.join(parameters)}"
+
+def document_id(url: str) -> Optional[str]:
+    """
+    Returns the canonical document identifier of a modern speech URL or href.
+
+    Args:
+        url: An absolute URL or an href, e.g. '/Sejm7.nsf/wypowiedz.xsp?posiedzenie=1&dzien=1&wyp=3'.
+
+    Returns:
+        The identifier, or None if the URL is not a wypowiedz.xsp link.
+    """
+    match = _DOCUMENT_ID.search(url) if isinstance(url, str) else None
+    return _canonical_document_id(match.group(1), match.group(2)) if match else None
+
+def electoral_cycle(date: Any) -> str:
+    """Returns the Sejm term of a session date, e.g. 'IV', or 'unknown'."""
+    if pd.isna(date):
+        return UNKNOWN_CYCLE
+    index = bisect_right(_TERM_STARTS, pd.Timestamp(date)) - 1
+    return SEJM_TERMS[index][1] if index >= 0 else UNKNOWN_CYCLE
+
+class DocumentIndex:
+    """
+    A dataset-wide index from the document identifier in the 'source' column of speech rows to
+    their row labels, so that modern wypowiedz.xsp links resolve by a hash lookup.
+
+    It is built in one vectorized pass over the dataset, and counts per electoral cycle how many
+    modern links it resolved.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Indexes the speeches of a dataset.
+
+        Args:
+            df: The dataset, with the 'source' column and, for the statistics, an
+                'electoral_cycle' or a datetime 'date' column. Row labels must be unique.
+        """
+        sources = df['source'].fillna('').astype(str) if 'source' in df.columns else pd.Series('', index=df.index)
+        # A plain substring test first, so that only modern sources go through the pattern
+        sources = sources[sources.str.contains('wypowiedz.xsp', case=False, regex=False)]
+        parts = sources.str.extract(DOCUMENT_ID_PATTERN)
+        matched = parts[1].notna()
+        document_ids = parts.loc[matched, 0].fillna('').str.lower() + '|' + parts.loc[matched, 1].str.lower().str.split('&').map(
+            lambda parameters: '&'.join(sorted(parameter for parameter in parameters if parameter))
+        )
+        # Grouping in one loop over the identifiers is several times faster than groupby().groups
+        self.rows: Dict[str, List[Hashable]] = {}
+        for label, doc_id in zip(document_ids.index.tolist(), document_ids.tolist()):
+            self.rows.setdefault(doc_id, []).append(label)
+
+        if 'electoral_cycle' in df.columns:
+            cycles = df['electoral_cycle'].fillna(UNKNOWN_CYCLE).astype(str)
+        elif 'date' in df.columns:
+            # Sessions share their date, so each distinct date is looked up once
+            dates = pd.to_datetime(df['date'], errors='coerce')
+            cycles = dates.map({date: electoral_cycle(date) for date in dates.dropna().unique()}).fillna(UNKNOWN_CYCLE)
+        else:
+            cycles = pd.Series(UNKNOWN_CYCLE, index=df.index)
+        self.cycles: Dict[Hashable, str] = cycles.to_dict()
+        # cycle -> [modern links, links resolved by the index]
+        self.stats: Dict[str, List[int]] = {}
+        logger.info(f"Indexed {len(document_ids)} speeches with {len(self.rows)} modern document identifiers.")
+
+    def labels(self, href: str) -> List[Hashable]:
+        """Returns the labels of the rows whose source is the document of an href, in dataset order."""
+        doc_id = document_id(href)
+        return self.rows.get(doc_id, []) if doc_id is not None else []
+
+    def record(self, label: Hashable, links: int, resolved: int):
+        """Counts the modern links of a session, identified by one of its row labels, and how many the index resolved."""
+        if not links:
+            return
+        counts = self.stats.setdefault(self.cycles.get(label, UNKNOWN_CYCLE), [0, 0])
+        counts[0] += links
+        counts[1] += resolved
+
+    def take_stats(self) -> Dict[str, List[int]]:
+        """Returns the counts recorded so far and resets them, e.g. to send them from a worker process."""
+        stats, self.stats = self.stats, {}
+        return stats
+
+    def merge_stats(self, stats: Dict[str, List[int]]):
+        """Adds counts taken from another copy of the index."""
+        for cycle, (links, resolved) in stats.items():
+            counts = self.stats.setdefault(cycle, [0, 0])
+            counts[0] += links
+            counts[1] += resolved
+
+    def match_rates(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the modern 'links', the 'resolved' ones and the 'match_rate' per electoral cycle,
+        in the order of the terms.
+        """
+        order = {name: index for index, (_, name) in enumerate(SEJM_TERMS)}
+        return {
+            cycle: {'links': links, 'resolved': resolved, 'match_rate': resolved / links if links else 0.0}
+            for cycle, (links, resolved) in sorted(self.stats.items(), key=lambda item: order.get(item[0], len(order)))
+        }
@@ -1,81 +1,161 @@
+from collections import deque
 from loguru import logger
 import pandas as pd
 from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit
 import re
+from src.reconstruction.document_index import DocumentIndex
 
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
 
 def normalize_text(text: str) -> str:
     """Normalizes text for comparison by lowercasing, removing non-alphanumeric characters, and extra whitespace."""
     if not isinstance(text, str):
         return ""
     # Aggressively remove punctuation and extra whitespace, then lowercase
-    text = re.sub(r'[\W_]+', ' ', text)
+    text = NON_WORD_PATTERN.sub(' ', text)
     return text.strip().lower()
 
+def href_key(url: str) -> str:
+    """Returns the path and query of a URL or href, lowercased, so that a relative href and the absolute source URL agree."""
+    parts = urlsplit(url.strip())
+    return (parts.path + ('?' + parts.query if parts.query else '')).lower()
+
+def _positions_by_key(keys: List[str]) -> Dict[str, deque]:
+    """Maps each key to the ascending positions it occurs at."""
+    positions: Dict[str, deque] = {}
+    for position, key in enumerate(keys):
+        positions.setdefault(key, deque()).append(position)
+    return positions
+
+class SessionMatchIndex:
+    """
+    The speeches of a session indexed for matching links, built once per session.
+
+    Normalized agenda items, speaker infos and source hrefs map to queues of row positions in
+    session order. A matched row is marked consumed and skipped when it reaches the front of
+    another queue, so every strategy still finds the first remaining row, in O(1) per link.
+    Given the dataset's DocumentIndex, modern links are resolved through it first.
+    """
+
+    def __init__(self, speeches_df: pd.DataFrame, document_index: Optional[DocumentIndex] = None):
+        """
+        Indexes a session's speeches.
+
+        Args:
+            speeches_df: The session's non-speaker rows, in session order.
+            document_index: An optional DocumentIndex of the dataset the rows belong to.
+        """
+        self.labels = speeches_df.index.tolist()
+        self.document_index = document_index
+        self._positions = {label: position for position, label in enumerate(self.labels)} if document_index is not None else {}
+        # Modern links matched, and how many of them the document index resolved
+        self.modern_links = 0
+        self.indexed_links = 0
+        self.rows = speeches_df.to_dict('records')
+        self.consumed = [False] * len(self.rows)
+        self.norm_agenda_items = [normalize_text(agenda_item) for agenda_item in speeches_df['agenda_item']]
+        norm_speaker_infos = (speeches_df['speaker_type'].fillna('') + ' ' + speeches_df['speaker'].fillna('')).apply(normalize_text)
+        sources = speeches_df['source'] if 'source' in speeches_df.columns else pd.Series('', index=speeches_df.index)
+        self.sources = [source.lower() if isinstance(source, str) else '' for source in sources]
+        self._agenda_items = _positions_by_key(self.norm_agenda_items)
+        self._speaker_infos = _positions_by_key(norm_speaker_infos.tolist())
+        self._hrefs = _positions_by_key([href_key(source) if source else '' for source in self.sources])
+
+    def _first_remaining(self, positions: Optional[deque]) -> Optional[int]:
+        """Returns the first unconsumed position of a queue, dropping the consumed ones before it."""
+        while positions:
+            if not self.consumed[positions[0]]:
+                return positions[0]
+            positions.popleft()
+        return None
+
+    def _first_remaining_where(self, predicate) -> Optional[int]:
+        """Returns the first unconsumed position satisfying a predicate, scanning in session order."""
+        return next((position for position in range(len(self.rows)) if not self.consumed[position] and predicate(position)), None)
+
+    def _first_indexed(self, link_href: str) -> Optional[int]:
+        """Returns the first unconsumed position of this session among the rows the document index maps an href to."""
+        positions = (self._positions.get(label) for label in self.document_index.labels(link_href))
+        return next((position for position in positions if position is not None and not self.consumed[position]), None)
+
+    def match(self, analyzed_link: Dict[str, str]) -> Optional[int]:
+        """
+        Finds the position of the speech a link points to, and consumes it, by the strategies
+        of find_matching_speech_index.
+
+        Returns:
+            The row position, or None if no remaining speech matches.
+        """
+        link_href = analyzed_link.get('href', '')
+        link_text_normalized = normalize_text(analyzed_link.get('text', ''))
+
+        if not link_href and not link_text_normalized:
+            logger.warning(f"Link has no href or text to match: {analyzed_link}")
+            return None
+
+        position = None
+        # --- Strategy 1: Modern Link href Match (fast and reliable) ---
+        if 'wypowiedz.xsp' in link_href:
+            self.modern_links += 1
+            if self.document_index is not None:
+                position = self._first_indexed(link_href)
+                self.indexed_links += position is not None
+            if position is None:
+                position = self._first_remaining(self._hrefs.get(href_key(link_href)))
+            if position is None:
+                # An href that is not the path of its source, e.g. relative to the document
+                href = link_href.lower()
+                position = self._first_remaining_where(lambda candidate: href in self.sources[candidate])
+
+        # --- Strategy 2: Content-based matching for older links ---
+        if position is None:
+            # 2a: an exact match in agenda_item, 2b: in speaker_type + speaker
+            position = self._first_remaining(self._agenda_items.get(link_text_normalized))
+        if position is None:
+            position = self._first_remaining(self._speaker_infos.get(link_text_normalized))
+        if position is None:
+            # 2c: Fallback to substring contains check (less strict)
+            position = self._first_remaining_where(lambda candidate: link_text_normalized in self.norm_agenda_items[candidate])
+
+        if position is None:
+            logger.warning(f"Could not find any suitable match for link: {analyzed_link.get('text')}")
+            return None
+        self.consumed[position] = True
+        return position
+
+    def remaining_rows(self) -> List[Dict[str, Any]]:
+        """Returns the rows not matched to any link, in session order."""
+        return [row for row, consumed in zip(self.rows, self.consumed) if not consumed]
+
 def find_matching_speech_index(analyzed_link: Dict[str, str], speeches_df: pd.DataFrame) -> Optional[int]:
     """
     Finds the index of the matching speech by attempting several strategies in order:
     1. For modern links, match the href against the source URL.
     2. For older links, fall back to content-based matching using normalized text
        against the 'agenda_item' or 'speaker' + 'speaker_type' columns.
-    """
-    link_href = analyzed_link.get('href', '')
-    link_text_normalized = normalize_text(analyzed_link.get('text', ''))
-
-    if not link_href and not link_text_normalized:
-        logger.warning(f"Link has no href or text to match: {analyzed_link}")
-        return None
 
-    logger.debug(f"Attempting to match link: {analyzed_link.get('text')}")
-
-    # --- Strategy 1: Modern Link href Match (fast and reliable) ---
-    if 'wypowiedz.xsp' in link_href:
-        matching_rows = speeches_df[speeches_df['source'].str.contains(link_href, case=False, na=False)]
-        if not matching_rows.empty:
-            match_index = matching_rows.index[0]
-            logger.info(f"Found match for modern href '{link_href}' at index {match_index}.")
-            return match_index
-
-    # --- Strategy 2: Content-based matching for older links ---
-    
-    # Create a normalized text column from 'agenda_item' for comparison
-    # This is often the most reliable source for older entries
-    speeches_df['norm_agenda_item'] = speeches_df['agenda_item'].apply(normalize_text)
-    
-    # Create a combined normalized column from speaker and speaker_type
-    speeches_df['norm_speaker_info'] = (speeches_df['speaker_type'].fillna('') + ' ' + speeches_df['speaker'].fillna('')).apply(normalize_text)
-
-    # 2a: Try to find an exact match in agenda_item
-    exact_agenda_match = speeches_df[speeches_df['norm_agenda_item'] == link_text_normalized]
-    if not exact_agenda_match.empty:
-        match_index = exact_agenda_match.index[0]
-        logger.info(f"Found exact content match in 'agenda_item' for '{link_text_normalized}' at index {match_index}.")
-        return match_index
-
-    # 2b: Try to find an exact match in speaker_info
-    exact_speaker_match = speeches_df[speeches_df['norm_speaker_info'] == link_text_normalized]
-    if not exact_speaker_match.empty:
-        match_index = exact_speaker_match.index[0]
-        logger.info(f"Found exact content match in 'speaker_info' for '{link_text_normalized}' at index {match_index}.")
-        return match_index
-        
-    # 2c: Fallback to substring contains check (less strict)
-    substring_agenda_match = speeches_df[speeches_df['norm_agenda_item'].str.contains(link_text_normalized, na=False)]
-    if not substring_agenda_match.empty:
-        match_index = substring_agenda_match.index[0]
-        logger.info(f"Found substring content match in 'agenda_item' for '{link_text_normalized}' at index {match_index}.")
-        return match_index
-
-    logger.warning(f"Could not find any suitable match for link: {analyzed_link.get('text')}")
-    return None
+    Matching several links against one session should use a SessionMatchIndex instead, which
+    indexes the session once.
+    """
+    position = SessionMatchIndex(speeches_df).match(analyzed_link)
+    return None if position is None else speeches_df.index[position]
 
 class RowInserter:
     """Handles the logic of inserting new rows into a session DataFrame in the correct order."""
 
     @staticmethod
-    def insert_rows(session_df: pd.DataFrame, new_rows: List[Dict[str, Any]], analyzed_links: List[Dict[str, str]]) -> pd.DataFrame:
+    def insert_rows(
+        session_df: pd.DataFrame,
+        new_rows: List[Dict[str, Any]],
+        analyzed_links: List[Dict[str, str]],
+        document_index: Optional[DocumentIndex] = None
+    ) -> pd.DataFrame:
         """
         Inserts new speaker segments into the session DataFrame at their correct positions.
+
+        Given the dataset's DocumentIndex, modern links are resolved through it, and their
+        counts are recorded in its statistics.
         """
         if not new_rows:
             logger.warning("No new speaker rows to insert.")
@@ -88,35 +168,40 @@ class RowInserter:
             return pd.DataFrame(new_rows)
 
         reconstructed_rows: List[Dict[str, Any]] = []
-        remaining_speeches = session_df.copy()
+        match_index = SessionMatchIndex(session_df, document_index)
 
         # The first segment of the speaker's speech always comes first
         reconstructed_rows.append(new_rows[0])
 
         # Iterate through the links to place the existing speeches and subsequent speaker segments
+        unmatched_links = 0
         for i, link in enumerate(analyzed_links):
-            match_index = find_matching_speech_index(link, remaining_speeches)
-            
-            if match_index is not None:
-                # Append the matched speech
-                reconstructed_rows.append(remaining_speeches.loc[match_index].to_dict())
-                # Remove the matched speech so it's not considered again
-                remaining_speeches.drop(match_index, inplace=True)
+            position = match_index.match(link)
+
+            if position is not None:
+                # Append the matched speech; it is consumed, so it is not considered again
+                reconstructed_rows.append(match_index.rows[position])
             else:
                 # This is a critical issue if a link doesn't have a corresponding speech
-                logger.warning(f"Could not find a matching speech for link: {link}")
+                unmatched_links += 1
 
             # Append the next speaker segment that follows this link
             if (i + 1) < len(new_rows):
                 reconstructed_rows.append(new_rows[i + 1])
 
+        if unmatched_links:
+            logger.warning(f"Could not find a matching speech for {unmatched_links} of {len(analyzed_links)} links.")
+        if document_index is not None:
+            document_index.record(match_index.labels[0], match_index.modern_links, match_index.indexed_links)
+
         # If any non-speaker speeches were not matched, append them to the end to avoid data loss
-        if not remaining_speeches.empty:
+        remaining_rows = match_index.remaining_rows()
+        if remaining_rows:
             logger.warning(
-                f"Found {len(remaining_speeches)} non-speaker speeches that were not matched to any link. "
+                f"Found {len(remaining_rows)} non-speaker speeches that were not matched to any link. "
                 f"Appending them to the end to avoid data loss."
             )
-            reconstructed_rows.extend(remaining_speeches.to_dict('records'))
+            reconstructed_rows.extend(remaining_rows)
 
         if not reconstructed_rows:
             logger.error("Reconstruction resulted in an empty list of rows. This should not happen.")
@@ -125,5 +210,5 @@ class RowInserter:
         # Convert the list of dictionaries back to a DataFrame
         final_df = pd.DataFrame(reconstructed_rows)
         logger.info(f"Reconstruction complete. New session has {len(final_df)} rows.")
-        
-        return final_df
\ No newline at end of file
+
+        return final_df
@@ -0,0 +1,331 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from loguru import logger
+
+from src.scraping.bot_detection import detect_bot_challenge
+from src.scraping.cache_manager import CacheManager, response_metadata
+from src.scraping.rate_limiter import AdaptiveRateLimiter
+from src.scraping.web_client import DEFAULT_HEADERS, load_browser_cookies
+from src.utils.metrics import metrics
+
+# Status codes that are worth retrying, mirroring the WebClient retry strategy.
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """An asyncio token bucket limiting the request rate towards a single host."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initializes the TokenBucket.
+
+        Args:
+            rate: The number of tokens added per second (the sustained request rate).
+            capacity: The maximum number of tokens that can accumulate (the allowed burst).
+        """
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits until a token is available and consumes it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """
+    Fetches batches of URLs concurrently with asyncio, enforcing a token-bucket rate limit
+    and a cap on in-flight requests per host. Successful responses are written to the cache.
+
+    The HTTP requests themselves are made with a shared requests session on a thread pool,
+    so the fetcher needs no dependencies beyond those of WebClient.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        cache_manager: Optional[CacheManager] = None,
+        timeout: int = 30,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        requests_per_second: float = 2.0,
+        burst: int = 1,
+        max_in_flight_per_host: int = 4,
+        max_workers: int = 16,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None
+    ):
+        """
+        Initializes the AsyncFetcher.
+
+        Args:
+            user_agent: The User-Agent string to use for requests.
+            cache_manager: An optional CacheManager that successful responses are saved to.
+            timeout: The timeout in seconds for a single request.
+            max_retries: The maximum number of retry attempts per URL.
+            backoff_factor: The backoff factor for exponential backoff between retries.
+            requests_per_second: The sustained request rate allowed per host.
+            burst: The number of requests that may be sent back-to-back to an idle host.
+            max_in_flight_per_host: The maximum number of concurrent requests per host.
+            max_workers: The number of threads performing the blocking HTTP calls.
+            rate_limiter: An optional shared AdaptiveRateLimiter that replaces the fixed per-host
+                          token bucket and is informed of every response.
+        """
+        self.cache_manager = cache_manager
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_in_flight_per_host = max_in_flight_per_host
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': user_agent, **DEFAULT_HEADERS})
+        # Retries are handled by the fetcher itself, so the adapter only needs a large enough pool.
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_limits: Dict[str, Tuple[TokenBucket, asyncio.Semaphore]] = {}
+
+    def load_cookies(self, cookies: List[Dict]):
+        """Loads cookies exported from a browser context, e.g. those of a passed bot check, into the session."""
+        load_browser_cookies(self.session, cookies)
+
+    def _get_host_limits(self, url: str) -> Tuple[TokenBucket, asyncio.Semaphore]:
+        """Returns the token bucket and in-flight semaphore for the host of a URL."""
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = (
+                TokenBucket(self.requests_per_second, self.burst),
+                asyncio.Semaphore(self.max_in_flight_per_host)
+            )
+        return self._host_limits[host]
+
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """
+        Computes the delay before the next attempt, honouring a numeric Retry-After header.
+
+        Args:
+            attempt: The zero-based number of the attempt that just failed.
+            response: The failed response, if one was received.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        delay = self.backoff_factor * (2 ** attempt)
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+        return delay
+
+    async def _fetch_one(
+        self,
+        url: str,
+        executor: ThreadPoolExecutor,
+        stats: Dict[str, int],
+        latencies: Optional[Dict[str, float]] = None
+    ) -> Optional[requests.Response]:
+        """
+        Fetches a single URL with retries, respecting the per-host limits.
+
+        Args:
+            url: The URL to fetch.
+            executor: The thread pool performing the blocking requests.
+            stats: The batch counters, updated in place.
+            latencies: An optional dictionary receiving the seconds from the URL's first request
+                       to its completion, retries included but time spent queueing excluded.
+
+        Returns:
+            The successful response, or None if every attempt failed. Bot-protection challenge
+            pages are retried like throttling responses and never returned.
+        """
+        bucket, semaphore = self._get_host_limits(url)
+        loop = asyncio.get_running_loop()
+
+        first_sent_at = None
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = None
+                error = None
+                async with semaphore:
+                    if self.rate_limiter:
+                        await asyncio.sleep(self.rate_limiter.reserve())
+                    else:
+                        await bucket.acquire()
+                    stats['requests'] += 1
+                    start_time = time.monotonic()
+                    if first_sent_at is None:
+                        first_sent_at = start_time
+                    try:
+                        response = await loop.run_in_executor(
+                            executor, lambda: self.session.get(url, timeout=self.timeout)
+                        )
+                    except requests.exceptions.RequestException as e:
+                        error = e
+                    latency = time.monotonic() - start_time
+                    metrics.observe('http_request_seconds', latency, client='async')
+                    if response is not None:
+                        metrics.inc('http_requests_total', client='async', status=response.status_code)
+                        metrics.inc('http_response_bytes_total', len(response.content), client='async')
+                    else:
+                        metrics.inc('http_requests_total', client='async', status='error')
+                    # A bot-protection page is served with 200, but is not the transcript
+                    challenge = detect_bot_challenge(response.text) if response is not None else None
+                    if self.rate_limiter:
+                        self.rate_limiter.record(
+                            status=response.status_code if response is not None else None,
+                            latency=latency,
+                            challenge=challenge is not None
+                        )
+
+                if response is not None and response.ok and challenge is None:
+                    logger.debug(f"Fetched {url} ({len(response.text)} characters).")
+                    return response
+
+                if response is not None and challenge is None and response.status_code not in RETRY_STATUS_CODES:
+                    logger.error(f"Failed to fetch {url}: HTTP {response.status_code} is not retryable.")
+                    return None
+
+                if error is not None:
+                    reason = error
+                elif challenge is not None:
+                    reason = f"bot protection page ('{challenge}')"
+                else:
+                    reason = f"HTTP {response.status_code}"
+                if attempt < self.max_retries:
+                    delay = self._backoff_delay(attempt, response)
+                    stats['retries'] += 1
+                    metrics.inc('http_retries_total', client='async')
+                    logger.warning(f"Attempt {attempt + 1} for {url} failed ({reason}). Retrying in {delay:.2f} seconds.")
+                    await asyncio.sleep(delay)
+                else:
+                    logger.error(f"Failed to fetch {url} after {self.max_retries + 1} attempts. Last error: {reason}")
+            return None
+        finally:
+            if latencies is not None and first_sent_at is not None:
+                latencies[url] = time.monotonic() - first_sent_at
+
+    async def fetch_all(
+        self,
+        urls: Iterable[str],
+        skip_cached: bool = True,
+        on_result: Optional[Callable[[str, Optional[str]], None]] = None,
+        url_metadata: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetches a batch of URLs concurrently and saves the successful responses to the cache.
+
+        Args:
+            urls: The URLs to fetch. Duplicates are fetched only once.
+            skip_cached: Whether URLs that are already in the cache should be skipped.
+            on_result: An optional callback invoked with (url, content) as each fetch completes.
+            url_metadata: Optional extra metadata per URL (e.g. the session year) stored with its cache entry.
+
+        Returns:
+            A summary dictionary with the fetched 'results' (URL -> HTML or None), the
+            'succeeded', 'failed', 'cached', 'requests' and 'retries' counters, the
+            'elapsed_seconds', the achieved 'requests_per_second' and the 'latencies' (URL ->
+            seconds from its first request to completion, retries included). With an adaptive rate
+            limiter, its metrics are included under 'rate_limiter'.
+        """
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        stats = {'requests': 0, 'retries': 0}
+        results: Dict[str, Optional[str]] = {}
+        latencies: Dict[str, float] = {}
+
+        to_fetch = []
+        cached_count = 0
+        for url in unique_urls:
+            if skip_cached and self.cache_manager and self.cache_manager.get_from_cache(url) is not None:
+                cached_count += 1
+            else:
+                to_fetch.append(url)
+
+        logger.info(f"Fetching {len(to_fetch)} URLs asynchronously ({cached_count} already cached).")
+        self._host_limits = {}  # Limits are bound to the running event loop
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            async def fetch_and_store(url: str) -> Optional[str]:
+                response = await self._fetch_one(url, executor, stats, latencies)
+                content = response.text if response is not None else None
+                if content and self.cache_manager:
+                    metadata = response_metadata(response.headers, response.status_code)
+                    metadata.update((url_metadata or {}).get(url, {}))
+                    self.cache_manager.save_to_cache(url, content, metadata)
+                if on_result:
+                    on_result(url, content)
+                return content
+
+            contents = await asyncio.gather(*(fetch_and_store(url) for url in to_fetch))
+        elapsed_seconds = time.monotonic() - start_time
+
+        for url, content in zip(to_fetch, contents):
+            results[url] = content
+
+        succeeded = sum(1 for content in contents if content)
+        requests_per_second = stats['requests'] / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        summary = {
+            'results': results,
+            'succeeded': succeeded,
+            'failed': len(to_fetch) - succeeded,
+            'cached': cached_count,
+            'requests': stats['requests'],
+            'retries': stats['retries'],
+            'elapsed_seconds': elapsed_seconds,
+            'requests_per_second': requests_per_second,
+            'latencies': latencies
+        }
+        if self.rate_limiter:
+            summary['rate_limiter'] = self.rate_limiter.metrics()
+        logger.info(
+            f"Async fetch finished: {succeeded} succeeded, {summary['failed']} failed, {cached_count} cached, "
+            f"{stats['requests']} requests in {elapsed_seconds:.2f}s ({requests_per_second:.2f} requests/s)."
+        )
+        return summary
+
+    def fetch_batch(
+        self,
+        urls: Iterable[str],
+        skip_cached: bool = True,
+        on_result: Optional[Callable[[str, Optional[str]], None]] = None,
+        url_metadata: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Synchronous entry point for `fetch_all`, for callers outside an event loop.
+
+        Args:
+            urls: The URLs to fetch.
+            skip_cached: Whether URLs that are already in the cache should be skipped.
+            on_result: An optional callback invoked with (url, content) as each fetch completes.
+            url_metadata: Optional extra metadata per URL stored with its cache entry.
+
+        Returns:
+            The summary dictionary returned by `fetch_all`.
+        """
+        return asyncio.run(self.fetch_all(
+            urls, skip_cached=skip_cached, on_result=on_result, url_metadata=url_metadata
+        ))
+
+    def close(self):
+        """Closes the underlying HTTP session."""
+        self.session.close()
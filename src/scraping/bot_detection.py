@@ -0,0 +1,29 @@
+from typing import Optional
+
+# Text that only appears on the bot-protection CAPTCHA page.
+CAPTCHA_SIGNATURE = "This question is for testing whether you are a human visitor"
+
+# Markers of the pages served by the site's bot protection instead of the requested document:
+# the CAPTCHA question and the TSPD (F5 "Threat Detection") JavaScript challenge.
+BOT_SIGNATURES = [
+    CAPTCHA_SIGNATURE,
+    "TSPD_101",
+    "Threat Detection",
+]
+
+def detect_bot_challenge(html: Optional[str]) -> Optional[str]:
+    """
+    Checks whether a page is a bot-protection challenge rather than real content.
+
+    Args:
+        html: The page HTML.
+
+    Returns:
+        The first signature found in the page, or None if the page looks genuine.
+    """
+    if not html:
+        return None
+    for signature in BOT_SIGNATURES:
+        if signature in html:
+            return signature
+    return None
@@ -0,0 +1,168 @@
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
+from loguru import logger
+
+from src.scraping.cache_codecs import ZSTD, CodecUnavailableError, compress, decode_content, decompress, encode_content, resolve_codec
+
+if TYPE_CHECKING:
+    from src.scraping.cache_manager import CacheManager
+
+# A bundle is a single file: the compressed bodies back to back, followed by a zlib-compressed
+# JSON index (key -> url, timestamp, metadata, offset, length, codec, kind) and a fixed trailer
+# holding the index position. Readers map the file and decompress only the bodies they need.
+MAGIC = b'SEJMCB01'
+HEADER = MAGIC
+TRAILER = struct.Struct('<QQ8s') # index offset, index length, magic
+BUNDLE_VERSION = 1
+
+class CacheBundle:
+    """
+    Read-only, random access to a cache bundle through a memory map.
+
+    Opening a bundle reads only its index; `get_entry` slices and decompresses a single body.
+    The file is never written, so a bundle can live on a read-only share used by many nodes.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Opens a bundle.
+
+        Args:
+            path: The bundle file.
+
+        Raises:
+            ValueError: If the file is not a cache bundle.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # An empty file cannot be mapped
+            self._file.close()
+            raise ValueError(f"{path} is not a cache bundle.")
+        if len(self._map) < len(HEADER) + TRAILER.size or self._map[:len(HEADER)] != HEADER:
+            self.close()
+            raise ValueError(f"{path} is not a cache bundle.")
+        index_offset, index_length, magic = TRAILER.unpack(self._map[-TRAILER.size:])
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is truncated or corrupted: the bundle trailer is missing.")
+        index = json.loads(zlib.decompress(self._map[index_offset:index_offset + index_length]))
+        self.created = index['created']
+        self._entries: Dict[str, list] = index['entries']
+        logger.info(f"Opened cache bundle {path} with {len(self._entries)} entries.")
+
+    @property
+    def entry_count(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def urls(self) -> Iterator[str]:
+        return (member[0] for member in self._entries.values())
+
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Reads the entry stored under a cache key.
+
+        Args:
+            key: The cache key, as generated by the CacheManager.
+
+        Returns:
+            The entry dictionary with 'url', 'timestamp', 'content' and 'metadata' keys, or None.
+        """
+        member = self._entries.get(key)
+        if member is None:
+            return None
+        url, timestamp, metadata, offset, length, codec, kind = member
+        try:
+            content = decode_content(decompress(self._map[offset:offset + length], codec), kind)
+        except (CodecUnavailableError, zlib.error, ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not read the bundled entry for {url} from {self.path}: {e}")
+            return None
+        return {'url': url, 'timestamp': timestamp, 'content': content, 'metadata': dict(metadata)}
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+def write_bundle(cache_manager: 'CacheManager', path: Path, compression: str = ZSTD) -> int:
+    """
+    Packs every entry visible to a CacheManager into a bundle file, atomically.
+
+    Args:
+        cache_manager: The cache to export (its own entries, plus those of its bundle if it has one).
+        path: The bundle file to write.
+        compression: 'zstd', 'zlib' or 'none'.
+
+    Returns:
+        The number of exported entries.
+    """
+    codec = resolve_codec(compression)
+    entries: Dict[str, list] = {}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER)
+        offset = len(HEADER)
+        for url in cache_manager.iter_urls():
+            key = cache_manager._generate_cache_key(url)
+            if key in entries: # Another variant of an already exported URL
+                continue
+            cache_entry = cache_manager.get_entry(url)
+            if cache_entry is None:
+                continue
+            try:
+                kind, data = encode_content(cache_entry['content'])
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping {url}: its content cannot be bundled ({e}).")
+                continue
+            body = compress(data, codec)
+            f.write(body)
+            entries[key] = [
+                url, cache_entry['timestamp'], cache_entry.get('metadata') or {}, offset, len(body), codec, kind
+            ]
+            offset += len(body)
+        index = zlib.compress(json.dumps({'version': BUNDLE_VERSION, 'created': time.time(), 'entries': entries}).encode('utf-8'))
+        f.write(index)
+        f.write(TRAILER.pack(offset, len(index), MAGIC))
+    os.replace(temp_path, path)
+    logger.info(f"Exported {len(entries)} cache entries to {path} ({path.stat().st_size / 1e6:.1f} MB).")
+    return len(entries)
+
+def import_bundle(path: Path, cache_manager: 'CacheManager', overwrite: bool = False) -> Dict[str, int]:
+    """
+    Copies the entries of a bundle into a CacheManager's own storage, keeping their timestamps.
+
+    Args:
+        path: The bundle file.
+        cache_manager: The cache to fill.
+        overwrite: Whether bundled entries replace entries the cache already has.
+
+    Returns:
+        A dictionary with the number of 'imported' and 'skipped' entries.
+    """
+    counts = {'imported': 0, 'skipped': 0}
+    bundle = CacheBundle(path)
+    try:
+        for key in bundle.keys():
+            cache_entry = bundle.get_entry(key)
+            if cache_entry is None or (not overwrite and cache_manager._load_entry(cache_entry['url']) is not None):
+                counts['skipped'] += 1
+                continue
+            if cache_manager._write_entry(cache_entry['url'], cache_entry):
+                counts['imported'] += 1
+            else:
+                counts['skipped'] += 1
+    finally:
+        bundle.close()
+    logger.info(f"Imported {counts['imported']} cache entries from {path} ({counts['skipped']} skipped).")
+    return counts
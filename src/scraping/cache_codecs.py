@@ -0,0 +1,82 @@
+import json
+import zlib
+from typing import Any, Optional, Tuple
+from loguru import logger
+
+try:
+    import zstandard
+except ImportError: # zstd is optional; zlib from the standard library is the fallback
+    zstandard = None
+
+# Body codecs. The codec is stored with every body, so stores may mix codecs after a settings change.
+ZSTD = 'zstd'
+ZLIB = 'zlib'
+NO_COMPRESSION = 'none'
+CODECS = (ZSTD, ZLIB, NO_COMPRESSION)
+
+# Body kinds: HTML is stored as UTF-8 text, any other content as JSON. Nothing is ever unpickled.
+TEXT_KIND = 'text'
+JSON_KIND = 'json'
+
+DEFAULT_LEVELS = {ZSTD: 3, ZLIB: 6}
+
+class CodecUnavailableError(Exception):
+    """Raised when stored data uses a codec whose package is not installed; the data itself may be intact."""
+
+def resolve_codec(codec: str) -> str:
+    """
+    Validates a configured codec, falling back from zstd to zlib if zstandard is not installed.
+
+    Raises:
+        ValueError: If the codec is unknown.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown cache compression '{codec}'. Expected one of {CODECS}.")
+    if codec == ZSTD and zstandard is None:
+        logger.warning("The zstandard package is not installed. Compressing cache entries with zlib instead.")
+        return ZLIB
+    return codec
+
+def compress(data: bytes, codec: str, level: Optional[int] = None) -> bytes:
+    """Compresses data with a codec from CODECS; None picks the codec's default level."""
+    level = level if level is not None else DEFAULT_LEVELS.get(codec)
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    if codec == ZLIB:
+        return zlib.compress(data, level)
+    return data
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """
+    Reverses `compress`.
+
+    Raises:
+        CodecUnavailableError: If the data is zstd-compressed and zstandard is not installed.
+        ValueError: If zstd data is corrupted.
+        zlib.error: If zlib data is corrupted.
+    """
+    if codec == ZSTD:
+        if zstandard is None:
+            raise CodecUnavailableError("the entry is zstd-compressed but the zstandard package is not installed")
+        try:
+            return zstandard.ZstdDecompressor().decompress(data)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"corrupted zstd data: {e}") from e
+    if codec == ZLIB:
+        return zlib.decompress(data)
+    return data
+
+def encode_content(content: Any) -> Tuple[str, bytes]:
+    """
+    Serializes cached content into (kind, bytes).
+
+    Raises:
+        TypeError, ValueError: If non-text content is not JSON-serializable.
+    """
+    if isinstance(content, str):
+        return TEXT_KIND, content.encode('utf-8')
+    return JSON_KIND, json.dumps(content).encode('utf-8')
+
+def decode_content(data: bytes, kind: str) -> Any:
+    """Reverses `encode_content`."""
+    return data.decode('utf-8') if kind == TEXT_KIND else json.loads(data)
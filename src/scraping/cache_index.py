@@ -0,0 +1,266 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from loguru import logger
+
+# Upper bounds of the age histogram of the cache stats, in seconds.
+AGE_BUCKETS = (
+    ('<1h', 3600),
+    ('1h-1d', 86400),
+    ('1d-7d', 7 * 86400),
+    ('7d-30d', 30 * 86400),
+    ('30d-1y', 365 * 86400),
+    ('>1y', None)
+)
+
+# Lookup outcomes of get_from_cache, accumulated across runs for the hit ratio.
+LOOKUP_RESULTS = ('hit', 'miss', 'stale', 'expired')
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_index (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    year INTEGER,
+    size INTEGER NOT NULL,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS cache_index_timestamp ON cache_index (timestamp);
+CREATE INDEX IF NOT EXISTS cache_index_content_hash ON cache_index (content_hash);
+"""
+
+COUNTERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# The queries below work on any table with key, timestamp, year and size columns: the
+# pickle cache's sidecar `cache_index` and the sqlite backend's `cache_entries` alike.
+
+def expired_keys(
+    connection: sqlite3.Connection,
+    table: str,
+    cutoff: float,
+    revalidate_year_range: Optional[Tuple[int, int]] = None
+) -> List[str]:
+    """
+    Returns the keys of the entries written before the cutoff, except those of revalidated years.
+
+    Args:
+        connection: The database holding the table.
+        table: The table name.
+        cutoff: Entries with an older timestamp are expired.
+        revalidate_year_range: Session years whose entries are never expired.
+    """
+    query = f'SELECT key FROM {table} WHERE timestamp < ?'
+    params: tuple = (cutoff,)
+    if revalidate_year_range:
+        query += ' AND (year IS NULL OR year NOT BETWEEN ? AND ?)'
+        params += tuple(revalidate_year_range)
+    return [row[0] for row in connection.execute(query, params)]
+
+def eviction_keys(connection: sqlite3.Connection, table: str, max_bytes: int) -> List[str]:
+    """
+    Returns the keys of the oldest entries that must go for the table's total size to fit in max_bytes.
+
+    Args:
+        connection: The database holding the table.
+        table: The table name.
+        max_bytes: The size budget.
+    """
+    excess = connection.execute(f'SELECT COALESCE(SUM(size), 0) FROM {table}').fetchone()[0] - max_bytes
+    keys = []
+    if excess <= 0:
+        return keys
+    for key, size in connection.execute(f'SELECT key, size FROM {table} ORDER BY timestamp'):
+        keys.append(key)
+        excess -= size
+        if excess <= 0:
+            break
+    return keys
+
+def add_counters(connection: sqlite3.Connection, counts: Mapping[str, int]):
+    """Adds the counts to the persistent counters. The caller commits."""
+    connection.executemany(
+        'INSERT INTO cache_counters (name, value) VALUES (?, ?) '
+        'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+        [(name, value) for name, value in counts.items() if value]
+    )
+
+def read_stats(connection: sqlite3.Connection, table: str, now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Summarizes a cache table from its indexed columns alone.
+
+    Args:
+        connection: The database holding the table and the cache_counters table.
+        table: The table name.
+        now: The reference time of the ages (default: the current time).
+
+    Returns:
+        A dictionary with 'entries', 'total_bytes', 'oldest'/'newest' timestamps, the 'age_histogram'
+        (entry counts per AGE_BUCKETS label), the cumulative 'lookups', the 'hit_ratio', the
+        'alias_hits' (hits on an entry stored for another variant of the URL, i.e. avoided fetches)
+        and the 'duplicates': entries whose body another entry also has, and those bodies' bytes.
+    """
+    now = time.time() if now is None else now
+    bounded = [(label, seconds) for label, seconds in AGE_BUCKETS if seconds is not None]
+    bucket_sums = ', '.join('COALESCE(SUM(timestamp >= ?), 0)' for _ in bounded)
+    row = connection.execute(
+        f'SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(timestamp), MAX(timestamp), {bucket_sums} FROM {table}',
+        [now - seconds for _, seconds in bounded]
+    ).fetchone()
+    entries, total_bytes, oldest, newest = row[:4]
+
+    # The query counts entries younger than each bound; the histogram wants the counts between bounds.
+    age_histogram = {}
+    previous = 0
+    for (label, _), younger in zip(bounded, row[4:]):
+        age_histogram[label] = younger - previous
+        previous = younger
+    age_histogram[AGE_BUCKETS[-1][0]] = entries - previous
+
+    # Per body: its entry count and size; all but one of the entries sharing a body are duplicates.
+    duplicate_entries, duplicate_bytes = connection.execute(
+        f'SELECT COALESCE(SUM(n - 1), 0), COALESCE(SUM((n - 1) * size), 0) FROM ('
+        f'SELECT COUNT(*) AS n, MAX(size) AS size FROM {table} WHERE content_hash IS NOT NULL GROUP BY content_hash)'
+    ).fetchone()
+
+    counters = dict(connection.execute('SELECT name, value FROM cache_counters'))
+    lookups = {result: counters.get(f'lookup_{result}', 0) for result in LOOKUP_RESULTS}
+    total_lookups = sum(lookups.values())
+    return {
+        'entries': entries,
+        'total_bytes': total_bytes,
+        'oldest': oldest,
+        'newest': newest,
+        'age_histogram': age_histogram,
+        'lookups': lookups,
+        'hit_ratio': lookups['hit'] / total_lookups if total_lookups else None,
+        'alias_hits': counters.get('lookup_alias_hit', 0),
+        'duplicates': {'entries': duplicate_entries, 'bytes': duplicate_bytes}
+    }
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """Formats the output of read_stats as a short text report."""
+    lines = [
+        f"Entries:     {stats['entries']}",
+        f"Total size:  {stats['total_bytes'] / 1e6:.1f} MB",
+    ]
+    if stats['entries']:
+        lines.append(f"Oldest:      {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats['oldest']))}")
+        lines.append(f"Newest:      {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats['newest']))}")
+    lines.append("Age histogram:")
+    lines.extend(f"  {label:<8}{count:>10}" for label, count in stats['age_histogram'].items())
+    lookups = stats['lookups']
+    lines.append("Lookups:     " + ', '.join(f"{result} {count}" for result, count in lookups.items()))
+    hit_ratio = stats['hit_ratio']
+    lines.append(f"Hit ratio:   {hit_ratio:.1%}" if hit_ratio is not None else "Hit ratio:   n/a (no lookups recorded)")
+    lines.append(f"URL aliases: {stats['alias_hits']} hits on another variant of a cached URL (fetches avoided)")
+    duplicates = stats['duplicates']
+    outcome = 'stored once (deduplicated)' if stats.get('deduplicate') else 'stored again (deduplication is off)'
+    lines.append(f"Duplicates:  {duplicates['entries']} entries repeat another body, {duplicates['bytes'] / 1e6:.1f} MB {outcome}")
+    memory = stats.get('memory')
+    if memory:
+        lines.append(
+            f"Memory tier: {memory['entries']} entries, {memory['bytes'] / 1e6:.1f}/{memory['max_bytes'] / 1e6:.1f} MB, "
+            f"{memory['hits']} hits, {memory['misses']} misses, {memory['evictions']} evictions"
+        )
+    return '\n'.join(lines)
+
+class CacheIndex:
+    """
+    A sidecar SQLite index of a pickle cache directory: one row per cache file with its URL,
+    timestamp, session year, size and content hash, so that expiry, eviction and stats never
+    have to unpickle the bodies.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Opens (or creates) the index.
+
+        Args:
+            path: The index database file.
+        """
+        self.path = path
+        self.created = not path.exists()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(INDEX_SCHEMA + COUNTERS_SCHEMA)
+        self._connection.commit()
+
+    def upsert(self, key: str, url: str, timestamp: float, year: Optional[int], size: int, content_hash: Optional[str]):
+        """Records (or replaces) the row of a cache file."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO cache_index (key, url, timestamp, year, size, content_hash) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, url, timestamp, year, size, content_hash)
+            )
+
+    def remove(self, keys: Iterable[str]) -> List[str]:
+        """
+        Drops the rows of deleted cache files.
+
+        Returns:
+            The content hashes that no remaining row references, whose deduplicated bodies can go.
+        """
+        rows = [(key,) for key in keys]
+        with self._lock, self._connection:
+            digests = {
+                row[0] for key in rows
+                for row in self._connection.execute('SELECT content_hash FROM cache_index WHERE key = ?', key)
+                if row[0] is not None
+            }
+            self._connection.executemany('DELETE FROM cache_index WHERE key = ?', rows)
+            return [
+                digest for digest in digests
+                if self._connection.execute('SELECT 1 FROM cache_index WHERE content_hash = ? LIMIT 1', (digest,)).fetchone() is None
+            ]
+
+    def clear(self):
+        """Drops every row."""
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM cache_index')
+
+    def timestamp(self, key: str) -> Optional[float]:
+        """Returns the timestamp of an indexed entry, or None."""
+        with self._lock:
+            row = self._connection.execute('SELECT timestamp FROM cache_index WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def references(self, digest: str) -> bool:
+        """Returns True if an indexed entry has this content hash."""
+        with self._lock:
+            return self._connection.execute('SELECT 1 FROM cache_index WHERE content_hash = ? LIMIT 1', (digest,)).fetchone() is not None
+
+    def urls(self) -> Iterator[str]:
+        """Returns the URLs of all indexed entries."""
+        with self._lock:
+            return iter([row[0] for row in self._connection.execute('SELECT url FROM cache_index')])
+
+    def expired_keys(self, cutoff: float, revalidate_year_range: Optional[Tuple[int, int]] = None) -> List[str]:
+        with self._lock:
+            return expired_keys(self._connection, 'cache_index', cutoff, revalidate_year_range)
+
+    def eviction_keys(self, max_bytes: int) -> List[str]:
+        with self._lock:
+            return eviction_keys(self._connection, 'cache_index', max_bytes)
+
+    def add_lookups(self, counts: Mapping[str, int]):
+        """Adds get_from_cache outcome counts to the persistent lookup counters."""
+        with self._lock, self._connection:
+            add_counters(self._connection, {f'lookup_{result}': count for result, count in counts.items()})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return read_stats(self._connection, 'cache_index')
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+        logger.debug(f"Closed cache index {self.path}.")
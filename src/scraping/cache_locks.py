@@ -0,0 +1,106 @@
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError: # No advisory file locks (Windows): the locks then only exclude threads of one process
+    fcntl = None
+
+# Namespaces of the striped locks. Whoever takes several takes them in this order, so they cannot
+# deadlock: the maintenance lock, then a fetch lease, then an entry's lock, then a body's lock.
+MAINTENANCE = 'maintenance'
+FETCH = 'fetch'
+ENTRY = 'entry'
+BODY = 'body'
+
+# The number of leading hex digits of a key that select its lock file in each namespace. Keys
+# sharing a stripe share a lock; fetch leases are held for a whole download, so they get more stripes.
+STRIPE_DIGITS = {FETCH: 3, ENTRY: 2, BODY: 2}
+
+class CacheLocks:
+    """
+    Advisory locks shared by every process and thread using one cache.
+
+    A lock is a thread lock of this process plus an flock on a file in `lock_dir` for the other
+    processes; the kernel releases the flock if its holder dies. Keys are spread over a bounded
+    number of lock files per namespace. The entry, body and maintenance lock files stay open, as
+    they are taken for every write; fetch lease files, one per 4096th of the keys, are opened
+    for each download.
+    """
+
+    def __init__(self, lock_dir: Path):
+        """
+        Initializes the CacheLocks.
+
+        Args:
+            lock_dir: The directory holding the lock files; it is created if missing.
+        """
+        self.lock_dir = lock_dir
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self._locks: Dict[str, Tuple[threading.Lock, int]] = {}
+        self._guard = threading.Lock()
+        self._pid = os.getpid()
+        if fcntl is None:
+            logger.warning("File locking is not available on this platform. Only one process may use the cache at a time.")
+
+    def _lock(self, name: str, keep_open: bool) -> Tuple[threading.Lock, int]:
+        """Returns the thread lock and the open lock file (-1 without fcntl or if not kept open) of a name."""
+        with self._guard:
+            if self._pid != os.getpid():
+                # A forked child shares the parent's open files, and with them its flocks: start afresh.
+                self._locks, self._pid = {}, os.getpid()
+            if name not in self._locks:
+                fd = os.open(self.lock_dir / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o644) if keep_open and fcntl else -1
+                self._locks[name] = (threading.Lock(), fd)
+            return self._locks[name]
+
+    @contextmanager
+    def hold(self, namespace: str, key: str = '') -> Iterator[bool]:
+        """
+        Holds the lock of a key in a namespace, waiting for it if needed.
+
+        Args:
+            namespace: One of MAINTENANCE, FETCH, ENTRY and BODY.
+            key: A hex cache key or content hash; ignored for MAINTENANCE.
+
+        Yields:
+            True if the lock was held by someone else and had to be waited for.
+        """
+        name = f"{namespace}-{key[:STRIPE_DIGITS[namespace]]}" if namespace in STRIPE_DIGITS else namespace
+        keep_open = namespace != FETCH
+        lock, fd = self._lock(name, keep_open)
+        waited = not lock.acquire(blocking=False)
+        if waited:
+            lock.acquire()
+        try:
+            if fcntl is None:
+                yield waited
+                return
+            if not keep_open:
+                fd = os.open(self.lock_dir / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    waited = True
+                yield waited
+            finally:
+                if keep_open:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.close(fd) # Closing the descriptor releases the lock
+        finally:
+            lock.release()
+
+    def close(self):
+        """Closes the lock files kept open."""
+        with self._guard:
+            for _, fd in self._locks.values():
+                if fd >= 0:
+                    os.close(fd)
+            self._locks = {}
@@ -1,24 +1,155 @@
 import hashlib
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+import os
 from pathlib import Path
 import pickle
+import re
+import shutil
+import threading
 import time
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
 from loguru import logger
 
+from src.scraping.cache_bundle import CacheBundle
+from src.scraping.cache_index import CacheIndex
+from src.scraping.cache_locks import BODY, ENTRY, FETCH, MAINTENANCE, CacheLocks
+from src.scraping.memory_cache import MemoryCache, build_memory_cache
+from src.scraping.url_canonicalizer import UrlCanonicalizer, build_url_canonicalizer
+from src.utils.metrics import metrics
+
+# Expiry policies: 'expire' deletes entries older than the TTL, 'revalidate' keeps them
+# and lets the caller revalidate them with a conditional GET once they are stale.
+EXPIRY_POLICIES = ('expire', 'revalidate')
+
+# Cache files are named after the SHA256 of their URL; anything else in the directory is not an entry.
+CACHE_FILE_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+INDEX_FILE = 'index.sqlite3'
+# Deduplicated bodies, as UTF-8 files named after their content hash.
+BODIES_DIR = 'bodies'
+LOCK_DIR = '.locks'
+
+def url_key(url: str) -> str:
+    """Returns the SHA256 of a URL as given, the cache key used before URL canonicalization."""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+def content_hash(content: Any) -> Optional[str]:
+    """Returns the SHA256 of a text body, or None for other content."""
+    if isinstance(content, str):
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    return None
+
+def entry_year(cache_entry: Dict[str, Any]) -> Optional[int]:
+    """Returns the session year stored in an entry's metadata, if any."""
+    year = (cache_entry.get('metadata') or {}).get('year')
+    return int(year) if isinstance(year, (int, float)) else None
+
+def response_metadata(headers: Mapping[str, str], status: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extracts the response metadata worth storing alongside a cached body.
+
+    Args:
+        headers: The (case-insensitive) response headers.
+        status: The HTTP status code of the response.
+
+    Returns:
+        A dictionary with the validators ('etag', 'last_modified'), the 'content_type'
+        and the 'status'. Missing values are omitted.
+    """
+    lowered = {key.lower(): value for key, value in headers.items()}
+    metadata = {
+        'etag': lowered.get('etag'),
+        'last_modified': lowered.get('last-modified'),
+        'content_type': lowered.get('content-type'),
+        'status': status
+    }
+    return {key: value for key, value in metadata.items() if value is not None}
+
 class CacheManager:
-    """Manages a file-based cache for storing web content to avoid redundant downloads."""
+    """
+    Manages a file-based cache for storing web content to avoid redundant downloads.
+
+    Every write is recorded in a sidecar index (see CacheIndex), so expiry, eviction and
+    `stats()` run off the index instead of unpickling the cache files. An optional MemoryCache
+    serves hot entries without touching the disk; every read, write and delete goes through it.
+    An optional CacheBundle is a read-only lower layer: entries missing from the cache's own
+    storage are read from it, while new and refreshed entries are written to the own storage.
+
+    With a UrlCanonicalizer, entries are keyed by the canonical URL, so the URL variants of a
+    page share one entry; entries stored under a URL's old key are moved on first access. With
+    `deduplicate`, text bodies are stored once per content hash in the 'bodies' directory and
+    each URL's cache file only references its body.
+
+    Several processes may share one cache directory. Files are written to a temporary name and
+    renamed into place, so readers never see a partial entry; writes and deletes of an entry hold
+    its advisory lock (see CacheLocks), and expiry, eviction and the other maintenance operations
+    hold the cache-wide maintenance lock. `single_flight` lets concurrent workers that miss the
+    same URL fetch it only once. The memory tier is per process: it may keep serving an entry
+    that another process replaced or deleted.
+    """
 
-    def __init__(self, cache_dir: Path, cache_ttl_seconds: int = 86400):
+    def __init__(
+        self,
+        cache_dir: Path,
+        cache_ttl_seconds: int = 86400,
+        expiry_policy: str = 'expire',
+        revalidate_year_range: Optional[Tuple[int, int]] = None,
+        memory_cache: Optional[MemoryCache] = None,
+        bundle: Optional[CacheBundle] = None,
+        canonicalizer: Optional[UrlCanonicalizer] = None,
+        deduplicate: bool = False
+    ):
         """
         Initializes the CacheManager.
 
         Args:
             cache_dir: The directory where cache files will be stored.
             cache_ttl_seconds: The Time-To-Live for cache entries in seconds (default: 1 day).
+            expiry_policy: 'expire' to delete entries older than the TTL, or 'revalidate' to keep
+                           them and only report them as stale so they can be revalidated.
+            revalidate_year_range: Session years whose entries always follow the 'revalidate'
+                                   policy, e.g. closed historical terms that no longer change.
+            memory_cache: An optional in-memory LRU tier in front of the storage.
+            bundle: An optional read-only bundle consulted when the storage misses, e.g. one
+                    exported by another node.
+            canonicalizer: An optional UrlCanonicalizer applied to URLs before keying.
+            deduplicate: Whether identical text bodies are stored only once.
         """
+        if expiry_policy not in EXPIRY_POLICIES:
+            raise ValueError(f"Unknown cache expiry policy '{expiry_policy}'. Expected one of {EXPIRY_POLICIES}.")
         self.cache_dir = cache_dir
         self.cache_ttl_seconds = cache_ttl_seconds
+        self.expiry_policy = expiry_policy
+        self.revalidate_year_range = tuple(revalidate_year_range) if revalidate_year_range else None
+        self.memory_cache = memory_cache
+        self.bundle = bundle
+        self.canonicalizer = canonicalizer
+        self.deduplicate = deduplicate
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.locks = CacheLocks(self._lock_dir())
+        self._lookups: Counter = Counter()
+        self._lookups_lock = threading.Lock()
+        self.index = self._open_index()
+
+    def _lock_dir(self) -> Path:
+        return self.cache_dir / LOCK_DIR
+
+    def _open_index(self) -> Optional[CacheIndex]:
+        """Opens the sidecar index, building it from the cache files if it did not exist yet."""
+        index = CacheIndex(self.cache_dir / INDEX_FILE)
+        if index.created and any(CACHE_FILE_PATTERN.match(item.name) for item in self.cache_dir.iterdir()):
+            self.index = index
+            self.rebuild_index()
+        return index
+
+    def _count_lookup(self, result: str):
+        metrics.inc('cache_lookups_total', result=result)
+        with self._lookups_lock:
+            self._lookups[result] += 1
+
+    def canonical_url(self, url: str) -> str:
+        """Returns the URL the cache keys a URL by: its canonical form, or the URL itself without a canonicalizer."""
+        return self.canonicalizer.canonicalize(url) if self.canonicalizer is not None else url
 
     def _generate_cache_key(self, url: str) -> str:
         """
@@ -28,94 +159,550 @@ class CacheManager:
             url: The URL to generate a key for.
 
         Returns:
-            A SHA256 hash of the URL to be used as a filename.
+            A SHA256 hash of the canonical URL to be used as a filename.
         """
-        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return url_key(self.canonical_url(url))
 
-    def get_from_cache(self, url: str) -> Optional[Any]:
+    def _cache_file(self, url: str) -> Path:
+        """Returns the path of the pickle file holding a URL's entry."""
+        return self.cache_dir / self._generate_cache_key(url)
+
+    def _load_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """Reads the stored entry of a URL. Storage backends override `_load_key` and the other primitives."""
+        return self._load_key(self._generate_cache_key(url))
+
+    def _load_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """Reads the entry stored under a cache key."""
+        return self._read_cache_file(self.cache_dir / key)
+
+    def _store_entry(self, url: str, cache_entry: Dict[str, Any]) -> bool:
+        """Stores the entry of a URL. Returns True on success."""
+        return self._write_cache_file(self._cache_file(url), cache_entry)
+
+    def _delete_entry(self, url: str, not_newer_than: Optional[float] = None):
+        """Removes the stored entry of a URL, if any (and, with `not_newer_than`, if it was not rewritten since)."""
+        key = self._generate_cache_key(url)
+        self._forget([key])
+        self._delete_keys([key], not_newer_than)
+
+    def _delete_keys(self, keys, not_newer_than: Optional[float] = None):
         """
-        Retrieves content from the cache if it exists and has not expired.
+        Removes the cache files with the given keys, each under its entry lock.
 
         Args:
-            url: The URL of the content to retrieve.
-
-        Returns:
-            The cached content, or None if it's not in the cache or has expired.
+            keys: The cache keys.
+            not_newer_than: If given, entries written after this time, e.g. refreshed by another
+                            process since they were found expired, are kept.
         """
-        cache_key = self._generate_cache_key(url)
-        cache_file = self.cache_dir / cache_key
+        for key in keys:
+            with self.locks.hold(ENTRY, key):
+                if not_newer_than is not None and (self.index.timestamp(key) or 0) > not_newer_than:
+                    continue
+                self._remove_files([key])
 
-        if not cache_file.exists():
-            logger.debug(f"Cache miss for URL: {url}")
+    def _remove_files(self, keys):
+        """Removes cache files, their index rows and the bodies no other entry references. The caller holds the entry locks."""
+        for key in keys:
+            (self.cache_dir / key).unlink(missing_ok=True)
+        for digest in self.index.remove(keys):
+            with self.locks.hold(BODY, digest):
+                if not self.index.references(digest): # Unless a writer took the body up again meanwhile
+                    (self.cache_dir / BODIES_DIR / digest).unlink(missing_ok=True)
+
+    def _adopt_legacy_entry(self, url: str, key: str) -> Optional[Dict[str, Any]]:
+        """Moves an entry stored under the URL's key from before canonicalization to its canonical key."""
+        legacy_key = url_key(url)
+        if legacy_key == key:
             return None
+        cache_entry = self._load_key(legacy_key)
+        if cache_entry is not None and self._store_entry(url, cache_entry):
+            self._delete_keys([legacy_key])
+        return cache_entry
+
+    def _read_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """Reads the entry of a URL from the memory tier, falling back to the storage and then the bundle."""
+        key = self._generate_cache_key(url)
+        if self.memory_cache is not None:
+            cache_entry = self.memory_cache.get(key)
+            if cache_entry is not None:
+                return cache_entry
+        cache_entry = self._load_entry(url)
+        if cache_entry is None and self.canonicalizer is not None:
+            cache_entry = self._adopt_legacy_entry(url, key)
+        if cache_entry is None and self.bundle is not None:
+            cache_entry = self.bundle.get_entry(key)
+            if cache_entry is None and self.canonicalizer is not None:
+                cache_entry = self.bundle.get_entry(url_key(url))
+        if cache_entry is not None and self.memory_cache is not None:
+            self.memory_cache.put(key, cache_entry)
+        return cache_entry
+
+    def _write_entry(self, url: str, cache_entry: Dict[str, Any]) -> bool:
+        """Stores the entry of a URL and keeps the memory tier in step. Returns True on success."""
+        stored = self._store_entry(url, cache_entry)
+        if self.memory_cache is not None:
+            key = self._generate_cache_key(url)
+            if stored:
+                self.memory_cache.put(key, cache_entry)
+            else:
+                self.memory_cache.discard(key)
+        return stored
+
+    def _forget(self, keys=None):
+        """Drops entries from the memory tier: the given keys, or all of them."""
+        if self.memory_cache is None:
+            return
+        if keys is None:
+            self.memory_cache.clear()
+            return
+        for key in keys:
+            self.memory_cache.discard(key)
 
+    def _read_cache_file(self, cache_file: Path) -> Optional[Dict[str, Any]]:
+        """
+        Reads a cache entry from disk, removing the file if it is corrupted.
+
+        Args:
+            cache_file: The path of the cache file.
+
+        Returns:
+            The cache entry dictionary, or None if the file is missing or corrupted.
+        """
+        try:
+            seen = cache_file.stat()
+        except FileNotFoundError:
+            return None
         try:
             with open(cache_file, 'rb') as f:
                 cache_entry = pickle.load(f)
-        except (pickle.UnpicklingError, EOFError) as e:
+            digest = cache_entry.pop('content_ref', None)
+            if digest is not None:
+                cache_entry['content'] = (self.cache_dir / BODIES_DIR / digest).read_bytes().decode('utf-8')
+            return cache_entry
+        except (pickle.UnpicklingError, EOFError, OSError, UnicodeDecodeError) as e:
             logger.warning(f"Could not read corrupted cache file {cache_file}. Removing it. Error: {e}")
-            cache_file.unlink()
+            self._discard_corrupted(cache_file, seen)
+            return None
+
+    def _discard_corrupted(self, cache_file: Path, seen: os.stat_result):
+        """Removes a corrupted cache file, unless another process replaced (or removed) it since it was read."""
+        with self.locks.hold(ENTRY, cache_file.name):
+            try:
+                current = cache_file.stat()
+            except FileNotFoundError:
+                return
+            if (current.st_ino, current.st_mtime_ns) == (seen.st_ino, seen.st_mtime_ns):
+                self._remove_files([cache_file.name])
+
+    def _replace_file(self, path: Path, data: bytes) -> bool:
+        """Writes a file atomically: to a temporary file of this process and thread, renamed over the target."""
+        temp_file = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temp_file.write_bytes(data)
+            os.replace(temp_file, path)
+        except IOError as e:
+            logger.error(f"Could not write to cache file {path}: {e}")
+            temp_file.unlink(missing_ok=True)
+            return False
+        return True
+
+    def _store_body(self, digest: str, content: str) -> Optional[int]:
+        """Writes a deduplicated body unless it is already stored. Returns its size, or None on failure. The caller holds the body lock."""
+        body_file = self.cache_dir / BODIES_DIR / digest
+        data = content.encode('utf-8')
+        if body_file.exists():
+            return len(data)
+        body_file.parent.mkdir(exist_ok=True)
+        return len(data) if self._replace_file(body_file, data) else None
+
+    def _write_cache_file(self, cache_file: Path, cache_entry: Dict[str, Any]) -> bool:
+        """Writes a cache entry to disk and records it in the index, under the entry's lock. Returns True on success."""
+        content = cache_entry.get('content')
+        digest = content_hash(content)
+        deduplicated = self.deduplicate and digest is not None
+        # The body lock is held until the index references the body, so that no delete collects it in between.
+        with self.locks.hold(ENTRY, cache_file.name), (self.locks.hold(BODY, digest) if deduplicated else nullcontext()):
+            stored_entry, body_size = cache_entry, 0
+            if deduplicated:
+                body_size = self._store_body(digest, content)
+                if body_size is None:
+                    return False
+                stored_entry = {key: value for key, value in cache_entry.items() if key != 'content'}
+                stored_entry['content_ref'] = digest
+            payload = pickle.dumps(stored_entry)
+            if not self._replace_file(cache_file, payload):
+                return False
+            self.index.upsert(
+                cache_file.name,
+                cache_entry['url'],
+                cache_entry['timestamp'],
+                entry_year(cache_entry),
+                len(payload) + body_size,
+                digest
+            )
+        return True
+
+    def is_expired(self, cache_entry: Dict[str, Any]) -> bool:
+        """Returns True if a cache entry is older than the TTL."""
+        age_seconds = time.time() - cache_entry.get('timestamp', 0)
+        return age_seconds > self.cache_ttl_seconds
+
+    def is_revalidate_only(self, cache_entry: Dict[str, Any]) -> bool:
+        """
+        Returns True if a cache entry must never be deleted for its age, only revalidated.
+
+        Args:
+            cache_entry: The cache entry dictionary.
+        """
+        if self.expiry_policy == 'revalidate':
+            return True
+        year = cache_entry.get('metadata', {}).get('year')
+        if self.revalidate_year_range and year is not None:
+            return self.revalidate_year_range[0] <= year <= self.revalidate_year_range[1]
+        return False
+
+    def get_from_cache(self, url: str) -> Optional[Any]:
+        """
+        Retrieves content from the cache if it exists and has not expired.
+
+        Args:
+            url: The URL of the content to retrieve.
+
+        Returns:
+            The cached content, or None if it's not in the cache or has expired.
+            Expired entries under the 'revalidate' policy are kept for `get_entry`.
+        """
+        cache_entry = self._read_entry(url)
+        if cache_entry is None:
+            logger.debug(f"Cache miss for URL: {url}")
+            self._count_lookup('miss')
             return None
 
         # Check if the cache entry has expired
-        age_seconds = time.time() - cache_entry['timestamp']
-        if age_seconds > self.cache_ttl_seconds:
+        if self.is_expired(cache_entry):
+            if self.is_revalidate_only(cache_entry):
+                logger.info(f"Cache entry for URL is stale and needs revalidation: {url}")
+                self._count_lookup('stale')
+                return None
             logger.info(f"Cache expired for URL: {url}. Removing old cache file.")
-            cache_file.unlink()
+            self._count_lookup('expired')
+            self._delete_entry(url, not_newer_than=cache_entry['timestamp'])
             return None
 
         logger.info(f"Cache hit for URL: {url}")
+        self._count_lookup('hit')
+        if cache_entry['url'] != url:
+            # Served from the entry of another variant of the URL: a fetch canonicalization saved.
+            metrics.inc('cache_alias_hits_total')
+            with self._lookups_lock:
+                self._lookups['alias_hit'] += 1
         return cache_entry['content']
 
-    def save_to_cache(self, url: str, content: Any):
+    def get_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves the full cache entry for a URL regardless of its age.
+
+        Args:
+            url: The URL of the entry to retrieve.
+
+        Returns:
+            The entry dictionary with 'url', 'timestamp', 'content' and 'metadata' keys,
+            or None if there is no entry.
+        """
+        cache_entry = self._read_entry(url)
+        if cache_entry is not None:
+            cache_entry.setdefault('metadata', {})
+        return cache_entry
+
+    @contextmanager
+    def single_flight(self, url: str) -> Iterator[Optional[Any]]:
+        """
+        Holds the fetch lease of a URL, shared by all processes and threads using the cache, so that
+        workers missing the same URL fetch it only once: the others wait for the lease and then
+        find the page in the cache. Buffered writes are flushed when the lease is released.
+
+        Args:
+            url: The URL about to be fetched after a cache miss.
+
+        Yields:
+            The cached content if another worker stored a fresh copy since the miss, else None.
+        """
+        with self.locks.hold(FETCH, self._generate_cache_key(url)) as waited:
+            if waited:
+                metrics.inc('cache_single_flight_waits_total')
+            cache_entry = self._read_entry(url)
+            content = None
+            if cache_entry is not None and not self.is_expired(cache_entry):
+                logger.info(f"Another worker fetched {url} meanwhile; using its cache entry.")
+                metrics.inc('cache_single_flight_hits_total')
+                content = cache_entry['content']
+            try:
+                yield content
+            finally:
+                self.flush()
+
+    def flush(self) -> bool:
+        """Makes buffered writes visible to other processes. Pickle files are written through; see SQLiteCacheManager."""
+        return True
+
+    def save_to_cache(self, url: str, content: Any, metadata: Optional[Dict[str, Any]] = None):
         """
         Saves content to the cache.
 
         Args:
             url: The URL of the content being cached.
             content: The content to save.
+            metadata: Optional response metadata (validators, content type, status, session year).
         """
-        cache_key = self._generate_cache_key(url)
-        cache_file = self.cache_dir / cache_key
-
         cache_entry = {
             'url': url,
             'timestamp': time.time(),
-            'content': content
+            'content': content,
+            'metadata': metadata or {}
         }
 
-        try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(cache_entry, f)
+        if self._write_entry(url, cache_entry):
             logger.info(f"Saved content for URL to cache: {url}")
-        except IOError as e:
-            logger.error(f"Could not write to cache file {cache_file}: {e}")
+            metrics.inc('cache_writes_total')
+            if isinstance(content, str):
+                metrics.inc('cache_written_bytes_total', len(content.encode('utf-8')))
+
+    def refresh_timestamp(self, url: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Marks an entry as fresh again after a successful revalidation, keeping its body.
+
+        Args:
+            url: The URL of the revalidated entry.
+            metadata: Updated response metadata to merge into the entry's metadata.
+
+        Returns:
+            True if the entry existed and was refreshed.
+        """
+        cache_entry = self._read_entry(url)
+        if cache_entry is None:
+            return False
+        cache_entry['timestamp'] = time.time()
+        cache_entry['metadata'] = {**cache_entry.get('metadata', {}), **(metadata or {})}
+        if self._write_entry(url, cache_entry):
+            logger.info(f"Refreshed revalidated cache entry for URL: {url}")
+            return True
+        return False
 
     def clear_expired_cache(self):
-        """Iterates through the cache directory and removes all expired files."""
+        """Removes all expired entries that are not kept for revalidation, as listed by the index."""
         logger.info("Clearing expired cache files...")
-        cleared_count = 0
+        if self.expiry_policy == 'revalidate':
+            logger.info("Cleared 0 expired cache files.")
+            return
+        with self.locks.hold(MAINTENANCE):
+            cutoff = time.time() - self.cache_ttl_seconds
+            keys = self.index.expired_keys(cutoff, self.revalidate_year_range)
+            self._forget(keys)
+            self._delete_keys(keys, not_newer_than=cutoff)
+        logger.info(f"Cleared {len(keys)} expired cache files.")
+
+    def evict(self, max_bytes: int) -> int:
+        """
+        Removes the oldest entries until the cache fits in a size budget.
+
+        Args:
+            max_bytes: The maximum total size of the entries.
+
+        Returns:
+            The number of removed entries.
+        """
+        with self.locks.hold(MAINTENANCE): # Concurrent evictions would each remove the whole excess
+            keys = self.index.eviction_keys(max_bytes)
+            self._forget(keys)
+            self._delete_keys(keys)
+        if keys:
+            logger.info(f"Evicted {len(keys)} cache entries to fit in {max_bytes} bytes.")
+        return len(keys)
+
+    def rebuild_index(self):
+        """Recreates the index from the cache files, unpickling each of them once, and drops unreferenced bodies."""
+        with self.locks.hold(MAINTENANCE):
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        logger.warning(f"Building the cache index of {self.cache_dir}. This reads every cache file once.")
+        self.index.clear()
+        bodies_dir = self.cache_dir / BODIES_DIR
+        referenced = set()
+        indexed = 0
         for cache_file in self.cache_dir.iterdir():
-            if not cache_file.is_file():
+            if not cache_file.is_file() or not CACHE_FILE_PATTERN.match(cache_file.name):
                 continue
             try:
                 with open(cache_file, 'rb') as f:
-                    timestamp = pickle.load(f).get('timestamp', 0)
-                if (time.time() - timestamp) > self.cache_ttl_seconds:
-                    cache_file.unlink()
-                    cleared_count += 1
-                    logger.debug(f"Removed expired cache file: {cache_file.name}")
-            except (pickle.UnpicklingError, EOFError, KeyError):
+                    cache_entry = pickle.load(f)
+                size = cache_file.stat().st_size
+                digest = cache_entry.get('content_ref')
+                if digest is not None:
+                    size += (bodies_dir / digest).stat().st_size
+                    referenced.add(digest)
+                else:
+                    digest = content_hash(cache_entry.get('content'))
+                self.index.upsert(
+                    cache_file.name,
+                    cache_entry['url'],
+                    cache_entry['timestamp'],
+                    entry_year(cache_entry),
+                    size,
+                    digest
+                )
+                indexed += 1
+            except (pickle.UnpicklingError, EOFError, OSError, KeyError, TypeError, AttributeError):
                 logger.warning(f"Removing corrupted or invalid cache file: {cache_file.name}")
                 cache_file.unlink()
-        logger.info(f"Cleared {cleared_count} expired cache files.")
+        if bodies_dir.is_dir():
+            for body_file in bodies_dir.iterdir():
+                if body_file.name in referenced or not CACHE_FILE_PATTERN.match(body_file.name):
+                    continue
+                with self.locks.hold(BODY, body_file.name):
+                    if not self.index.references(body_file.name): # Unless written meanwhile
+                        body_file.unlink(missing_ok=True)
+        logger.info(f"Indexed {indexed} cache files ({len(referenced)} deduplicated bodies).")
+
+    def rekey(self) -> int:
+        """
+        Moves every entry stored under its URL's key from before canonicalization to its canonical key,
+        instead of waiting for each entry to be read. Of several variants of a URL, the first one moved wins.
+
+        Returns:
+            The number of moved entries.
+        """
+        with self.locks.hold(MAINTENANCE):
+            return self._rekey()
+
+    def _rekey(self) -> int:
+        moved = 0
+        for url in list(self._stored_urls()):
+            key = self._generate_cache_key(url)
+            legacy_key = url_key(url)
+            if legacy_key == key:
+                continue
+            cache_entry = self._load_key(legacy_key)
+            if cache_entry is None:
+                continue
+            if self._load_key(key) is None and not self._store_entry(url, cache_entry):
+                continue
+            self._forget([legacy_key])
+            self._delete_keys([legacy_key])
+            moved += 1
+        logger.info(f"Moved {moved} cache entries to their canonical URL keys.")
+        return moved
 
     def clear_all_cache(self):
-        """Removes all files from the cache directory."""
+        """Removes all cache files from the cache directory."""
         logger.warning("Clearing all cache files...")
+        self._forget()
         cleared_count = 0
-        for item in self.cache_dir.iterdir():
-            if item.is_file():
-                item.unlink()
-                cleared_count += 1
+        with self.locks.hold(MAINTENANCE):
+            for item in self.cache_dir.iterdir():
+                if item.is_file() and CACHE_FILE_PATTERN.match(item.name):
+                    item.unlink(missing_ok=True)
+                    cleared_count += 1
+                elif item.is_file() and item.name.startswith('.') and item.name.endswith('.tmp'): # Left by a killed writer
+                    item.unlink(missing_ok=True)
+            shutil.rmtree(self.cache_dir / BODIES_DIR, ignore_errors=True)
+            self.index.clear()
         logger.info(f"Cleared {cleared_count} cache files.")
+
+    def _stored_urls(self):
+        """Yields the URLs of the entries in the cache's own storage."""
+        return self.index.urls()
+
+    def iter_urls(self):
+        """Yields the URL of every entry visible through the cache: its own entries, then those only in the bundle."""
+        stored = set()
+        for url in self._stored_urls():
+            stored.add(url)
+            yield url
+        if self.bundle is not None:
+            for url in self.bundle.urls():
+                if url not in stored:
+                    yield url
+
+    def _take_lookups(self) -> Dict[str, int]:
+        """Returns and resets the lookup outcomes counted since the last call."""
+        with self._lookups_lock:
+            lookups = dict(self._lookups)
+            self._lookups.clear()
+        return lookups
+
+    def _index_stats(self) -> Dict[str, Any]:
+        self.index.add_lookups(self._take_lookups())
+        return self.index.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarizes the cache from its index: entry count, total bytes, age histogram and hit ratio.
+
+        Returns:
+            The dictionary described in `cache_index.read_stats`. The lookups include those of
+            earlier runs and of this instance so far. With a memory tier, its counters are
+            added under 'memory'; with a bundle, its path and entry count under 'bundle'.
+            'deduplicate' tells whether the duplicate bytes are actually stored once.
+        """
+        report = self._index_stats()
+        report['deduplicate'] = self.deduplicate
+        if self.memory_cache is not None:
+            report['memory'] = self.memory_cache.stats()
+        if self.bundle is not None:
+            report['bundle'] = {'path': str(self.bundle.path), 'entries': self.bundle.entry_count}
+        return report
+
+    def _close_tiers(self):
+        """Reports the memory tier's counters, unmaps the bundle and closes the lock files."""
+        self.locks.close()
+        if self.memory_cache is not None:
+            logger.info(f"Memory cache: {self.memory_cache.stats()}")
+        if self.bundle is not None:
+            self.bundle.close()
+
+    def close(self):
+        """Persists the lookup counters and closes the index."""
+        if self.index is None:
+            return
+        self._close_tiers()
+        self.index.add_lookups(self._take_lookups())
+        self.index.close()
+        self.index = None
+
+def build_cache_manager(config: dict) -> CacheManager:
+    """
+    Creates the CacheManager described by the application settings: the one-pickle-per-URL
+    directory cache, or the single-file SQLite store if 'cache.backend' is 'sqlite'.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+
+    Returns:
+        The configured CacheManager.
+    """
+    cache_config = config.get('cache', {})
+    options = {
+        'cache_ttl_seconds': cache_config.get('ttl_seconds', 86400),
+        'expiry_policy': cache_config.get('expiry_policy', 'expire'),
+        'revalidate_year_range': cache_config.get('revalidate_year_range'),
+        'memory_cache': build_memory_cache(config),
+        'canonicalizer': build_url_canonicalizer(config),
+        'deduplicate': cache_config.get('deduplicate', False)
+    }
+    bundle_path = config['paths'].get('cache_bundle')
+    if bundle_path:
+        options['bundle'] = CacheBundle(Path(bundle_path))
+    backend = cache_config.get('backend', 'pickle')
+    if backend == 'sqlite':
+        from src.scraping.sqlite_cache import SQLiteCacheManager
+
+        return SQLiteCacheManager(
+            db_path=Path(config['paths'].get('cache_db', 'data/cache.sqlite3')),
+            compression=cache_config.get('compression', 'zstd'),
+            batch_size=cache_config.get('batch_size', 50),
+            **options
+        )
+    if backend != 'pickle':
+        raise ValueError(f"Unknown cache backend '{backend}'. Expected 'pickle' or 'sqlite'.")
+    return CacheManager(cache_dir=Path(config['paths']['cache_dir']), **options)
@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from loguru import logger
+
+# Circuit states: 'closed' lets requests through, 'open' rejects them until the reset timeout
+# has passed, 'half_open' lets a single trial request through to probe the host.
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitBreaker:
+    """
+    A per-host circuit breaker that stops sending requests to a host after a run of
+    consecutive failures, and probes it again with a single request after a timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_seconds: float = 300):
+        """
+        Initializes the CircuitBreaker.
+
+        Args:
+            failure_threshold: The number of consecutive failures that opens a host's circuit.
+            reset_timeout_seconds: How long an open circuit rejects requests before a trial request.
+        """
+        if failure_threshold < 1:
+            raise ValueError("The failure threshold must be at least 1.")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._hosts: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def _host_state(self, host: str) -> Dict:
+        """Returns the mutable state of a host. Must be called with the lock held."""
+        return self._hosts.setdefault(host, {'state': CLOSED, 'failures': 0, 'opened_at': 0.0, 'trial_in_flight': False})
+
+    def state(self, url: str) -> str:
+        """Returns the circuit state of a URL's host."""
+        with self._lock:
+            return self._host_state(self._host(url))['state']
+
+    def allow_request(self, url: str) -> bool:
+        """
+        Returns True if a request to the URL's host may be sent now.
+
+        An open circuit turns half-open once the reset timeout has passed, and then
+        lets exactly one trial request through until its outcome is recorded.
+        """
+        with self._lock:
+            host_state = self._host_state(self._host(url))
+            if host_state['state'] == OPEN:
+                if time.monotonic() - host_state['opened_at'] < self.reset_timeout_seconds:
+                    return False
+                host_state['state'] = HALF_OPEN
+                host_state['trial_in_flight'] = False
+                logger.info(f"Circuit for {self._host(url)} is half-open; sending a trial request.")
+            if host_state['state'] == HALF_OPEN:
+                if host_state['trial_in_flight']:
+                    return False
+                host_state['trial_in_flight'] = True
+            return True
+
+    def record_success(self, url: str):
+        """Closes the host's circuit and resets its failure count."""
+        host = self._host(url)
+        with self._lock:
+            host_state = self._host_state(host)
+            if host_state['state'] != CLOSED:
+                logger.info(f"Circuit for {host} closed after a successful request.")
+            host_state.update(state=CLOSED, failures=0, trial_in_flight=False)
+
+    def record_failure(self, url: str):
+        """Counts a failure, opening the host's circuit at the threshold or after a failed trial."""
+        host = self._host(url)
+        with self._lock:
+            host_state = self._host_state(host)
+            host_state['failures'] += 1
+            if host_state['state'] == HALF_OPEN or host_state['failures'] >= self.failure_threshold:
+                if host_state['state'] != OPEN:
+                    logger.warning(
+                        f"Circuit for {host} opened after {host_state['failures']} consecutive failures. "
+                        f"Pausing requests for {self.reset_timeout_seconds:.0f} seconds."
+                    )
+                host_state.update(state=OPEN, opened_at=time.monotonic(), trial_in_flight=False)
+
+def build_circuit_breaker(config: dict) -> Optional[CircuitBreaker]:
+    """
+    Creates the CircuitBreaker described by the 'circuit_breaker' settings.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+
+    Returns:
+        The CircuitBreaker, or None if it is disabled.
+    """
+    breaker_config = config.get('circuit_breaker', {})
+    if not breaker_config.get('enabled', False):
+        return None
+    return CircuitBreaker(
+        failure_threshold=breaker_config.get('failure_threshold', 5),
+        reset_timeout_seconds=breaker_config.get('reset_timeout_seconds', 300)
+    )
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+class DeadLetterQueue:
+    """
+    A persistent record of session URLs whose fetch failed, so that later runs do not retry
+    them in line and a dedicated run can reprocess only those sessions.
+
+    Every entry keeps the last failure reason, the number of failed attempts and the time
+    from which the URL is eligible for another attempt; the delay doubles with every attempt.
+    The queue is stored as a JSON file and rewritten atomically after every change.
+    """
+
+    def __init__(self, path: Path, base_delay_seconds: float = 3600, max_delay_seconds: float = 7 * 86400):
+        """
+        Initializes the DeadLetterQueue and loads the existing entries.
+
+        Args:
+            path: The JSON file the queue is persisted to.
+            base_delay_seconds: The waiting time before the first retry of a failed URL.
+            max_delay_seconds: The upper bound of the exponentially growing waiting time.
+        """
+        self.path = path
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Reads the persisted entries, starting empty if the file is missing or unreadable."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = {entry['url']: entry for entry in json.load(f)}
+            logger.info(f"Loaded {len(self._entries)} dead-lettered URLs from {self.path}.")
+        except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Could not read the dead-letter file {self.path}. Starting with an empty queue. Error: {e}")
+
+    def _save(self):
+        """Writes the entries to a temporary file and renames it over the queue file. Must be called with the lock held."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._entries.values()), f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Could not write the dead-letter file {self.path}: {e}")
+
+    def record_failure(self, url: str, reason: str, year: Optional[int] = None, count_attempt: bool = True):
+        """
+        Records a failed fetch and schedules the URL's next eligible attempt.
+
+        Args:
+            url: The URL that could not be fetched.
+            reason: A human-readable failure reason.
+            year: The session year, kept so the retry run can store the page with it.
+            count_attempt: False if the URL was not actually requested (e.g. the circuit was open);
+                           the attempt counter and the backoff are then left unchanged.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.setdefault(url, {
+                'url': url, 'year': year, 'attempts': 0, 'first_failed_at': now, 'next_eligible_at': now
+            })
+            entry['reason'] = reason
+            entry['last_failed_at'] = now
+            if year is not None:
+                entry['year'] = year
+            if count_attempt:
+                entry['attempts'] += 1
+                delay = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (entry['attempts'] - 1))
+                entry['next_eligible_at'] = now + delay
+            self._save()
+        logger.warning(f"Dead-lettered {url} (attempts: {entry['attempts']}): {reason}")
+
+    def record_success(self, url: str):
+        """Removes a URL from the queue after it was fetched successfully."""
+        with self._lock:
+            if self._entries.pop(url, None) is None:
+                return
+            self._save()
+        logger.info(f"Removed {url} from the dead-letter queue after a successful fetch.")
+
+    def is_eligible(self, url: str, now: Optional[float] = None) -> bool:
+        """Returns True if a URL is not dead-lettered or its next attempt is due."""
+        with self._lock:
+            entry = self._entries.get(url)
+            return entry is None or entry['next_eligible_at'] <= (now or time.time())
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Returns a copy of a URL's entry, or None if it is not dead-lettered."""
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Returns copies of all entries, in the order they were first recorded."""
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()]
+
+    def release_all(self):
+        """Makes every dead-lettered URL eligible immediately, for an explicit retry run."""
+        now = time.time()
+        with self._lock:
+            for entry in self._entries.values():
+                entry['next_eligible_at'] = now
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+def build_dead_letter_queue(config: dict) -> Optional[DeadLetterQueue]:
+    """
+    Creates the DeadLetterQueue described by the application settings.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+
+    Returns:
+        The DeadLetterQueue, or None if no 'dead_letter_file' path is configured.
+    """
+    dead_letter_file = config['paths'].get('dead_letter_file')
+    if not dead_letter_file:
+        return None
+    dead_letter_config = config.get('dead_letters', {})
+    return DeadLetterQueue(
+        Path(dead_letter_file),
+        base_delay_seconds=dead_letter_config.get('base_delay_seconds', 3600),
+        max_delay_seconds=dead_letter_config.get('max_delay_seconds', 7 * 86400)
+    )
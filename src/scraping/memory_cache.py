@@ -0,0 +1,118 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from loguru import logger
+
+from src.utils.metrics import metrics
+
+def _entry_size(cache_entry: Dict[str, Any]) -> int:
+    """Estimates the memory held by an entry; the body dominates, so only it is measured."""
+    return sys.getsizeof(cache_entry.get('content'))
+
+def _copy_entry(cache_entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Copies an entry deeply enough that callers mutating it (e.g. its metadata) cannot alter the cached one."""
+    return {**cache_entry, 'metadata': dict(cache_entry.get('metadata') or {})}
+
+class MemoryCache:
+    """
+    A thread-safe, byte-bounded LRU of cache entries kept in front of a CacheManager's storage.
+
+    The CacheManager fills it on reads, replaces entries on writes and drops them on deletes,
+    so it always agrees with the disk. Entries are copied in and out.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initializes the MemoryCache.
+
+        Args:
+            max_bytes: The budget for the cached bodies; the least recently used entries are
+                       evicted beyond it, and bodies larger than it are never cached.
+        """
+        if max_bytes <= 0:
+            raise ValueError("The memory cache budget must be positive.")
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict() # key -> (entry, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns a copy of the entry with the given key, or None, marking it as recently used."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+        metrics.inc('memory_cache_lookups_total', result='miss' if item is None else 'hit')
+        return _copy_entry(item[0]) if item is not None else None
+
+    def put(self, key: str, cache_entry: Dict[str, Any]):
+        """Stores a copy of an entry, evicting the least recently used entries beyond the budget."""
+        size = _entry_size(cache_entry)
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (_copy_entry(cache_entry), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                evicted += 1
+            self.evictions += evicted
+            current_bytes = self._bytes
+        if evicted:
+            metrics.inc('memory_cache_evictions_total', evicted)
+        metrics.set_gauge('memory_cache_bytes', current_bytes)
+
+    def discard(self, key: str):
+        """Drops the entry with the given key, if cached."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+    def clear(self):
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the entry count, bytes held, budget, hits, misses, hit ratio and evictions."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else None,
+                'evictions': self.evictions
+            }
+
+def build_memory_cache(config: dict) -> Optional[MemoryCache]:
+    """
+    Creates the MemoryCache described by the 'cache' settings.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+
+    Returns:
+        The MemoryCache, or None if 'cache.memory_max_mb' is unset or 0.
+    """
+    max_mb = config.get('cache', {}).get('memory_max_mb') or 0
+    if max_mb <= 0:
+        return None
+    logger.info(f"Keeping up to {max_mb} MB of cached transcripts in memory.")
+    return MemoryCache(int(max_mb * 1_000_000))
@@ -1,9 +1,79 @@
+import csv
 from loguru import logger
 from pathlib import Path
 import re
-from typing import Optional
-from playwright.sync_api import Playwright, sync_playwright, BrowserContext, Page, Error
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from playwright.sync_api import Playwright, sync_playwright, BrowserContext, Page, Route, Error
 
+from src.scraping.bot_detection import CAPTCHA_SIGNATURE
+from src.scraping.rate_limiter import AdaptiveRateLimiter
+from src.utils.metrics import metrics
+
+# Browser settings shared by every Playwright-based client so they present the same fingerprint.
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--start-maximized',
+]
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Selectors indicating that a transcript page has loaded, for the different site layouts.
+SUCCESS_SELECTORS = [
+    'div.stenogram', # Added for modern layouts (Sejm7 onwards)
+    'body > blockquote:nth-of-type(2)',
+    'body > div > blockquote',
+    'body > blockquote'
+]
+# All success selectors as one selector list, so a single wait resolves on whichever appears first.
+READINESS_SELECTOR = ', '.join(SUCCESS_SELECTORS)
+
+# Resource types aborted in fast navigation mode. Scripts and XHRs are still needed to pass the bot check.
+BLOCKED_RESOURCE_TYPES = ['image', 'stylesheet', 'font', 'media']
+
+def wait_for_manual_intervention(url: str, reason: str):
+    """Asks the user to resolve a CAPTCHA or error in the browser window and blocks until they press Enter."""
+    print("\n" + "="*60)
+    print(f"ACTION REQUIRED: {reason}")
+    print(f"Please solve the CAPTCHA or resolve the issue in the browser window for URL: {url}")
+    print("The script will wait indefinitely. Press Enter in this console when you are done...")
+    print("="*60)
+
+    input()
+    logger.info("Resuming script after manual intervention.")
+
+class FetchTimingLog:
+    """Appends per-fetch timings to a CSV file, so page latency can be compared between configurations."""
+
+    FIELDS = ['timestamp', 'url', 'fast_navigation', 'navigation_ms', 'readiness_ms', 'total_ms', 'matched_selector']
+
+    def __init__(self, log_path: Path):
+        """
+        Initializes the FetchTimingLog.
+
+        Args:
+            log_path: The CSV file the timings are appended to. A header is written to a new file.
+        """
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.log_path.exists():
+            with open(self.log_path, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f).writerow(self.FIELDS)
+
+    def record(self, url: str, fast_navigation: bool, navigation_s: float, readiness_s: float, matched_selector: Optional[str]):
+        """Logs and appends the timing of one fetch."""
+        navigation_ms, readiness_ms = navigation_s * 1000, readiness_s * 1000
+        total_ms = navigation_ms + readiness_ms
+        logger.info(
+            f"Fetch timing for {url}: navigation {navigation_ms:.0f} ms, readiness {readiness_ms:.0f} ms, "
+            f"total {total_ms:.0f} ms (selector: {matched_selector}, fast navigation: {fast_navigation})."
+        )
+        with self._lock, open(self.log_path, 'a', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerow([
+                f"{time.time():.3f}", url, fast_navigation,
+                f"{navigation_ms:.1f}", f"{readiness_ms:.1f}", f"{total_ms:.1f}", matched_selector or ''
+            ])
 
 class PlaywrightClient:
     """
@@ -11,19 +81,39 @@ class PlaywrightClient:
     to maintain sessions and cookies across runs.
     """
 
-    def __init__(self, headless: bool = False, timeout: int = 60000):
+    def __init__(
+        self,
+        headless: bool = False,
+        timeout: int = 60000,
+        fast_navigation: bool = False,
+        blocked_resource_types: Optional[List[str]] = None,
+        readiness_timeout: int = 10000,
+        timing_log: Optional[FetchTimingLog] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None
+    ):
         """
         Initializes the PlaywrightClient.
 
         Args:
             headless: Whether to run the browser in headless mode.
             timeout: The default navigation timeout in milliseconds.
+            fast_navigation: Whether to abort non-essential resources and wait for all success
+                             selectors at once instead of trying them one after another.
+            blocked_resource_types: The resource types aborted in fast navigation mode.
+            readiness_timeout: The timeout in milliseconds for a success selector to appear.
+            timing_log: An optional FetchTimingLog recording the latency of every fetch.
+            rate_limiter: An optional shared AdaptiveRateLimiter pacing the navigations.
         """
         self.playwright: Optional[Playwright] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.headless = headless
         self.timeout = timeout
+        self.fast_navigation = fast_navigation
+        self.blocked_resource_types = set(blocked_resource_types or BLOCKED_RESOURCE_TYPES)
+        self.readiness_timeout = readiness_timeout
+        self.timing_log = timing_log
+        self.rate_limiter = rate_limiter
         
         self.user_data_dir = Path('data/browser_context')
         self.user_data_dir.mkdir(exist_ok=True)
@@ -42,12 +132,11 @@ class PlaywrightClient:
             self.context = self.playwright.chromium.launch_persistent_context(
                 self.user_data_dir,
                 headless=self.headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--start-maximized',
-                ],
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                args=BROWSER_ARGS,
+                user_agent=BROWSER_USER_AGENT
             )
+            if self.fast_navigation:
+                self.context.route("**/*", self._block_resources)
             self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
             self.page.set_default_timeout(self.timeout)
             logger.info("Persistent browser context launched successfully.")
@@ -56,58 +145,163 @@ class PlaywrightClient:
             self.close()
             raise
 
+    def _block_resources(self, route: Route):
+        """Aborts requests for resource types that are not needed to read the transcript."""
+        if route.request.resource_type in self.blocked_resource_types:
+            route.abort()
+        else:
+            route.continue_()
+
+    def _wait_for_success_selector(self) -> Optional[str]:
+        """
+        Waits until the page shows one of the success selectors.
+
+        In fast navigation mode all selectors are awaited at once and the first one in priority
+        order that is present wins; otherwise they are tried one after another.
+
+        Returns:
+            The matched selector, or None if none appeared in time.
+        """
+        if self.fast_navigation:
+            try:
+                self.page.wait_for_selector(READINESS_SELECTOR, timeout=self.readiness_timeout)
+            except Error:
+                logger.debug(f"None of the selectors '{READINESS_SELECTOR}' appeared.")
+                return None
+            for selector in SUCCESS_SELECTORS:
+                if self.page.query_selector(selector):
+                    return selector
+            return None
+
+        for selector in SUCCESS_SELECTORS:
+            try:
+                self.page.wait_for_selector(selector, timeout=self.readiness_timeout)
+                return selector # Found a valid selector, no need to check others
+            except Error:
+                logger.debug(f"Selector '{selector}' not found, trying next one.")
+        return None
+
     def fetch(self, url: str) -> Optional[str]:
         """
         Fetches content from a URL, handling CAPTCHAs and different page load states intelligently.
         It checks for multiple possible content selectors before deciding if a page has loaded successfully.
         """
+        return self.fetch_with_headers(url)[0]
+
+    def fetch_with_headers(self, url: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Fetches content from a URL like `fetch`, also returning the headers of the document response.
+        The headers are empty when the page had to pass through a CAPTCHA.
+        """
         if not self.page:
             logger.error("Browser page not started. Call start() before fetching.")
-            return None
+            return None, {}
 
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        start_time = time.perf_counter()
         try:
             logger.info(f"Navigating to URL: {url}")
-            self.page.goto(url, wait_until='domcontentloaded')
+            response = self.page.goto(url, wait_until='domcontentloaded')
+            navigated_time = time.perf_counter()
+            headers = response.headers if response else {}
 
             # First, check for an explicit CAPTCHA page
             page_content_for_captcha_check = self.page.content()
-            captcha_signature = "This question is for testing whether you are a human visitor"
-            if captcha_signature in page_content_for_captcha_check:
+            is_captcha = CAPTCHA_SIGNATURE in page_content_for_captcha_check
+            metrics.observe('browser_navigation_seconds', navigated_time - start_time, client='playwright')
+            if self.rate_limiter:
+                self.rate_limiter.record(
+                    status=response.status if response else None,
+                    latency=navigated_time - start_time,
+                    challenge=is_captcha
+                )
+            if is_captcha:
+                metrics.inc('browser_captchas_total', client='playwright')
                 logger.warning("Definitive CAPTCHA page detected. Pausing for user intervention.")
                 self._handle_captcha_or_error(url, "Real CAPTCHA detected.")
-                return self.page.content()
+                return self.page.content(), {}
 
             # If no immediate CAPTCHA, wait for one of the potential success selectors
-            potential_selectors = [
-                'div.stenogram', # Added for modern layouts (Sejm7 onwards)
-                'body > blockquote:nth-of-type(2)',
-                'body > div > blockquote',
-                'body > blockquote'
-            ]
-            
-            success = False
-            for selector in potential_selectors:
-                try:
-                    self.page.wait_for_selector(selector, timeout=10000) # 10s timeout for each selector
-                    logger.info(f"Success selector '{selector}' found. Page loaded correctly.")
-                    success = True
-                    break # Found a valid selector, no need to check others
-                except Error:
-                    logger.debug(f"Selector '{selector}' not found, trying next one.")
-                    continue
-
-            if success:
-                return self.page.content()
+            matched_selector = self._wait_for_success_selector()
+            metrics.observe('browser_readiness_seconds', time.perf_counter() - navigated_time, client='playwright')
+            if self.timing_log:
+                self.timing_log.record(
+                    url, self.fast_navigation, navigated_time - start_time,
+                    time.perf_counter() - navigated_time, matched_selector
+                )
+
+            if matched_selector:
+                logger.info(f"Success selector '{matched_selector}' found. Page loaded correctly.")
+                metrics.inc('browser_fetches_total', client='playwright', result='success')
+                return self.page.content(), headers
             else:
-                logger.warning(f"None of the potential success selectors {potential_selectors} were found, and no CAPTCHA was detected. "
+                logger.warning(f"None of the potential success selectors {SUCCESS_SELECTORS} were found, and no CAPTCHA was detected. "
                              f"The page might have an unsupported layout or was too slow to load. Skipping.")
+                metrics.inc('browser_fetches_total', client='playwright', result='no_selector')
                 self._save_debug_page(url, "no_selector_found")
-                return None
+                return None, {}
 
         except Error as e:
+            if self.rate_limiter:
+                self.rate_limiter.record(latency=time.perf_counter() - start_time)
             logger.error(f"A critical error occurred during Playwright navigation for {url}: {e}")
+            metrics.inc('browser_fetches_total', client='playwright', result='error')
             self._save_debug_page(url, "critical_error")
-            return None
+            return None, {}
+
+    def fetch_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Tuple[Optional[int], Optional[str], Dict[str, str]]:
+        """
+        Revalidates a previously fetched URL with a conditional GET sent through the browser
+        context's request API, so the context's cookies are used without rendering the page.
+
+        Args:
+            url: The URL to revalidate.
+            etag: The ETag of the cached copy, sent as If-None-Match.
+            last_modified: The Last-Modified value of the cached copy, sent as If-Modified-Since.
+
+        Returns:
+            A tuple of the status code (None if the request failed), the new body (only for a
+            200 response) and the response headers. A 304 status means the cached copy is current.
+        """
+        if not self.context:
+            logger.error("Browser context not started. Call start() before revalidating.")
+            return None, None, {}
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        try:
+            logger.info(f"Revalidating URL: {url}")
+            start_time = time.perf_counter()
+            response = self.context.request.get(url, headers=headers, timeout=self.timeout)
+            if self.rate_limiter:
+                self.rate_limiter.record(status=response.status, latency=time.perf_counter() - start_time)
+            body = response.text() if response.status == 200 else None
+            return response.status, body, response.headers
+        except Error as e:
+            logger.error(f"Failed to revalidate {url}: {e}")
+            return None, None, {}
+
+    def export_cookies(self) -> List[Dict]:
+        """
+        Returns the cookies of the persistent browser context, including those set
+        after passing the bot protection, so that plain HTTP clients can reuse them.
+        """
+        if not self.context:
+            logger.error("Browser context not started. Call start() before exporting cookies.")
+            return []
+        return self.context.cookies()
 
     def _save_debug_page(self, url: str, suffix: str):
         """Saves the current page content for debugging."""
@@ -124,15 +318,7 @@ class PlaywrightClient:
     def _handle_captcha_or_error(self, url: str, reason: str):
         """Saves debug info and pauses the script for manual user intervention."""
         self._save_debug_page(url, "captcha_or_error")
-        
-        print("\n" + "="*60)
-        print(f"ACTION REQUIRED: {reason}")
-        print(f"Please solve the CAPTCHA or resolve the issue in the browser window for URL: {url}")
-        print("The script will wait indefinitely. Press Enter in this console when you are done...")
-        print("="*60)
-        
-        input()
-        logger.info("Resuming script after manual intervention.")
+        wait_for_manual_intervention(url, reason)
 
     def close(self):
         """Closes the browser context and stops the Playwright instance."""
@@ -0,0 +1,408 @@
+import asyncio
+from contextlib import asynccontextmanager
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+from loguru import logger
+from playwright.async_api import Playwright, async_playwright, BrowserContext, Page, Route, Error
+
+from src.scraping.playwright_client import (
+    BLOCKED_RESOURCE_TYPES, BROWSER_ARGS, BROWSER_USER_AGENT, CAPTCHA_SIGNATURE,
+    READINESS_SELECTOR, SUCCESS_SELECTORS, FetchTimingLog, PlaywrightClient, wait_for_manual_intervention
+)
+from src.scraping.rate_limiter import AdaptiveRateLimiter
+from src.utils.metrics import metrics
+
+T = TypeVar('T')
+
+
+class PlaywrightPagePool:
+    """
+    Hosts several pages inside one persistent browser context, so that transcripts can be
+    rendered concurrently while sharing the cookie jar that gets past the bot protection.
+
+    Playwright objects may only be used from the event loop that created them, therefore the
+    pool runs its own asyncio loop in a background thread. Worker threads use `fetch` or
+    `run_with_page`, coroutines running in another event loop use `afetch` or `arun_with_page`.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 4,
+        headless: bool = False,
+        timeout: int = 60000,
+        fast_navigation: bool = False,
+        blocked_resource_types: Optional[List[str]] = None,
+        readiness_timeout: int = 10000,
+        timing_log: Optional[FetchTimingLog] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None
+    ):
+        """
+        Initializes the PlaywrightPagePool.
+
+        Args:
+            pool_size: The number of pages (tabs) that render concurrently.
+            headless: Whether to run the browser in headless mode.
+            timeout: The default navigation timeout in milliseconds.
+            fast_navigation: Whether to abort non-essential resources and wait for all success
+                             selectors at once, as in PlaywrightClient.
+            blocked_resource_types: The resource types aborted in fast navigation mode.
+            readiness_timeout: The timeout in milliseconds for a success selector to appear.
+            timing_log: An optional FetchTimingLog recording the latency of every fetch.
+            rate_limiter: An optional shared AdaptiveRateLimiter pacing the navigations of all pages.
+        """
+        if pool_size < 1:
+            raise ValueError("The page pool must contain at least one page.")
+        self.pool_size = pool_size
+        self.headless = headless
+        self.timeout = timeout
+        self.fast_navigation = fast_navigation
+        self.blocked_resource_types = set(blocked_resource_types or BLOCKED_RESOURCE_TYPES)
+        self.readiness_timeout = readiness_timeout
+        self.timing_log = timing_log
+        self.rate_limiter = rate_limiter
+
+        self.playwright: Optional[Playwright] = None
+        self.context: Optional[BrowserContext] = None
+        self.pages: List[Page] = []
+        self._idle_pages: Optional[asyncio.Queue] = None
+        self._captcha_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.user_data_dir = Path('data/browser_context')
+        self.user_data_dir.mkdir(exist_ok=True)
+
+        self.debug_dir = Path('data/debug')
+        self.debug_dir.mkdir(exist_ok=True)
+
+    def start(self):
+        """Starts the pool's event loop thread and launches the persistent context with its pages."""
+        if self.context:
+            logger.warning("The page pool is already running.")
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="playwright-pool", daemon=True)
+        self._thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        except Exception as e:
+            logger.error(f"Failed to initialize the Playwright page pool: {e}")
+            self.close()
+            raise
+
+    async def _start(self):
+        """Launches the persistent context and opens the pooled pages. Runs on the pool's loop."""
+        logger.info(f"Launching persistent context from {self.user_data_dir} with a pool of {self.pool_size} pages.")
+        self.playwright = await async_playwright().start()
+        self.context = await self.playwright.chromium.launch_persistent_context(
+            self.user_data_dir,
+            headless=self.headless,
+            args=BROWSER_ARGS,
+            user_agent=BROWSER_USER_AGENT
+        )
+        if self.fast_navigation:
+            await self.context.route("**/*", self._block_resources)
+        self.pages = list(self.context.pages[:self.pool_size])
+        while len(self.pages) < self.pool_size:
+            self.pages.append(await self.context.new_page())
+
+        self._idle_pages = asyncio.Queue()
+        for page in self.pages:
+            page.set_default_timeout(self.timeout)
+            self._idle_pages.put_nowait(page)
+        self._captcha_lock = asyncio.Lock()
+        logger.info("Playwright page pool launched successfully.")
+
+    async def checkout(self) -> Page:
+        """
+        Takes an idle page out of the pool, waiting until one becomes available.
+        Must be awaited on the pool's event loop; other callers should use `run_with_page`.
+        """
+        return await self._idle_pages.get()
+
+    async def checkin(self, page: Page):
+        """Returns a page to the pool. Must be awaited on the pool's event loop."""
+        self._idle_pages.put_nowait(page)
+
+    @asynccontextmanager
+    async def page(self):
+        """Async context manager that checks a page out for the duration of the block."""
+        page = await self.checkout()
+        try:
+            yield page
+        finally:
+            await self.checkin(page)
+
+    async def _run_with_page(self, func: Callable[[Page], Awaitable[T]]) -> T:
+        """Runs a coroutine function with a checked-out page. Runs on the pool's loop."""
+        async with self.page() as page:
+            return await func(page)
+
+    def run_with_page(self, func: Callable[[Page], Awaitable[T]]) -> T:
+        """
+        Runs `func(page)` on the pool's loop with a checked-out page and blocks for the result.
+        Safe to call from any thread except the pool's own.
+
+        Args:
+            func: A coroutine function receiving the checked-out Page.
+
+        Returns:
+            The value returned by `func`.
+        """
+        if not self._loop or not self.context:
+            raise RuntimeError("The page pool is not started. Call start() first.")
+        return asyncio.run_coroutine_threadsafe(self._run_with_page(func), self._loop).result()
+
+    async def arun_with_page(self, func: Callable[[Page], Awaitable[T]]) -> T:
+        """
+        Awaitable counterpart of `run_with_page` for coroutines running in another event loop.
+
+        Args:
+            func: A coroutine function receiving the checked-out Page.
+
+        Returns:
+            The value returned by `func`.
+        """
+        if not self._loop or not self.context:
+            raise RuntimeError("The page pool is not started. Call start() first.")
+        future = asyncio.run_coroutine_threadsafe(self._run_with_page(func), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        Renders a URL on one of the pooled pages. Blocks the calling thread only,
+        so several worker threads can render concurrently.
+        """
+        return self.fetch_with_headers(url)[0]
+
+    def fetch_with_headers(self, url: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """Renders a URL like `fetch`, also returning the headers of the document response."""
+        if not self.context:
+            logger.error("Page pool not started. Call start() before fetching.")
+            return None, {}
+        return self.run_with_page(lambda page: self._render(page, url))
+
+    async def afetch(self, url: str) -> Optional[str]:
+        """Renders a URL on one of the pooled pages from an asyncio caller."""
+        if not self.context:
+            logger.error("Page pool not started. Call start() before fetching.")
+            return None
+        content, _ = await self.arun_with_page(lambda page: self._render(page, url))
+        return content
+
+    async def _block_resources(self, route: Route):
+        """Aborts requests for resource types that are not needed to read the transcript."""
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _wait_for_success_selector(self, page: Page) -> Optional[str]:
+        """
+        Waits until a pooled page shows one of the success selectors, following the
+        same rules as PlaywrightClient._wait_for_success_selector.
+
+        Returns:
+            The matched selector, or None if none appeared in time.
+        """
+        if self.fast_navigation:
+            try:
+                await page.wait_for_selector(READINESS_SELECTOR, timeout=self.readiness_timeout)
+            except Error:
+                logger.debug(f"None of the selectors '{READINESS_SELECTOR}' appeared.")
+                return None
+            for selector in SUCCESS_SELECTORS:
+                if await page.query_selector(selector):
+                    return selector
+            return None
+
+        for selector in SUCCESS_SELECTORS:
+            try:
+                await page.wait_for_selector(selector, timeout=self.readiness_timeout)
+                return selector
+            except Error:
+                logger.debug(f"Selector '{selector}' not found, trying next one.")
+        return None
+
+    async def _render(self, page: Page, url: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Navigates a pooled page to a URL and waits for one of the known content selectors,
+        following the same rules as PlaywrightClient.fetch_with_headers.
+        """
+        if self.rate_limiter:
+            await asyncio.sleep(self.rate_limiter.reserve())
+        start_time = time.perf_counter()
+        try:
+            logger.info(f"Navigating pooled page to URL: {url}")
+            response = await page.goto(url, wait_until='domcontentloaded')
+            navigated_time = time.perf_counter()
+            headers = response.headers if response else {}
+
+            is_captcha = CAPTCHA_SIGNATURE in await page.content()
+            metrics.observe('browser_navigation_seconds', navigated_time - start_time, client='playwright_pool')
+            if self.rate_limiter:
+                self.rate_limiter.record(
+                    status=response.status if response else None,
+                    latency=navigated_time - start_time,
+                    challenge=is_captcha
+                )
+            if is_captcha:
+                metrics.inc('browser_captchas_total', client='playwright_pool')
+                logger.warning("Definitive CAPTCHA page detected. Pausing for user intervention.")
+                await self._handle_captcha_or_error(page, url, "Real CAPTCHA detected.")
+                return await page.content(), {}
+
+            matched_selector = await self._wait_for_success_selector(page)
+            metrics.observe('browser_readiness_seconds', time.perf_counter() - navigated_time, client='playwright_pool')
+            if self.timing_log:
+                self.timing_log.record(
+                    url, self.fast_navigation, navigated_time - start_time,
+                    time.perf_counter() - navigated_time, matched_selector
+                )
+
+            if matched_selector:
+                logger.info(f"Success selector '{matched_selector}' found. Page loaded correctly.")
+                metrics.inc('browser_fetches_total', client='playwright_pool', result='success')
+                return await page.content(), headers
+
+            logger.warning(f"None of the potential success selectors {SUCCESS_SELECTORS} were found, and no CAPTCHA was detected. "
+                           f"The page might have an unsupported layout or was too slow to load. Skipping.")
+            metrics.inc('browser_fetches_total', client='playwright_pool', result='no_selector')
+            await self._save_debug_page(page, url, "no_selector_found")
+            return None, {}
+
+        except Error as e:
+            if self.rate_limiter:
+                self.rate_limiter.record(latency=time.perf_counter() - start_time)
+            logger.error(f"A critical error occurred during Playwright navigation for {url}: {e}")
+            metrics.inc('browser_fetches_total', client='playwright_pool', result='error')
+            await self._save_debug_page(page, url, "critical_error")
+            return None, {}
+
+    async def _fetch_conditional(self, url: str, headers: Dict[str, str]) -> Tuple[Optional[int], Optional[str], Dict[str, str]]:
+        """Sends a conditional GET through the context's request API. Runs on the pool's loop."""
+        if self.rate_limiter:
+            await asyncio.sleep(self.rate_limiter.reserve())
+        try:
+            start_time = time.perf_counter()
+            response = await self.context.request.get(url, headers=headers, timeout=self.timeout)
+            if self.rate_limiter:
+                self.rate_limiter.record(status=response.status, latency=time.perf_counter() - start_time)
+            body = await response.text() if response.status == 200 else None
+            return response.status, body, response.headers
+        except Error as e:
+            logger.error(f"Failed to revalidate {url}: {e}")
+            return None, None, {}
+
+    def fetch_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Tuple[Optional[int], Optional[str], Dict[str, str]]:
+        """
+        Revalidates a previously fetched URL with a conditional GET that shares the pool's cookies.
+        See PlaywrightClient.fetch_conditional for the return value.
+        """
+        if not self._loop or not self.context:
+            logger.error("Page pool not started. Call start() before revalidating.")
+            return None, None, {}
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        logger.info(f"Revalidating URL: {url}")
+        return asyncio.run_coroutine_threadsafe(self._fetch_conditional(url, headers), self._loop).result()
+
+    def export_cookies(self) -> List[Dict]:
+        """Returns the cookies of the shared browser context, see PlaywrightClient.export_cookies."""
+        if not self._loop or not self.context:
+            logger.error("Page pool not started. Call start() before exporting cookies.")
+            return []
+        return asyncio.run_coroutine_threadsafe(self.context.cookies(), self._loop).result()
+
+    async def _save_debug_page(self, page: Page, url: str, suffix: str):
+        """Saves the content of a pooled page for debugging."""
+        try:
+            debug_content = await page.content()
+            sanitized_url = re.sub(r'[^a-zA-Z0-9_-]', '_', url)
+            debug_filepath = self.debug_dir / f"{suffix}_{sanitized_url[:100]}.html"
+            with open(debug_filepath, 'w', encoding='utf-8') as f:
+                f.write(debug_content)
+            logger.info(f"The current page HTML has been saved to: {debug_filepath}")
+        except Exception as e:
+            logger.error(f"Failed to save debug page: {e}")
+
+    async def _handle_captcha_or_error(self, page: Page, url: str, reason: str):
+        """
+        Pauses for manual intervention. Only one prompt is shown at a time; pages that hit the
+        challenge meanwhile wait their turn and usually pass once the shared cookies are set.
+        """
+        async with self._captcha_lock:
+            if CAPTCHA_SIGNATURE not in await page.content():
+                return
+            await self._save_debug_page(page, url, "captcha_or_error")
+            await asyncio.get_running_loop().run_in_executor(None, wait_for_manual_intervention, url, reason)
+
+    async def _close(self):
+        """Closes the context and stops Playwright. Runs on the pool's loop."""
+        if self.context:
+            logger.info("Closing the pooled browser context.")
+            await self.context.close()
+            self.context = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        self.pages = []
+
+    def close(self):
+        """Closes the browser context, stops Playwright and shuts down the pool's loop thread."""
+        if self._loop:
+            try:
+                asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+            except Exception as e:
+                logger.error(f"Error while closing the page pool: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+        logger.info("Playwright page pool shut down.")
+
+
+def build_browser_client(
+    config: dict,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+) -> Union[PlaywrightClient, PlaywrightPagePool]:
+    """
+    Creates the browser client described by the application settings: a page pool when
+    'playwright_pool_size' is above 1, otherwise a single-page PlaywrightClient.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+        rate_limiter: An optional shared AdaptiveRateLimiter pacing the navigations.
+
+    Returns:
+        The configured, not yet started, browser client.
+    """
+    scraping_config = config['scraping']
+    timing_log = None
+    if scraping_config.get('log_fetch_timings', False):
+        timing_log = FetchTimingLog(Path(config['paths']['log_dir']) / 'fetch_timings.csv')
+    options = {
+        'headless': scraping_config.get('headless', True), # Default to headless
+        'fast_navigation': scraping_config.get('fast_navigation', False),
+        'blocked_resource_types': scraping_config.get('blocked_resource_types'),
+        'readiness_timeout': scraping_config.get('readiness_timeout_ms', 10000),
+        'timing_log': timing_log,
+        'rate_limiter': rate_limiter
+    }
+    pool_size = scraping_config.get('playwright_pool_size', 1)
+    if pool_size > 1:
+        return PlaywrightPagePool(pool_size=pool_size, **options)
+    return PlaywrightClient(**options)
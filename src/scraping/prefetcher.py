@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import csv
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from loguru import logger
+from tqdm import tqdm
+
+from src.scraping.async_fetcher import AsyncFetcher
+from src.scraping.cache_manager import CacheManager
+from src.scraping.session_scraper import SessionScraper
+from src.scraping.tiered_fetcher import supports_concurrent_fetches
+
+
+class Prefetcher:
+    """
+    Warms the cache for a list of session URLs ahead of the reconstruction run,
+    so that parsing and reconstruction can later run entirely from the cache.
+    """
+
+    def __init__(
+        self,
+        cache_manager: CacheManager,
+        session_scraper: Optional[SessionScraper] = None,
+        async_fetcher: Optional[AsyncFetcher] = None,
+        max_workers: int = 1
+    ):
+        """
+        Initializes the Prefetcher. Exactly one of `session_scraper` (browser rendering)
+        and `async_fetcher` (plain HTTP) must be provided.
+
+        Args:
+            cache_manager: The CacheManager to fill.
+            session_scraper: A SessionScraper used to render pages in the browser.
+            async_fetcher: An AsyncFetcher used to download pages over plain HTTP.
+            max_workers: The number of worker threads driving the session scraper.
+        """
+        if (session_scraper is None) == (async_fetcher is None):
+            raise ValueError("Provide either a session_scraper or an async_fetcher.")
+        self.cache_manager = cache_manager
+        self.session_scraper = session_scraper
+        self.async_fetcher = async_fetcher
+        self.max_workers = max_workers
+
+    def _fetch_with_scraper(self, urls: List[str], years: Dict[str, int], on_result) -> None:
+        """
+        Renders the URLs with the session scraper: on worker threads when its client is a page
+        pool, otherwise on this thread, which started the single-page browser.
+        """
+        if self.max_workers <= 1 or not supports_concurrent_fetches(self.session_scraper.web_client):
+            for url in urls:
+                try:
+                    content = self.session_scraper.fetch_session_html(url, years.get(url))
+                except Exception as e:
+                    logger.error(f"Unexpected error while prefetching {url}: {e}")
+                    content = None
+                on_result(url, content)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.session_scraper.fetch_session_html, url, years.get(url)): url
+                for url in urls
+            }
+            for future in as_completed(futures):
+                try:
+                    content = future.result()
+                except Exception as e:
+                    logger.error(f"Unexpected error while prefetching {futures[future]}: {e}")
+                    content = None
+                on_result(futures[future], content)
+
+    def run(
+        self,
+        urls: List[str],
+        years: Optional[Dict[str, int]] = None,
+        failures_path: Optional[Path] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetches every URL that is not cached yet and reports progress, throughput and failures.
+
+        Args:
+            urls: The session URLs to prefetch. Duplicates, and variants of a URL the cache keys
+                  as the same page, are fetched only once.
+            years: The session year of each URL, stored with the cache entries.
+            failures_path: An optional CSV file the failed URLs are written to.
+
+        Returns:
+            A summary dictionary with the 'total', 'variants' (URLs skipped as variants of another
+            listed URL), 'cached', 'fetched' and 'failed' counts, the 'failed_urls',
+            'elapsed_seconds', 'pages_per_second' and 'bytes_fetched'.
+        """
+        pages: Dict[str, str] = {}
+        for url in urls:
+            if url:
+                pages.setdefault(self.cache_manager.canonical_url(url), url)
+        unique_urls = list(pages.values())
+        variant_count = len(set(url for url in urls if url)) - len(unique_urls)
+        if variant_count:
+            logger.info(f"Skipping {variant_count} URLs that are variants of another listed session URL.")
+        to_fetch = [url for url in unique_urls if self.cache_manager.get_from_cache(url) is None]
+        cached_count = len(unique_urls) - len(to_fetch)
+        logger.info(f"Prefetching {len(to_fetch)} of {len(unique_urls)} session URLs ({cached_count} already cached).")
+
+        failed_urls: List[str] = []
+        counters = {'fetched': 0, 'bytes': 0}
+        start_time = time.monotonic()
+
+        with tqdm(total=len(to_fetch), desc="Prefetching Sessions", unit="page") as progress:
+            def on_result(url: str, content: Optional[str]):
+                if content:
+                    counters['fetched'] += 1
+                    counters['bytes'] += len(content.encode('utf-8'))
+                else:
+                    failed_urls.append(url)
+                progress.update(1)
+                progress.set_postfix(failed=len(failed_urls))
+
+            years = years or {}
+            if self.async_fetcher:
+                url_metadata = {url: {'year': year} for url, year in years.items()}
+                self.async_fetcher.fetch_batch(to_fetch, skip_cached=False, on_result=on_result, url_metadata=url_metadata)
+            else:
+                self._fetch_with_scraper(to_fetch, years, on_result)
+
+        elapsed_seconds = time.monotonic() - start_time
+        pages_per_second = counters['fetched'] / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        summary = {
+            'total': len(unique_urls),
+            'variants': variant_count,
+            'cached': cached_count,
+            'fetched': counters['fetched'],
+            'failed': len(failed_urls),
+            'failed_urls': failed_urls,
+            'elapsed_seconds': elapsed_seconds,
+            'pages_per_second': pages_per_second,
+            'bytes_fetched': counters['bytes']
+        }
+        logger.info(
+            f"Prefetch finished: {summary['fetched']} fetched, {summary['failed']} failed, {cached_count} already cached "
+            f"in {elapsed_seconds:.1f}s ({pages_per_second:.2f} pages/s, {counters['bytes'] / 1_000_000:.1f} MB)."
+        )
+
+        if failures_path and failed_urls:
+            failures_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(failures_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['source'])
+                writer.writerows([url] for url in failed_urls)
+            logger.warning(f"Wrote {len(failed_urls)} failed URLs to: {failures_path}")
+
+        return summary
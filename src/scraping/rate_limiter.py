@@ -0,0 +1,174 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+from loguru import logger
+
+from src.utils.metrics import metrics
+
+# Status codes telling the client that the server is overloaded or throttling it.
+THROTTLE_STATUS_CODES = {429, 503}
+
+class AdaptiveRateLimiter:
+    """
+    A thread-safe AIMD (additive increase, multiplicative decrease) rate limiter shared by all
+    fetch clients talking to the same server.
+
+    While responses are healthy the allowed request rate grows by `additive_increase` requests
+    per second for every second of traffic; a throttling status (429/503), a bot-protection
+    challenge or a latency spike cuts it by `decrease_factor`. Clients reserve a send slot with
+    `reserve()`, sleep for the returned delay (with `time.sleep` or `asyncio.sleep`) and report
+    the outcome of the request with `record()`.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 1.0,
+        min_rate: float = 0.1,
+        max_rate: float = 10.0,
+        additive_increase: float = 0.1,
+        decrease_factor: float = 0.5,
+        latency_threshold: float = 3.0,
+        decrease_cooldown: float = 2.0
+    ):
+        """
+        Initializes the AdaptiveRateLimiter.
+
+        Args:
+            initial_rate: The starting request rate in requests per second.
+            min_rate: The rate is never decreased below this value.
+            max_rate: The rate is never increased above this value.
+            additive_increase: The rate increase (requests/s) per second of healthy traffic.
+            decrease_factor: The factor the rate is multiplied by on a congestion signal.
+            latency_threshold: A response slower than this multiple of the smoothed baseline
+                               latency is treated as a congestion signal.
+            decrease_cooldown: The minimum number of seconds between two decreases, so that a burst
+                               of errors caused by one overload is only punished once.
+        """
+        if not 0 < min_rate <= initial_rate <= max_rate:
+            raise ValueError("Rates must satisfy 0 < min_rate <= initial_rate <= max_rate.")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("The decrease factor must be between 0 and 1.")
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.decrease_cooldown = decrease_cooldown
+
+        self.baseline_latency: Optional[float] = None
+        self.stats = {'requests': 0, 'increases': 0, 'decreases': 0, 'throttled': 0, 'challenges': 0, 'slow': 0}
+        self._next_slot = 0.0
+        self._last_decrease = float('-inf')
+        self._lock = threading.Lock()
+        metrics.set_gauge('rate_limiter_requests_per_second', self.rate)
+
+    @property
+    def current_rate(self) -> float:
+        """The currently allowed request rate in requests per second."""
+        return self.rate
+
+    def reserve(self) -> float:
+        """
+        Reserves the next send slot at the current rate.
+
+        Returns:
+            The number of seconds the caller has to wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+            return slot - now
+
+    def wait(self):
+        """Blocks the calling thread until its send slot is reached."""
+        delay = self.reserve()
+        if delay > 0:
+            logger.debug(f"Rate limiting: sleeping for {delay:.2f} seconds.")
+            time.sleep(delay)
+
+    def record(self, status: Optional[int] = None, latency: Optional[float] = None, challenge: bool = False):
+        """
+        Reports the outcome of a request and adapts the rate.
+
+        Args:
+            status: The HTTP status code, if known.
+            latency: The response time in seconds, if known.
+            challenge: Whether the response was a bot-protection challenge page.
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            reason = None
+            if challenge:
+                self.stats['challenges'] += 1
+                reason = "bot-protection challenge"
+            elif status in THROTTLE_STATUS_CODES:
+                self.stats['throttled'] += 1
+                reason = f"HTTP {status}"
+            elif latency is not None:
+                if self.baseline_latency is not None and latency > self.latency_threshold * self.baseline_latency:
+                    self.stats['slow'] += 1
+                    reason = f"latency {latency:.2f}s above {self.latency_threshold}x the {self.baseline_latency:.2f}s baseline"
+                else:
+                    # Exponentially weighted moving average of the healthy response times
+                    self.baseline_latency = latency if self.baseline_latency is None else 0.8 * self.baseline_latency + 0.2 * latency
+
+            if reason:
+                self._decrease(reason)
+            elif status is None or status < 400:
+                self._increase()
+
+    def _increase(self):
+        """Additively increases the rate. Must be called with the lock held."""
+        if self.rate >= self.max_rate:
+            return
+        # Each request adds increase/rate, i.e. `additive_increase` per second of traffic.
+        self.rate = min(self.max_rate, self.rate + self.additive_increase / self.rate)
+        self.stats['increases'] += 1
+        metrics.set_gauge('rate_limiter_requests_per_second', self.rate)
+
+    def _decrease(self, reason: str):
+        """Multiplicatively decreases the rate. Must be called with the lock held."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        previous_rate = self.rate
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        # Push back the next slot so the lower rate applies immediately
+        self._next_slot = max(self._next_slot, now + 1.0 / self.rate)
+        self.stats['decreases'] += 1
+        metrics.set_gauge('rate_limiter_requests_per_second', self.rate)
+        metrics.inc('rate_limiter_decreases_total')
+        logger.warning(f"Backing off ({reason}): request rate {previous_rate:.2f} -> {self.rate:.2f} requests/s.")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns the current rate, the smoothed baseline latency and the adaptation counters."""
+        with self._lock:
+            return {'rate': self.rate, 'baseline_latency': self.baseline_latency, **self.stats}
+
+def build_rate_limiter(config: dict) -> Optional[AdaptiveRateLimiter]:
+    """
+    Creates the AdaptiveRateLimiter described by the 'rate_limit' settings. The same
+    instance should be handed to every client that fetches from the Sejm server.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+
+    Returns:
+        The configured AdaptiveRateLimiter, or None if adaptive rate limiting is disabled
+        and the clients should keep their fixed delays.
+    """
+    rate_config = config.get('rate_limit', {})
+    if not rate_config.get('adaptive', False):
+        return None
+    return AdaptiveRateLimiter(
+        initial_rate=rate_config.get('initial_rate', 1.0),
+        min_rate=rate_config.get('min_rate', 0.1),
+        max_rate=rate_config.get('max_rate', 10.0),
+        additive_increase=rate_config.get('additive_increase', 0.1),
+        decrease_factor=rate_config.get('decrease_factor', 0.5),
+        latency_threshold=rate_config.get('latency_threshold', 3.0),
+        decrease_cooldown=rate_config.get('decrease_cooldown_seconds', 2.0)
+    )
@@ -1,48 +1,168 @@
+import hashlib
+import json
+import threading
+from bisect import bisect_right
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple, Union
 from loguru import logger
 import yaml
 
-_rules_cache: List[Dict[str, Any]] = []
+from src.parsing.parser_backends import BS4_BACKEND, CompiledSelector, compile_selector
 
-def load_scraping_rules(rules_path: Path, year: int) -> Dict[str, str]:
+def rules_hash(rules: Dict[str, Any]) -> str:
+    """Returns a stable hash of a year's rule set."""
+    return hashlib.sha256(json.dumps(rules, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class RuleSet:
     """
-    Loads scraping rules from a YAML file and returns the appropriate set for a given year.
+    The selectors of one year range, with their compiled form per parser backend.
 
-    Args:
-        rules_path: The path to the YAML file containing the scraping rules.
-        year: The year of the session to find rules for.
+    A selector is compiled the first time a backend asks for it and reused for every later page,
+    so the CSS is parsed once per process rather than on every select.
+    """
 
-    Returns:
-        A dictionary of CSS selectors and patterns for the given year.
+    def __init__(self, year_range: Tuple[int, int], selectors: Dict[str, str]):
+        """
+        Initializes the RuleSet.
 
-    Raises:
-        FileNotFoundError: If the rules file does not exist.
-        ValueError: If no matching rule set is found for the given year.
+        Args:
+            year_range: The first and last year the rules apply to.
+            selectors: The CSS selectors and patterns of the range.
+        """
+        self.start, self.end = year_range
+        self.selectors = selectors
+        # Equal to rules_hash of the selectors, so cache keys stay those of plain rule dictionaries
+        self.version = rules_hash(selectors)
+        self._compiled: Dict[Tuple[str, str], CompiledSelector] = {}
+
+    def selector(self, name: str, backend: str = BS4_BACKEND) -> CompiledSelector:
+        """
+        Returns a selector of the rule set compiled for a parser backend.
+
+        Args:
+            name: The selector's key, e.g. 'speech_link'.
+            backend: The backend of the document it is used on, one of PARSER_BACKENDS.
+
+        Raises:
+            KeyError: If the rule set has no such selector.
+        """
+        key = (name, backend)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._compiled[key] = compile_selector(self.selectors[name], backend)
+        return compiled
+
+    def __repr__(self) -> str:
+        return f"RuleSet({self.start}-{self.end}, {self.version[:12]})"
+
+class RulesRegistry:
     """
-    global _rules_cache
+    The scraping rules of a YAML file, loaded once and indexed by year.
 
-    # Load rules from YAML file if the cache is empty
-    if not _rules_cache:
+    Year ranges are cut into disjoint intervals, each owned by the first rule set in the file
+    that covers it (the one a linear scan would return), and looked up by bisection.
+    """
+
+    def __init__(self, rules_path: Path):
+        """
+        Loads and indexes a scraping rules file.
+
+        Args:
+            rules_path: The path to the YAML file containing the scraping rules.
+
+        Raises:
+            FileNotFoundError: If the rules file does not exist.
+            ValueError: If the file is empty or not valid YAML.
+        """
+        self.rules_path = rules_path
         logger.info(f"Loading scraping rules from: {rules_path}")
         try:
-            with open(rules_path, 'r', encoding='utf-8') as f:
-                _rules_cache = yaml.safe_load(f)
-            if not _rules_cache:
-                 raise ValueError("Rules file is empty or invalid.")
+            with open(rules_path, 'rb') as f:
+                raw_rules = f.read()
+            rules = yaml.safe_load(raw_rules)
         except FileNotFoundError:
             logger.error(f"Scraping rules file not found at: {rules_path}")
             raise
         except yaml.YAMLError as e:
             logger.error(f"Error parsing YAML file {rules_path}: {e}")
             raise ValueError(f"Invalid YAML format in {rules_path}")
+        if not rules:
+            raise ValueError("Rules file is empty or invalid.")
+
+        # A hash of the whole file, for keys of results that depend on every rule set
+        self.version = hashlib.sha256(raw_rules).hexdigest()
+        self.rule_sets: List[RuleSet] = []
+        for rule_set in rules:
+            year_range = rule_set.get('year_range', [])
+            if len(year_range) != 2:
+                logger.warning(f"Skipping a rule set without a [first, last] year_range in {rules_path}.")
+                continue
+            self.rule_sets.append(RuleSet((year_range[0], year_range[1]), rule_set.get('selectors', {})))
+        self._starts, self._intervals = self._build_index(self.rule_sets)
+
+    @staticmethod
+    def _build_index(rule_sets: List[RuleSet]) -> Tuple[List[int], List[Tuple[int, RuleSet]]]:
+        """Returns the sorted starts of the disjoint year intervals, and the (end, rule set) of each."""
+        bounds = sorted({rule_set.start for rule_set in rule_sets} | {rule_set.end + 1 for rule_set in rule_sets})
+        starts, intervals = [], []
+        for low, high in zip(bounds, bounds[1:]):
+            # Every range starts and ends on a bound, so it covers an interval whole or not at all
+            owner = next((rule_set for rule_set in rule_sets if rule_set.start <= low and high - 1 <= rule_set.end), None)
+            if owner is None:
+                continue
+            if intervals and intervals[-1][1] is owner and intervals[-1][0] == low - 1:
+                intervals[-1] = (high - 1, owner)
+            else:
+                starts.append(low)
+                intervals.append((high - 1, owner))
+        return starts, intervals
 
-    # Find the matching rule set for the given year
-    for rule_set in _rules_cache:
-        year_range = rule_set.get('year_range', [])
-        if len(year_range) == 2 and year_range[0] <= year <= year_range[1]:
-            logger.debug(f"Found matching rule set for year {year}.")
-            return rule_set.get('selectors', {})
+    def rule_set(self, year: int) -> RuleSet:
+        """
+        Returns the rule set for a given year.
 
-    logger.error(f"No matching scraping rule set found for year: {year}")
-    raise ValueError(f"No scraping rules defined for year {year}.")
+        Raises:
+            ValueError: If no rule set covers the year.
+        """
+        index = bisect_right(self._starts, year) - 1
+        if index >= 0 and year <= self._intervals[index][0]:
+            return self._intervals[index][1]
+        logger.error(f"No matching scraping rule set found for year: {year}")
+        raise ValueError(f"No scraping rules defined for year {year}.")
+
+_registries: Dict[Path, RulesRegistry] = {}
+_registries_lock = threading.Lock()
+
+def get_rules_registry(rules_path: Union[str, Path]) -> RulesRegistry:
+    """
+    Returns the RulesRegistry of a rules file, loading it on the first call for that path.
+
+    Raises:
+        FileNotFoundError: If the rules file does not exist.
+        ValueError: If the file is empty or not valid YAML.
+    """
+    path = Path(rules_path).resolve()
+    registry = _registries.get(path)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(path)
+            if registry is None:
+                registry = _registries[path] = RulesRegistry(path)
+    return registry
+
+def load_scraping_rules(rules_path: Path, year: int) -> Dict[str, str]:
+    """
+    Loads scraping rules from a YAML file and returns the appropriate set for a given year.
+
+    Args:
+        rules_path: The path to the YAML file containing the scraping rules.
+        year: The year of the session to find rules for.
+
+    Returns:
+        A dictionary of CSS selectors and patterns for the given year.
+
+    Raises:
+        FileNotFoundError: If the rules file does not exist.
+        ValueError: If no matching rule set is found for the given year.
+    """
+    return get_rules_registry(rules_path).rule_set(year).selectors
@@ -1,17 +1,26 @@
+import time
+from typing import Optional
 from loguru import logger
+import undetected_chromedriver as uc
+from selenium.common.exceptions import WebDriverException
+
+from src.scraping.bot_detection import detect_bot_challenge
+from src.scraping.rate_limiter import AdaptiveRateLimiter
 
 class SeleniumClient:
     """A web client using undetected-chromedriver to bypass bot detection."""
 
-    def __init__(self, rate_limit_delay: float = 2.0):
+    def __init__(self, rate_limit_delay: float = 2.0, rate_limiter: Optional[AdaptiveRateLimiter] = None):
         """
         Initializes the SeleniumClient.
 
         Args:
             rate_limit_delay: Minimum delay in seconds between requests.
+            rate_limiter: An optional shared AdaptiveRateLimiter replacing the fixed delay.
         """
         self.driver = None
         self.rate_limit_delay = rate_limit_delay
+        self.rate_limiter = rate_limiter
         self.last_request_time = 0
         self._initialize_driver()
 
@@ -35,6 +44,9 @@ class SeleniumClient:
 
     def _apply_rate_limit(self):
         """Ensures that requests do not exceed the defined rate limit."""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+            return
         elapsed_time = time.time() - self.last_request_time
         if elapsed_time < self.rate_limit_delay:
             sleep_time = self.rate_limit_delay - elapsed_time
@@ -60,7 +72,9 @@ class SeleniumClient:
         logger.info(f"Fetching URL with Selenium: {url}")
 
         try:
+            start_time = time.monotonic()
             self.driver.get(url)
+            latency = time.monotonic() - start_time
             # It's good practice to wait for a moment to let JS challenges run
             time.sleep(5) 
             
@@ -68,7 +82,10 @@ class SeleniumClient:
             logger.info(f"Successfully fetched {url}. Page size: {len(content)} characters.")
             
             # Check if we got the threat detection page
-            if "TSPD_101" in content or "Threat Detection" in content:
+            is_challenge = detect_bot_challenge(content) is not None
+            if self.rate_limiter:
+                self.rate_limiter.record(latency=latency, challenge=is_challenge)
+            if is_challenge:
                 logger.warning(f"Bot detection page was returned for {url}.")
                 # Optionally, you could add more sophisticated handling here,
                 # like solving a CAPTCHA if one appears.
@@ -1,26 +1,95 @@
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Any, Dict, Mapping, Optional, Union
 from loguru import logger
 
-from src.scraping.cache_manager import CacheManager
+from src.scraping.bot_detection import detect_bot_challenge
+from src.scraping.cache_manager import CacheManager, response_metadata
+from src.scraping.circuit_breaker import CircuitBreaker
+from src.scraping.dead_letters import DeadLetterQueue
 from src.scraping.playwright_client import PlaywrightClient
+from src.scraping.playwright_pool import PlaywrightPagePool
+from src.scraping.web_client import WebClient
+from src.utils.metrics import SIZE_BUCKETS, metrics
 
 class SessionScraper:
     """Scrapes and caches parliamentary session pages."""
 
-    def __init__(self, playwright_client: PlaywrightClient, cache_manager: CacheManager):
+    def __init__(
+        self,
+        playwright_client: Union[PlaywrightClient, PlaywrightPagePool],
+        cache_manager: CacheManager,
+        revalidation_client: Optional[WebClient] = None,
+        dead_letters: Optional[DeadLetterQueue] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         """
         Initializes the SessionScraper.
 
         Args:
-            playwright_client: An instance of PlaywrightClient for making HTTP requests.
+            playwright_client: An instance of PlaywrightClient, or a PlaywrightPagePool for
+                               concurrent rendering, used for making HTTP requests.
             cache_manager: An instance of CacheManager for caching content.
+            revalidation_client: The client sending conditional GETs for stale cache entries.
+                                 Defaults to the browser client, which shares its cookies.
+            dead_letters: An optional DeadLetterQueue recording failed URLs. URLs whose next
+                          attempt is not due yet are skipped instead of being fetched.
+            circuit_breaker: An optional CircuitBreaker that stops fetching from a host
+                             after consecutive failures.
         """
         self.web_client = playwright_client
         self.cache_manager = cache_manager
+        self.revalidation_client = revalidation_client or playwright_client
+        self.dead_letters = dead_letters
+        self.circuit_breaker = circuit_breaker
 
-    def fetch_session_html(self, session_url: str) -> Optional[str]:
+    def _revalidate(self, session_url: str, cache_entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Revalidates a stale cache entry with a conditional GET.
+
+        Args:
+            session_url: The URL of the stale entry.
+            cache_entry: The stale cache entry.
+
+        Returns:
+            The current HTML (the cached body on 304 or on a failed revalidation, the new body on 200),
+            or None if the entry has no validators and must be fetched again.
+        """
+        metadata = cache_entry['metadata']
+        etag, last_modified = metadata.get('etag'), metadata.get('last_modified')
+        if not etag and not last_modified:
+            logger.info(f"Stale cache entry for {session_url} has no validators; fetching it again.")
+            return None
+
+        status, body, headers = self.revalidation_client.fetch_conditional(session_url, etag, last_modified)
+        if status == 304:
+            logger.info(f"Cached content for {session_url} is still current (304 Not Modified).")
+            metrics.inc('cache_revalidations_total', result='not_modified')
+            self.cache_manager.refresh_timestamp(session_url, response_metadata(headers, status))
+            return cache_entry['content']
+        if status == 200 and body and not detect_bot_challenge(body):
+            logger.info(f"Content for {session_url} changed since it was cached; storing the new version.")
+            metrics.inc('cache_revalidations_total', result='modified')
+            self.cache_manager.save_to_cache(
+                session_url, body, {**response_metadata(headers, status), 'year': metadata.get('year')}
+            )
+            return body
+
+        # Historical transcripts practically never change, so a stale copy beats no copy.
+        logger.warning(f"Could not revalidate {session_url} (status: {status}). Serving the stale cached copy.")
+        metrics.inc('cache_revalidations_total', result='failed')
+        return cache_entry['content']
+
+    def fetch_session_html(self, session_url: str, year: Optional[int] = None) -> Optional[str]:
         """
         Fetches the HTML content for a given session URL, utilizing a cache.
+        Stale entries kept for revalidation are revalidated instead of being downloaded again.
+        On a miss, the URL's fetch lease is held while fetching, so that other workers (threads or
+        processes sharing the cache) missing the same URL wait and reuse this fetch.
+
+        Args:
+            session_url: The URL of the session transcript.
+            year: The year of the session, stored with the entry to select its expiry policy.
         """
         if not session_url:
             logger.warning("Session URL is empty, cannot fetch.")
@@ -31,15 +100,84 @@ class SessionScraper:
         if cached_html:
             return cached_html
 
-        # 2. If not in cache, fetch from the web
+        with self.cache_manager.single_flight(session_url) as fetched_meanwhile:
+            if fetched_meanwhile:
+                return fetched_meanwhile
+            return self._fetch_uncached(session_url, year)
+
+    def _fetch_uncached(self, session_url: str, year: Optional[int]) -> Optional[str]:
+        """Revalidates or fetches a page the cache had no fresh copy of, recording the outcome."""
+        # 2. Revalidate a stale entry that the cache kept instead of expiring it
+        stale_entry = self.cache_manager.get_entry(session_url)
+        if stale_entry and hasattr(self.revalidation_client, 'fetch_conditional'):
+            revalidated_html = self._revalidate(session_url, stale_entry)
+            if revalidated_html:
+                return revalidated_html
+
+        # 3. Skip URLs that failed recently or whose host is failing, instead of retrying them in line
+        if self.dead_letters is not None and not self.dead_letters.is_eligible(session_url):
+            logger.info(f"Skipping {session_url}: it is dead-lettered and not yet eligible for another attempt.")
+            metrics.inc('scraper_fetches_total', result='skipped')
+            return None
+        if self.circuit_breaker and not self.circuit_breaker.allow_request(session_url):
+            logger.warning(f"Skipping {session_url}: the circuit for its host is open.")
+            metrics.inc('scraper_fetches_total', result='circuit_open')
+            if self.dead_letters is not None:
+                self.dead_letters.record_failure(session_url, "circuit breaker open", year, count_attempt=False)
+            return None
+
+        # 4. If not in cache, fetch from the web
         logger.info(f"Content for {session_url} not in cache, fetching from web.")
         
-        fetched_html = self.web_client.fetch(session_url)
+        start_time = time.monotonic()
+        try:
+            fetched_html, headers = self.web_client.fetch_with_headers(session_url)
+            failure_reason = None if fetched_html else "no content returned by the fetch client"
+        except Exception as e:
+            fetched_html, headers = None, {}
+            failure_reason = f"{type(e).__name__}: {e}"
+        signature = detect_bot_challenge(fetched_html) if fetched_html else None
+        if signature:
+            failure_reason = f"bot protection page ('{signature}')"
+        metrics.observe('scraper_fetch_seconds', time.monotonic() - start_time)
 
-        # 3. If fetching was successful, save the content to the cache
-        if fetched_html:
-            self.cache_manager.save_to_cache(session_url, fetched_html)
+        # 5. If fetching was successful, save the content to the cache
+        if not failure_reason:
+            metadata = {**response_metadata(headers), 'year': year}
+            self.cache_manager.save_to_cache(session_url, fetched_html, metadata)
+            metrics.inc('scraper_fetches_total', result='success')
+            metrics.observe('scraper_fetch_bytes', len(fetched_html.encode('utf-8')), buckets=SIZE_BUCKETS)
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success(session_url)
+            if self.dead_letters is not None:
+                self.dead_letters.record_success(session_url)
             return fetched_html
         
-        logger.error(f"Failed to fetch session HTML for URL: {session_url}")
+        logger.error(f"Failed to fetch session HTML for URL: {session_url} ({failure_reason})")
+        metrics.inc('scraper_fetches_total', result='failed')
+        if self.circuit_breaker:
+            self.circuit_breaker.record_failure(session_url)
+        if self.dead_letters is not None:
+            self.dead_letters.record_failure(session_url, failure_reason, year)
         return None
+
+    def fetch_sessions(self, session_years: Mapping[str, Optional[int]], max_workers: int = 1) -> Dict[str, Optional[str]]:
+        """
+        Fetches several session pages using worker threads, utilizing the cache.
+
+        Concurrency only pays off with a PlaywrightPagePool; a single PlaywrightClient
+        must be driven from one thread, so `max_workers` should stay at 1 in that case.
+
+        Args:
+            session_years: The session URLs to fetch, mapped to their session years, which are
+                           stored with the cache entries to select their expiry policy.
+            max_workers: The number of worker threads, usually the page pool size.
+
+        Returns:
+            A dictionary mapping each URL to its HTML content, or None if fetching failed.
+        """
+        unique_urls = [url for url in session_years if url]
+        logger.info(f"Fetching {len(unique_urls)} session pages with {max_workers} worker(s).")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            contents = executor.map(lambda url: self.fetch_session_html(url, session_years[url]), unique_urls)
+            return dict(zip(unique_urls, contents))
@@ -0,0 +1,403 @@
+import atexit
+import json
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from loguru import logger
+
+from src.scraping.cache_codecs import ZSTD, CodecUnavailableError, compress, decode_content, decompress, encode_content, resolve_codec
+from src.scraping.cache_bundle import CacheBundle
+from src.scraping.cache_index import COUNTERS_SCHEMA, add_counters, eviction_keys, read_stats
+from src.scraping.cache_locks import MAINTENANCE
+from src.scraping.cache_manager import BODIES_DIR, CACHE_FILE_PATTERN, CacheManager, content_hash, entry_year
+from src.scraping.memory_cache import MemoryCache
+from src.scraping.url_canonicalizer import UrlCanonicalizer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    year INTEGER,
+    size INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    content_hash TEXT,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_entries_url ON cache_entries (url);
+CREATE INDEX IF NOT EXISTS cache_entries_timestamp ON cache_entries (timestamp);
+CREATE TABLE IF NOT EXISTS cache_bodies (
+    content_hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    body BLOB NOT NULL
+);
+"""
+
+UPSERT = """
+INSERT OR REPLACE INTO cache_entries (key, url, timestamp, year, size, codec, kind, metadata, content_hash, body)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_BODY = 'INSERT OR IGNORE INTO cache_bodies (content_hash, codec, kind, body) VALUES (?, ?, ?, ?)'
+
+# Deletes the deduplicated bodies no entry references any more.
+COLLECT_BODIES = """
+DELETE FROM cache_bodies WHERE NOT EXISTS (
+    SELECT 1 FROM cache_entries WHERE cache_entries.content_hash = cache_bodies.content_hash
+)
+"""
+
+# The codec of an entry whose body is deduplicated into cache_bodies under its content_hash.
+REF_CODEC = 'ref'
+
+class SQLiteCacheManager(CacheManager):
+    """
+    A CacheManager that keeps every entry in a single SQLite database with compressed bodies.
+
+    Entries are keyed by the same SHA256 of the URL as the pickle cache, with the URL, timestamp,
+    session year, size and content hash in columns, so the table doubles as the cache index.
+    Writes are buffered and committed in batches of `batch_size` rows (or after
+    `flush_interval_seconds`); buffered entries are visible to reads immediately and are
+    flushed by `flush()`, `close()` and at interpreter exit. With `deduplicate`, text bodies
+    go to the cache_bodies table once per content hash and entries reference them.
+
+    Several processes may share the database: SQLite serializes their transactions, and a body
+    is committed in the same transaction as the entries referencing it. Writes buffered by one
+    process become visible to the others when they are flushed.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        cache_ttl_seconds: int = 86400,
+        expiry_policy: str = 'expire',
+        revalidate_year_range: Optional[Tuple[int, int]] = None,
+        compression: str = ZSTD,
+        compression_level: Optional[int] = None,
+        batch_size: int = 50,
+        flush_interval_seconds: float = 5.0,
+        memory_cache: Optional[MemoryCache] = None,
+        bundle: Optional[CacheBundle] = None,
+        canonicalizer: Optional[UrlCanonicalizer] = None,
+        deduplicate: bool = False
+    ):
+        """
+        Initializes the SQLiteCacheManager.
+
+        Args:
+            db_path: The SQLite database file; it is created if missing.
+            cache_ttl_seconds: The Time-To-Live for cache entries in seconds (default: 1 day).
+            expiry_policy: 'expire' or 'revalidate', as for CacheManager.
+            revalidate_year_range: Session years whose entries always follow the 'revalidate' policy.
+            compression: 'zstd', 'zlib' or 'none'. 'zstd' falls back to 'zlib' if the
+                         zstandard package is not installed.
+            compression_level: The codec's compression level; None uses the codec's default.
+            batch_size: The number of buffered writes that triggers a commit.
+            flush_interval_seconds: The maximum age of a buffered write before it is committed.
+            memory_cache: An optional in-memory LRU tier in front of the database.
+            bundle: An optional read-only bundle consulted when the database misses.
+            canonicalizer: An optional UrlCanonicalizer applied to URLs before keying.
+            deduplicate: Whether identical text bodies are stored only once.
+        """
+        compression = resolve_codec(compression)
+        self.db_path = db_path
+        super().__init__(
+            cache_dir=db_path.parent,
+            cache_ttl_seconds=cache_ttl_seconds,
+            expiry_policy=expiry_policy,
+            revalidate_year_range=revalidate_year_range,
+            memory_cache=memory_cache,
+            bundle=bundle,
+            canonicalizer=canonicalizer,
+            deduplicate=deduplicate
+        )
+        self.compression = compression
+        self.compression_level = compression_level
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+
+        self._pending: Dict[str, tuple] = {}
+        self._pending_bodies: Dict[str, tuple] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(SCHEMA + COUNTERS_SCHEMA)
+        columns = {row[1] for row in self._connection.execute('PRAGMA table_info(cache_entries)')}
+        if 'content_hash' not in columns: # Databases created before the column existed
+            self._connection.execute('ALTER TABLE cache_entries ADD COLUMN content_hash TEXT')
+        self._connection.execute('CREATE INDEX IF NOT EXISTS cache_entries_content_hash ON cache_entries (content_hash)')
+        self._connection.commit()
+        atexit.register(self.close)
+
+    def _lock_dir(self) -> Path:
+        return self.db_path.with_name(self.db_path.name + '.locks')
+
+    def _open_index(self) -> None:
+        """The cache_entries table is its own index; no sidecar is needed."""
+        return None
+
+    def _encode_row(self, url: str, cache_entry: Dict[str, Any]) -> Optional[Tuple[tuple, Optional[tuple]]]:
+        """
+        Serializes a cache entry into a table row and, for a deduplicated body, a cache_bodies row.
+        Returns None if its content cannot be stored.
+
+        The body row is written with every entry (and ignored if the body exists): checking for the
+        body first would race with another process deleting the last entry that referenced it.
+        """
+        content = cache_entry.get('content')
+        try:
+            kind, data = encode_content(content)
+            metadata = cache_entry.get('metadata') or {}
+            metadata_json = json.dumps(metadata)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Could not serialize cache entry for {url}: {e}")
+            return None
+        digest = content_hash(content)
+        codec, body, body_row = self.compression, None, None
+        if self.deduplicate and digest is not None:
+            codec, body = REF_CODEC, b''
+            body_row = (digest, self.compression, kind, sqlite3.Binary(compress(data, self.compression, self.compression_level)))
+        else:
+            body = sqlite3.Binary(compress(data, self.compression, self.compression_level))
+        row = (
+            self._generate_cache_key(url),
+            url,
+            cache_entry.get('timestamp', time.time()),
+            entry_year(cache_entry),
+            len(data),
+            codec,
+            kind,
+            metadata_json,
+            digest,
+            body
+        )
+        return row, body_row
+
+    def _decode_row(self, row: tuple) -> Dict[str, Any]:
+        url, timestamp, codec, kind, metadata_json, body = row
+        content = decode_content(decompress(bytes(body), codec), kind)
+        return {'url': url, 'timestamp': timestamp, 'content': content, 'metadata': json.loads(metadata_json)}
+
+    def _load_body(self, digest: str) -> Optional[tuple]:
+        """Returns the (codec, body) of a deduplicated body, or None if it is missing."""
+        body_row = self._pending_bodies.get(digest)
+        if body_row is not None:
+            return body_row[1], body_row[3]
+        if self._connection is None:
+            return None
+        return self._connection.execute('SELECT codec, body FROM cache_bodies WHERE content_hash = ?', (digest,)).fetchone()
+
+    def _load_key(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._pending.get(key)
+            if row is not None:
+                row = (row[1], row[2], row[5], row[6], row[7], row[9], row[8])
+            elif self._connection is not None:
+                row = self._connection.execute(
+                    'SELECT url, timestamp, codec, kind, metadata, body, content_hash FROM cache_entries WHERE key = ?', (key,)
+                ).fetchone()
+            if row is None:
+                return None
+            url, timestamp, codec, kind, metadata_json, body, digest = row
+            if codec == REF_CODEC:
+                codec, body = self._load_body(digest) or (REF_CODEC, None)
+        try:
+            if body is None:
+                raise ValueError(f"its deduplicated body {digest} is missing")
+            return self._decode_row((url, timestamp, codec, kind, metadata_json, body))
+        except CodecUnavailableError as e:
+            # The entry is intact, and readable on nodes that have the codec; keep it and report a miss
+            logger.warning(f"Could not read cache entry for {url}: {e}. Treating it as a miss.")
+            return None
+        except (zlib.error, ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not read corrupted cache entry for {url}. Removing it. Error: {e}")
+            self._forget([key])
+            self._delete_keys([key])
+            return None
+
+    def _store_entry(self, url: str, cache_entry: Dict[str, Any]) -> bool:
+        encoded = self._encode_row(url, cache_entry)
+        if encoded is None:
+            return False
+        row, body_row = encoded
+        with self._lock:
+            if self._connection is None:
+                logger.error(f"Could not write cache entry for {url}: the cache database is closed.")
+                return False
+            if body_row is not None:
+                self._pending_bodies[body_row[0]] = body_row
+            self._pending[row[0]] = row
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+                return self.flush()
+        return True
+
+    def _delete_keys(self, keys, not_newer_than: Optional[float] = None):
+        # Entries written after not_newer_than, here or by another process, are kept.
+        cutoff = float('inf') if not_newer_than is None else not_newer_than
+        rows = [(key, cutoff) for key in keys]
+        with self._lock:
+            for key in keys:
+                if key in self._pending and self._pending[key][2] <= cutoff:
+                    del self._pending[key]
+            if self._connection is None:
+                return
+            # Buffered entries may reference bodies the deleted entries shared; commit them first.
+            self.flush()
+            with self._connection:
+                digests = {
+                    row[0] for key, cutoff in rows
+                    for row in self._connection.execute(
+                        'SELECT content_hash FROM cache_entries WHERE key = ? AND timestamp <= ? AND codec = ?', (key, cutoff, REF_CODEC)
+                    )
+                }
+                self._connection.executemany('DELETE FROM cache_entries WHERE key = ? AND timestamp <= ?', rows)
+                self._connection.executemany(
+                    'DELETE FROM cache_bodies WHERE content_hash = ? AND NOT EXISTS '
+                    '(SELECT 1 FROM cache_entries WHERE content_hash = ?)',
+                    [(digest, digest) for digest in digests]
+                )
+
+    def flush(self) -> bool:
+        """
+        Commits the buffered writes in a single transaction.
+
+        Returns:
+            True on success. On failure the writes stay buffered for the next flush.
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending or self._connection is None:
+                return True
+            try:
+                with self._connection:
+                    self._connection.executemany(INSERT_BODY, list(self._pending_bodies.values()))
+                    self._connection.executemany(UPSERT, list(self._pending.values()))
+            except sqlite3.Error as e:
+                logger.error(f"Could not write {len(self._pending)} entries to the cache database {self.db_path}: {e}")
+                return False
+            logger.debug(f"Committed {len(self._pending)} cache entries to {self.db_path}.")
+            self._pending.clear()
+            self._pending_bodies.clear()
+            return True
+
+    def clear_expired_cache(self):
+        """Removes all expired entries that are not kept for revalidation."""
+        logger.info("Clearing expired cache entries...")
+        if self.expiry_policy == 'revalidate':
+            logger.info("Cleared 0 expired cache entries.")
+            return
+        query = 'DELETE FROM cache_entries WHERE timestamp < ?'
+        params: tuple = (time.time() - self.cache_ttl_seconds,)
+        if self.revalidate_year_range:
+            query += ' AND (year IS NULL OR year NOT BETWEEN ? AND ?)'
+            params += tuple(self.revalidate_year_range)
+        self._forget()
+        with self.locks.hold(MAINTENANCE), self._lock:
+            self.flush()
+            with self._connection:
+                cleared_count = self._connection.execute(query, params).rowcount
+                self._connection.execute(COLLECT_BODIES)
+        logger.info(f"Cleared {cleared_count} expired cache entries.")
+
+    def clear_all_cache(self):
+        """Removes all entries from the cache database."""
+        logger.warning("Clearing all cache entries...")
+        self._forget()
+        with self.locks.hold(MAINTENANCE), self._lock:
+            self._pending.clear()
+            self._pending_bodies.clear()
+            with self._connection:
+                cleared_count = self._connection.execute('DELETE FROM cache_entries').rowcount
+                self._connection.execute('DELETE FROM cache_bodies')
+        logger.info(f"Cleared {cleared_count} cache entries.")
+
+    def evict(self, max_bytes: int) -> int:
+        """Removes the oldest entries until the uncompressed bodies fit in max_bytes. Returns the number removed."""
+        with self.locks.hold(MAINTENANCE), self._lock:
+            self.flush()
+            keys = eviction_keys(self._connection, 'cache_entries', max_bytes)
+            self._forget(keys)
+            self._delete_keys(keys)
+        if keys:
+            logger.info(f"Evicted {len(keys)} cache entries to fit in {max_bytes} bytes.")
+        return len(keys)
+
+    def _stored_urls(self):
+        with self._lock:
+            self.flush()
+            urls = [row[0] for row in self._connection.execute('SELECT url FROM cache_entries')]
+        return iter(urls)
+
+    def rebuild_index(self):
+        """Nothing to rebuild: the index columns are written with every entry."""
+
+    def _persist_lookups(self):
+        with self._connection:
+            add_counters(self._connection, {f'lookup_{result}': count for result, count in self._take_lookups().items()})
+
+    def _index_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self.flush()
+            self._persist_lookups()
+            return read_stats(self._connection, 'cache_entries')
+
+    def close(self):
+        """Commits the buffered writes and lookup counters and closes the database. Safe to call more than once."""
+        with self._lock:
+            if self._connection is None:
+                return
+            self._close_tiers()
+            self.flush()
+            self._persist_lookups()
+            self._connection.close()
+            self._connection = None
+        atexit.unregister(self.close)
+
+def migrate_pickle_cache(cache_dir: Path, target: SQLiteCacheManager) -> Dict[str, int]:
+    """
+    Copies every entry of a pickle cache directory into a SQLiteCacheManager, keeping the
+    original timestamps and metadata. The source directory is left untouched.
+
+    Only pickles written by CacheManager are read, so the directory must be trusted.
+
+    Args:
+        cache_dir: The pickle cache directory.
+        target: The cache to fill.
+
+    Returns:
+        A dictionary with the number of 'migrated' and 'skipped' (unreadable or invalid) files.
+    """
+    counts = {'migrated': 0, 'skipped': 0}
+    if not cache_dir.is_dir():
+        logger.warning(f"Pickle cache directory {cache_dir} does not exist. Nothing to migrate.")
+        return counts
+    for cache_file in cache_dir.iterdir():
+        if not cache_file.is_file() or not CACHE_FILE_PATTERN.match(cache_file.name):
+            continue
+        try:
+            with open(cache_file, 'rb') as f:
+                cache_entry = pickle.load(f)
+            url = cache_entry['url']
+            digest = cache_entry.pop('content_ref', None)
+            if digest is not None: # A deduplicated body
+                cache_entry['content'] = (cache_dir / BODIES_DIR / digest).read_bytes().decode('utf-8')
+        except (pickle.UnpicklingError, EOFError, OSError, UnicodeDecodeError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Skipping unreadable cache file {cache_file.name}: {e}")
+            counts['skipped'] += 1
+            continue
+        if target._write_entry(url, cache_entry):
+            counts['migrated'] += 1
+        else:
+            counts['skipped'] += 1
+    target.flush()
+    logger.info(f"Migrated {counts['migrated']} cache entries from {cache_dir} to {target.db_path} ({counts['skipped']} skipped).")
+    return counts
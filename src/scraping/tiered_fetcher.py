@@ -0,0 +1,231 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from src.scraping.async_fetcher import AsyncFetcher
+from src.scraping.bot_detection import detect_bot_challenge
+from src.scraping.playwright_client import BROWSER_USER_AGENT, READINESS_SELECTOR, PlaywrightClient
+from src.scraping.playwright_pool import PlaywrightPagePool, build_browser_client
+from src.scraping.rate_limiter import AdaptiveRateLimiter
+from src.scraping.web_client import WebClient
+from src.utils.metrics import metrics
+
+# Names of the tiers, as reported by TieredFetcher.tier_counts.
+HTTP_TIER = 'http'
+BROWSER_TIER = 'browser'
+FAILED = 'failed'
+
+def load_cookie_file(http_client: Union[WebClient, AsyncFetcher], cookie_file: Path) -> bool:
+    """
+    Loads the browser cookies exported to a cookie file into an HTTP client.
+
+    Args:
+        http_client: A client with a `load_cookies` method, e.g. a WebClient or an AsyncFetcher.
+        cookie_file: The JSON file written by TieredFetcher.sync_cookies.
+
+    Returns:
+        Whether the cookies were loaded; False if the file is missing or unreadable.
+    """
+    if not cookie_file.exists():
+        return False
+    try:
+        with open(cookie_file, 'r', encoding='utf-8') as f:
+            cookies = json.load(f)
+        http_client.load_cookies(cookies)
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        logger.warning(f"Could not load browser cookies from {cookie_file}: {e}")
+        return False
+    logger.info(f"Loaded {len(cookies)} browser cookies from {cookie_file}.")
+    return True
+
+class TieredFetcher:
+    """
+    Fetches pages over plain HTTP first and escalates to the browser only when the HTTP
+    response is missing, is a bot-protection challenge or does not look like a transcript.
+
+    The HTTP session reuses the cookies of the persistent browser context, so pages behind
+    an already passed bot check are served without rendering. The browser is started lazily,
+    on the first escalation, when the cookies can be loaded from the cookie file.
+    """
+
+    def __init__(
+        self,
+        http_client: WebClient,
+        browser_client: Union[PlaywrightClient, PlaywrightPagePool],
+        cookie_file: Optional[Path] = None
+    ):
+        """
+        Initializes the TieredFetcher.
+
+        Args:
+            http_client: The WebClient serving the first tier. Its User-Agent should match the
+                         browser's, because the bot-protection cookies are bound to it.
+            browser_client: The browser client that escalated URLs are rendered with.
+            cookie_file: An optional JSON file the browser cookies are exported to and loaded from.
+        """
+        self.http_client = http_client
+        self.browser_client = browser_client
+        self.cookie_file = cookie_file
+        self.tier_counts = {HTTP_TIER: 0, BROWSER_TIER: 0, FAILED: 0}
+        self._browser_started = False
+        self._lock = threading.Lock()
+        self._cookie_lock = threading.Lock()
+
+    def start(self):
+        """Loads the exported cookies, starting the browser to export them if there is no cookie file."""
+        if self.cookie_file and load_cookie_file(self.http_client, self.cookie_file):
+            return
+        self._ensure_browser()
+
+    def _ensure_browser(self):
+        """Starts the browser client on first use and copies its cookies to the HTTP session."""
+        with self._lock:
+            if self._browser_started:
+                return
+            self.browser_client.start()
+            self._browser_started = True
+        self.sync_cookies()
+
+    def sync_cookies(self):
+        """Copies the browser context's cookies to the HTTP session and the cookie file."""
+        with self._cookie_lock:
+            cookies: List[Dict] = self.browser_client.export_cookies()
+            self.http_client.load_cookies(cookies)
+            if self.cookie_file:
+                self.cookie_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.cookie_file, 'w', encoding='utf-8') as f:
+                    json.dump(cookies, f)
+        logger.debug(f"Synchronized {len(cookies)} cookies from the browser context.")
+
+    @staticmethod
+    def _escalation_reason(content: Optional[str]) -> Optional[str]:
+        """
+        Decides whether an HTTP response must be escalated to the browser.
+
+        Returns:
+            A human-readable reason for escalating, or None if the content can be used as is.
+        """
+        if not content:
+            return "HTTP request failed"
+        signature = detect_bot_challenge(content)
+        if signature:
+            return f"bot protection detected ('{signature}')"
+        if BeautifulSoup(content, 'lxml').select_one(READINESS_SELECTOR) is None:
+            return "no transcript content found"
+        return None
+
+    def _count(self, tier: str):
+        """Increments the counter of a tier."""
+        with self._lock:
+            self.tier_counts[tier] += 1
+        metrics.inc('tiered_fetches_total', tier=tier)
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        Fetches a URL, escalating to the browser only if plain HTTP does not yield a transcript.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            The page HTML, or None if both tiers failed.
+        """
+        return self.fetch_with_headers(url)[0]
+
+    def fetch_with_headers(self, url: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """Fetches a URL like `fetch`, also returning the response headers."""
+        content, headers = self.http_client.fetch_with_headers(url)
+        reason = self._escalation_reason(content)
+        if reason is None:
+            self._count(HTTP_TIER)
+            return content, headers
+
+        logger.info(f"Escalating {url} to the browser: {reason}.")
+        self._ensure_browser()
+        content, headers = self.browser_client.fetch_with_headers(url)
+        if not content:
+            self._count(FAILED)
+            return None, {}
+
+        self._count(BROWSER_TIER)
+        # The browser may have passed a challenge and received new cookies; share them with the HTTP tier.
+        self.sync_cookies()
+        return content, headers
+
+    def fetch_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Tuple[Optional[int], Optional[str], Dict[str, str]]:
+        """
+        Revalidates a URL over plain HTTP, falling back to the browser context's request API
+        when the HTTP request fails or is answered with a bot-protection challenge.
+        See WebClient.fetch_conditional for the return value.
+        """
+        status, body, headers = self.http_client.fetch_conditional(url, etag, last_modified)
+        if status is not None and not detect_bot_challenge(body):
+            return status, body, headers
+
+        self._ensure_browser()
+        return self.browser_client.fetch_conditional(url, etag, last_modified)
+
+    def log_tier_report(self):
+        """Logs how many fetches were served by each tier."""
+        total = sum(self.tier_counts.values())
+        logger.info(
+            f"Tiered fetch report: {self.tier_counts[HTTP_TIER]} served over HTTP, "
+            f"{self.tier_counts[BROWSER_TIER]} escalated to the browser, {self.tier_counts[FAILED]} failed "
+            f"({total} fetches)."
+        )
+
+    def close(self):
+        """Reports the tier usage and closes the browser if it was started."""
+        self.log_tier_report()
+        if self._browser_started:
+            self.browser_client.close()
+            self._browser_started = False
+
+def supports_concurrent_fetches(client) -> bool:
+    """
+    Returns whether a fetch client may be driven from several threads: a PlaywrightPagePool,
+    directly or as the browser tier of a TieredFetcher. A sync PlaywrightClient only works on
+    the thread that started it.
+    """
+    if isinstance(client, TieredFetcher):
+        client = client.browser_client
+    return isinstance(client, PlaywrightPagePool)
+
+def build_fetch_client(
+    config: dict,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
+) -> Union[TieredFetcher, PlaywrightClient, PlaywrightPagePool]:
+    """
+    Creates the client fetching session pages, as selected by the 'fetch_strategy' setting:
+    'tiered' tries plain HTTP first, 'browser' always renders in the browser.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+        rate_limiter: An optional AdaptiveRateLimiter shared by the HTTP and browser tiers.
+
+    Returns:
+        The configured, not yet started, fetch client.
+    """
+    scraping_config = config['scraping']
+    browser_client = build_browser_client(config, rate_limiter)
+    if scraping_config.get('fetch_strategy', 'browser') != 'tiered':
+        return browser_client
+
+    http_client = WebClient(
+        user_agent=BROWSER_USER_AGENT, # Must match the browser for its cookies to stay valid
+        timeout=scraping_config.get('timeout', 30),
+        max_retries=scraping_config.get('retry_count', 3),
+        backoff_factor=scraping_config.get('retry_delay', 1.0),
+        rate_limit_delay=scraping_config.get('rate_limit_delay', 0.5),
+        rate_limiter=rate_limiter
+    )
+    cookie_file = config['paths'].get('cookie_file')
+    return TieredFetcher(http_client, browser_client, Path(cookie_file) if cookie_file else None)
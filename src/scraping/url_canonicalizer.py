@@ -0,0 +1,109 @@
+import re
+from typing import Iterable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# A Lotus Notes document UNID: 32 hex digits.
+NOTES_UNID = re.compile(r'^[0-9a-f]{32}$', re.IGNORECASE)
+
+# Domino URL commands are case-insensitive; they are rewritten to their documented spelling.
+NOTES_COMMANDS = {
+    command.lower(): command
+    for command in ('OpenDocument', 'OpenView', 'OpenForm', 'OpenNavigator', 'OpenAgent', 'OpenPage',
+                    'OpenDatabase', 'OpenFrameset', 'OpenElement', 'ReadForm', 'EditDocument')
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+class UrlCanonicalizer:
+    """
+    Rewrites the variants under which the same Sejm page is reachable into one canonical URL,
+    used for cache keys (the page is still fetched from the URL as given).
+
+    Lotus Notes serves a document under every view: /Debata1.nsf/<view>/<unid> is the same page
+    for any view GUID or name, and Domino accepts the view '0' for "any view". Commands such as
+    ?OpenDocument are case-insensitive, as are the host and the database name.
+    """
+
+    def __init__(
+        self,
+        force_https: bool = False,
+        collapse_notes_views: bool = True,
+        drop_query_params: Optional[Iterable[str]] = None
+    ):
+        """
+        Initializes the UrlCanonicalizer.
+
+        Args:
+            force_https: Whether http:// URLs are keyed as https://.
+            collapse_notes_views: Whether the view segment before a document UNID is replaced by '0'.
+            drop_query_params: Query parameters that do not change the page (compared case-insensitively).
+        """
+        self.force_https = force_https
+        self.collapse_notes_views = collapse_notes_views
+        self.drop_query_params = {param.lower() for param in (drop_query_params or [])}
+
+    def _canonical_path(self, path: str) -> str:
+        segments = path.split('/')
+        for index, segment in enumerate(segments):
+            if not segment.lower().endswith('.nsf'):
+                continue
+            segments[index] = segment.lower()
+            document = index + 2
+            if document < len(segments) and NOTES_UNID.match(segments[document]):
+                if self.collapse_notes_views:
+                    segments[index + 1] = '0'
+                segments[document] = segments[document].lower()
+            break
+        return '/'.join(segments)
+
+    def _canonical_query(self, query: str) -> str:
+        parts = []
+        for part in query.split('&'):
+            if not part:
+                continue
+            name = part.split('=', 1)[0]
+            if '=' not in part and not parts:
+                parts.append(NOTES_COMMANDS.get(part.lower(), part)) # The leading Domino command
+            elif name.lower() not in self.drop_query_params:
+                parts.append(part)
+        return '&'.join(parts)
+
+    def canonicalize(self, url: str) -> str:
+        """
+        Returns the canonical form of a URL.
+
+        Args:
+            url: An absolute URL.
+
+        Returns:
+            The URL with a lower-case scheme, host and database name, no default port or fragment,
+            the Domino command in its documented spelling, the dropped parameters removed and,
+            for Notes documents, the view replaced by '0'.
+        """
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').lower()
+        if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{parts.port}"
+        if self.force_https and scheme == 'http':
+            scheme = 'https'
+        return urlunsplit((scheme, host, self._canonical_path(parts.path), self._canonical_query(parts.query), ''))
+
+def build_url_canonicalizer(config: dict) -> Optional[UrlCanonicalizer]:
+    """
+    Creates the UrlCanonicalizer described by the 'cache.canonicalize_urls' settings.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+
+    Returns:
+        The UrlCanonicalizer, or None if canonicalization is disabled.
+    """
+    settings = config.get('cache', {}).get('canonicalize_urls', {})
+    if not settings.get('enabled', False):
+        return None
+    return UrlCanonicalizer(
+        force_https=settings.get('force_https', False),
+        collapse_notes_views=settings.get('collapse_notes_views', True),
+        drop_query_params=settings.get('drop_query_params', [])
+    )
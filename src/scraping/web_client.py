@@ -1,6 +1,42 @@
 import time
+from typing import Dict, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 
+from src.scraping.bot_detection import detect_bot_challenge
+from src.scraping.rate_limiter import THROTTLE_STATUS_CODES, AdaptiveRateLimiter
+from src.utils.metrics import metrics
+
+# Headers sent with every plain HTTP request, shared by the synchronous and asynchronous clients.
+DEFAULT_HEADERS = {
+    'Accept-Language': 'pl-PL,pl;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Accept-Encoding': 'gzip, deflate',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Connection': 'keep-alive'
+}
+
+def load_browser_cookies(session: requests.Session, cookies: List[Dict]):
+    """
+    Loads cookies exported from a browser context (Playwright's cookie format) into a requests session.
+
+    Args:
+        session: The session to load the cookies into.
+        cookies: A list of cookie dictionaries with 'name', 'value', 'domain' and 'path' keys.
+    """
+    for cookie in cookies:
+        expires = cookie.get('expires')
+        session.cookies.set(
+            cookie['name'],
+            cookie['value'],
+            domain=cookie.get('domain', ''),
+            path=cookie.get('path', '/'),
+            secure=cookie.get('secure', False),
+            expires=int(expires) if expires and expires > 0 else None
+        )
+    logger.debug(f"Loaded {len(cookies)} cookies into the HTTP session.")
+
 class WebClient:
     """A robust HTTP client for scraping web pages with session management, retries, and rate limiting."""
 
@@ -10,7 +46,8 @@ class WebClient:
         timeout: int = 30,
         max_retries: int = 3,
         backoff_factor: float = 1.0,
-        rate_limit_delay: float = 0.5
+        rate_limit_delay: float = 0.5,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None
     ):
         """
         Initializes the WebClient.
@@ -21,35 +58,45 @@ class WebClient:
             max_retries: The maximum number of retry attempts.
             backoff_factor: The backoff factor for exponential backoff between retries.
             rate_limit_delay: The minimum delay in seconds between consecutive requests.
+            rate_limiter: An optional shared AdaptiveRateLimiter. When given, it replaces the fixed
+                          `rate_limit_delay` and is informed of every response.
         """
         self.user_agent = user_agent
         self.timeout = timeout
         self.rate_limit_delay = rate_limit_delay
+        self.rate_limiter = rate_limiter
         self.last_request_time = 0
 
         # Set up a requests session
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.user_agent,
-            'Accept-Language': 'pl-PL,pl;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Connection': 'keep-alive'
-        })
+        self.session.headers.update({'User-Agent': self.user_agent, **DEFAULT_HEADERS})
 
         # Configure retry strategy
         retry_strategy = Retry(
             total=max_retries,
             backoff_factor=backoff_factor,
             status_forcelist=[429, 500, 502, 503, 504], # Status codes to trigger a retry
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
+            allowed_methods=["HEAD", "GET", "OPTIONS"],
+            raise_on_status=False # Return the last response so its status reaches the rate limiter
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
+    def load_cookies(self, cookies: List[Dict]):
+        """
+        Loads cookies exported from a browser context (Playwright's cookie format) into the session.
+
+        Args:
+            cookies: A list of cookie dictionaries with 'name', 'value', 'domain' and 'path' keys.
+        """
+        load_browser_cookies(self.session, cookies)
+
     def _apply_rate_limit(self):
         """Ensures that requests do not exceed the defined rate limit."""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+            return
         elapsed_time = time.time() - self.last_request_time
         if elapsed_time < self.rate_limit_delay:
             sleep_time = self.rate_limit_delay - elapsed_time
@@ -57,6 +104,38 @@ class WebClient:
             time.sleep(sleep_time)
         self.last_request_time = time.time()
 
+    def _record_outcome(self, response: Optional[requests.Response], latency: float):
+        """
+        Records a request's outcome in the metrics and reports it to the shared rate limiter,
+        including the throttled attempts that the retry strategy already absorbed.
+
+        Args:
+            response: The final response, or None if the request raised an exception.
+            latency: The wall-clock duration of the request including retries, in seconds.
+        """
+        metrics.observe('http_request_seconds', latency, client='web')
+        if response is None:
+            metrics.inc('http_requests_total', client='web', status='error')
+            if self.rate_limiter:
+                self.rate_limiter.record(latency=latency)
+            return
+        metrics.inc('http_requests_total', client='web', status=response.status_code)
+        metrics.inc('http_response_bytes_total', len(response.content), client='web')
+        retries = getattr(response.raw, 'retries', None)
+        history = getattr(retries, 'history', None) or ()
+        if history:
+            metrics.inc('http_retries_total', len(history), client='web')
+        if not self.rate_limiter:
+            return
+        for attempt in history:
+            if attempt.status in THROTTLE_STATUS_CODES:
+                self.rate_limiter.record(status=attempt.status)
+        self.rate_limiter.record(
+            status=response.status_code,
+            latency=latency,
+            challenge=detect_bot_challenge(response.text) is not None
+        )
+
     def fetch(self, url: str) -> Optional[str]:
         """
         Fetches the content of a given URL.
@@ -67,17 +146,71 @@ class WebClient:
         Returns:
             The text content of the response, or None if the request fails.
         """
+        return self.fetch_with_headers(url)[0]
+
+    def fetch_with_headers(self, url: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Fetches the content of a given URL together with the response headers.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            A tuple of the text content (None if the request fails) and the response headers.
+        """
         self._apply_rate_limit()
         logger.info(f"Fetching URL: {url}")
 
+        start_time = time.monotonic()
         try:
             response = self.session.get(url, timeout=self.timeout)
+            self._record_outcome(response, time.monotonic() - start_time)
             response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
 
             # The response content is already decoded by requests
             logger.info(f"Successfully fetched {url}. Response size: {len(response.text)} characters.")
-            return response.text
+            return response.text, dict(response.headers)
         
         except requests.exceptions.RequestException as e:
+            if e.response is None:
+                self._record_outcome(None, time.monotonic() - start_time)
             logger.error(f"Failed to fetch {url} after multiple retries. Error: {e}")
-            return None
+            return None, {}
+
+    def fetch_conditional(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Tuple[Optional[int], Optional[str], Dict[str, str]]:
+        """
+        Revalidates a previously fetched URL with a conditional GET.
+
+        Args:
+            url: The URL to revalidate.
+            etag: The ETag of the cached copy, sent as If-None-Match.
+            last_modified: The Last-Modified value of the cached copy, sent as If-Modified-Since.
+
+        Returns:
+            A tuple of the status code (None if the request failed), the new body (only for a
+            200 response) and the response headers. A 304 status means the cached copy is current.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        self._apply_rate_limit()
+        logger.info(f"Revalidating URL: {url}")
+        start_time = time.monotonic()
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            self._record_outcome(None, time.monotonic() - start_time)
+            logger.error(f"Failed to revalidate {url}. Error: {e}")
+            return None, None, {}
+
+        self._record_outcome(response, time.monotonic() - start_time)
+        body = response.text if response.status_code == 200 else None
+        return response.status_code, body, dict(response.headers)
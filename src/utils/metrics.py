@@ -0,0 +1,236 @@
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+from loguru import logger
+
+# Default histogram buckets: latencies in seconds and payload sizes in bytes.
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Turns keyword labels into a hashable, sorted key."""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(label_key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Formats a label key in the Prometheus exposition syntax."""
+    pairs = list(label_key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (
+        f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+class Histogram:
+    """A cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1) # The last slot counts values above every bucket
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        """Returns (upper bound, cumulative count) pairs, ending with +Inf."""
+        total = 0
+        for bound, count in zip(list(self.buckets) + [float('inf')], self.counts):
+            total += count
+            yield bound, total
+
+class MetricsRegistry:
+    """
+    A thread-safe, process-wide collection of counters, gauges and histograms describing
+    the scraper's throughput. Components record into the shared `metrics` instance and a
+    MetricsReporter periodically dumps it to a JSON or Prometheus textfile.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increments a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Sets a gauge to its current value."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels):
+        """
+        Records a value in a histogram.
+
+        Args:
+            name: The histogram name, e.g. 'scraper_fetch_seconds'.
+            value: The observed value.
+            buckets: The bucket upper bounds, used when the series is first created.
+            **labels: The label values identifying the series.
+        """
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+
+    def counter_value(self, name: str, **labels) -> float:
+        """Returns the current value of a counter series (0 if it was never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def reset(self):
+        """Drops every recorded series."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns all series as a JSON-serializable dictionary."""
+        def labelled(key: LabelKey) -> Dict[str, str]:
+            return dict(key)
+
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'uptime_seconds': time.time() - self.started_at,
+                'counters': {
+                    name: [{'labels': labelled(key), 'value': value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                'gauges': {
+                    name: [{'labels': labelled(key), 'value': value} for key, value in series.items()]
+                    for name, series in self._gauges.items()
+                },
+                'histograms': {
+                    name: [
+                        {
+                            'labels': labelled(key),
+                            'count': histogram.count,
+                            'sum': histogram.sum,
+                            'buckets': {str(bound): count for bound, count in histogram.cumulative_counts()}
+                        }
+                        for key, histogram in series.items()
+                    ]
+                    for name, series in self._histograms.items()
+                }
+            }
+
+    def to_prometheus(self) -> str:
+        """Renders all series in the Prometheus text exposition format (for the node_exporter textfile collector)."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{_format_labels(key)} {value}" for key, value in series.items())
+            for name, series in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{_format_labels(key)} {value}" for key, value in series.items())
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in series.items():
+                    for bound, count in histogram.cumulative_counts():
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', le))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Path):
+        """
+        Writes the metrics atomically, as a Prometheus textfile if the path ends in '.prom'
+        and as JSON otherwise.
+
+        Args:
+            path: The output file.
+        """
+        content = self.to_prometheus() if path.suffix == '.prom' else json.dumps(self.snapshot(), indent=2)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.error(f"Could not write metrics to {path}: {e}")
+
+# The registry shared by every component of the scraper.
+metrics = MetricsRegistry()
+
+class MetricsReporter:
+    """Dumps a MetricsRegistry to a file at a fixed interval from a background thread."""
+
+    def __init__(self, path: Path, interval_seconds: float = 30, registry: MetricsRegistry = metrics):
+        """
+        Initializes the MetricsReporter.
+
+        Args:
+            path: The output file; '.prom' selects the Prometheus textfile format, anything else JSON.
+            interval_seconds: The number of seconds between two dumps.
+            registry: The registry to dump.
+        """
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.registry = registry
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            self.registry.write(self.path)
+
+    def start(self):
+        """Starts the periodic dumps."""
+        if self._thread:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-reporter', daemon=True)
+        self._thread.start()
+        logger.info(f"Writing scraper metrics to {self.path} every {self.interval_seconds} seconds.")
+
+    def stop(self):
+        """Stops the periodic dumps and writes the final state."""
+        if self._thread:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        self.registry.write(self.path)
+        logger.info(f"Final scraper metrics written to {self.path}.")
+
+def build_metrics_reporter(config: dict) -> Optional[MetricsReporter]:
+    """
+    Creates the MetricsReporter described by the 'metrics' settings.
+
+    Args:
+        config: A dictionary containing application settings from settings.yaml.
+
+    Returns:
+        The MetricsReporter, or None if metrics dumping is disabled.
+    """
+    metrics_config = config.get('metrics', {})
+    if not metrics_config.get('enabled', False):
+        return None
+    return MetricsReporter(
+        Path(metrics_config.get('path', Path(config['paths']['log_dir']) / 'scraper_metrics.json')),
+        interval_seconds=metrics_config.get('interval_seconds', 30)
+    )
@@ -1,5 +1,7 @@
 import re
 import unicodedata
+from typing import Dict, List, Sequence, Union
+import pandas as pd
 
 class TextCleaner:
     """A utility class for cleaning and normalizing text content."""
@@ -8,24 +10,57 @@ class TextCleaner:
     HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
     # Regex to find and remove all bracketed content, like (Oklaski) or (Początek posiedzenia...)
     BRACKET_INFO_PATTERN = re.compile(r'\s*\([^)]*\)\s*')
+    # The bracket itself: a match extends backwards over the whitespace before it, like BRACKET_INFO_PATTERN's
+    # leading \s*, which makes the regex engine start a match attempt at every whitespace character
+    BRACKET_PATTERN = re.compile(r'\([^)]*\)\s*')
     # Regex to find and remove stray metadata, e.g., 'POS: 1 DZIEN: 1'
     METADATA_PATTERN = re.compile(r'\b([A-Z0-9]+:\s*.*?)(?=\s[A-Z0-9]+:|$)')
+    # Every metadata match contains this; most texts do not, and skip METADATA_PATTERN
+    METADATA_HINT_PATTERN = re.compile(r'[A-Z0-9]:')
     # Regex for multiple whitespace characters
     WHITESPACE_PATTERN = re.compile(r'\s+')
 
+    # The HTML entities that are decoded, in a single pass. The entities used to be replaced one
+    # after the other, &amp; before &lt; and &gt;, so '&amp;lt;' and '&amp;gt;' decode twice.
+    HTML_ENTITIES = {
+        '&nbsp;': ' ', '&quot;': '"', '&amp;': '&', '&lt;': '<', '&gt;': '>', '&amp;lt;': '<', '&amp;gt;': '>'
+    }
+    # Longest entities first, so '&amp;lt;' wins over '&amp;'
+    HTML_ENTITY_PATTERN = re.compile('|'.join(re.escape(entity) for entity in sorted(HTML_ENTITIES, key=len, reverse=True)))
+
+    @staticmethod
+    def _decode_entity(match: re.Match) -> str:
+        return TextCleaner.HTML_ENTITIES[match.group()]
+
+    @staticmethod
+    def remove_bracket_info(text: str) -> str:
+        """Replaces bracketed content and the whitespace around it with a space, as BRACKET_INFO_PATTERN.sub(' ', text)."""
+        parts = []
+        end = 0
+        for match in TextCleaner.BRACKET_PATTERN.finditer(text):
+            start = match.start()
+            # The whitespace before the bracket, unless the previous match took it
+            while start > end and text[start - 1].isspace():
+                start -= 1
+            parts.append(text[end:start])
+            parts.append(' ')
+            end = match.end()
+        if not parts:
+            return text
+        parts.append(text[end:])
+        return ''.join(parts)
+
     @staticmethod
     def remove_html_tags(text: str) -> str:
         """Removes HTML tags and entities from a string."""
         if not text:
             return ""
         # Replace common HTML entities
-        text = text.replace('&nbsp;', ' ')
-        text = text.replace('&quot;', '"')
-        text = text.replace('&amp;', '&')
-        text = text.replace('&lt;', '<')
-        text = text.replace('&gt;', '>')
+        if '&' in text:
+            text = TextCleaner.HTML_ENTITY_PATTERN.sub(TextCleaner._decode_entity, text)
         # Remove all HTML tags
-        text = TextCleaner.HTML_TAG_PATTERN.sub('', text)
+        if '<' in text:
+            text = TextCleaner.HTML_TAG_PATTERN.sub('', text)
         return text
 
     @staticmethod
@@ -33,6 +68,8 @@ class TextCleaner:
         """Normalizes unicode characters to a consistent form (NFC)."""
         if not text:
             return ""
+        if text.isascii() or unicodedata.is_normalized('NFC', text):
+            return text
         return unicodedata.normalize('NFC', text)
 
     @staticmethod
@@ -57,17 +94,45 @@ class TextCleaner:
 
         if remove_html:
             text = TextCleaner.remove_html_tags(text)
-        
+
         # Remove all bracketed content (e.g., applause, session times)
-        text = TextCleaner.BRACKET_INFO_PATTERN.sub(' ', text)
+        if '(' in text:
+            text = TextCleaner.remove_bracket_info(text)
 
         # Remove stray metadata patterns
-        text = TextCleaner.METADATA_PATTERN.sub('', text)
+        if ':' in text and TextCleaner.METADATA_HINT_PATTERN.search(text):
+            text = TextCleaner.METADATA_PATTERN.sub('', text)
 
         if normalize_chars:
             text = TextCleaner.normalize_polish_chars(text)
 
-        # Replace multiple whitespace characters with a single space and strip leading/trailing whitespace
-        text = TextCleaner.WHITESPACE_PATTERN.sub(' ', text).strip()
+        # Replace multiple whitespace characters with a single space and strip leading/trailing
+        # whitespace (str.split splits on exactly the characters \s matches)
+        return ' '.join(text.split())
 
-        return text
+    @staticmethod
+    def clean_texts(
+        texts: Union[Sequence[str], pd.Series],
+        remove_html: bool = True,
+        normalize_chars: bool = True
+    ) -> Union[List[str], pd.Series]:
+        """
+        Applies clean_text to many strings at once, cleaning each distinct string only once.
+
+        Args:
+            texts: A list of strings or a pandas Series; missing values are cleaned to "".
+            remove_html: Whether to remove HTML tags and entities.
+            normalize_chars: Whether to normalize unicode characters.
+
+        Returns:
+            The cleaned strings, as a list or as a Series with the same index and name.
+        """
+        values = texts.tolist() if isinstance(texts, pd.Series) else list(texts)
+        cleaned: Dict[str, str] = {}
+        for value in values:
+            if value not in cleaned:
+                cleaned[value] = TextCleaner.clean_text(value, remove_html, normalize_chars) if isinstance(value, str) else ""
+        results = [cleaned[value] for value in values]
+        if isinstance(texts, pd.Series):
+            return pd.Series(results, index=texts.index, name=texts.name, dtype=object)
+        return results
@@ -0,0 +1,147 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import time
+import pytest
+
+from src.benchmark.mock_sejm_server import FaultProfile, MockSejmServer
+from src.scraping.async_fetcher import AsyncFetcher
+from src.scraping.cache_manager import CacheManager
+from src.scraping.rate_limiter import AdaptiveRateLimiter
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves small HTML pages, failing '/flaky' once and tracking concurrency."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    flaky_calls = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(0.05)
+            if self.path == '/missing':
+                self.send_response(404)
+                self.end_headers()
+                return
+            if self.path == '/flaky':
+                with cls.lock:
+                    cls.flaky_calls += 1
+                    first_call = cls.flaky_calls == 1
+                if first_call:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+            body = f"<html><body>{self.path}</body></html>".encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Runs the stub HTTP server on a free local port."""
+    StubHandler.in_flight = 0
+    StubHandler.max_in_flight = 0
+    StubHandler.flaky_calls = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    cache_manager = CacheManager(cache_dir=tmp_path / 'cache')
+    return AsyncFetcher(
+        user_agent='test-agent',
+        cache_manager=cache_manager,
+        max_retries=2,
+        backoff_factor=0.01,
+        requests_per_second=200.0,
+        burst=10,
+        max_in_flight_per_host=3
+    )
+
+
+class TestAsyncFetcher:
+    def test_fetches_batch_and_writes_cache(self, stub_server, fetcher):
+        urls = [f"{stub_server}/page/{i}" for i in range(12)]
+        summary = fetcher.fetch_batch(urls + urls[:3])
+
+        assert summary['succeeded'] == 12
+        assert summary['failed'] == 0
+        assert summary['requests'] == 12
+        assert summary['requests_per_second'] > 0
+        assert fetcher.cache_manager.get_from_cache(urls[5]) == '<html><body>/page/5</body></html>'
+
+    def test_respects_max_in_flight_per_host(self, stub_server, fetcher):
+        fetcher.fetch_batch([f"{stub_server}/page/{i}" for i in range(12)])
+        assert 1 <= StubHandler.max_in_flight <= 3
+
+    def test_skips_cached_urls(self, stub_server, fetcher):
+        url = f"{stub_server}/page/cached"
+        fetcher.cache_manager.save_to_cache(url, '<html>cached</html>')
+        summary = fetcher.fetch_batch([url])
+
+        assert summary['cached'] == 1
+        assert summary['requests'] == 0
+
+    def test_retries_retryable_status_and_gives_up_on_client_errors(self, stub_server, fetcher):
+        summary = fetcher.fetch_batch([f"{stub_server}/flaky", f"{stub_server}/missing"])
+
+        assert summary['results'][f"{stub_server}/flaky"] is not None
+        assert summary['results'][f"{stub_server}/missing"] is None
+        assert summary['retries'] == 1
+        assert summary['failed'] == 1
+
+    def test_token_bucket_limits_rate(self, stub_server, fetcher):
+        fetcher.requests_per_second = 20.0
+        fetcher.burst = 1
+        summary = fetcher.fetch_batch([f"{stub_server}/page/{i}" for i in range(6)])
+        # Five refills at 20 tokens/s take at least 0.25 seconds.
+        assert summary['elapsed_seconds'] >= 0.24
+
+    def test_adaptive_rate_limiter_backs_off_on_throttling(self, stub_server, tmp_path):
+        rate_limiter = AdaptiveRateLimiter(initial_rate=50.0, max_rate=100.0, decrease_cooldown=0.0)
+        fetcher = AsyncFetcher(
+            user_agent='test-agent',
+            cache_manager=CacheManager(cache_dir=tmp_path / 'cache'),
+            max_retries=2,
+            backoff_factor=0.01,
+            rate_limiter=rate_limiter
+        )
+        summary = fetcher.fetch_batch([f"{stub_server}/flaky", f"{stub_server}/ok"])
+
+        assert summary['succeeded'] == 2
+        assert summary['rate_limiter']['throttled'] == 1
+        assert summary['rate_limiter']['decreases'] == 1
+        fetcher.close()
+
+    def test_bot_challenge_pages_are_retried_and_never_cached(self, fetcher):
+        server = MockSejmServer(faults=FaultProfile(captcha_rate=1.0), segments=3)
+        server.start()
+        try:
+            url = server.url_for('captcha-1')
+            summary = fetcher.fetch_batch([url])
+        finally:
+            server.stop()
+
+        assert (summary['succeeded'], summary['failed']) == (0, 1)
+        assert summary['results'][url] is None
+        assert server.stats['captchas'] == 3
+        assert fetcher.cache_manager.get_entry(url) is None
@@ -0,0 +1,95 @@
+import pytest
+
+from src.scraping.cache_bundle import CacheBundle, import_bundle, write_bundle
+from src.scraping.cache_codecs import ZLIB, ZSTD
+from src.scraping.cache_manager import CacheManager
+from src.scraping.sqlite_cache import SQLiteCacheManager
+
+URL = 'https://orka2.sejm.gov.pl/Debata1.nsf/view/doc?OpenDocument'
+PAGE = '<html><body>' + 'Zamykam dyskusję. ' * 200 + '</body></html>'
+
+
+@pytest.fixture
+def source(tmp_path):
+    cache_manager = CacheManager(cache_dir=tmp_path / 'source')
+    cache_manager.save_to_cache(URL, PAGE, {'year': 1995, 'etag': '"v1"'})
+    cache_manager.save_to_cache(URL + '&other', '<html>other</html>')
+    yield cache_manager
+    cache_manager.close()
+
+
+@pytest.fixture
+def bundle_path(tmp_path, source):
+    path = tmp_path / 'sejm.bundle'
+    assert write_bundle(source, path, compression=ZLIB) == 2
+    return path
+
+
+class TestCacheBundle:
+    def test_single_entries_are_read_by_key(self, bundle_path, source):
+        bundle = CacheBundle(bundle_path)
+        try:
+            assert bundle.entry_count == 2
+            assert bundle.get_entry(source._generate_cache_key(URL)) == source.get_entry(URL)
+            assert bundle.get_entry('missing') is None
+        finally:
+            bundle.close()
+
+    def test_bundle_is_smaller_than_the_pages(self, bundle_path):
+        assert bundle_path.stat().st_size < len(PAGE) / 2
+
+    def test_corrupted_zstd_entry_is_a_miss(self, tmp_path, source):
+        pytest.importorskip('zstandard')
+        path = tmp_path / 'zstd.bundle'
+        write_bundle(source, path, compression=ZSTD)
+        bundle = CacheBundle(path)
+        key = source._generate_cache_key(URL)
+        try:
+            url, timestamp, metadata, offset, length, codec, kind = bundle._entries[key]
+            bundle._entries[key] = (url, timestamp, metadata, offset, length // 2, codec, kind)
+            assert bundle.get_entry(key) is None
+        finally:
+            bundle.close()
+
+    def test_other_files_are_rejected(self, tmp_path):
+        (tmp_path / 'not.bundle').write_bytes(b'not a bundle at all, just some bytes')
+        with pytest.raises(ValueError):
+            CacheBundle(tmp_path / 'not.bundle')
+
+
+class TestBundleAsReadOnlyLayer:
+    def test_misses_fall_back_to_the_bundle_and_writes_stay_local(self, tmp_path, bundle_path):
+        bundle_path.chmod(0o444)
+        bundle_size = bundle_path.stat().st_size
+        cache_manager = CacheManager(cache_dir=tmp_path / 'node', bundle=CacheBundle(bundle_path))
+
+        assert cache_manager.get_from_cache(URL) == PAGE
+        assert cache_manager.get_entry(URL)['metadata'] == {'year': 1995, 'etag': '"v1"'}
+        cache_manager.save_to_cache(URL, '<html>refetched</html>')
+
+        assert cache_manager.get_from_cache(URL) == '<html>refetched</html>'
+        assert cache_manager.stats()['entries'] == 1
+        assert sorted(cache_manager.iter_urls()) == [URL, URL + '&other']
+        assert bundle_path.stat().st_size == bundle_size
+        cache_manager.close()
+
+
+class TestImport:
+    def test_import_copies_entries_with_their_timestamps(self, tmp_path, bundle_path, source):
+        target = SQLiteCacheManager(tmp_path / 'node.sqlite3', compression=ZLIB)
+        target.save_to_cache(URL + '&other', '<html>local</html>')
+
+        assert import_bundle(bundle_path, target) == {'imported': 1, 'skipped': 1}
+        assert target.get_entry(URL) == source.get_entry(URL)
+        assert target.get_from_cache(URL + '&other') == '<html>local</html>'
+        target.close()
+
+    def test_export_of_an_imported_cache_round_trips(self, tmp_path, bundle_path, source):
+        target = SQLiteCacheManager(tmp_path / 'node.sqlite3', compression=ZLIB)
+        import_bundle(bundle_path, target)
+        assert write_bundle(target, tmp_path / 'again.bundle', compression=ZLIB) == 2
+        target.close()
+
+        bundle = CacheBundle(tmp_path / 'again.bundle')
+        assert bundle.get_entry(source._generate_cache_key(URL)) == source.get_entry(URL)
+        bundle.close()
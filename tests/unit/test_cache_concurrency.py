@@ -0,0 +1,39 @@
+import time
+import pytest
+
+from src.benchmark.cache_stress import run_cache_stress
+from src.scraping.cache_manager import CacheManager
+
+URL = 'https://orka2.sejm.gov.pl/Debata1.nsf/view/doc?OpenDocument'
+
+
+@pytest.mark.parametrize('backend', ['pickle', 'sqlite'])
+def test_concurrent_processes_fetch_every_url_once(backend):
+    result = run_cache_stress(backend, processes=6, url_count=30, rounds=2)
+
+    assert result['fetches'] == 30
+    assert result['duplicate_fetches'] == 0
+    assert result['corrupted_reads'] == 0
+    assert result['problems'] == []
+
+
+@pytest.mark.parametrize('backend', ['pickle', 'sqlite'])
+def test_concurrent_writes_expiry_and_eviction_never_corrupt_entries(backend):
+    result = run_cache_stress(backend, processes=6, url_count=30, rounds=2, churn=True)
+
+    assert result['corrupted_reads'] == 0
+    assert result['problems'] == []
+
+
+def test_expired_entry_rewritten_meanwhile_is_kept(tmp_path):
+    cache_manager = CacheManager(cache_dir=tmp_path / 'cache', cache_ttl_seconds=60)
+    cache_manager.save_to_cache(URL, '<html>old</html>')
+    seen_timestamp = cache_manager.get_entry(URL)['timestamp']
+    time.sleep(0.01)
+    cache_manager.save_to_cache(URL, '<html>new</html>') # Another process refreshes the entry
+
+    cache_manager._delete_entry(URL, not_newer_than=seen_timestamp)
+
+    assert cache_manager.get_from_cache(URL) == '<html>new</html>'
+    assert not list(cache_manager.cache_dir.glob('.*.tmp'))
+    cache_manager.close()
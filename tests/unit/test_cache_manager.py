@@ -0,0 +1,246 @@
+import time
+import pytest
+
+from src.scraping.cache_manager import BODIES_DIR, CacheManager, response_metadata, url_key
+from src.scraping.session_scraper import SessionScraper
+from src.scraping.url_canonicalizer import UrlCanonicalizer
+
+URL = 'https://orka2.sejm.gov.pl/Debata1.nsf/view/doc?OpenDocument'
+DOC = '0b9f1f5e1e1a5a3bc12574c60039c1b6'
+NOTES_URL = f'https://orka2.sejm.gov.pl/Debata1.nsf/7f10c9a5bfa8e1d2c1257d77004bbf4d/{DOC}?OpenDocument'
+NOTES_VARIANT = f'https://orka2.sejm.gov.pl/Debata1.nsf/AllDocuments/{DOC}?opendocument'
+
+
+def make_stale(cache_manager: CacheManager, url: str):
+    """Backdates an entry so that it is older than the TTL."""
+    cache_entry = cache_manager.get_entry(url)
+    cache_entry['timestamp'] = time.time() - cache_manager.cache_ttl_seconds - 10
+    cache_manager._write_cache_file(cache_manager.cache_dir / cache_manager._generate_cache_key(url), cache_entry)
+
+
+class FakeClient:
+    """Records fetches and answers conditional GETs with a preset response."""
+
+    def __init__(self, conditional_response=(304, None, {})):
+        self.conditional_response = conditional_response
+        self.fetched = []
+        self.revalidated = []
+
+    def fetch_with_headers(self, url):
+        self.fetched.append(url)
+        return '<html>fresh</html>', {'ETag': '"v2"'}
+
+    def fetch_conditional(self, url, etag=None, last_modified=None):
+        self.revalidated.append((url, etag, last_modified))
+        return self.conditional_response
+
+
+@pytest.fixture
+def cache_manager(tmp_path):
+    return CacheManager(cache_dir=tmp_path / 'cache', revalidate_year_range=(1991, 2011))
+
+
+class TestCacheManager:
+    def test_response_metadata_keeps_validators(self):
+        metadata = response_metadata({'ETag': '"abc"', 'last-modified': 'Mon, 01 Jan 2001 00:00:00 GMT'}, 200)
+        assert metadata == {'etag': '"abc"', 'last_modified': 'Mon, 01 Jan 2001 00:00:00 GMT', 'status': 200}
+
+    def test_expired_entry_is_removed_under_expire_policy(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 2015})
+        make_stale(cache_manager, URL)
+
+        assert cache_manager.get_from_cache(URL) is None
+        assert cache_manager.get_entry(URL) is None
+
+    def test_historical_entry_is_kept_for_revalidation(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 1995, 'etag': '"v1"'})
+        make_stale(cache_manager, URL)
+
+        assert cache_manager.get_from_cache(URL) is None
+        assert cache_manager.get_entry(URL)['content'] == '<html>old</html>'
+        cache_manager.clear_expired_cache()
+        assert cache_manager.get_entry(URL) is not None
+
+    def test_refresh_timestamp_makes_entry_fresh(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 1995})
+        make_stale(cache_manager, URL)
+
+        assert cache_manager.refresh_timestamp(URL, {'etag': '"v1"'})
+        assert cache_manager.get_from_cache(URL) == '<html>old</html>'
+        assert cache_manager.get_entry(URL)['metadata'] == {'year': 1995, 'etag': '"v1"'}
+
+
+class TestSessionScraperRevalidation:
+    def test_not_modified_keeps_body_without_refetch(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 1995, 'etag': '"v1"'})
+        make_stale(cache_manager, URL)
+        client = FakeClient((304, None, {}))
+
+        assert SessionScraper(client, cache_manager).fetch_session_html(URL) == '<html>old</html>'
+        assert client.revalidated == [(URL, '"v1"', None)]
+        assert client.fetched == []
+        assert cache_manager.get_from_cache(URL) == '<html>old</html>'
+
+    def test_modified_response_replaces_body(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 1995, 'etag': '"v1"'})
+        make_stale(cache_manager, URL)
+        client = FakeClient((200, '<html>new</html>', {'ETag': '"v2"'}))
+
+        assert SessionScraper(client, cache_manager).fetch_session_html(URL) == '<html>new</html>'
+        assert cache_manager.get_entry(URL)['metadata']['etag'] == '"v2"'
+
+    def test_failed_revalidation_serves_stale_copy(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 1995, 'etag': '"v1"'})
+        make_stale(cache_manager, URL)
+        client = FakeClient((None, None, {}))
+
+        assert SessionScraper(client, cache_manager).fetch_session_html(URL) == '<html>old</html>'
+        assert client.fetched == []
+
+    def test_entry_without_validators_is_fetched_again(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 1995})
+        make_stale(cache_manager, URL)
+        client = FakeClient()
+
+        assert SessionScraper(client, cache_manager).fetch_session_html(URL, year=1995) == '<html>fresh</html>'
+        assert client.revalidated == []
+        assert cache_manager.get_entry(URL)['metadata'] == {'etag': '"v2"', 'year': 1995}
+
+    def test_fetch_sessions_stores_the_session_years(self, cache_manager):
+        recent_url = 'https://orka2.sejm.gov.pl/Sejm9.nsf/stenogram.xsp?id=1'
+        client = FakeClient()
+
+        contents = SessionScraper(client, cache_manager).fetch_sessions({URL: 1995, recent_url: 2015}, max_workers=2)
+
+        assert contents == {URL: '<html>fresh</html>', recent_url: '<html>fresh</html>'}
+        assert cache_manager.get_entry(URL)['metadata']['year'] == 1995
+        assert cache_manager.get_entry(recent_url)['metadata']['year'] == 2015
+        # The closed-term page is kept for revalidation, the recent one expires
+        make_stale(cache_manager, URL)
+        make_stale(cache_manager, recent_url)
+        cache_manager.clear_expired_cache()
+        assert cache_manager.get_entry(URL) is not None
+        assert cache_manager.get_entry(recent_url) is None
+
+
+class TestCacheIndex:
+    def test_stats_come_from_the_index(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 2015})
+        cache_manager.save_to_cache(URL + '&other', '<html>other</html>', {'year': 1995})
+        make_stale(cache_manager, URL)
+        cache_manager.get_from_cache(URL + '&other')
+        cache_manager.get_from_cache(URL + '&missing')
+
+        stats = cache_manager.stats()
+
+        assert stats['entries'] == 2
+        assert stats['total_bytes'] == sum(
+            (cache_manager.cache_dir / cache_manager._generate_cache_key(url)).stat().st_size
+            for url in (URL, URL + '&other')
+        )
+        assert stats['age_histogram']['<1h'] == 1
+        assert stats['age_histogram']['1d-7d'] == 1
+        assert stats['lookups'] == {'hit': 1, 'miss': 1, 'stale': 0, 'expired': 0}
+        assert stats['hit_ratio'] == 0.5
+
+    def test_expiry_does_not_unpickle_entries(self, cache_manager, monkeypatch):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 2015})
+        cache_manager.save_to_cache(URL + '&historical', '<html>old</html>', {'year': 1995})
+        make_stale(cache_manager, URL)
+        make_stale(cache_manager, URL + '&historical')
+        monkeypatch.setattr('pickle.load', lambda f: pytest.fail("expiry unpickled a cache file"))
+
+        cache_manager.clear_expired_cache()
+
+        assert cache_manager.stats()['entries'] == 1
+        assert not (cache_manager.cache_dir / cache_manager._generate_cache_key(URL)).exists()
+
+    def test_evict_removes_oldest_entries_first(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>')
+        make_stale(cache_manager, URL)
+        cache_manager.save_to_cache(URL + '&new', '<html>new</html>')
+
+        assert cache_manager.evict(max_bytes=cache_manager.stats()['total_bytes'] - 1) == 1
+        assert cache_manager.get_entry(URL) is None
+        assert cache_manager.get_entry(URL + '&new') is not None
+
+    def test_index_is_built_for_an_existing_cache(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>', {'year': 1995})
+        cache_manager.close()
+        for index_file in cache_manager.cache_dir.glob('index.sqlite3*'):
+            index_file.unlink()
+
+        reopened = CacheManager(cache_dir=cache_manager.cache_dir)
+
+        assert reopened.stats()['entries'] == 1
+        reopened.close()
+
+    def test_lookup_counters_persist_across_instances(self, cache_manager):
+        cache_manager.get_from_cache(URL)
+        cache_manager.close()
+
+        reopened = CacheManager(cache_dir=cache_manager.cache_dir)
+        assert reopened.stats()['lookups']['miss'] == 1
+        reopened.close()
+
+
+class TestCanonicalKeysAndDeduplication:
+    @pytest.fixture
+    def canonical_cache(self, tmp_path):
+        cache = CacheManager(cache_dir=tmp_path / 'cache', canonicalizer=UrlCanonicalizer(), deduplicate=True)
+        yield cache
+        cache.close()
+
+    def test_url_variants_share_one_entry(self, canonical_cache):
+        canonical_cache.save_to_cache(NOTES_URL, '<html>doc</html>')
+
+        assert canonical_cache.get_from_cache(NOTES_VARIANT) == '<html>doc</html>'
+        stats = canonical_cache.stats()
+        assert stats['entries'] == 1
+        assert stats['alias_hits'] == 1
+
+    def test_entry_under_the_raw_url_key_is_moved_on_first_read(self, tmp_path):
+        CacheManager(cache_dir=tmp_path / 'cache').save_to_cache(NOTES_URL, '<html>doc</html>')
+        cache = CacheManager(cache_dir=tmp_path / 'cache', canonicalizer=UrlCanonicalizer())
+
+        assert cache.get_from_cache(NOTES_URL) == '<html>doc</html>'
+        assert not (cache.cache_dir / url_key(NOTES_URL)).exists()
+        assert (cache.cache_dir / cache._generate_cache_key(NOTES_URL)).exists()
+        cache.close()
+
+    def test_rekey_moves_every_entry(self, tmp_path):
+        plain = CacheManager(cache_dir=tmp_path / 'cache')
+        plain.save_to_cache(NOTES_URL, '<html>doc</html>')
+        plain.save_to_cache(NOTES_VARIANT, '<html>doc</html>')
+        plain.close()
+        cache = CacheManager(cache_dir=tmp_path / 'cache', canonicalizer=UrlCanonicalizer())
+
+        assert cache.rekey() == 2
+        assert cache.stats()['entries'] == 1
+        assert cache.get_from_cache(NOTES_VARIANT) == '<html>doc</html>'
+        cache.close()
+
+    def test_identical_bodies_are_stored_once(self, canonical_cache):
+        canonical_cache.save_to_cache(URL, '<html>same</html>')
+        canonical_cache.save_to_cache(URL + '&other', '<html>same</html>')
+        bodies_dir = canonical_cache.cache_dir / BODIES_DIR
+
+        assert len(list(bodies_dir.iterdir())) == 1
+        duplicates = canonical_cache.stats()['duplicates']
+        assert duplicates['entries'] == 1
+        assert duplicates['bytes'] >= len('<html>same</html>')
+
+        canonical_cache._delete_entry(URL)
+        assert canonical_cache.get_from_cache(URL + '&other') == '<html>same</html>'
+        canonical_cache._delete_entry(URL + '&other')
+        assert list(bodies_dir.iterdir()) == []
+
+    def test_index_rebuild_resolves_deduplicated_bodies(self, canonical_cache):
+        canonical_cache.save_to_cache(URL, '<html>same</html>')
+        canonical_cache.save_to_cache(URL + '&other', '<html>same</html>')
+        (canonical_cache.cache_dir / BODIES_DIR / ('f' * 64)).write_text('unreferenced')
+
+        canonical_cache.rebuild_index()
+
+        assert canonical_cache.stats()['duplicates']['entries'] == 1
+        assert len(list((canonical_cache.cache_dir / BODIES_DIR).iterdir())) == 1
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from src.benchmark.dataset_benchmark import RULES_PATH, synthetic_sessions
+from src.parsing.parser_backends import LXML_BACKEND
+from src.reconstruction.dataset_builder import segment_session, segment_sessions
+
+CONFIG = {'extraction_cache': {'enabled': False}}
+
+def test_synthetic_sessions_are_segmented():
+    session_df, html_content = synthetic_sessions(1, segments=6)[0]
+    segmented = segment_session(session_df, html_content, RULES_PATH, LXML_BACKEND)
+
+    assert len(segmented) == 11
+    assert segmented['chair'].tolist() == [1, 0] * 5 + [1]
+    assert segmented['place_agenda'].tolist() == list(range(1, 12))
+
+def test_parallel_segmentation_is_identical_to_the_serial_run():
+    work_units = synthetic_sessions(6, segments=8)
+    # A session without a transcript is passed through unchanged, in its place
+    work_units[2] = (work_units[2][0], None)
+
+    serial = [
+        session_df if html_content is None else segment_session(session_df, html_content, RULES_PATH, LXML_BACKEND)
+        for session_df, html_content in work_units
+    ]
+    parallel = list(segment_sessions(iter(work_units), 2, CONFIG, RULES_PATH, LXML_BACKEND))
+
+    assert parallel[2] is work_units[2][0]
+    assert pd.concat(parallel, ignore_index=True).to_csv(index=False) == pd.concat(serial, ignore_index=True).to_csv(index=False)
@@ -0,0 +1,84 @@
+import pytest
+
+from src.scraping.cache_manager import CacheManager
+from src.scraping.circuit_breaker import CircuitBreaker
+from src.scraping.dead_letters import DeadLetterQueue
+from src.scraping.session_scraper import SessionScraper
+
+URL = 'https://orka2.sejm.gov.pl/Debata1.nsf/view/doc?OpenDocument'
+
+
+class FailingClient:
+    """Fails every fetch and counts the attempts."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_with_headers(self, url):
+        self.calls += 1
+        return None, {}
+
+
+@pytest.fixture
+def dead_letters(tmp_path):
+    return DeadLetterQueue(tmp_path / 'dead_letters.json', base_delay_seconds=60, max_delay_seconds=100)
+
+
+class TestDeadLetterQueue:
+    def test_failures_are_persisted_with_backoff(self, dead_letters, tmp_path):
+        dead_letters.record_failure(URL, "timeout", year=1995)
+        dead_letters.record_failure(URL, "HTTP 503")
+
+        reloaded = DeadLetterQueue(tmp_path / 'dead_letters.json')
+        entry = reloaded.get(URL)
+        assert entry['attempts'] == 2
+        assert entry['reason'] == "HTTP 503"
+        assert entry['year'] == 1995
+        assert entry['next_eligible_at'] - entry['last_failed_at'] == pytest.approx(100)
+        assert not reloaded.is_eligible(URL)
+
+    def test_release_and_success(self, dead_letters):
+        dead_letters.record_failure(URL, "timeout")
+        dead_letters.release_all()
+        assert dead_letters.is_eligible(URL)
+        dead_letters.record_success(URL)
+        assert URL not in dead_letters
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_probes_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=0)
+        breaker.record_failure(URL)
+        assert breaker.state(URL) == 'closed'
+        breaker.record_failure(URL)
+        assert breaker.state(URL) == 'open'
+
+        assert breaker.allow_request(URL)  # Reset timeout elapsed: one trial request
+        assert not breaker.allow_request(URL)
+        breaker.record_success(URL)
+        assert breaker.state(URL) == 'closed'
+
+
+class TestSessionScraperDeadLetters:
+    def test_failed_url_is_dead_lettered_and_skipped(self, dead_letters, tmp_path):
+        client = FailingClient()
+        scraper = SessionScraper(client, CacheManager(cache_dir=tmp_path / 'cache'), dead_letters=dead_letters)
+
+        assert scraper.fetch_session_html(URL, year=1995) is None
+        assert scraper.fetch_session_html(URL, year=1995) is None
+        assert client.calls == 1
+        assert dead_letters.get(URL)['attempts'] == 1
+
+    def test_open_circuit_stops_requests(self, dead_letters, tmp_path):
+        client = FailingClient()
+        scraper = SessionScraper(
+            client, CacheManager(cache_dir=tmp_path / 'cache'),
+            dead_letters=dead_letters, circuit_breaker=CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+        )
+        other_url = URL.replace('doc', 'other')
+
+        assert scraper.fetch_session_html(URL) is None
+        assert scraper.fetch_session_html(other_url) is None
+        assert client.calls == 1
+        assert dead_letters.get(other_url)['reason'] == "circuit breaker open"
+        assert dead_letters.get(other_url)['attempts'] == 0
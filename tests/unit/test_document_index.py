@@ -0,0 +1,87 @@
+import pandas as pd
+
+from src.benchmark.dataset_benchmark import RULES_PATH, synthetic_sessions
+from src.parsing.parser_backends import LXML_BACKEND
+from src.reconstruction.dataset_builder import segment_session, segment_sessions
+from src.reconstruction.document_index import UNKNOWN_CYCLE, DocumentIndex, document_id, electoral_cycle
+
+BASE_URL = 'https://orka2.sejm.gov.pl'
+CONFIG = {'extraction_cache': {'enabled': False}}
+
+def _dataset_work_units(sessions: int, segments: int):
+    """Synthetic sessions as rows of one dataset, with its labels, and their transcripts."""
+    generated = synthetic_sessions(sessions, segments)
+    dataset = pd.concat([session_df for session_df, _ in generated], ignore_index=True)
+    sessions_df = [session_df for _, session_df in dataset.groupby(dataset['date'].dt.date)]
+    return dataset, [(session_df, html_content) for session_df, (_, html_content) in zip(sessions_df, generated)]
+
+def test_document_ids_ignore_case_and_parameter_order():
+    expected = document_id(f'{BASE_URL}/Sejm7.nsf/wypowiedz.xsp?posiedzenie=1&dzien=2&wyp=3')
+
+    assert expected == 'sejm7.nsf|dzien=2&posiedzenie=1&wyp=3'
+    assert document_id('/SEJM7.NSF/Wypowiedz.xsp?wyp=3&dzien=2&posiedzenie=1#top') == expected
+    assert document_id('wypowiedz.xsp?id=1') == '|id=1'
+    assert document_id(f'{BASE_URL}/Debata1.nsf/main/1') is None
+    assert document_id(None) is None
+
+def test_vectorized_index_agrees_with_document_id():
+    sources = [
+        f'{BASE_URL}/Sejm7.nsf/wypowiedz.xsp?posiedzenie=1&dzien=2&wyp=3',
+        f'{BASE_URL}/sejm7.nsf/wypowiedz.xsp?wyp=3&posiedzenie=1&dzien=2',
+        f'{BASE_URL}/Sejm7.nsf/wypowiedz.xsp?posiedzenie=1&dzien=2&wyp=4',
+        f'{BASE_URL}/Debata1.nsf/main/1',
+        None,
+    ]
+    df = pd.DataFrame({'source': sources}, index=[5, 7, 9, 11, 13])
+    index = DocumentIndex(df)
+
+    expected = {}
+    for label, source in zip(df.index, sources):
+        if document_id(source) is not None:
+            expected.setdefault(document_id(source), []).append(label)
+    assert index.rows == expected
+    assert index.labels('/SEJM7.nsf/wypowiedz.xsp?wyp=3&dzien=2&posiedzenie=1') == [5, 7]
+    assert index.labels('/Debata1.nsf/main/1') == []
+
+def test_electoral_cycles_follow_the_term_dates():
+    assert electoral_cycle('1991-11-24') == 'X PRL'
+    assert electoral_cycle('1991-11-25') == 'I'
+    assert electoral_cycle(pd.Timestamp('2011-11-08')) == 'VII'
+    assert electoral_cycle('1985-01-01') == UNKNOWN_CYCLE
+    assert electoral_cycle(pd.NaT) == UNKNOWN_CYCLE
+
+    index = DocumentIndex(pd.DataFrame({'source': [None] * 3, 'date': pd.to_datetime(['2001-10-18', '2001-10-19', None])}))
+    assert index.cycles == {0: 'III', 1: 'IV', 2: UNKNOWN_CYCLE}
+
+def test_stats_are_merged_per_cycle_in_term_order():
+    index = DocumentIndex(pd.DataFrame({'source': [None] * 2, 'date': pd.to_datetime(['2008-01-01', '1999-01-01'])}))
+    index.record(0, 4, 3)
+    index.record(1, 0, 0)
+    other = index.take_stats()
+    index.record(1, 2, 2)
+    index.merge_stats(other)
+
+    assert index.match_rates() == {
+        'III': {'links': 2, 'resolved': 2, 'match_rate': 1.0},
+        'VI': {'links': 4, 'resolved': 3, 'match_rate': 0.75},
+    }
+
+def test_modern_links_are_resolved_by_the_index():
+    dataset, work_units = _dataset_work_units(4, 6)
+    index = DocumentIndex(dataset)
+
+    for session_df, html_content in work_units:
+        indexed = segment_session(session_df, html_content, RULES_PATH, LXML_BACKEND, document_index=index)
+        assert indexed.to_csv(index=False) == segment_session(session_df, html_content, RULES_PATH, LXML_BACKEND).to_csv(index=False)
+    # The two modern sessions have 5 links each, all resolved; legacy links are not counted
+    assert index.match_rates() == {'III': {'links': 10, 'resolved': 10, 'match_rate': 1.0}}
+
+def test_worker_stats_are_merged_into_the_parent_index():
+    dataset, work_units = _dataset_work_units(4, 6)
+    serial_index, parallel_index = DocumentIndex(dataset), DocumentIndex(dataset)
+
+    serial = [segment_session(session_df, html_content, RULES_PATH, LXML_BACKEND, document_index=serial_index) for session_df, html_content in work_units]
+    parallel = list(segment_sessions(iter(work_units), 2, CONFIG, RULES_PATH, LXML_BACKEND, parallel_index))
+
+    assert pd.concat(parallel).to_csv() == pd.concat(serial).to_csv()
+    assert parallel_index.match_rates() == serial_index.match_rates()
@@ -0,0 +1,57 @@
+from pathlib import Path
+import pytest
+
+from src.benchmark.mock_sejm_server import LEGACY_LAYOUT, synthetic_transcript
+from src.parsing import extraction_cache as extraction_cache_module
+from src.parsing.extraction_cache import ExtractionCache, extract_session
+
+RULES_PATH = Path(__file__).resolve().parent.parent.parent / 'config' / 'scraping_rules.yaml'
+RULES = {'speech_link': 'a[href*="/main/"]'}
+
+
+@pytest.fixture
+def page():
+    return synthetic_transcript('42', LEGACY_LAYOUT, segments=4)
+
+
+@pytest.fixture
+def extraction_cache(tmp_path):
+    cache = ExtractionCache(tmp_path / 'extractions.sqlite3')
+    yield cache
+    cache.close()
+
+
+class TestExtractionCache:
+    def test_key_depends_on_html_rules_and_extractor_version(self, page, monkeypatch):
+        key = ExtractionCache.key(page, RULES)
+
+        assert ExtractionCache.key(page + ' ', RULES) != key
+        assert ExtractionCache.key(page, {**RULES, 'speech_link': 'a'}) != key
+        monkeypatch.setattr(extraction_cache_module, 'EXTRACTOR_VERSION', 999)
+        assert ExtractionCache.key(page, RULES) != key
+
+    def test_results_survive_reopening(self, tmp_path, page):
+        cache = ExtractionCache(tmp_path / 'extractions.sqlite3')
+        cache.put(page, RULES, ['Otwieram posiedzenie.'], [{'text': 'Poseł Jan Kowalski', 'href': '/main/1'}])
+        cache.close()
+
+        reopened = ExtractionCache(tmp_path / 'extractions.sqlite3')
+        assert reopened.get(page, RULES) == (['Otwieram posiedzenie.'], [{'text': 'Poseł Jan Kowalski', 'href': '/main/1'}])
+        assert reopened.get(page, {'speech_link': 'a'}) is None
+        reopened.close()
+
+
+class TestExtractSession:
+    def test_unchanged_page_skips_parsing(self, page, extraction_cache, monkeypatch):
+        segments, links = extract_session(page, 2001, RULES_PATH, extraction_cache)
+        assert len(segments) == 4
+        assert [link['href'] for link in links] == [f'/Debata1.nsf/main/42-{index}' for index in range(3)]
+
+        monkeypatch.setattr(extraction_cache_module, 'HTMLParser', lambda *args, **kwargs: pytest.fail("parsed again"))
+        assert extract_session(page, 2001, RULES_PATH, extraction_cache) == (segments, links)
+        assert (extraction_cache.hits, extraction_cache.misses) == (1, 1)
+
+    def test_cached_result_matches_a_fresh_parse(self, page, extraction_cache):
+        extract_session(page, 2001, RULES_PATH, extraction_cache)
+
+        assert extract_session(page, 2001, RULES_PATH, extraction_cache) == extract_session(page, 2001, RULES_PATH)
@@ -0,0 +1,68 @@
+import random
+import re
+
+import pytest
+
+from src.benchmark.mock_sejm_server import SPEAKER_NAMES, SPEAKER_TITLES
+from src.parsing import link_analyzer
+from src.parsing.link_analyzer import LinkAnalyzer
+
+# The backtracking pattern the speaker pattern replaced, as the reference for its results
+LEGACY_SPEAKER_PATTERN = re.compile(
+    r"^\s*([\w\s\.\-]+?)\s+([A-ZĄĆĘŁŃÓŚŹŻ][\w\s\-ĄĆĘŁŃÓŚŹŻ]+)[\s\.]*$", re.IGNORECASE
+)
+
+WORDS = ['Poseł', 'Minister', 'Sekretarz Stanu', 'Jan', 'Kowalski', 'ks.', 'dr.', 'Nowak-Jeziorański', 'Łukasz', 'ąę', '-']
+CHARACTERS = list('aAzZąĄłŁ .-_!,1\t\n') + ['\xa0', '\x1c', 'é', 'ß', 'ſ', 'K', 'ı', 'İ']
+
+def _groups(pattern, text):
+    match = pattern.match(text)
+    return None if match is None else (match.group(1).strip(), match.group(2).strip())
+
+def _texts():
+    rng = random.Random(0)
+    texts = [f"{title} {name}" for title in SPEAKER_TITLES for name in SPEAKER_NAMES]
+    texts += [''.join(rng.choice(CHARACTERS) for _ in range(rng.randint(0, 16))) for _ in range(20000)]
+    texts += [
+        rng.choice(['', ' ', '  ', '\t']) + rng.choice([' ', '  ', '. ', '.']).join(rng.sample(WORDS, rng.randint(1, 4)))
+        + rng.choice(['', '.', ' .', '!'])
+        for _ in range(20000)
+    ]
+    return texts
+
+@pytest.fixture
+def speaker_cache():
+    link_analyzer._parse_speaker.cache_clear()
+    yield
+    link_analyzer._parse_speaker.cache_clear()
+
+def test_speaker_pattern_matches_the_legacy_pattern():
+    mismatches = [
+        text for text in _texts() if _groups(LinkAnalyzer.SPEAKER_PATTERN, text) != _groups(LEGACY_SPEAKER_PATTERN, text)
+    ]
+    assert mismatches == []
+
+def test_speaker_pattern_does_not_backtrack():
+    # The legacy pattern takes seconds to minutes on each of these
+    for text in (' ' * 5000, 'a' + ' ' * 5000 + '!', 'Poseł ' + 'a ' * 5000 + '.b', 'a ' + '.' * 5000 + ' '):
+        assert LinkAnalyzer.SPEAKER_PATTERN.match(text) is None
+    assert _groups(LinkAnalyzer.SPEAKER_PATTERN, 'Poseł ' + 'a ' * 5000 + 'Kowalski')[0] == 'Poseł'
+
+def test_links_are_analyzed_with_memoized_speakers(speaker_cache):
+    links = [
+        {'text': 'Poseł Jan Kowalski', 'href': '/main/1'},
+        {'text': 'Sekretarz Stanu w Ministerstwie Zdrowia Anna Nowak', 'href': '/main/2'},
+        {'text': 'Poseł Jan Kowalski', 'href': '/main/3'},
+        {'text': '!!!', 'href': '/main/4'},
+    ]
+    analyzed = LinkAnalyzer(links).analyze_links()
+    LinkAnalyzer(links).analyze_links()
+
+    assert [(link['speaker_title'], link['speaker_name']) for link in analyzed] == [
+        ('Poseł', 'Jan Kowalski'), ('Sekretarz', 'Stanu w Ministerstwie Zdrowia Anna Nowak'),
+        ('Poseł', 'Jan Kowalski'), ('Unknown', '!!!')
+    ]
+    assert analyzed[2]['href'] == '/main/3'
+    stats = LinkAnalyzer.cache_stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (5, 3, 3)
+    assert stats['hit_rate'] == pytest.approx(5 / 8)
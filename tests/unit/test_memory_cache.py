@@ -0,0 +1,89 @@
+import pytest
+
+from src.scraping.cache_manager import CacheManager, build_cache_manager
+from src.scraping.memory_cache import MemoryCache, _entry_size
+from src.scraping.session_scraper import SessionScraper
+
+URL = 'https://orka2.sejm.gov.pl/Debata1.nsf/view/doc?OpenDocument'
+
+
+def entry(content):
+    return {'url': URL, 'timestamp': 0.0, 'content': content, 'metadata': {}}
+
+
+class FakeClient:
+    def __init__(self, html):
+        self.html = html
+
+    def fetch_with_headers(self, url):
+        return self.html, {}
+
+
+@pytest.fixture
+def cache_manager(tmp_path):
+    return CacheManager(cache_dir=tmp_path / 'cache', memory_cache=MemoryCache(max_bytes=10_000_000))
+
+
+class TestMemoryCache:
+    def test_least_recently_used_entries_are_evicted_beyond_the_budget(self):
+        size = _entry_size(entry('x' * 1000))
+        memory_cache = MemoryCache(max_bytes=2 * size)
+        memory_cache.put('a', entry('a' * 1000))
+        memory_cache.put('b', entry('b' * 1000))
+        memory_cache.get('a')
+        memory_cache.put('c', entry('c' * 1000))
+
+        assert memory_cache.get('b') is None
+        assert memory_cache.get('a')['content'] == 'a' * 1000
+        assert memory_cache.stats()['evictions'] == 1
+        assert memory_cache.stats()['bytes'] == 2 * size
+
+    def test_entries_larger_than_the_budget_are_not_cached(self):
+        memory_cache = MemoryCache(max_bytes=100)
+        memory_cache.put('a', entry('a' * 1000))
+
+        assert memory_cache.get('a') is None
+        assert memory_cache.stats()['bytes'] == 0
+
+    def test_returned_entries_are_copies(self):
+        memory_cache = MemoryCache(max_bytes=10_000)
+        memory_cache.put('a', entry('body'))
+        memory_cache.get('a')['metadata']['etag'] = '"changed"'
+
+        assert memory_cache.get('a')['metadata'] == {}
+
+
+class TestCacheManagerMemoryTier:
+    def test_hot_entries_are_served_from_memory(self, cache_manager, monkeypatch):
+        cache_manager.save_to_cache(URL, '<html>body</html>')
+        monkeypatch.setattr(cache_manager, '_load_entry', lambda url: pytest.fail("read the disk"))
+
+        assert cache_manager.get_from_cache(URL) == '<html>body</html>'
+        assert cache_manager.stats()['memory']['hits'] == 1
+
+    def test_memory_follows_session_scraper_writes(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>old</html>')
+        assert cache_manager.get_from_cache(URL) == '<html>old</html>'
+        cache_manager.get_entry(URL)['metadata']['etag'] = '"mutated"'
+
+        cache_manager._delete_entry(URL)
+        assert cache_manager.get_from_cache(URL) is None
+        assert SessionScraper(FakeClient('<html>new</html>'), cache_manager).fetch_session_html(URL) == '<html>new</html>'
+
+        assert cache_manager.get_from_cache(URL) == '<html>new</html>'
+        assert 'etag' not in cache_manager.get_entry(URL)['metadata']
+
+    def test_clearing_the_cache_clears_memory(self, cache_manager):
+        cache_manager.save_to_cache(URL, '<html>body</html>')
+        cache_manager.clear_all_cache()
+
+        assert cache_manager.get_from_cache(URL) is None
+        assert cache_manager.memory_cache.stats()['entries'] == 0
+
+
+def test_memory_tier_is_optional(tmp_path):
+    config = {'cache': {'memory_max_mb': 0}, 'paths': {'cache_dir': str(tmp_path / 'cache')}}
+    assert build_cache_manager(config).memory_cache is None
+
+    config['cache']['memory_max_mb'] = 1
+    assert build_cache_manager(config).memory_cache.max_bytes == 1_000_000
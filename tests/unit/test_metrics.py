@@ -0,0 +1,45 @@
+import json
+
+from src.scraping.cache_manager import CacheManager
+from src.utils.metrics import MetricsRegistry, MetricsReporter, metrics
+
+URL = 'https://orka2.sejm.gov.pl/Debata1.nsf/view/doc?OpenDocument'
+
+
+class TestMetricsRegistry:
+    def test_prometheus_textfile_format(self):
+        registry = MetricsRegistry()
+        registry.inc('http_requests_total', client='web', status=200)
+        registry.set_gauge('rate_limiter_requests_per_second', 1.5)
+        registry.observe('http_request_seconds', 0.2, buckets=(0.1, 1.0), client='web')
+
+        text = registry.to_prometheus()
+        assert '# TYPE http_requests_total counter' in text
+        assert 'http_requests_total{client="web",status="200"} 1' in text
+        assert 'rate_limiter_requests_per_second 1.5' in text
+        assert 'http_request_seconds_bucket{client="web",le="0.1"} 0' in text
+        assert 'http_request_seconds_bucket{client="web",le="1.0"} 1' in text
+        assert 'http_request_seconds_bucket{client="web",le="+Inf"} 1' in text
+        assert 'http_request_seconds_count{client="web"} 1' in text
+
+    def test_reporter_writes_json_on_stop(self, tmp_path):
+        registry = MetricsRegistry()
+        registry.inc('cache_lookups_total', result='hit')
+        reporter = MetricsReporter(tmp_path / 'metrics.json', interval_seconds=60, registry=registry)
+        reporter.start()
+        reporter.stop()
+
+        snapshot = json.loads((tmp_path / 'metrics.json').read_text())
+        assert snapshot['counters']['cache_lookups_total'] == [{'labels': {'result': 'hit'}, 'value': 1}]
+
+
+def test_cache_manager_records_hits_and_misses(tmp_path):
+    metrics.reset()
+    cache_manager = CacheManager(cache_dir=tmp_path / 'cache')
+    cache_manager.get_from_cache(URL)
+    cache_manager.save_to_cache(URL, '<html>ok</html>')
+    cache_manager.get_from_cache(URL)
+
+    assert metrics.counter_value('cache_lookups_total', result='miss') == 1
+    assert metrics.counter_value('cache_lookups_total', result='hit') == 1
+    assert metrics.counter_value('cache_written_bytes_total') == len('<html>ok</html>')
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+from src.benchmark.load_test import benchmark_playwright, percentile, run_benchmark
+from src.benchmark.mock_sejm_server import LEGACY_LAYOUT, MODERN_LAYOUT, FaultProfile, MockSejmServer, synthetic_transcript
+from src.parsing.speech_extractor import SpeechExtractor
+from src.scraping.bot_detection import CAPTCHA_SIGNATURE
+from src.scraping.playwright_client import SUCCESS_SELECTORS
+
+RULES = {'speech_link': 'a[href*="/main/"], a[href*="wypowiedz.xsp"]'}
+
+
+@pytest.fixture
+def server():
+    server = MockSejmServer(segments=5)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.parametrize('layout, selector', [
+    (LEGACY_LAYOUT, 'body > blockquote:nth-of-type(2)'),
+    (MODERN_LAYOUT, 'div.stenogram'),
+])
+def test_layouts_match_success_selectors_and_segment(layout, selector):
+    soup = BeautifulSoup(synthetic_transcript('42', layout, segments=5), 'lxml')
+    assert selector in SUCCESS_SELECTORS
+    content_area = soup.select_one(selector)
+    assert content_area is not None
+
+    extractor = SpeechExtractor(content_area, RULES)
+    assert len(extractor.extract_segments()) == 5
+    assert len(extractor.extract_hyperlinks()) == 4
+
+
+def test_serves_both_layouts_with_validators(server):
+    legacy = requests.get(server.url_for('7', LEGACY_LAYOUT))
+    modern = requests.get(server.url_for('7', MODERN_LAYOUT))
+    assert legacy.status_code == modern.status_code == 200
+    assert 'blockquote' in legacy.text and 'stenogram' in modern.text
+
+    revalidated = requests.get(server.url_for('7', LEGACY_LAYOUT), headers={'If-None-Match': legacy.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert server.stats['served'] == 2 and server.stats['not_modified'] == 1
+
+
+def test_injects_throttling_and_captchas():
+    server = MockSejmServer(faults=FaultProfile(throttle_rate=0.5, captcha_rate=0.5))
+    server.start()
+    try:
+        responses = [requests.get(server.url_for(str(index))) for index in range(20)]
+    finally:
+        server.stop()
+    throttled = [response for response in responses if response.status_code == 429]
+    captchas = [response for response in responses if CAPTCHA_SIGNATURE in response.text]
+    assert len(throttled) + len(captchas) == 20
+    assert all(response.headers['Retry-After'] == '1' for response in throttled)
+
+
+def test_benchmark_reports_throughput_and_tail_latency():
+    results = run_benchmark(['web', 'async'], [2], requests=6, faults=FaultProfile(latency_ms=5))
+    for result in results:
+        assert result['succeeded'] == 6
+        assert result['server']['served'] == 6
+        assert result['pages_per_second'] > 0
+        assert result['p50_ms'] <= result['p99_ms'] <= result['max_ms']
+
+
+class ThreadBoundPlaywrightClient:
+    """Stands in for the sync PlaywrightClient, which fails on any thread but the one that started it."""
+
+    def __init__(self, **options):
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.get_ident()
+
+    def fetch(self, url):
+        if threading.get_ident() != self.thread:
+            raise RuntimeError("Cannot switch to a different thread")
+        return f"<html><body>{url}</body></html>"
+
+    def close(self):
+        pass
+
+
+def test_single_page_playwright_benchmark_fetches_on_the_starting_thread(monkeypatch):
+    monkeypatch.setattr('src.scraping.playwright_client.PlaywrightClient', ThreadBoundPlaywrightClient)
+
+    result = benchmark_playwright(['http://a/1', 'http://a/2'], 1)
+
+    assert (result['succeeded'], result['failed']) == (2, 0)
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([0.4, 0.1, 0.3, 0.2], 50) == 0.2
+    assert percentile([0.4, 0.1, 0.3, 0.2], 99) == 0.4
+    assert percentile([], 95) == 0.0
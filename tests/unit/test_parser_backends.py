@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import pytest
+
+from src.benchmark.extraction_benchmark import multi_pass_extraction
+from src.benchmark.mock_sejm_server import LAYOUTS, synthetic_transcript
+from src.parsing import parser_backends
+from src.parsing.parser_backends import BS4_BACKEND, LXML_BACKEND, LxmlDocument, ParsedDocument, parse_html, resolve_parser_backend
+from src.parsing.speech_extractor import SpeechExtractor
+
+FIXTURES_DIR = Path(__file__).parent.parent / 'fixtures'
+RULES = {'speech_link': 'a[href*="/main/"], a[href*="wypowiedz.xsp"]'}
+
+QUIRKY_PAGES = [
+    # A doctype, comments and processing instructions are walked as strings by BeautifulSoup
+    '<!-- head --><!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN"><p>Otwieram<?php echo 1 ?> posiedzenie.'
+    '<a href="/Debata1.nsf/main/1">Poseł <!-- x -->Jan Kowalski</a> Dziękuję &amp; &nbsp; proszę.',
+    # The text around removed scripts stays in separate strings; a script inside a link is dropped
+    '<p>a<script>var x = 1;</script>b<style>p {}</style>c<a href="wypowiedz.xsp?id=2"><script>s</script>Minister</a>d</p>',
+    # Content after </html> and a doctype inside the page
+    '<html><body>Pierwsza <a href="/main/3">Poseł A</a></body></html>druga<a href="/main/4">Poseł B</a><!DOCTYPE html>trzecia',
+    # Strings in ruby annotations and templates are walked, but not part of get_text()
+    '<p>Tekst <a href="/main/5"><ruby>Z<rt>z</rt></ruby> Nowak</a><template>ukryty <a href="/main/6">W</a></template> koniec',
+    '<!-- only a comment -->',
+]
+
+def _extract(html_content: str, backend: str):
+    document = parse_html(html_content, backend)
+    extractor = SpeechExtractor(document, RULES)
+    return extractor.extract_segments(), extractor.extract_hyperlinks(), document.stripped_text()
+
+@pytest.mark.parametrize('html_content', [
+    (FIXTURES_DIR / 'sample_html.html').read_text(encoding='utf-8'),
+    *(synthetic_transcript(str(index), LAYOUTS[index % len(LAYOUTS)], segments=30) for index in range(6)),
+    *QUIRKY_PAGES,
+])
+def test_backends_extract_identical_segments_and_links(html_content):
+    assert _extract(html_content, LXML_BACKEND) == _extract(html_content, BS4_BACKEND)
+
+def test_lxml_backend_walks_strings_like_beautifulsoup():
+    html_content = QUIRKY_PAGES[0]
+    strings = [item for item in parse_html(html_content, LXML_BACKEND).walk() if isinstance(item, str)]
+    assert strings[:3] == [' head ', 'HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN"', 'Otwieram']
+    assert '?php echo 1 ?' in strings # libxml2 reads processing instructions as comments
+
+def test_pages_lxml_cannot_reproduce_fall_back_to_bs4():
+    assert isinstance(parse_html(QUIRKY_PAGES[0], LXML_BACKEND), LxmlDocument)
+    assert not isinstance(parse_html(QUIRKY_PAGES[2], LXML_BACKEND), LxmlDocument)
+    assert not isinstance(parse_html(QUIRKY_PAGES[4], LXML_BACKEND), LxmlDocument)
+
+def test_resolves_configured_backends(monkeypatch):
+    assert resolve_parser_backend(LXML_BACKEND) == LXML_BACKEND
+    with pytest.raises(ValueError):
+        resolve_parser_backend('selectolax')
+    monkeypatch.setattr(parser_backends, 'CSSSelector', None)
+    assert resolve_parser_backend(LXML_BACKEND) == BS4_BACKEND
+
+@pytest.mark.parametrize('backend', [BS4_BACKEND, LXML_BACKEND])
+@pytest.mark.parametrize('html_content', [
+    (FIXTURES_DIR / 'sample_html.html').read_text(encoding='utf-8'),
+    synthetic_transcript('7', LAYOUTS[0], segments=30),
+    *QUIRKY_PAGES,
+])
+def test_single_pass_extraction_matches_multi_pass(backend, html_content):
+    extraction = SpeechExtractor(parse_html(html_content, backend), RULES).extract()
+    expected = multi_pass_extraction(parse_html(html_content, backend), RULES['speech_link'])
+    assert (extraction['segments'], extraction['links'], extraction['text_length']) == expected
+
+def test_single_pass_extraction_interleaves_segments_and_links():
+    html_content = '<p>Otwieram.<a href="/main/1">Poseł A</a>Dziękuję.<a href="/main/2"></a><a href="/main/3">Poseł B</a></p>'
+    extractor = SpeechExtractor(parse_html(html_content, LXML_BACKEND), RULES)
+    extraction = extractor.extract()
+    # The second link has no text: it ends a segment but is dropped. A link's text opens the next segment.
+    assert extraction['segments'] == ['Otwieram.', 'Poseł A Dziękuję.', 'Poseł B']
+    assert extraction['sequence'] == [('segment', 0), ('link', 0), ('segment', 1), ('link', 1), ('segment', 2)]
+    assert extractor.extract_hyperlinks() is extraction['links']
+
+def test_documents_must_implement_every_operation():
+    class SelectOnlyDocument(ParsedDocument):
+        backend = LXML_BACKEND
+
+        def select(self, selector):
+            return []
+
+    with pytest.raises(TypeError):
+        SelectOnlyDocument()
+    assert ParsedDocument.__abstractmethods__ == {'select', 'remove', 'walk', 'events', 'matcher', 'text', 'attribute', 'stripped_text'}
+    for backend in (BS4_BACKEND, LXML_BACKEND):
+        assert isinstance(parse_html('<p>a</p>', backend), ParsedDocument)
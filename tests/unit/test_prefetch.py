@@ -0,0 +1,125 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from src.benchmark.mock_sejm_server import FaultProfile, MockSejmServer
+from src.prefetch import load_speaker_urls
+from src.scraping.async_fetcher import AsyncFetcher
+from src.scraping.cache_manager import CacheManager
+from src.scraping.prefetcher import Prefetcher
+from src.scraping.session_scraper import SessionScraper
+from src.scraping.tiered_fetcher import load_cookie_file
+from src.scraping.url_canonicalizer import UrlCanonicalizer
+
+
+class FakeScraper:
+    """Stands in for SessionScraper, failing for URLs containing 'broken'."""
+
+    def __init__(self, cache_manager):
+        self.cache_manager = cache_manager
+        self.web_client = None
+        self.calls = []
+
+    def fetch_session_html(self, url, year=None):
+        self.calls.append(url)
+        if 'broken' in url:
+            return None
+        html = f"<html>{url}</html>"
+        self.cache_manager.save_to_cache(url, html)
+        return html
+
+
+class ThreadBoundClient:
+    """Stands in for a sync PlaywrightClient, which fails on any thread but the one that created it."""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+
+    def fetch_with_headers(self, url):
+        if threading.get_ident() != self.thread:
+            raise RuntimeError("Cannot switch to a different thread")
+        return f"<html>{url}</html>", {}
+
+
+def test_load_speaker_urls_scans_only_speaker_rows_in_range(tmp_path):
+    csv_path = tmp_path / 'speeches.csv'
+    pd.DataFrame({
+        'source': ['http://a/1', 'http://a/2', 'http://a/1', 'http://a/3', 'http://a/4'],
+        'chair': [1, 0, 1, 1, 1],
+        'date_presented': ['1991-11-25', '1991-11-25', '1991-11-25', '2015-01-01', '2010-08-06'],
+        'text': ['x', 'y', 'z', 'w', 'v']
+    }).to_csv(csv_path, index=False)
+
+    assert load_speaker_urls(csv_path, chunksize=2) == {'http://a/1': 1991, 'http://a/4': 2010}
+
+
+def test_prefetcher_accounts_for_cached_fetched_and_failed(tmp_path):
+    cache_manager = CacheManager(cache_dir=tmp_path / 'cache')
+    cache_manager.save_to_cache('http://a/cached', '<html>cached</html>')
+    scraper = FakeScraper(cache_manager)
+    failures_path = tmp_path / 'failures.csv'
+
+    summary = Prefetcher(cache_manager, session_scraper=scraper, max_workers=2).run(
+        ['http://a/cached', 'http://a/1', 'http://a/broken', 'http://a/1'], failures_path=failures_path
+    )
+
+    assert sorted(scraper.calls) == ['http://a/1', 'http://a/broken']
+    assert (summary['total'], summary['cached'], summary['fetched'], summary['failed']) == (3, 1, 1, 1)
+    assert summary['failed_urls'] == ['http://a/broken']
+    assert 'http://a/broken' in failures_path.read_text(encoding='utf-8')
+
+
+def test_prefetcher_fetches_url_variants_once(tmp_path):
+    cache_manager = CacheManager(cache_dir=tmp_path / 'cache', canonicalizer=UrlCanonicalizer())
+    scraper = FakeScraper(cache_manager)
+
+    summary = Prefetcher(cache_manager, session_scraper=scraper).run(['http://a/1?OpenDocument', 'http://A/1?opendocument'])
+
+    assert scraper.calls == ['http://a/1?OpenDocument']
+    assert (summary['total'], summary['variants'], summary['fetched']) == (1, 1, 1)
+
+
+def test_prefetcher_requires_exactly_one_fetcher(tmp_path):
+    with pytest.raises(ValueError):
+        Prefetcher(CacheManager(cache_dir=tmp_path / 'cache'))
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_prefetcher_drives_a_single_page_client_on_its_own_thread(tmp_path, max_workers):
+    cache_manager = CacheManager(cache_dir=tmp_path / 'cache')
+    scraper = SessionScraper(ThreadBoundClient(), cache_manager)
+
+    summary = Prefetcher(cache_manager, session_scraper=scraper, max_workers=max_workers).run(['http://a/1', 'http://a/2'])
+
+    assert (summary['fetched'], summary['failed']) == (2, 0)
+    assert cache_manager.get_from_cache('http://a/2') == '<html>http://a/2</html>'
+
+
+def test_http_prefetch_counts_challenge_pages_as_failures(tmp_path):
+    cache_manager = CacheManager(cache_dir=tmp_path / 'cache')
+    async_fetcher = AsyncFetcher(user_agent='test-agent', cache_manager=cache_manager, max_retries=1, backoff_factor=0.01)
+    failures_path = tmp_path / 'failures.csv'
+    server = MockSejmServer(faults=FaultProfile(captcha_rate=1.0), segments=3)
+    server.start()
+    try:
+        url = server.url_for('prefetch-captcha')
+        summary = Prefetcher(cache_manager, async_fetcher=async_fetcher).run([url], failures_path=failures_path)
+    finally:
+        server.stop()
+        async_fetcher.close()
+
+    assert (summary['fetched'], summary['failed']) == (0, 1)
+    assert url in failures_path.read_text(encoding='utf-8')
+    assert cache_manager.get_entry(url) is None
+
+
+def test_exported_browser_cookies_are_loaded_into_the_async_fetcher(tmp_path):
+    cookie_file = tmp_path / 'cookies.json'
+    cookie_file.write_text('[{"name": "TS01", "value": "passed", "domain": "orka2.sejm.gov.pl", "path": "/", "expires": -1}]')
+    async_fetcher = AsyncFetcher(user_agent='test-agent')
+
+    assert load_cookie_file(async_fetcher, cookie_file)
+    assert async_fetcher.session.cookies.get('TS01', domain='orka2.sejm.gov.pl') == 'passed'
+    assert not load_cookie_file(async_fetcher, tmp_path / 'missing.json')
+    async_fetcher.close()
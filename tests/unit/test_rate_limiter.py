@@ -0,0 +1,43 @@
+import pytest
+
+from src.scraping.rate_limiter import AdaptiveRateLimiter
+
+
+@pytest.fixture
+def rate_limiter():
+    return AdaptiveRateLimiter(initial_rate=2.0, min_rate=0.5, max_rate=4.0, additive_increase=1.0, decrease_cooldown=0.0)
+
+
+class TestAdaptiveRateLimiter:
+    def test_healthy_responses_increase_rate_additively(self, rate_limiter):
+        rate_limiter.record(status=200, latency=0.1)
+        assert rate_limiter.current_rate == pytest.approx(2.5)
+        for _ in range(20):
+            rate_limiter.record(status=200, latency=0.1)
+        assert rate_limiter.current_rate == 4.0
+
+    def test_throttling_and_challenges_decrease_rate_multiplicatively(self, rate_limiter):
+        rate_limiter.record(status=429)
+        assert rate_limiter.current_rate == 1.0
+        rate_limiter.record(status=200, challenge=True)
+        assert rate_limiter.current_rate == 0.5
+        rate_limiter.record(status=503)
+        assert rate_limiter.current_rate == 0.5
+        assert rate_limiter.metrics()['throttled'] == 2
+        assert rate_limiter.metrics()['challenges'] == 1
+
+    def test_latency_spike_decreases_rate(self, rate_limiter):
+        rate_limiter.record(status=200, latency=0.1)
+        rate_limiter.record(status=200, latency=1.0)
+        assert rate_limiter.current_rate == pytest.approx(1.25)
+        assert rate_limiter.metrics()['slow'] == 1
+
+    def test_cooldown_limits_decreases_per_burst(self):
+        rate_limiter = AdaptiveRateLimiter(initial_rate=4.0, decrease_cooldown=60.0)
+        for _ in range(5):
+            rate_limiter.record(status=429)
+        assert rate_limiter.current_rate == 2.0
+
+    def test_reserve_spaces_slots_by_current_rate(self, rate_limiter):
+        assert rate_limiter.reserve() == 0
+        assert rate_limiter.reserve() == pytest.approx(0.5, abs=0.01)
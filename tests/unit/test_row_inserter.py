@@ -0,0 +1,73 @@
+import random
+
+import pandas as pd
+
+from src.benchmark.row_inserter_benchmark import LEGACY_COLUMNS, legacy_find_matching_speech_index, legacy_insert_rows, session_inputs
+from src.reconstruction.row_inserter import RowInserter, SessionMatchIndex, find_matching_speech_index
+
+BASE_URL = 'https://orka2.sejm.gov.pl'
+
+def _speeches(rows):
+    return pd.DataFrame(
+        [{'text': f'Wypowiedź {index}.', 'chair': 0, 'place_agenda': index + 2, **row} for index, row in enumerate(rows)],
+        index=[10 * index for index in range(len(rows))]
+    )
+
+def test_insert_rows_matches_the_legacy_insertion():
+    other_rows, new_rows, analyzed_links = session_inputs('rows-test', 'legacy', 40)
+    # Shuffled speeches, a link without a speech and a speech without a link
+    other_rows = other_rows.sample(frac=1, random_state=1).iloc[1:]
+    analyzed_links = analyzed_links + [{'text': 'Poseł Nieznany', 'href': '/Debata1.nsf/main/x'}]
+
+    legacy = legacy_insert_rows(other_rows, new_rows, analyzed_links).drop(columns=LEGACY_COLUMNS)
+    assert RowInserter.insert_rows(other_rows, new_rows, analyzed_links).to_csv(index=False) == legacy.to_csv(index=False)
+
+def test_modern_speeches_follow_the_link_to_their_source():
+    other_rows, new_rows, analyzed_links = session_inputs('rows-modern', 'modern', 40)
+    other_rows = other_rows.sample(frac=1, random_state=1)
+
+    reconstructed = RowInserter.insert_rows(other_rows, new_rows, analyzed_links)
+    speeches = reconstructed[reconstructed['chair'] == 0]
+    assert speeches['source'].tolist() == [BASE_URL + link['href'] for link in analyzed_links]
+
+def test_content_matching_consumes_rows_in_session_order():
+    rng = random.Random(0)
+    names = ['Jan Kowalski', 'Anna Nowak', 'Ewa Kierzkowska']
+    rows = [
+        {'speaker': rng.choice(names), 'speaker_type': rng.choice(['Poseł', None]), 'agenda_item': rng.choice(['Punkt 1.', 'Pytania w sprawach bieżących', None]), 'source': None}
+        for _ in range(60)
+    ]
+    speeches_df = _speeches(rows)
+    links = [{'text': rng.choice(['Poseł ' + name for name in names] + names + ['sprawach', '', 'Punkt 1']), 'href': '/main/1'} for _ in range(80)]
+
+    legacy_df = speeches_df.copy()
+    match_index = SessionMatchIndex(speeches_df)
+    for link in links:
+        expected = legacy_find_matching_speech_index(link, legacy_df)
+        assert find_matching_speech_index(link, legacy_df.drop(columns=LEGACY_COLUMNS, errors='ignore')) == expected
+        position = match_index.match(link)
+        assert (None if position is None else speeches_df.index[position]) == expected
+        if expected is not None:
+            legacy_df = legacy_df.drop(expected)
+
+def test_modern_links_match_their_source_literally():
+    speeches_df = _speeches([
+        {'speaker': 'Jan Kowalski', 'speaker_type': 'Poseł', 'agenda_item': 'Punkt 1.', 'source': f'{BASE_URL}/Sejm.nsf/wypowiedz.xsp?id=12'},
+        {'speaker': 'Jan Kowalski', 'speaker_type': 'Poseł', 'agenda_item': 'Punkt 1.', 'source': f'{BASE_URL}/Sejm.nsf/wypowiedz.xsp?id=1'},
+        {'speaker': 'Anna Nowak', 'speaker_type': 'Poseł', 'agenda_item': 'Punkt 2.', 'source': f'{BASE_URL}/Sejm.nsf/wypowiedz.xsp?id=(3'},
+    ])
+    match_index = SessionMatchIndex(speeches_df)
+
+    # '?' and '(' are literal, and id=1 is not a prefix match of id=12
+    assert match_index.match({'text': 'Poseł Jan Kowalski', 'href': '/SEJM.nsf/wypowiedz.xsp?id=1'}) == 1
+    assert match_index.match({'text': 'Poseł Anna Nowak', 'href': 'wypowiedz.xsp?id=(3'}) == 2
+    assert match_index.match({'text': 'Poseł Jan Kowalski', 'href': '/Sejm.nsf/wypowiedz.xsp?id=1'}) == 0 # by content
+    assert match_index.remaining_rows() == []
+
+def test_matching_does_not_add_columns():
+    other_rows, new_rows, analyzed_links = session_inputs('rows-columns', 'legacy', 6)
+    columns = list(other_rows.columns)
+
+    reconstructed = RowInserter.insert_rows(other_rows, new_rows, analyzed_links)
+    assert list(reconstructed.columns) == columns
+    assert list(other_rows.columns) == columns
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from src.benchmark.mock_sejm_server import LAYOUTS, synthetic_transcript
+from src.parsing.parser_backends import BS4_BACKEND, LXML_BACKEND, parse_html
+from src.parsing.speech_extractor import SpeechExtractor
+from src.scraping.rules_loader import RulesRegistry, get_rules_registry, load_scraping_rules, rules_hash
+
+RULES_PATH = Path(__file__).resolve().parent.parent.parent / 'config' / 'scraping_rules.yaml'
+
+OVERLAPPING_RULES = """
+- year_range: [1991, 2000]
+  selectors: {speech_link: 'a.first'}
+- year_range: [1995, 2010]
+  selectors: {speech_link: 'a.second'}
+- year_range: [2015, 2015]
+  selectors: {speech_link: 'a.third'}
+- year_range: [2020]
+  selectors: {speech_link: 'a.invalid'}
+"""
+
+@pytest.fixture
+def rules_file(tmp_path):
+    path = tmp_path / 'rules.yaml'
+    path.write_text(OVERLAPPING_RULES, encoding='utf-8')
+    return path
+
+def _linear_scan(path: Path, year: int):
+    import yaml
+    for rule_set in yaml.safe_load(path.read_text(encoding='utf-8')):
+        year_range = rule_set.get('year_range', [])
+        if len(year_range) == 2 and year_range[0] <= year <= year_range[1]:
+            return rule_set['selectors']
+    return None
+
+def test_index_returns_the_first_rule_set_covering_a_year(rules_file):
+    registry = RulesRegistry(rules_file)
+
+    for year in range(1985, 2025):
+        expected = _linear_scan(rules_file, year)
+        if expected is None:
+            with pytest.raises(ValueError):
+                registry.rule_set(year)
+        else:
+            assert registry.rule_set(year).selectors == expected
+
+def test_registry_is_loaded_once_per_path(rules_file):
+    registry = get_rules_registry(rules_file)
+
+    assert get_rules_registry(str(rules_file)) is registry
+    assert get_rules_registry(RULES_PATH) is not registry
+    assert load_scraping_rules(rules_file, 1991) is registry.rule_set(1991).selectors
+
+def test_missing_or_empty_rules_files_are_rejected(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RulesRegistry(tmp_path / 'missing.yaml')
+    (tmp_path / 'empty.yaml').write_text('', encoding='utf-8')
+    with pytest.raises(ValueError):
+        RulesRegistry(tmp_path / 'empty.yaml')
+
+def test_versions_identify_the_rules(rules_file):
+    registry = RulesRegistry(rules_file)
+    rule_set = registry.rule_set(1991)
+    # A rule set hashes like its selectors, so extraction cache keys are unchanged
+    assert rule_set.version == rules_hash(rule_set.selectors)
+    assert registry.rule_set(2005).version != rule_set.version
+
+    rules_file.write_text(OVERLAPPING_RULES.replace('a.third', 'a.fourth'), encoding='utf-8')
+    changed = RulesRegistry(rules_file)
+    assert changed.version != registry.version
+    assert changed.rule_set(1991).version == rule_set.version
+
+@pytest.mark.parametrize('backend', [BS4_BACKEND, LXML_BACKEND])
+def test_compiled_selectors_are_reused_and_extract_like_text_selectors(backend):
+    rule_set = get_rules_registry(RULES_PATH).rule_set(2001)
+    assert rule_set.selector('speech_link', backend) is rule_set.selector('speech_link', backend)
+
+    html_content = synthetic_transcript('3', LAYOUTS[1], segments=20)
+    compiled = SpeechExtractor(parse_html(html_content, backend), rule_set).extract()
+    assert compiled == SpeechExtractor(parse_html(html_content, backend), rule_set.selectors).extract()
+    assert len(compiled['links']) == 19
@@ -0,0 +1,177 @@
+import sqlite3
+import time
+import pytest
+
+from src.scraping import cache_codecs
+from src.scraping.cache_manager import CacheManager, build_cache_manager
+from src.scraping.cache_codecs import ZLIB, ZSTD
+from src.scraping.sqlite_cache import SQLiteCacheManager, migrate_pickle_cache
+
+URL = 'https://orka2.sejm.gov.pl/Debata1.nsf/view/doc?OpenDocument'
+PAGE = '<html><body>' + 'Otwieram posiedzenie Sejmu. ' * 500 + '</body></html>'
+
+
+def backdate(cache_manager: CacheManager, url: str):
+    """Backdates an entry so that it is older than the TTL."""
+    cache_entry = cache_manager.get_entry(url)
+    cache_entry['timestamp'] = time.time() - cache_manager.cache_ttl_seconds - 10
+    cache_manager._store_entry(url, cache_entry)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / 'cache.sqlite3'
+
+
+@pytest.fixture
+def sqlite_cache(db_path):
+    cache = SQLiteCacheManager(db_path, revalidate_year_range=(1991, 2011), compression=ZLIB, batch_size=10)
+    yield cache
+    cache.close()
+
+
+class TestSQLiteCacheManager:
+    def test_round_trip_keeps_content_and_metadata(self, sqlite_cache):
+        sqlite_cache.save_to_cache(URL, PAGE, {'year': 2001, 'etag': '"v1"'})
+
+        assert sqlite_cache.get_from_cache(URL) == PAGE
+        assert sqlite_cache.get_entry(URL)['metadata'] == {'year': 2001, 'etag': '"v1"'}
+
+    def test_buffered_writes_are_readable_and_persist_after_close(self, db_path):
+        cache = SQLiteCacheManager(db_path, compression=ZLIB, batch_size=100, flush_interval_seconds=3600)
+        cache.save_to_cache(URL, PAGE)
+        assert cache.get_from_cache(URL) == PAGE
+        with sqlite3.connect(str(db_path)) as connection:
+            assert connection.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0] == 0
+        cache.close()
+
+        reopened = SQLiteCacheManager(db_path, compression=ZLIB)
+        assert reopened.get_from_cache(URL) == PAGE
+        reopened.close()
+
+    def test_bodies_are_compressed(self, sqlite_cache, db_path):
+        sqlite_cache.save_to_cache(URL, PAGE)
+        sqlite_cache.flush()
+
+        with sqlite3.connect(str(db_path)) as connection:
+            size, stored = connection.execute('SELECT size, LENGTH(body) FROM cache_entries').fetchone()
+        assert size == len(PAGE.encode('utf-8'))
+        assert stored < size / 10
+
+    def test_expired_entry_is_removed_unless_kept_for_revalidation(self, sqlite_cache):
+        historical_url = URL + '&historical'
+        sqlite_cache.save_to_cache(URL, PAGE, {'year': 2015})
+        sqlite_cache.save_to_cache(historical_url, PAGE, {'year': 1995})
+        backdate(sqlite_cache, URL)
+        backdate(sqlite_cache, historical_url)
+
+        sqlite_cache.clear_expired_cache()
+
+        assert sqlite_cache.get_entry(URL) is None
+        assert sqlite_cache.get_from_cache(historical_url) is None
+        assert sqlite_cache.get_entry(historical_url)['content'] == PAGE
+
+    def test_refresh_timestamp_makes_entry_fresh(self, sqlite_cache):
+        sqlite_cache.save_to_cache(URL, PAGE, {'year': 1995})
+        backdate(sqlite_cache, URL)
+
+        assert sqlite_cache.refresh_timestamp(URL, {'etag': '"v1"'})
+        assert sqlite_cache.get_from_cache(URL) == PAGE
+        assert sqlite_cache.get_entry(URL)['metadata'] == {'year': 1995, 'etag': '"v1"'}
+
+    def test_clear_all_cache_drops_buffered_and_committed_entries(self, sqlite_cache):
+        sqlite_cache.save_to_cache(URL, PAGE)
+        sqlite_cache.flush()
+        sqlite_cache.save_to_cache(URL + '&other', PAGE)
+
+        sqlite_cache.clear_all_cache()
+
+        assert sqlite_cache.get_entry(URL) is None
+        assert sqlite_cache.get_entry(URL + '&other') is None
+
+    def test_stats_and_eviction_use_the_indexed_columns(self, sqlite_cache):
+        sqlite_cache.save_to_cache(URL, PAGE, {'year': 2015})
+        backdate(sqlite_cache, URL)
+        sqlite_cache.save_to_cache(URL + '&new', PAGE, {'year': 2015})
+        sqlite_cache.get_from_cache(URL + '&new')
+
+        stats = sqlite_cache.stats()
+        assert stats['entries'] == 2
+        assert stats['total_bytes'] == 2 * len(PAGE.encode('utf-8'))
+        assert stats['hit_ratio'] == 1.0
+
+        assert sqlite_cache.evict(max_bytes=len(PAGE.encode('utf-8'))) == 1
+        assert sqlite_cache.get_entry(URL) is None
+        assert sqlite_cache.get_entry(URL + '&new') is not None
+
+
+class TestMigration:
+    def test_pickle_entries_are_copied_with_their_timestamps(self, tmp_path, sqlite_cache):
+        pickle_cache = CacheManager(cache_dir=tmp_path / 'pickles')
+        pickle_cache.save_to_cache(URL, PAGE, {'year': 1995, 'etag': '"v1"'})
+        pickle_cache.save_to_cache(URL + '&other', '<html>other</html>')
+        (pickle_cache.cache_dir / ('0' * 64)).write_bytes(b'not a pickle')
+        original = pickle_cache.get_entry(URL)
+
+        counts = migrate_pickle_cache(pickle_cache.cache_dir, sqlite_cache)
+
+        assert counts == {'migrated': 2, 'skipped': 1}
+        assert sqlite_cache.get_entry(URL) == original
+        assert sqlite_cache.get_from_cache(URL + '&other') == '<html>other</html>'
+
+
+    def test_deduplicated_bodies_are_shared_and_collected(self, db_path):
+        cache = SQLiteCacheManager(db_path, compression=ZLIB, deduplicate=True)
+        cache.save_to_cache(URL, PAGE)
+        cache.save_to_cache(URL + '&other', PAGE)
+        cache.flush()
+
+        assert sqlite3.connect(str(db_path)).execute('SELECT COUNT(*) FROM cache_bodies').fetchone()[0] == 1
+        assert cache.stats()['duplicates'] == {'entries': 1, 'bytes': len(PAGE)}
+        cache._delete_entry(URL)
+        assert cache.get_from_cache(URL + '&other') == PAGE
+        cache._delete_entry(URL + '&other')
+        assert sqlite3.connect(str(db_path)).execute('SELECT COUNT(*) FROM cache_bodies').fetchone()[0] == 0
+        cache.close()
+
+    def test_corrupted_zstd_body_is_removed(self, db_path):
+        pytest.importorskip('zstandard')
+        cache = SQLiteCacheManager(db_path, compression=ZSTD)
+        cache.save_to_cache(URL, PAGE)
+        cache.close()
+        with sqlite3.connect(str(db_path)) as connection:
+            connection.execute('UPDATE cache_entries SET body = SUBSTR(body, 1, LENGTH(body) / 2)')
+
+        reopened = SQLiteCacheManager(db_path, compression=ZSTD)
+        assert reopened.get_from_cache(URL) is None
+        assert reopened.get_entry(URL) is None
+        reopened.close()
+
+    def test_zstd_entries_are_kept_when_zstandard_is_missing(self, db_path, monkeypatch):
+        pytest.importorskip('zstandard')
+        cache = SQLiteCacheManager(db_path, compression=ZSTD)
+        cache.save_to_cache(URL, PAGE)
+        cache.close()
+
+        monkeypatch.setattr(cache_codecs, 'zstandard', None)
+        without_zstd = SQLiteCacheManager(db_path, compression=ZLIB)
+        assert without_zstd.get_from_cache(URL) is None
+        without_zstd.close()
+        monkeypatch.undo()
+
+        reopened = SQLiteCacheManager(db_path, compression=ZSTD)
+        assert reopened.get_from_cache(URL) == PAGE
+        reopened.close()
+
+
+def test_build_cache_manager_selects_backend(tmp_path):
+    config = {
+        'cache': {'backend': 'sqlite', 'compression': 'zlib'},
+        'paths': {'cache_dir': str(tmp_path / 'cache'), 'cache_db': str(tmp_path / 'cache.sqlite3')}
+    }
+    cache = build_cache_manager(config)
+    assert isinstance(cache, SQLiteCacheManager)
+    cache.close()
+
+    config['cache']['backend'] = 'pickle'
+    assert type(build_cache_manager(config)) is CacheManager
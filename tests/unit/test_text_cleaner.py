@@ -0,0 +1,31 @@
+import random
+
+import pandas as pd
+import pytest
+
+from src.benchmark.text_cleaner_benchmark import legacy_clean_text, synthetic_texts
+from src.utils.text_cleaner import TextCleaner
+
+@pytest.mark.parametrize('text', [
+    '',
+    'Otwieram posiedzenie Sejmu.',
+    '&amp;lt;b&amp;gt;Tekst&amp;amp;lt; &amp;nbsp; &quot;cytat&quot;&nbsp;&lt;i&gt;',
+    'Dziękuję. (Oklaski)   (Poruszenie na sali)\n(Wesołość)Proszę ( bez końca',
+    'POS: 1 DZIEN: 2\nDalej: tekst posiedzenia X1: koniec',
+    'Za\u0301z\u0307o\u0301\u0142c\u0301', # Decomposed; NFC composes it
+    '\xa0 Tekst\x1c\tz　odstępami\n',
+])
+def test_clean_text_matches_the_sequential_pipeline(text):
+    assert TextCleaner.clean_text(text) == legacy_clean_text(text)
+
+def test_clean_text_matches_the_sequential_pipeline_on_random_text():
+    alphabet = ['a', 'Z', '9', ':', ' ', '\n', '\xa0', '(', ')', '&', 'amp;', 'lt;', 'gt;', 'nbsp;', '<', '>', 'ó', 'POS: ', 'Ż']
+    rng = random.Random(0)
+    texts = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 25))) for _ in range(5000)] + synthetic_texts(500)
+    assert TextCleaner.clean_texts(texts) == [legacy_clean_text(text) for text in texts]
+
+def test_clean_texts_keeps_the_series_index():
+    texts = pd.Series(['Tak (Oklaski)', None, 'Tak (Oklaski)'], index=[10, 11, 12], name='text')
+    cleaned = TextCleaner.clean_texts(texts)
+    assert cleaned.tolist() == ['Tak', '', 'Tak']
+    assert cleaned.index.tolist() == [10, 11, 12] and cleaned.name == 'text'
@@ -0,0 +1,67 @@
+import json
+
+from src.scraping.bot_detection import CAPTCHA_SIGNATURE
+from src.scraping.tiered_fetcher import TieredFetcher
+
+TRANSCRIPT = '<html><body><div class="stenogram"><p>Marszałek: Otwieram posiedzenie.</p></div></body></html>'
+CHALLENGE = f'<html><body>{CAPTCHA_SIGNATURE}</body></html>'
+COOKIES = [{'name': 'TS01', 'value': 'abc', 'domain': 'orka2.sejm.gov.pl', 'path': '/'}]
+
+
+class FakeHttpClient:
+    """Answers every URL with a preset page and records the loaded cookies."""
+
+    def __init__(self, content):
+        self.content = content
+        self.cookies = []
+
+    def load_cookies(self, cookies):
+        self.cookies = cookies
+
+    def fetch_with_headers(self, url):
+        return self.content, {}
+
+
+class FakeBrowserClient:
+    """Renders every URL as a transcript and exports a fixed cookie jar."""
+
+    def __init__(self):
+        self.started = False
+        self.fetched = []
+
+    def start(self):
+        self.started = True
+
+    def export_cookies(self):
+        return COOKIES
+
+    def fetch_with_headers(self, url):
+        self.fetched.append(url)
+        return TRANSCRIPT, {}
+
+    def close(self):
+        self.started = False
+
+
+def test_transcript_over_http_is_not_escalated(tmp_path):
+    cookie_file = tmp_path / 'cookies.json'
+    cookie_file.write_text(json.dumps(COOKIES))
+    http_client, browser_client = FakeHttpClient(TRANSCRIPT), FakeBrowserClient()
+    fetcher = TieredFetcher(http_client, browser_client, cookie_file)
+    fetcher.start()
+
+    assert fetcher.fetch('https://orka2.sejm.gov.pl/a') == TRANSCRIPT
+    assert http_client.cookies == COOKIES
+    assert not browser_client.started
+    assert fetcher.tier_counts == {'http': 1, 'browser': 0, 'failed': 0}
+
+
+def test_challenge_is_escalated_and_cookies_are_synchronized(tmp_path):
+    cookie_file = tmp_path / 'cookies.json'
+    http_client, browser_client = FakeHttpClient(CHALLENGE), FakeBrowserClient()
+    fetcher = TieredFetcher(http_client, browser_client, cookie_file)
+
+    assert fetcher.fetch('https://orka2.sejm.gov.pl/a') == TRANSCRIPT
+    assert browser_client.fetched == ['https://orka2.sejm.gov.pl/a']
+    assert json.loads(cookie_file.read_text()) == COOKIES
+    assert fetcher.tier_counts == {'http': 0, 'browser': 1, 'failed': 0}
@@ -0,0 +1,38 @@
+from src.scraping.url_canonicalizer import UrlCanonicalizer, build_url_canonicalizer
+
+VIEW = '7f10c9a5bfa8e1d2c1257d77004bbf4d'
+DOC = '0b9f1f5e1e1a5a3bc12574c60039c1b6'
+CANONICAL = f'https://orka2.sejm.gov.pl/debata1.nsf/0/{DOC}?OpenDocument'
+
+
+def test_notes_document_variants_share_one_canonical_url():
+    canonicalizer = UrlCanonicalizer(force_https=True)
+    variants = [
+        f'https://orka2.sejm.gov.pl/Debata1.nsf/{VIEW}/{DOC}?OpenDocument',
+        f'http://ORKA2.sejm.gov.pl:80/Debata1.nsf/{VIEW.upper()}/{DOC.upper()}?opendocument',
+        f'https://orka2.sejm.gov.pl:443/debata1.nsf/AllDocuments/{DOC}?OPENDOCUMENT#top',
+    ]
+
+    assert {canonicalizer.canonicalize(url) for url in variants} == {CANONICAL}
+
+
+def test_views_are_kept_when_collapsing_is_off_and_other_paths_are_untouched():
+    canonicalizer = UrlCanonicalizer(collapse_notes_views=False)
+
+    assert canonicalizer.canonicalize(f'https://orka2.sejm.gov.pl/Debata1.nsf/{VIEW}/{DOC}?OpenDocument') == \
+        f'https://orka2.sejm.gov.pl/debata1.nsf/{VIEW}/{DOC}?OpenDocument'
+    assert canonicalizer.canonicalize('https://www.sejm.gov.pl/Sejm7.nsf/page.xsp/Posiedzenia') == \
+        'https://www.sejm.gov.pl/sejm7.nsf/page.xsp/Posiedzenia'
+
+
+def test_only_listed_query_parameters_are_dropped():
+    canonicalizer = UrlCanonicalizer(drop_query_params=['SessionID'])
+
+    assert canonicalizer.canonicalize('http://a/Debata1.nsf/0/x?openview&Start=1&sessionid=42&Count=30') == \
+        'http://a/debata1.nsf/0/x?OpenView&Start=1&Count=30'
+
+
+def test_build_url_canonicalizer_follows_the_settings():
+    assert build_url_canonicalizer({'cache': {}}) is None
+    canonicalizer = build_url_canonicalizer({'cache': {'canonicalize_urls': {'enabled': True, 'force_https': True}}})
+    assert canonicalizer.canonicalize('http://a/b') == 'https://a/b'